@@ -394,6 +394,11 @@ def on_graph_type_changed(main_window: "m_main_window.MainWindow", event):
                 # Keep is_hyperedge only if multiple endpoints remain
                 if len(getattr(edge, 'source_ids', []) or []) <= 1 and len(getattr(edge, 'target_ids', []) or []) <= 1:
                     edge.is_hyperedge = False
+        # Endpoint lists may have grown, so bring the edge index up to date
+        graph = main_window.current_graph
+        if hasattr(graph, 'reindex_edge'):
+            for edge in graph.get_all_edges():
+                graph.reindex_edge(edge.id)
         # Refresh view
         if hasattr(main_window, 'canvas'):
             main_window.canvas.Refresh()
@@ -577,6 +577,18 @@ def on_background_layers(main_window: "MainWindow", event):
     dialog.Destroy()
 
 
+def on_show_graph_3d(main_window: "MainWindow", event):
+    """Open a 3D view of the current graph; selections and 3D layouts show up in the editor."""
+    from gui.graph_view_3d import show_graph_3d
+    try:
+        show_graph_3d(main_window, main_window.current_graph,
+                      on_selection_changed=lambda node_ids: main_window.canvas.Refresh(),
+                      on_positions_changed=main_window.canvas.Refresh)
+    except Exception as e:
+        print(f"DEBUG: Could not open 3D graph view: {e}")
+        wx.MessageBox(f"Could not open the 3D graph view:\n{e}", "3D Graph View", wx.OK | wx.ICON_ERROR)
+
+
 # Graph name handlers
 def on_graph_name_changed(main_window: "MainWindow", event):
     """Handle graph name change."""
@@ -55,6 +55,10 @@ class Camera3D:
         self.rotation_speed = 45.0  # degrees per unit
         self.zoom_speed = 1.0
         
+        # Matrices are rebuilt only when the state they depend on changes
+        self._view_cache = None
+        self._projection_cache = None
+        
     def update_vectors(self):
         """Update camera vectors based on rotation."""
 
@@ -90,8 +94,12 @@ class Camera3D:
             self.right = new_right
     
     def get_view_matrix(self):
-        """Get the view matrix for the camera."""
+        """Get the view matrix for the camera (cached until position or rotation change)."""
 
+        key = (tuple(self.position), tuple(self.rotation))
+        if self._view_cache is not None and self._view_cache[0] == key:
+            return self._view_cache[1]
+        
         self.update_vectors()
         
         # Create view matrix using look-at
@@ -114,16 +122,26 @@ class Camera3D:
             [s[2], u[2], -f[2], 0],
             [-np.dot(s, eye), -np.dot(u, eye), np.dot(f, eye), 1]
         ])
+        view_matrix.flags.writeable = False
         
+        self._view_cache = (key, view_matrix)
         return view_matrix
     
     def get_projection_matrix(self, aspect_ratio: float):
-        """Get the projection matrix based on current mode."""
+        """Get the projection matrix based on current mode (cached until the lens or aspect ratio change)."""
 
+        key = (self.projection_mode, self.fov, self.ortho_size, self.near_plane, self.far_plane, aspect_ratio)
+        if self._projection_cache is not None and self._projection_cache[0] == key:
+            return self._projection_cache[1]
+        
         if self.projection_mode == ProjectionMode.PERSPECTIVE:
-            return self._get_perspective_matrix(aspect_ratio)
+            projection_matrix = self._get_perspective_matrix(aspect_ratio)
         else:
-            return self._get_orthographic_matrix(aspect_ratio)
+            projection_matrix = self._get_orthographic_matrix(aspect_ratio)
+        projection_matrix.flags.writeable = False
+        
+        self._projection_cache = (key, projection_matrix)
+        return projection_matrix
     
     def _get_perspective_matrix(self, aspect_ratio: float):
         """Get perspective projection matrix."""
@@ -208,6 +226,73 @@ class Camera3D:
         return (self.view_limits['x_min'] <= point[0] <= self.view_limits['x_max'] and
                 self.view_limits['y_min'] <= point[1] <= self.view_limits['y_max'] and
                 self.view_limits['z_min'] <= point[2] <= self.view_limits['z_max'])
+    
+    def points_in_view_limits(self, points: np.ndarray) -> np.ndarray:
+        """Vectorized point_in_view_limits: a boolean mask for an (N, 3) array of points."""
+
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        if not self.use_view_limits:
+            return np.ones(len(points), dtype=bool)
+        
+        low = np.array([self.view_limits['x_min'], self.view_limits['y_min'], self.view_limits['z_min']])
+        high = np.array([self.view_limits['x_max'], self.view_limits['y_max'], self.view_limits['z_max']])
+        return ((points >= low) & (points <= high)).all(axis=1)
+
+
+def project_points(points: np.ndarray, matrix: np.ndarray, width: int, height: int):
+    """Project an (N, 3) array of points to screen space in one batch.
+
+    matrix is the combined projection @ view @ world matrix. Applies the same
+    rules as Canvas3D.project_point to every point at once and returns integer
+    screen coordinates (N, 2), NDC depth (N,) and a mask of points that may be
+    drawn: in front of the near plane and within the safe coordinate range.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    
+    # Rows are points, so (N x 4) . (4 x 4)^T with the homogeneous 1 folded into the translation column
+    clip = points @ matrix[:, :3].T + matrix[:, 3]
+    w = clip[:, 3]
+    at_camera = np.abs(w) < 1e-6
+    
+    with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+        ndc = clip[:, :3] / np.where(at_camera, 1.0, w)[:, None]
+        
+        # Clamp NDC to keep screen coordinates from overflowing
+        ndc_xy = np.clip(ndc[:, :2], -10.0, 10.0)
+        screen = np.empty((len(points), 2))
+        screen[:, 0] = (ndc_xy[:, 0] + 1.0) * 0.5 * width
+        screen[:, 1] = (1.0 - ndc_xy[:, 1]) * 0.5 * height
+        
+        # Truncate towards zero like int()
+        max_coord = 32767
+        screen = np.clip(screen, -max_coord, max_coord).astype(np.int64)
+    depth = ndc[:, 2].copy()
+    
+    # Points at the camera plane go far offscreen
+    screen[at_camera] = -999999
+    depth[at_camera] = -1.0
+    
+    drawable = (depth > 0) & (np.abs(screen) < max_coord).all(axis=1)
+    return screen, depth, drawable
+
+
+def grid_line_segments(grid_size: int, grid_spacing: float) -> np.ndarray:
+    """Endpoints of the XZ-plane grid as a (2 * (2 * grid_size + 1), 2, 3) array.
+
+    Lines alternate between one running along Z and one running along X at
+    each grid position, which is the order Canvas3D draws them in.
+    """
+    positions = np.arange(-grid_size, grid_size + 1) * grid_spacing
+    extent = grid_size * grid_spacing
+    
+    segments = np.zeros((len(positions), 2, 2, 3))
+    segments[:, 0, :, 0] = positions[:, None]
+    segments[:, 0, 0, 2] = -extent
+    segments[:, 0, 1, 2] = extent
+    segments[:, 1, 0, 0] = -extent
+    segments[:, 1, 1, 0] = extent
+    segments[:, 1, :, 2] = positions[:, None]
+    return segments.reshape(-1, 2, 3)
 
 
 class Canvas3D(wx.Panel):
@@ -264,6 +349,11 @@ class Canvas3D(wx.Panel):
         self.grid_color_y = (80, 80, 80)     # Darker gray for Y-parallel lines
         self.grid_color_z = (120, 120, 120)  # Lighter gray for Z-parallel lines
         
+        # Cached world, combined transform and grid geometry
+        self._world_cache = None
+        self._transform_cache = None
+        self._grid_cache = None
+        
         # Bind events
         self.Bind(wx.EVT_PAINT, self.on_paint)
         self.Bind(wx.EVT_SIZE, self.on_size)
@@ -327,8 +417,12 @@ class Canvas3D(wx.Panel):
             })
     
     def get_world_matrix(self):
-        """Get the world transformation matrix."""
+        """Get the world transformation matrix (cached until the world transform changes)."""
 
+        key = (tuple(self.world_position), tuple(self.world_rotation), tuple(self.world_scale))
+        if self._world_cache is not None and self._world_cache[0] == key:
+            return self._world_cache[1]
+        
         # Translation matrix
         T = np.array([
             [1, 0, 0, self.world_position[0]],
@@ -372,49 +466,39 @@ class Canvas3D(wx.Panel):
         ])
         
         # Combine transformations: T * Rz * Ry * Rx * S
-        return T @ Rz @ Ry @ Rx @ S
+        world_matrix = T @ Rz @ Ry @ Rx @ S
+        world_matrix.flags.writeable = False
+        
+        self._world_cache = (key, world_matrix)
+        return world_matrix
     
-    def project_point(self, point_3d: np.array) -> Tuple[int, int, float]:
-        """Project a 3D point to 2D screen coordinates."""
+    def get_transform_matrix(self, aspect_ratio: float) -> np.ndarray:
+        """Get the combined projection @ view @ world matrix, rebuilt only when one of them changes."""
+
+        matrices = (self.camera.get_projection_matrix(aspect_ratio),
+                    self.camera.get_view_matrix(),
+                    self.get_world_matrix())
+        if (self._transform_cache is None or
+                any(cached is not current for cached, current in zip(self._transform_cache[0], matrices))):
+            projection_matrix, view_matrix, world_matrix = matrices
+            self._transform_cache = (matrices, projection_matrix @ view_matrix @ world_matrix)
+        return self._transform_cache[1]
+    
+    def project_points(self, points: np.ndarray):
+        """Project an (N, 3) array of points to screen coordinates in one batch.
+
+        Returns (screen, depth, drawable); see the module-level project_points.
+        """
 
-        # Apply world transformation
-        world_matrix = self.get_world_matrix()
-        point_4d = np.append(point_3d, 1.0)
-        world_point = world_matrix @ point_4d
-        
-        # Apply view transformation
-        view_matrix = self.camera.get_view_matrix()
-        view_point = view_matrix @ world_point
-        
-        # Apply projection transformation
         size = self.GetSize()
         aspect_ratio = size.width / size.height if size.height > 0 else 1.0
-        projection_matrix = self.camera.get_projection_matrix(aspect_ratio)
-        clip_point = projection_matrix @ view_point
-        
-        # Perspective divide with safety checks
-        if abs(clip_point[3]) < 1e-6:
-            # Point is at or very close to camera plane, return far offscreen
-            return -999999, -999999, -1.0
-        
-        ndc_point = clip_point[:3] / clip_point[3]
-        
-        # Clamp NDC coordinates to reasonable range to prevent overflow
-        ndc_point[0] = np.clip(ndc_point[0], -10.0, 10.0)
-        ndc_point[1] = np.clip(ndc_point[1], -10.0, 10.0)
-        
-        # Convert to screen coordinates with bounds checking
-        screen_x = (ndc_point[0] + 1.0) * 0.5 * size.width
-        screen_y = (1.0 - ndc_point[1]) * 0.5 * size.height
-        
-        # Clamp to reasonable screen coordinate range
-        max_coord = 32767  # Safe maximum for screen coordinates
-        screen_x = int(np.clip(screen_x, -max_coord, max_coord))
-        screen_y = int(np.clip(screen_y, -max_coord, max_coord))
-        
-        depth = ndc_point[2]
-        
-        return screen_x, screen_y, depth
+        return project_points(points, self.get_transform_matrix(aspect_ratio), size.width, size.height)
+    
+    def project_point(self, point_3d: np.array) -> Tuple[int, int, float]:
+        """Project a 3D point to 2D screen coordinates."""
+
+        screen, depth, _ = self.project_points(point_3d)
+        return int(screen[0, 0]), int(screen[0, 1]), float(depth[0])
     
     def safe_draw_line(self, dc, start_screen, end_screen):
         """Safely draw a line with coordinate validation."""
@@ -429,37 +513,110 @@ class Canvas3D(wx.Panel):
                 # Silently skip lines that cause drawing errors
                 pass
     
+    def draw_segments(self, dc, segments: np.ndarray, pens):
+        """Project line segments in one batch and draw the visible ones with a single DrawLineList.
+
+        segments is an (M, 2, 3) array of endpoints; pens is one wx.Pen or a
+        list with a pen per segment. A segment is drawn when both endpoints
+        pass the same checks as safe_draw_line.
+        """
+
+        segments = np.asarray(segments, dtype=float).reshape(-1, 2, 3)
+        if not len(segments):
+            return
+        
+        screen, _, drawable = self.project_points(segments.reshape(-1, 3))
+        visible = drawable.reshape(-1, 2).all(axis=1)
+        if not visible.any():
+            return
+        
+        lines = screen.reshape(-1, 4)[visible].tolist()
+        if isinstance(pens, list):
+            pens = [pen for pen, keep in zip(pens, visible) if keep]
+        try:
+            dc.DrawLineList(lines, pens)
+        except (OverflowError, ValueError) as e:
+            # Silently skip lines that cause drawing errors
+            pass
+    
+    def _cull_segments(self, segments: np.ndarray) -> np.ndarray:
+        """Keep segments with at least one endpoint inside the camera's view limits."""
+
+        if not self.camera.use_view_limits:
+            return segments
+        inside = self.camera.points_in_view_limits(segments.reshape(-1, 3)).reshape(-1, 2)
+        return segments[inside.any(axis=1)]
+    
+    def get_grid_segments(self):
+        """Get the grid lines as (segments, pens), with Z-running and X-running lines alternating."""
+
+        key = (self.grid_size, self.grid_spacing)
+        if self._grid_cache is None or self._grid_cache[0] != key:
+            self._grid_cache = (key, grid_line_segments(self.grid_size, self.grid_spacing))
+        segments = self._grid_cache[1]
+        
+        pen_z = wx.Pen(wx.Colour(*self.grid_color_z), 1)
+        pen_x = wx.Pen(wx.Colour(*self.grid_color_x), 1)
+        if not self.camera.use_view_limits:
+            return segments, [pen_z, pen_x] * (len(segments) // 2)
+        
+        inside = self.camera.points_in_view_limits(segments.reshape(-1, 3)).reshape(-1, 2).any(axis=1)
+        pens = [pen_z if index % 2 == 0 else pen_x for index in np.flatnonzero(inside)]
+        return segments[inside], pens
+    
+    def get_axes_segments(self):
+        """Get the coordinate axes as (segments, pens)."""
+
+        origin = np.zeros(3)
+        axes = np.eye(3) * 3.0
+        
+        # The axes are drawn together when any of their points is inside the view limits
+        if not self.camera.points_in_view_limits(np.vstack([origin, axes])).any():
+            return np.empty((0, 2, 3)), []
+        
+        segments = np.stack([np.broadcast_to(origin, (3, 3)), axes], axis=1)
+        pens = [wx.Pen(wx.Colour(255, 0, 0), 3),
+                wx.Pen(wx.Colour(0, 255, 0), 3),
+                wx.Pen(wx.Colour(0, 0, 255), 3)]
+        return segments, pens
+    
+    def get_object_segments(self, obj, width: int = 1):
+        """Get an object's edges as (segments, pens) after view-limit culling."""
+
+        vertices = np.asarray(obj['vertices'], dtype=float) + obj['position']
+        edges = np.asarray(obj['edges'], dtype=int).reshape(-1, 2)
+        segments = self._cull_segments(vertices[edges])
+        return segments, [wx.Pen(wx.Colour(*obj['color']), width)] * len(segments)
+    
+    def get_scene_segments(self):
+        """Get the grid, axes and object edges in draw order as one (segments, pens) batch."""
+
+        batches = []
+        if self.show_grid:
+            batches.append(self.get_grid_segments())
+        if self.show_axes:
+            batches.append(self.get_axes_segments())
+        for obj in self.objects:
+            if obj['type'] == 'wireframe':
+                batches.append(self.get_object_segments(obj, 1))
+            elif obj['type'] == 'line':
+                batches.append(self.get_object_segments(obj, 2))
+        
+        batches = [(segments, pens) for segments, pens in batches if len(segments)]
+        if not batches:
+            return np.empty((0, 2, 3)), []
+        
+        segments = np.concatenate([segments for segments, _ in batches])
+        pens = [pen for _, batch_pens in batches for pen in batch_pens]
+        return segments, pens
+    
     def draw_grid(self, dc):
         """Draw a 3D grid with separate colors for X and Z parallel lines."""
 
         if not self.show_grid:
             return
         
-        # Draw grid in XZ plane
-        for i in range(-self.grid_size, self.grid_size + 1):
-            pos = i * self.grid_spacing
-            
-            # Lines parallel to X axis (running along Z direction) - use Z color
-            dc.SetPen(wx.Pen(wx.Colour(*self.grid_color_z), 1))
-            start_point = np.array([pos, 0, -self.grid_size * self.grid_spacing])
-            end_point = np.array([pos, 0, self.grid_size * self.grid_spacing])
-            
-            if (self.camera.point_in_view_limits(start_point) or 
-                self.camera.point_in_view_limits(end_point)):
-                start_screen = self.project_point(start_point)
-                end_screen = self.project_point(end_point)
-                self.safe_draw_line(dc, start_screen, end_screen)
-            
-            # Lines parallel to Z axis (running along X direction) - use X color
-            dc.SetPen(wx.Pen(wx.Colour(*self.grid_color_x), 1))
-            start_point = np.array([-self.grid_size * self.grid_spacing, 0, pos])
-            end_point = np.array([self.grid_size * self.grid_spacing, 0, pos])
-            
-            if (self.camera.point_in_view_limits(start_point) or 
-                self.camera.point_in_view_limits(end_point)):
-                start_screen = self.project_point(start_point)
-                end_screen = self.project_point(end_point)
-                self.safe_draw_line(dc, start_screen, end_screen)
+        self.draw_segments(dc, *self.get_grid_segments())
     
     def draw_axes(self, dc):
         """Draw coordinate axes."""
@@ -467,34 +624,7 @@ class Canvas3D(wx.Panel):
         if not self.show_axes:
             return
         
-        origin = np.array([0, 0, 0])
-        x_axis = np.array([3, 0, 0])
-        y_axis = np.array([0, 3, 0])
-        z_axis = np.array([0, 0, 3])
-        
-        # Check view limits
-        if not (self.camera.point_in_view_limits(origin) or
-                self.camera.point_in_view_limits(x_axis) or
-                self.camera.point_in_view_limits(y_axis) or
-                self.camera.point_in_view_limits(z_axis)):
-            return
-        
-        origin_screen = self.project_point(origin)
-        
-        # X axis (red)
-        dc.SetPen(wx.Pen(wx.Colour(255, 0, 0), 3))
-        x_screen = self.project_point(x_axis)
-        self.safe_draw_line(dc, origin_screen, x_screen)
-        
-        # Y axis (green)
-        dc.SetPen(wx.Pen(wx.Colour(0, 255, 0), 3))
-        y_screen = self.project_point(y_axis)
-        self.safe_draw_line(dc, origin_screen, y_screen)
-        
-        # Z axis (blue)
-        dc.SetPen(wx.Pen(wx.Colour(0, 0, 255), 3))
-        z_screen = self.project_point(z_axis)
-        self.safe_draw_line(dc, origin_screen, z_screen)
+        self.draw_segments(dc, *self.get_axes_segments())
     
     def draw_objects(self, dc):
         """Draw all 3D objects."""
@@ -508,40 +638,12 @@ class Canvas3D(wx.Panel):
     def draw_wireframe_object(self, dc, obj):
         """Draw a wireframe object."""
 
-        dc.SetPen(wx.Pen(wx.Colour(*obj['color']), 1))
-        
-        vertices = obj['vertices'] + obj['position']
-        
-        for edge in obj['edges']:
-            start_vertex = vertices[edge[0]]
-            end_vertex = vertices[edge[1]]
-            
-            # Check view limits
-            if (self.camera.point_in_view_limits(start_vertex) or
-                self.camera.point_in_view_limits(end_vertex)):
-                
-                start_screen = self.project_point(start_vertex)
-                end_screen = self.project_point(end_vertex)
-                self.safe_draw_line(dc, start_screen, end_screen)
+        self.draw_segments(dc, *self.get_object_segments(obj, 1))
     
     def draw_line_object(self, dc, obj):
         """Draw a line object."""
 
-        dc.SetPen(wx.Pen(wx.Colour(*obj['color']), 2))
-        
-        vertices = obj['vertices'] + obj['position']
-        
-        for edge in obj['edges']:
-            start_vertex = vertices[edge[0]]
-            end_vertex = vertices[edge[1]]
-            
-            # Check view limits
-            if (self.camera.point_in_view_limits(start_vertex) or
-                self.camera.point_in_view_limits(end_vertex)):
-                
-                start_screen = self.project_point(start_vertex)
-                end_screen = self.project_point(end_vertex)
-                self.safe_draw_line(dc, start_screen, end_screen)
+        self.draw_segments(dc, *self.get_object_segments(obj, 2))
     
     def draw_info(self, dc):
         """Draw camera and world information."""
@@ -607,10 +709,8 @@ class Canvas3D(wx.Panel):
         dc.SetBackground(wx.Brush(wx.Colour(*self.background_color)))
         dc.Clear()
         
-        # Draw 3D elements
-        self.draw_grid(dc)
-        self.draw_axes(dc)
-        self.draw_objects(dc)
+        # Draw the grid, axes and objects as one projected batch
+        self.draw_segments(dc, *self.get_scene_segments())
         
         # Draw UI info
         self.draw_info(dc)
@@ -1,22 +1,55 @@
 """
 GUI components for the graph editor application.
+
+Submodules are imported on first use rather than with the package, so
+importing one canvas (or the sphere renderer) does not load every window,
+dialog and canvas. The classes the package used to re-export, such as
+gui.MainWindow, are looked up in _EXPORTS and load only their own module.
 """
 
 
-from .control_points_and_composite_segment_panel import *
-from .dialogs import *
-from .drawer import *
-from .graph_canvas import *
-from .layouts import *
-from .main_window import *
-from .menubar import *
-from .selector import *
-from .signal import *
-from .status_bar import *
-from .theme_dialog import *
-from .tool_selector import *
-from .toolbar import *
-from .status_bar import *
+import importlib
+
+
+_SUBMODULES = (
+    'control_points_and_composite_segment_panel',
+    'dialogs',
+    'drawer',
+    'graph_canvas',
+    'layouts',
+    'main_window',
+    'menubar',
+    'selector',
+    'sidebar',
+    'signal',
+    'status_bar',
+    'theme_dialog',
+    'tool_selector',
+    'toolbar',
+)
+
+# Re-exported name -> submodule that defines it
+_EXPORTS = {
+    'NodePropertiesDialog': 'dialogs',
+    'EdgePropertiesDialog': 'dialogs',
+    'GraphPropertiesDialog': 'dialogs',
+    'MetadataDialog': 'dialogs',
+    'PreferencesDialog': 'dialogs',
+    'GraphCanvas': 'graph_canvas',
+    'MainWindow': 'main_window',
+    'Signal': 'signal',
+    'ThemeDialog': 'theme_dialog',
+}
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f'.{name}', __name__)
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(f'.{_EXPORTS[name]}', __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-__all__ = ['MainWindow', 'GraphCanvas', 'ThemeDialog', 'sidebar', 'menubar', 'toolbar', 'tool_selector', 'status_bar', 'rotator', 'zoomer']
\ No newline at end of file
+__all__ = ['MainWindow', 'GraphCanvas', 'ThemeDialog', 'sidebar', 'menubar', 'toolbar', 'tool_selector', 'status_bar', 'rotator', 'zoomer']
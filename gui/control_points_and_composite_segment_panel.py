@@ -7,27 +7,14 @@ import wx
 
 import gui.main_window as m_main_window
 
+import utils.edge_crossings as m_edge_crossings
+
 
 def count_edge_crossings(main_window: "m_main_window.MainWindow", edges):
     """Count the number of edge crossings in current layout."""
 
-    count = 0
-    for i, edge1 in enumerate(edges):
-        for j, edge2 in enumerate(edges):
-            if i >= j:
-                continue
-                
-            # Get node positions
-            src1 = main_window.current_graph.get_node(edge1.source_id)
-            tgt1 = main_window.current_graph.get_node(edge1.target_id)
-            src2 = main_window.current_graph.get_node(edge2.source_id)
-            tgt2 = main_window.current_graph.get_node(edge2.target_id)
-            
-            if src1 and tgt1 and src2 and tgt2:
-                if main_window.edges_intersect(src1.x, src1.y, tgt1.x, tgt1.y,
-                                        src2.x, src2.y, tgt2.x, tgt2.y):
-                    count += 1
-    return count
+    # Same test as edges_intersect, applied only to pairs whose bounds overlap
+    return m_edge_crossings.count_crossings(main_window.current_graph, edges)
 
 
 def edges_intersect(main_window: "m_main_window.MainWindow", x1, y1, x2, y2, x3, y3, x4, y4):
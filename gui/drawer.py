@@ -602,6 +602,9 @@ def draw(graph_canvas: "m_graph_canvas.GraphCanvas", dc):
         # Edges are drawn in SCREEN coordinates; no world transform applied
 
         # Draw edges in world coordinates under the unified transform
+        # (syncing the collapsed view first, so new edges into collapsed
+        # containers are already hidden)
+        graph_canvas.get_collapsed_view()
         edge_count = 0
         with world_transform(gc, graph_canvas):
             for edge in graph_canvas.graph.get_all_edges():
@@ -614,6 +617,9 @@ def draw(graph_canvas: "m_graph_canvas.GraphCanvas", dc):
                     edge_count += 1
         print(f"DEBUG: Drew {edge_count} edges")
 
+        # Edges hidden inside collapsed containers show up as meta-edges (screen space)
+        draw_meta_edges(graph_canvas, dc)
+
         # Draw nodes (only visible ones) under world transform
         visible_count = 0
         total_count = 0
@@ -2701,7 +2707,39 @@ def draw_nested_edge_indicator(graph_canvas: "m_graph_canvas.GraphCanvas", dc, s
     ]
     dc.DrawPolygon(diamond_points)
 
-   
+
+def draw_meta_edges(graph_canvas: "m_graph_canvas.GraphCanvas", dc):
+    """Draw the meta-edges of collapsed containers, labelled with how many edges they stand for."""
+
+    if not graph_canvas.show_nested_edges:
+        return
+
+    view = graph_canvas.get_collapsed_view()
+    pen = wx.Pen(wx.Colour(255, 165, 0), max(2, int(2 * graph_canvas.zoom)), wx.PENSTYLE_SHORT_DASH)  # Orange dashed
+    dc.SetFont(wx.Font(max(8, int(9 * graph_canvas.zoom)), wx.FONTFAMILY_DEFAULT,
+                       wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD))
+    dc.SetTextForeground(wx.Colour(200, 100, 0))
+    for source_id, target_id, count in view.meta_edges():
+        source_node = graph_canvas.graph.get_node(source_id)
+        target_node = graph_canvas.graph.get_node(target_id)
+        if not source_node or not target_node:
+            continue
+        source_screen = graph_canvas.world_to_screen(source_node.x, source_node.y)
+        target_screen = graph_canvas.world_to_screen(target_node.x, target_node.y)
+        source_adjusted = graph_canvas.calculate_line_endpoint(source_node, target_node, source_screen, target_screen, True)
+        target_adjusted = graph_canvas.calculate_line_endpoint(target_node, source_node, target_screen, source_screen, False)
+
+        dc.SetPen(pen)
+        dc.DrawLine(int(source_adjusted[0]), int(source_adjusted[1]),
+                    int(target_adjusted[0]), int(target_adjusted[1]))
+        if count > 1:
+            label = f"×{count}"
+            text_size = dc.GetTextExtent(label)
+            mid_x = (source_adjusted[0] + target_adjusted[0]) / 2
+            mid_y = (source_adjusted[1] + target_adjusted[1]) / 2
+            dc.DrawText(label, int(mid_x - text_size.width / 2), int(mid_y - text_size.height / 2))
+
+
 def draw_line_graph_hyperedge(graph_canvas: "m_graph_canvas.GraphCanvas", dc, edge, color):
     """Draw a line graph representation of the hyperedge (edges connected if they share nodes).
     Adds support for parallel uberedges (offsets) and self-loops (ellipse).
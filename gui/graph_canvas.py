@@ -24,6 +24,7 @@ try:
     from ..models import graph as m_graph
     from ..models import node as m_node
     from ..models import edge as m_edge
+    from ..models import collapsed_view as m_collapsed_view
     from ..utils import commands as m_commands
     from .graph_canvas_property_notifier import GraphCanvasPropertyNotifierMixin
 except ImportError:
@@ -33,6 +34,7 @@ except ImportError:
     import models.graph as m_graph
     import models.node as m_node
     import models.edge as m_edge
+    import models.collapsed_view as m_collapsed_view
     import utils.commands as m_commands
     from gui.graph_canvas_property_notifier import GraphCanvasPropertyNotifierMixin
 
@@ -186,6 +188,9 @@ class GraphCanvas(wx.Panel, GraphCanvasPropertyNotifierMixin):
         # Show nested edges toggle
         self.show_nested_edges = True
 
+        # Derived view of the graph with collapsed containers folded away
+        self._collapsed_view = None
+
         # Nested edge indicators
         self.show_nested_edge_indicators = True
 
@@ -5392,6 +5397,7 @@ class GraphCanvas(wx.Panel, GraphCanvasPropertyNotifierMixin):
             pass
         if dialog.ShowModal() == wx.ID_OK:
             # Edge was updated by dialog
+            self.graph.reindex_edge(edge.id)
             self.graph_modified.emit()
             self.Refresh()
         dialog.Destroy()
@@ -5511,6 +5517,7 @@ class GraphCanvas(wx.Panel, GraphCanvasPropertyNotifierMixin):
                     edge.source_id = None
                 if getattr(edge, 'target_id', None) == node_id:
                     edge.target_id = None
+                self.graph.reindex_edge(edge.id)
                 # Remove any per-node arrow position
                 if hasattr(edge, 'metadata') and isinstance(edge.metadata, dict):
                     nmap = edge.metadata.get('arrow_pos_nodes') or {}
@@ -6035,10 +6042,8 @@ class GraphCanvas(wx.Panel, GraphCanvasPropertyNotifierMixin):
             # Find all connected hyperedges
             connected_edges = set()
             if edge.is_hyperedge:
-                for other_edge in self.graph.get_all_edges():
-                    if other_edge.is_hyperedge and edge.shares_nodes_with(
-                            other_edge):
-                        connected_edges.add(other_edge)
+                connected_edges.update(
+                    self.graph.get_connected_hyperedges(edge.id))
 
             if edge.selected:
                 print(f"DEBUG: Deselecting edge {edge.id} and connected edges")
@@ -6136,10 +6141,8 @@ class GraphCanvas(wx.Panel, GraphCanvasPropertyNotifierMixin):
             # Find all connected hyperedges
             connected_edges = set()
             if edge.is_hyperedge:
-                for other_edge in self.graph.get_all_edges():
-                    if other_edge.is_hyperedge and edge.shares_nodes_with(
-                            other_edge):
-                        connected_edges.add(other_edge)
+                connected_edges.update(
+                    self.graph.get_connected_hyperedges(edge.id))
 
             if edge.selected:
                 print(f"DEBUG: Deselecting edge {edge.id} and connected edges")
@@ -6265,6 +6268,7 @@ class GraphCanvas(wx.Panel, GraphCanvasPropertyNotifierMixin):
                         self.dragging_edge.add_from_node(target_node.id)
                     else:  # 'to'
                         self.dragging_edge.add_to_node(target_node.id)
+                    self.graph.reindex_edge(self.dragging_edge.id)
 
                     self.graph.modified = True
                     self.graph_modified.emit()
@@ -6307,6 +6311,7 @@ class GraphCanvas(wx.Panel, GraphCanvasPropertyNotifierMixin):
                                 self.dragging_edge.target_ids[
                                     index - 1] = target_node.id
 
+                        self.graph.reindex_edge(self.dragging_edge.id)
                         self.graph.modified = True
                         self.graph_modified.emit()
                     except (ValueError, IndexError):
@@ -6343,8 +6348,9 @@ class GraphCanvas(wx.Panel, GraphCanvasPropertyNotifierMixin):
                     self.undo_redo_manager.execute_command(command)
                 else:
                     # Fallback if no undo manager
-                    self.dragging_edge.source_id = new_source_id
-                    self.dragging_edge.target_id = new_target_id
+                    m_commands.ChangeEdgeConnectionCommand(
+                        self.graph, self.dragging_edge.id, old_source_id,
+                        old_target_id, new_source_id, new_target_id).execute()
 
                 self.graph.modified = True
                 self.graph_modified.emit()
@@ -7467,13 +7473,10 @@ class GraphCanvas(wx.Panel, GraphCanvasPropertyNotifierMixin):
 
             # Hide contained items if container is collapsed
             if not container_node.is_expanded:
-                for node in nodes_to_contain:
-                    print(
-                        f"DEBUG: 📦 Hiding node '{node.text}' due to containment collapse"
-                    )
-                    node.visible = False
-                for edge in edges_to_contain:
-                    edge.visible = False
+                print(
+                    f"DEBUG: 📦 Hiding {len(nodes_to_contain)} nodes due to containment collapse"
+                )
+                self.get_collapsed_view().collapse(container_node.id)
 
             # Clear selection
             self.graph.clear_selection()
@@ -7523,48 +7526,10 @@ class GraphCanvas(wx.Panel, GraphCanvasPropertyNotifierMixin):
         if target_node and target_node.is_container:
             print(f"DEBUG: 📖 Expanding container {target_node.text}")
 
-            # Expand the container
-            target_node.is_expanded = True
-
-            # Show all contained nodes and edges
-            for child_id in target_node.child_ids:
-                child_node = self.graph.get_node(child_id)
-                if child_node:
-                    child_node.visible = True
-
-            for edge_id in target_node.contained_edge_ids:
-                edge = self.graph.get_edge(edge_id)
-                if edge:
-                    edge.visible = True
-
-            # Restore redirected edges to their original nodes
-            print(f"DEBUG: 📖 Restoring redirected edges from container")
-            edges_restored = 0
-            redirected_edges = target_node.get_redirected_edges()
-
-            for edge_id, original_node_id in redirected_edges.items():
-                edge = self.graph.get_edge(edge_id)
-                if edge:
-                    # Determine if this was a source or target redirection
-                    if edge.source_id == target_node.id:
-                        # Restore source
-                        print(
-                            f"DEBUG: 📖 Restoring edge {edge_id} source from {target_node.text} to {original_node_id}"
-                        )
-                        edge.source_id = original_node_id
-                        edges_restored += 1
-                    elif edge.target_id == target_node.id:
-                        # Restore target
-                        print(
-                            f"DEBUG: 📖 Restoring edge {edge_id} target from {target_node.text} to {original_node_id}"
-                        )
-                        edge.target_id = original_node_id
-                        edges_restored += 1
-
-                    # Remove the redirection record
-                    target_node.remove_redirected_edge(edge_id)
-
-            print(f"DEBUG: 📖 Restored {edges_restored} edges from container")
+            # Expand the container and reroute its meta-edges to the contents
+            view = self.get_collapsed_view()
+            view.expand(target_node.id)
+            meta_edge_count = len(view.meta_edges())
 
             # Mark graph as modified
             if hasattr(self, 'graph_modified'):
@@ -7586,7 +7551,7 @@ class GraphCanvas(wx.Panel, GraphCanvasPropertyNotifierMixin):
 
             self.Refresh()
             print(
-                f"DEBUG: 📖 Container expanded with {edges_restored} edges restored"
+                f"DEBUG: 📖 Container expanded, {meta_edge_count} meta-edges remain"
             )
         else:
             print(f"DEBUG: 📖 No container found or not a container")
@@ -7602,52 +7567,10 @@ class GraphCanvas(wx.Panel, GraphCanvasPropertyNotifierMixin):
         if target_node and target_node.is_container:
             print(f"DEBUG: 📕 Collapsing container {target_node.text}")
 
-            # Collapse the container
-            target_node.is_expanded = False
-
-            # Hide all contained nodes and edges
-            for child_id in target_node.child_ids:
-                child_node = self.graph.get_node(child_id)
-                if child_node:
-                    child_node.visible = False
-
-            for edge_id in target_node.contained_edge_ids:
-                edge = self.graph.get_edge(edge_id)
-                if edge:
-                    edge.visible = False
-
-            # Redirect edges from internal nodes to the container
-            print(
-                f"DEBUG: 📕 Redirecting edges from internal nodes to container")
-            edges_redirected = 0
-
-            for edge in self.graph.get_all_edges():
-                if not edge.visible:  # Skip already hidden internal edges
-                    continue
-
-                # Check if edge connects to any internal node
-                source_node = self.graph.get_node(edge.source_id)
-                target_edge_node = self.graph.get_node(edge.target_id)
-
-                if source_node and source_node.id in target_node.child_ids:
-                    # Source is internal - redirect source to container
-                    print(
-                        f"DEBUG: 📕 Redirecting edge {edge.id} source from {source_node.text} to {target_node.text}"
-                    )
-                    target_node.add_redirected_edge(edge.id, edge.source_id)
-                    edge.source_id = target_node.id
-                    edges_redirected += 1
-
-                elif target_edge_node and target_edge_node.id in target_node.child_ids:
-                    # Target is internal - redirect target to container
-                    print(
-                        f"DEBUG: 📕 Redirecting edge {edge.id} target from {target_edge_node.text} to {target_node.text}"
-                    )
-                    target_node.add_redirected_edge(edge.id, edge.target_id)
-                    edge.target_id = target_node.id
-                    edges_redirected += 1
-
-            print(f"DEBUG: 📕 Redirected {edges_redirected} edges to container")
+            # Collapse the container; edges leaving it become meta-edges
+            view = self.get_collapsed_view()
+            view.collapse(target_node.id)
+            meta_edge_count = len(view.meta_edges())
 
             # Mark graph as modified
             if hasattr(self, 'graph_modified'):
@@ -7669,7 +7592,7 @@ class GraphCanvas(wx.Panel, GraphCanvasPropertyNotifierMixin):
 
             self.Refresh()
             print(
-                f"DEBUG: 📕 Container collapsed with {edges_redirected} edges redirected"
+                f"DEBUG: 📕 Container collapsed, {meta_edge_count} meta-edges shown"
             )
         else:
             print(f"DEBUG: 📕 No container found or not a container")
@@ -7764,77 +7687,28 @@ class GraphCanvas(wx.Panel, GraphCanvasPropertyNotifierMixin):
         else:
             print(f"DEBUG: 🔄📕 No container found or not a container")
 
+    def get_collapsed_view(self):
+        """Get the collapsed-container view of the current graph, synced with its edges."""
+
+        if self._collapsed_view is None or self._collapsed_view.graph is not self.graph:
+            self._collapsed_view = m_collapsed_view.CollapsedView(self.graph)
+        else:
+            self._collapsed_view.sync()
+        return self._collapsed_view
+
     def recursive_expand_node(self, container_node):
         """Recursively expand a container node and all its child containers."""
 
         if not container_node.is_container:
             return 0
 
-        expanded_count = 0
-
-        # First, expand this container if it's collapsed
-        if not container_node.is_expanded:
-            print(f"DEBUG: 🔄📖 Expanding container {container_node.text}")
-
-            # Expand the container
-            container_node.is_expanded = True
-
-            # Show all contained nodes and edges
-            for child_id in container_node.child_ids:
-                child_node = self.graph.get_node(child_id)
-                if child_node:
-                    child_node.visible = True
-
-            for edge_id in container_node.contained_edge_ids:
-                edge = self.graph.get_edge(edge_id)
-                if edge:
-                    edge.visible = True
-
-            # Restore redirected edges to their original nodes
-            print(
-                f"DEBUG: 🔄📖 Restoring redirected edges from container {container_node.text}"
-            )
-            redirected_edges = container_node.get_redirected_edges()
-
-            for edge_id, original_node_id in redirected_edges.items():
-                edge = self.graph.get_edge(edge_id)
-                if edge:
-                    # Determine if this was a source or target redirection
-                    if edge.source_id == container_node.id:
-                        # Restore source
-                        print(
-                            f"DEBUG: 🔄📖 Restoring edge {edge_id} source from {container_node.text} to {original_node_id}"
-                        )
-                        edge.source_id = original_node_id
-                    elif edge.target_id == container_node.id:
-                        # Restore target
-                        print(
-                            f"DEBUG: 🔄📖 Restoring edge {edge_id} target from {container_node.text} to {original_node_id}"
-                        )
-                        edge.target_id = original_node_id
-
-                    # Remove the redirection record
-                    container_node.remove_redirected_edge(edge_id)
-
-            expanded_count += 1
-
-        # Then recursively expand all child containers
-        for child_id in container_node.child_ids:
-            child_node = self.graph.get_node(child_id)
-            if child_node and child_node.is_container:
-                expanded_count += self.recursive_expand_node(child_node)
-
-        return expanded_count
+        print(f"DEBUG: 🔄📖 Expanding container {container_node.text} and its child containers")
+        return self.get_collapsed_view().expand(container_node.id, recursive=True)
 
     def is_edge_redirected(self, edge):
-        """Check if an edge has been redirected due to container collapse."""
+        """Check if an edge is folded into a meta-edge by a collapsed container."""
 
-        # Check all container nodes to see if any have this edge in their redirected_edges
-        for node in self.graph.get_all_nodes():
-            if node.is_container and hasattr(node, 'redirected_edges'):
-                if edge.id in node.redirected_edges:
-                    return True
-        return False
+        return self.get_collapsed_view().is_edge_aggregated(edge.id)
 
     def recursive_collapse_node(self, container_node):
         """Recursively collapse a container node and all its child containers."""
@@ -7842,70 +7716,8 @@ class GraphCanvas(wx.Panel, GraphCanvasPropertyNotifierMixin):
         if not container_node.is_container:
             return 0
 
-        collapsed_count = 0
-
-        # First, recursively collapse all child containers
-        for child_id in container_node.child_ids:
-            child_node = self.graph.get_node(child_id)
-            if child_node and child_node.is_container:
-                collapsed_count += self.recursive_collapse_node(child_node)
-
-        # Then collapse this container if it's expanded
-        if container_node.is_expanded:
-            print(f"DEBUG: 🔄📕 Collapsing container {container_node.text}")
-
-            # Collapse the container
-            container_node.is_expanded = False
-
-            # Hide all contained nodes and edges
-            for child_id in container_node.child_ids:
-                child_node = self.graph.get_node(child_id)
-                if child_node:
-                    child_node.visible = False
-
-            for edge_id in container_node.contained_edge_ids:
-                edge = self.graph.get_edge(edge_id)
-                if edge:
-                    edge.visible = False
-
-            # Redirect edges from internal nodes to the container
-            print(
-                f"DEBUG: 🔄📕 Redirecting edges from internal nodes to container {container_node.text}"
-            )
-            edges_redirected = 0
-
-            for edge in self.graph.get_all_edges():
-                if not edge.visible:  # Skip already hidden internal edges
-                    continue
-
-                # Check if edge connects to any internal node
-                source_node = self.graph.get_node(edge.source_id)
-                target_edge_node = self.graph.get_node(edge.target_id)
-
-                if source_node and source_node.id in container_node.child_ids:
-                    # Source is internal - redirect source to container
-                    print(
-                        f"DEBUG: 🔄📕 Redirecting edge {edge.id} source from {source_node.text} to {container_node.text}"
-                    )
-                    container_node.add_redirected_edge(edge.id, edge.source_id)
-                    edge.source_id = container_node.id
-                    edges_redirected += 1
-
-                elif target_edge_node and target_edge_node.id in container_node.child_ids:
-                    # Target is internal - redirect target to container
-                    print(
-                        f"DEBUG: 🔄📕 Redirecting edge {edge.id} target from {target_edge_node.text} to {container_node.text}"
-                    )
-                    container_node.add_redirected_edge(edge.id, edge.target_id)
-                    edge.target_id = container_node.id
-                    edges_redirected += 1
-
-            print(
-                f"DEBUG: 🔄📕 Redirected {edges_redirected} edges to container {container_node.text}"
-            )
-            collapsed_count += 1
-
-        return collapsed_count
+        print(f"DEBUG: 🔄📕 Collapsing container {container_node.text} and its child containers")
+        return self.get_collapsed_view().collapse(container_node.id, recursive=True)
 
     def draw_container_target_feedback(self, dc):
         """Draw visual feedback for potential container target."""
@@ -8174,6 +7986,9 @@ class GraphCanvas(wx.Panel, GraphCanvasPropertyNotifierMixin):
                     except Exception:
                         pass
 
+                    self.graph.reindex_edge(e1.id)
+                    self.graph.reindex_edge(e2.id)
+
                     # Record an explicit edge-to-edge connection so line_graph view draws a link
                     lst = e1.metadata.get('connected_uberedges') if hasattr(
                         e1, 'metadata') else None
@@ -8224,6 +8039,7 @@ class GraphCanvas(wx.Panel, GraphCanvasPropertyNotifierMixin):
                     if end_node.id not in e1.target_ids and end_node.id != getattr(
                             e1, 'target_id', None):
                         e1.target_ids.append(end_node.id)
+                    self.graph.reindex_edge(e1.id)
                     self.graph_modified.emit()
                     self.Refresh()
                 except Exception:
@@ -8285,6 +8101,7 @@ class GraphCanvas(wx.Panel, GraphCanvasPropertyNotifierMixin):
                         # Bypass undo; add directly
                         try:
                             self.graph.edges[new_e.id] = new_e
+                            self.graph.reindex_edge(new_e.id)
                             self.graph.modified = True
                         except Exception:
                             pass
@@ -8315,6 +8132,7 @@ class GraphCanvas(wx.Panel, GraphCanvasPropertyNotifierMixin):
                     edge.add_from_node(self.edge_start_node.id)
                 else:  # 'to'
                     edge.add_to_node(self.edge_start_node.id)
+                self.graph.reindex_edge(edge.id)
                 self.graph.modified = True
                 self.graph_modified.emit()
                 # Clear temporary edge state
@@ -8349,6 +8167,7 @@ class GraphCanvas(wx.Panel, GraphCanvasPropertyNotifierMixin):
                                 end_edge_square, 'target_id', None):
                             end_edge_square.target_ids.append(
                                 self.edge_start_node.id)
+                        self.graph.reindex_edge(end_edge_square.id)
                         self.graph.modified = True
                         self.graph_modified.emit()
                     except Exception as _e:
@@ -8372,6 +8191,7 @@ class GraphCanvas(wx.Panel, GraphCanvasPropertyNotifierMixin):
                         edge.add_from_node(target_node.id)
                     else:  # 'to'
                         edge.add_to_node(target_node.id)
+                    self.graph.reindex_edge(edge.id)
                     self.graph.modified = True
                     self.graph_modified.emit()
                     # Clear temporary edge state
@@ -0,0 +1,645 @@
+"""
+3D view of the editor's graph using node z-coordinates.
+
+Node positions, colors and sizes are packed into arrays by GraphGeometry3D and
+kept in vertex buffer objects, so a frame is one draw call for all nodes
+(point sprites sized by node radius) and one for all edges (a GL_LINES batch,
+with control points as polyline bends). Clicking picks a node by rendering
+node indices as colors and reading back the pixels under the cursor.
+"""
+
+import math
+import wx
+import wx.glcanvas
+import numpy as np
+import OpenGL.GL as gl
+import OpenGL.GLU as glu
+from OpenGL.GL import shaders
+from typing import Callable, List, Optional
+
+import models.graph as m_graph
+import utils.layout as m_layout
+
+
+SELECTED_NODE_COLOR = (255, 140, 0)
+SELECTED_EDGE_COLOR = (255, 140, 0)
+
+_FLIP_Y = np.array([1.0, -1.0, 1.0])
+
+NODE_VERTEX_SHADER = """
+#version 120
+uniform float point_scale;
+varying vec4 node_color;
+void main() {
+    vec4 eye = gl_ModelViewMatrix * gl_Vertex;
+    gl_Position = gl_ProjectionMatrix * eye;
+    // Node radius (texture coordinate s) in world units to a diameter in pixels
+    gl_PointSize = max(2.0, 2.0 * gl_MultiTexCoord0.s * point_scale / max(-eye.z, 0.001));
+    node_color = gl_Color;
+}
+"""
+
+NODE_FRAGMENT_SHADER = """
+#version 120
+uniform int picking;
+varying vec4 node_color;
+void main() {
+    vec2 offset = gl_PointCoord - vec2(0.5);
+    float r2 = dot(offset, offset);
+    if (r2 > 0.25) discard;
+    if (picking != 0) {
+        gl_FragColor = node_color;
+    } else {
+        gl_FragColor = vec4(node_color.rgb * (1.0 - 1.6 * r2), node_color.a);
+    }
+}
+"""
+
+
+class GraphGeometry3D:
+    """
+    A graph packed into arrays for drawing.
+
+    Nodes are rows of positions (N, 3) float32, colors (N, 3) uint8 and
+    sizes (N,) float32, in node_ids order. Edges become line segments over
+    the node positions followed by the edges' control points; each segment
+    is a pair of indices into that combined point array and has its edge's
+    color. Hyperedges connect every source to every target.
+
+    set_graph() repacks everything; update_positions() and
+    update_selection() refresh only positions or colors. The version
+    counters tell the renderer which buffers to upload again.
+    """
+
+    def __init__(self, graph: Optional[m_graph.Graph] = None):
+        self.node_ids: List[str] = []
+        self.node_index = {}
+        self.positions = np.zeros((0, 3), dtype=np.float32)
+        self.colors = np.zeros((0, 3), dtype=np.uint8)
+        self.base_colors = self.colors
+        self.sizes = np.zeros(0, dtype=np.float32)
+        self.edge_ids: List[str] = []
+        self.segment_edges = np.zeros(0, dtype=np.int64)  # Edge (in edge_ids) of each segment
+        self.segment_indices = np.zeros((0, 2), dtype=np.int64)
+        self.control_points = np.zeros((0, 3), dtype=np.float32)
+        self.edge_colors = np.zeros((0, 3), dtype=np.uint8)
+        self.segment_colors = np.zeros((0, 3), dtype=np.uint8)
+        self._control_point_edges = []  # Edges whose control points fill control_points, in order
+        self.topology_version = 0
+        self.position_version = 0
+        self.color_version = 0
+        self._bounds = None
+        if graph is not None:
+            self.set_graph(graph)
+
+    @property
+    def node_count(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def segment_count(self) -> int:
+        return len(self.segment_indices)
+
+    def set_graph(self, graph: m_graph.Graph):
+        """Pack all visible nodes and edges of the graph."""
+
+        nodes = [node for node in graph.get_all_nodes() if node.visible]
+        self.node_ids = [node.id for node in nodes]
+        self.node_index = {node_id: i for i, node_id in enumerate(self.node_ids)}
+        self.positions = np.array([(node.x, node.y, node.z) for node in nodes], dtype=np.float32).reshape(-1, 3)
+        self.base_colors = np.array([node.color[:3] for node in nodes], dtype=np.uint8).reshape(-1, 3)
+        self.sizes = np.array([node.radius if node.shape == 'circle' else max(node.width, node.height) / 2
+                               for node in nodes], dtype=np.float32)
+
+        edge_ids, edge_colors, segment_edges, segments, control_points = [], [], [], [], []
+        self._control_point_edges = []
+        for edge in graph.get_all_edges():
+            if not edge.visible:
+                continue
+            sources = [self.node_index[node_id] for node_id in (edge.source_ids or [edge.source_id])
+                       if node_id in self.node_index]
+            targets = [self.node_index[node_id] for node_id in (edge.target_ids or [edge.target_id])
+                       if node_id in self.node_index]
+            if not sources or not targets:
+                continue
+
+            edge_number = len(edge_ids)
+            edge_ids.append(edge.id)
+            edge_colors.append(edge.color[:3])
+            if edge.control_points and len(sources) == 1 and len(targets) == 1:
+                # Polyline through the control points, which follow the node rows in the point array
+                first = len(self.node_ids) + len(control_points)
+                control_points.extend(_point_3d(point) for point in edge.control_points)
+                self._control_point_edges.append(edge)
+                path = [sources[0]] + list(range(first, first + len(edge.control_points))) + [targets[0]]
+                pairs = list(zip(path[:-1], path[1:]))
+            else:
+                pairs = [(source, target) for source in sources for target in targets]
+            segments.extend(pairs)
+            segment_edges.extend([edge_number] * len(pairs))
+
+        self.edge_ids = edge_ids
+        self.edge_colors = np.array(edge_colors, dtype=np.uint8).reshape(-1, 3)
+        self.segment_edges = np.array(segment_edges, dtype=np.int64)
+        self.segment_indices = np.array(segments, dtype=np.int64).reshape(-1, 2)
+        self.control_points = np.array(control_points, dtype=np.float32).reshape(-1, 3)
+
+        self.topology_version += 1
+        self.update_selection(graph)
+
+    def update_positions(self, graph: m_graph.Graph):
+        """Refresh node and control point positions after nodes moved (same nodes and edges)."""
+
+        nodes = graph.nodes
+        self.positions = np.array([(nodes[node_id].x, nodes[node_id].y, nodes[node_id].z)
+                                   for node_id in self.node_ids], dtype=np.float32).reshape(-1, 3)
+        if len(self.control_points):
+            points = [_point_3d(point) for edge in self._control_point_edges for point in edge.control_points]
+            if len(points) == len(self.control_points):
+                self.control_points = np.array(points, dtype=np.float32).reshape(-1, 3)
+        self.position_version += 1
+
+    def update_selection(self, graph: m_graph.Graph):
+        """Recolor selected nodes and edges."""
+
+        self.colors = self.base_colors.copy()
+        selected = [self.node_index[node_id] for node_id in graph.selected_nodes if node_id in self.node_index]
+        self.colors[selected] = SELECTED_NODE_COLOR
+
+        self.segment_colors = self.edge_colors[self.segment_edges] if len(self.segment_edges) else \
+            np.zeros((0, 3), dtype=np.uint8)
+        if graph.selected_edges and len(self.segment_edges):
+            selected_edges = np.array([edge_id in graph.selected_edges for edge_id in self.edge_ids])
+            self.segment_colors[selected_edges[self.segment_edges]] = SELECTED_EDGE_COLOR
+        self.color_version += 1
+
+    def line_vertices(self) -> np.ndarray:
+        """Segment endpoints as a (2 * segments, 3) float32 array for GL_LINES."""
+
+        points = np.concatenate([self.positions, self.control_points]) if len(self.control_points) else self.positions
+        return np.ascontiguousarray(points[self.segment_indices.ravel()], dtype=np.float32)
+
+    def line_colors(self) -> np.ndarray:
+        """Per-vertex colors matching line_vertices()."""
+
+        return np.ascontiguousarray(np.repeat(self.segment_colors, 2, axis=0))
+
+    def bounds(self):
+        """Center and radius of a sphere around all nodes."""
+
+        key = (self.topology_version, self.position_version)
+        if self._bounds is None or self._bounds[0] != key:
+            if not self.node_count:
+                bounds = np.zeros(3), 1.0
+            else:
+                low, high = self.positions.min(axis=0), self.positions.max(axis=0)
+                radius = float(np.linalg.norm(high - low)) / 2.0 + float(self.sizes.max())
+                bounds = ((low + high) / 2.0).astype(float), max(radius, 1.0)
+            self._bounds = (key, bounds)
+        return self._bounds[1]
+
+    @staticmethod
+    def id_colors(count: int) -> np.ndarray:
+        """Unique RGB colors encoding node index + 1 (black means no node)."""
+
+        ids = np.arange(1, count + 1, dtype=np.uint32)
+        return np.stack([ids & 0xFF, (ids >> 8) & 0xFF, (ids >> 16) & 0xFF], axis=1).astype(np.uint8)
+
+    @staticmethod
+    def decode_ids(pixels: np.ndarray) -> np.ndarray:
+        """Node indices for RGB pixels drawn with id_colors (-1 for background)."""
+
+        pixels = np.asarray(pixels, dtype=np.int64)
+        return (pixels[..., 0] | (pixels[..., 1] << 8) | (pixels[..., 2] << 16)) - 1
+
+
+def _point_3d(point):
+    """(x, y, z) from an (x, y) or (x, y, z) control point."""
+
+    return (point[0], point[1], point[2] if len(point) > 2 else 0.0)
+
+
+class GraphRenderer3D:
+    """
+    Draws a GraphGeometry3D with an orbiting camera into the current GL context.
+
+    The editor's y axis points down, so the scene is flipped to keep the 2D
+    layout upright when viewed from the front. Up to 16 million nodes can be
+    told apart by picking.
+    """
+
+    def __init__(self, geometry: GraphGeometry3D):
+        self.geometry = geometry
+
+        # Orbit camera around target
+        self.target = np.zeros(3)
+        self.distance = 1000.0
+        self.yaw = 0.0  # Degrees around the vertical axis
+        self.pitch = 0.0  # Degrees above the horizontal plane
+        self.fov = 45.0
+
+        self.background_color = (255, 255, 255)
+        self.line_width = 1.0
+
+        self._program = None  # None until first draw, 0 when shaders are unavailable
+        self._buffers = {}
+        self._uploaded = {}
+
+    def fit_view(self):
+        """Aim the camera at the whole graph."""
+
+        center, radius = self.geometry.bounds()
+        self.target = center
+        self.distance = radius / math.tan(math.radians(self.fov) / 2.0) * 1.1
+
+    def orbit(self, d_yaw: float, d_pitch: float):
+        self.yaw = (self.yaw + d_yaw) % 360.0
+        self.pitch = max(-89.0, min(89.0, self.pitch + d_pitch))
+
+    def zoom(self, factor: float):
+        self.distance = max(1e-3, self.distance * factor)
+
+    def pan(self, dx: float, dy: float, height: int):
+        """Move the target by a screen-space offset in pixels."""
+
+        units_per_pixel = 2.0 * self.distance * math.tan(math.radians(self.fov) / 2.0) / max(height, 1)
+        right, up, _ = self._camera_axes()
+        offset = (-right * dx + up * dy) * units_per_pixel
+        self.target = self.target + offset * _FLIP_Y
+
+    def _camera_axes(self):
+        """Right, up and backward unit vectors of the camera in the y-flipped view space."""
+
+        yaw, pitch = math.radians(self.yaw), math.radians(self.pitch)
+        backward = np.array([math.cos(pitch) * math.sin(yaw), math.sin(pitch), math.cos(pitch) * math.cos(yaw)])
+        right = np.array([math.cos(yaw), 0.0, -math.sin(yaw)])
+        up = np.cross(backward, right)
+        return right, up, backward
+
+    def setup_camera(self, width: int, height: int):
+        """Set the viewport and projection/modelview matrices."""
+
+        gl.glViewport(0, 0, width, height)
+        _, radius = self.geometry.bounds()
+        near = max(self.distance - 2.0 * radius, self.distance * 1e-3)
+        far = self.distance + 2.0 * radius
+
+        gl.glMatrixMode(gl.GL_PROJECTION)
+        gl.glLoadIdentity()
+        glu.gluPerspective(self.fov, width / max(height, 1), near, far)
+
+        gl.glMatrixMode(gl.GL_MODELVIEW)
+        gl.glLoadIdentity()
+        _, up, backward = self._camera_axes()
+        # Graph y points down; flip it so the view from the front matches the editor
+        target = self.target * _FLIP_Y
+        eye = target + backward * self.distance
+        glu.gluLookAt(eye[0], eye[1], eye[2], target[0], target[1], target[2], up[0], up[1], up[2])
+        gl.glScalef(*_FLIP_Y)
+
+    def _point_scale(self, height: int) -> float:
+        """Pixels per world unit at unit eye distance."""
+
+        return height / (2.0 * math.tan(math.radians(self.fov) / 2.0))
+
+    def _ensure_program(self):
+        if self._program is not None:
+            return
+        try:
+            self._program = shaders.compileProgram(
+                shaders.compileShader(NODE_VERTEX_SHADER, gl.GL_VERTEX_SHADER),
+                shaders.compileShader(NODE_FRAGMENT_SHADER, gl.GL_FRAGMENT_SHADER))
+        except Exception as e:
+            print(f"DEBUG: Node sprite shaders unavailable, drawing fixed-size points: {e}")
+            self._program = 0
+
+    def _upload(self, name: str, array: np.ndarray, version):
+        """Upload an array to its vertex buffer when its version changed."""
+
+        if self._uploaded.get(name) == version:
+            return
+        if name not in self._buffers:
+            self._buffers[name] = gl.glGenBuffers(1)
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self._buffers[name])
+        array = np.ascontiguousarray(array)
+        if array.nbytes:
+            gl.glBufferData(gl.GL_ARRAY_BUFFER, array.nbytes, array, gl.GL_STATIC_DRAW)
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, 0)
+        self._uploaded[name] = version
+
+    def sync_buffers(self):
+        """Upload whatever changed in the geometry since the last frame."""
+
+        geometry = self.geometry
+        topology = geometry.topology_version
+        positions = (topology, geometry.position_version)
+        colors = (topology, geometry.color_version)
+        self._upload('node_positions', geometry.positions, positions)
+        self._upload('node_colors', geometry.colors, colors)
+        self._upload('node_sizes', geometry.sizes, topology)
+        if self._uploaded.get('node_ids') != topology:
+            self._upload('node_ids', GraphGeometry3D.id_colors(geometry.node_count), topology)
+        if self._uploaded.get('line_vertices') != positions:
+            self._upload('line_vertices', geometry.line_vertices(), positions)
+        if self._uploaded.get('line_colors') != colors:
+            self._upload('line_colors', geometry.line_colors(), colors)
+
+    def _bind(self, vertices: str, colors: str, sizes: Optional[str] = None):
+        gl.glEnableClientState(gl.GL_VERTEX_ARRAY)
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self._buffers[vertices])
+        gl.glVertexPointer(3, gl.GL_FLOAT, 0, None)
+        gl.glEnableClientState(gl.GL_COLOR_ARRAY)
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self._buffers[colors])
+        gl.glColorPointer(3, gl.GL_UNSIGNED_BYTE, 0, None)
+        if sizes:
+            gl.glEnableClientState(gl.GL_TEXTURE_COORD_ARRAY)
+            gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self._buffers[sizes])
+            gl.glTexCoordPointer(1, gl.GL_FLOAT, 0, None)
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, 0)
+
+    def _unbind(self):
+        gl.glDisableClientState(gl.GL_VERTEX_ARRAY)
+        gl.glDisableClientState(gl.GL_COLOR_ARRAY)
+        gl.glDisableClientState(gl.GL_TEXTURE_COORD_ARRAY)
+
+    def _draw_nodes(self, height: int, picking: bool):
+        if not self.geometry.node_count:
+            return
+        self._bind('node_positions', 'node_ids' if picking else 'node_colors', 'node_sizes')
+        if self._program:
+            gl.glEnable(gl.GL_VERTEX_PROGRAM_POINT_SIZE)
+            gl.glEnable(gl.GL_POINT_SPRITE)
+            gl.glUseProgram(self._program)
+            gl.glUniform1f(gl.glGetUniformLocation(self._program, "point_scale"), self._point_scale(height))
+            gl.glUniform1i(gl.glGetUniformLocation(self._program, "picking"), int(picking))
+        else:
+            gl.glPointSize(6.0)
+        gl.glDrawArrays(gl.GL_POINTS, 0, self.geometry.node_count)
+        if self._program:
+            gl.glUseProgram(0)
+            gl.glDisable(gl.GL_POINT_SPRITE)
+            gl.glDisable(gl.GL_VERTEX_PROGRAM_POINT_SIZE)
+        self._unbind()
+
+    def _draw_edges(self):
+        if not self.geometry.segment_count:
+            return
+        self._bind('line_vertices', 'line_colors')
+        gl.glLineWidth(self.line_width)
+        gl.glDrawArrays(gl.GL_LINES, 0, 2 * self.geometry.segment_count)
+        self._unbind()
+
+    def _prepare(self, width: int, height: int, background):
+        self._ensure_program()
+        self.sync_buffers()
+        gl.glClearColor(*background, 1.0)
+        gl.glClear(gl.GL_COLOR_BUFFER_BIT | gl.GL_DEPTH_BUFFER_BIT)
+        gl.glEnable(gl.GL_DEPTH_TEST)
+        gl.glDisable(gl.GL_LIGHTING)
+        gl.glDisable(gl.GL_TEXTURE_2D)
+        self.setup_camera(width, height)
+
+    def draw(self, width: int, height: int):
+        """Draw edges, then nodes, in two draw calls."""
+
+        self._prepare(width, height, [channel / 255.0 for channel in self.background_color])
+        self._draw_edges()
+        self._draw_nodes(height, picking=False)
+
+    def pick(self, x: int, y: int, width: int, height: int, radius: int = 3) -> Optional[str]:
+        """
+        Node id under window position (x, y), top-left origin, or None.
+
+        Draws node index colors into the back buffer and reads a small square
+        around the cursor, preferring the hit nearest its center. The caller
+        should redraw before swapping buffers.
+        """
+
+        gl.glDisable(gl.GL_BLEND)
+        gl.glDisable(gl.GL_DITHER)
+        gl.glDisable(gl.GL_MULTISAMPLE)
+        gl.glDisable(gl.GL_POINT_SMOOTH)
+        self._prepare(width, height, (0.0, 0.0, 0.0))
+        self._draw_nodes(height, picking=True)
+
+        left, right = max(0, x - radius), min(width, x + radius + 1)
+        bottom, top = max(0, height - 1 - y - radius), min(height, height - y + radius)
+        gl.glEnable(gl.GL_DITHER)
+        if left >= right or bottom >= top:
+            return None
+
+        gl.glPixelStorei(gl.GL_PACK_ALIGNMENT, 1)
+        data = gl.glReadPixels(left, bottom, right - left, top - bottom, gl.GL_RGB, gl.GL_UNSIGNED_BYTE)
+        pixels = np.frombuffer(data, dtype=np.uint8).reshape(top - bottom, right - left, 3)
+        ids = GraphGeometry3D.decode_ids(pixels)
+        hits = np.argwhere((ids >= 0) & (ids < self.geometry.node_count))
+        if not len(hits):
+            return None
+
+        center = np.array([height - 1 - y - bottom, x - left])
+        row, column = hits[np.argmin(((hits - center) ** 2).sum(axis=1))]
+        return self.geometry.node_ids[ids[row, column]]
+
+    def release(self):
+        """Free GPU buffers and the shader program (needs the context current)."""
+
+        if self._buffers:
+            gl.glDeleteBuffers(len(self._buffers), list(self._buffers.values()))
+        self._buffers.clear()
+        self._uploaded.clear()
+        if self._program:
+            gl.glDeleteProgram(self._program)
+        self._program = None
+
+
+class Graph3DCanvas(wx.glcanvas.GLCanvas):
+    """
+    OpenGL canvas showing a graph in 3D.
+
+    Left drag orbits, right or middle drag pans, the wheel zooms and a left
+    click selects the node under the cursor (Shift/Ctrl adds to the
+    selection). F fits the view and L runs a 3D force-directed layout.
+    """
+
+    def __init__(self, parent, graph: m_graph.Graph,
+                 on_selection_changed: Optional[Callable[[List[str]], None]] = None,
+                 on_positions_changed: Optional[Callable[[], None]] = None):
+        attributes = [wx.glcanvas.WX_GL_RGBA, wx.glcanvas.WX_GL_DOUBLEBUFFER, wx.glcanvas.WX_GL_DEPTH_SIZE, 24, 0]
+        super().__init__(parent, attribList=attributes)
+        self.context = wx.glcanvas.GLContext(self)
+
+        self.graph = graph
+        self.geometry = GraphGeometry3D(graph)
+        self.renderer = GraphRenderer3D(self.geometry)
+        self.renderer.background_color = graph.background_color
+        self.renderer.fit_view()
+        self.on_selection_changed = on_selection_changed
+        self.on_positions_changed = on_positions_changed
+
+        self.layout_iterations = 50
+
+        # Mouse state
+        self.last_mouse_pos = None
+        self.mouse_down_pos = None
+        self.dragged = False
+
+        self.Bind(wx.EVT_PAINT, self.on_paint)
+        self.Bind(wx.EVT_SIZE, self.on_size)
+        self.Bind(wx.EVT_ERASE_BACKGROUND, lambda event: None)
+        self.Bind(wx.EVT_LEFT_DOWN, self.on_mouse_down)
+        self.Bind(wx.EVT_RIGHT_DOWN, self.on_mouse_down)
+        self.Bind(wx.EVT_MIDDLE_DOWN, self.on_mouse_down)
+        self.Bind(wx.EVT_LEFT_UP, self.on_left_up)
+        self.Bind(wx.EVT_RIGHT_UP, self.on_mouse_up)
+        self.Bind(wx.EVT_MIDDLE_UP, self.on_mouse_up)
+        self.Bind(wx.EVT_MOTION, self.on_motion)
+        self.Bind(wx.EVT_MOUSEWHEEL, self.on_mousewheel)
+        self.Bind(wx.EVT_KEY_DOWN, self.on_key_down)
+
+        print(f"DEBUG: Graph3DCanvas showing {self.geometry.node_count} nodes, "
+              f"{self.geometry.segment_count} edge segments")
+
+    def reload_graph(self):
+        """Repack the graph after nodes or edges were added or removed."""
+
+        self.geometry.set_graph(self.graph)
+        self.Refresh()
+
+    def refresh_positions(self):
+        """Pick up moved nodes without repacking the graph."""
+
+        self.geometry.update_positions(self.graph)
+        self.Refresh()
+
+    def apply_force_layout(self, iterations: Optional[int] = None):
+        """Run the 3D force-directed layout on the graph and show the result."""
+
+        with wx.BusyCursor():
+            m_layout.force_directed_layout_3d(self.graph, iterations=iterations or self.layout_iterations)
+        self.graph.modified = True
+        self.refresh_positions()
+        self.renderer.fit_view()
+        if self.on_positions_changed:
+            self.on_positions_changed()
+
+    def on_paint(self, event):
+        wx.PaintDC(self)
+        self.SetCurrent(self.context)
+        size = self.GetClientSize()
+        self.renderer.draw(size.width, size.height)
+        self.SwapBuffers()
+
+    def on_size(self, event):
+        self.Refresh()
+        event.Skip()
+
+    def on_mouse_down(self, event):
+        self.last_mouse_pos = self.mouse_down_pos = event.GetPosition()
+        self.dragged = False
+        if not self.HasCapture():
+            self.CaptureMouse()
+        self.SetFocus()
+
+    def on_mouse_up(self, event):
+        if self.HasCapture():
+            self.ReleaseMouse()
+        self.last_mouse_pos = None
+
+    def on_left_up(self, event):
+        clicked = not self.dragged and self.mouse_down_pos is not None
+        self.on_mouse_up(event)
+        if clicked:
+            self.select_at(event.GetX(), event.GetY(), event.ShiftDown() or event.ControlDown())
+
+    def on_motion(self, event):
+        if self.last_mouse_pos is None or not event.Dragging():
+            return
+        position = event.GetPosition()
+        dx, dy = position.x - self.last_mouse_pos.x, position.y - self.last_mouse_pos.y
+        if abs(position.x - self.mouse_down_pos.x) + abs(position.y - self.mouse_down_pos.y) > 3:
+            self.dragged = True
+        if event.LeftIsDown():
+            self.renderer.orbit(-dx * 0.5, dy * 0.5)
+        else:
+            self.renderer.pan(dx, dy, self.GetClientSize().height)
+        self.last_mouse_pos = position
+        self.Refresh()
+
+    def on_mousewheel(self, event):
+        self.renderer.zoom(0.9 if event.GetWheelRotation() > 0 else 1.0 / 0.9)
+        self.Refresh()
+
+    def on_key_down(self, event):
+        key_code = event.GetKeyCode()
+        if key_code == ord('F'):
+            self.renderer.fit_view()
+            self.Refresh()
+        elif key_code == ord('L'):
+            self.apply_force_layout()
+        else:
+            event.Skip()
+
+    def select_at(self, x: int, y: int, extend: bool = False):
+        """Select the node under (x, y); an empty click clears the selection unless extending."""
+
+        self.SetCurrent(self.context)
+        size = self.GetClientSize()
+        node_id = self.renderer.pick(x, y, size.width, size.height)
+
+        if not extend:
+            self.graph.clear_selection()
+        if node_id is not None:
+            if extend and node_id in self.graph.selected_nodes:
+                self.graph.deselect_node(node_id)
+            else:
+                self.graph.select_node(node_id)
+        print(f"DEBUG: 3D view picked node {node_id}")
+
+        self.geometry.update_selection(self.graph)
+        self.Refresh()
+        if self.on_selection_changed:
+            self.on_selection_changed(sorted(self.graph.selected_nodes))
+
+
+class Graph3DFrame(wx.Frame):
+    """Window holding a Graph3DCanvas for one graph."""
+
+    def __init__(self, parent, graph: m_graph.Graph, **canvas_callbacks):
+        super().__init__(parent, title=f"3D View - {graph.name}", size=(1000, 750))
+        self.canvas = Graph3DCanvas(self, graph, **canvas_callbacks)
+
+        menubar = wx.MenuBar()
+        view_menu = wx.Menu()
+        fit_item = view_menu.Append(wx.ID_ANY, "&Fit to Graph\tF", "Show the whole graph")
+        reload_item = view_menu.Append(wx.ID_ANY, "&Reload Graph\tCtrl+R", "Pick up added or removed nodes and edges")
+        layout_menu = wx.Menu()
+        force_item = layout_menu.Append(wx.ID_ANY, "3D &Force-Directed Layout\tL",
+                                        "Spread nodes along x, y and z")
+        menubar.Append(view_menu, "&View")
+        menubar.Append(layout_menu, "&Layout")
+        self.SetMenuBar(menubar)
+
+        self.Bind(wx.EVT_MENU, self.on_fit, fit_item)
+        self.Bind(wx.EVT_MENU, lambda event: self.canvas.reload_graph(), reload_item)
+        self.Bind(wx.EVT_MENU, lambda event: self.canvas.apply_force_layout(), force_item)
+        self.Bind(wx.EVT_CLOSE, self.on_close)
+
+    def on_fit(self, event):
+        self.canvas.renderer.fit_view()
+        self.canvas.Refresh()
+
+    def on_close(self, event):
+        try:
+            self.canvas.SetCurrent(self.canvas.context)
+            self.canvas.renderer.release()
+        except Exception as e:
+            print(f"DEBUG: Error releasing 3D graph view resources: {e}")
+        event.Skip()
+
+
+def show_graph_3d(parent, graph: m_graph.Graph, **canvas_callbacks) -> Graph3DFrame:
+    """Open a 3D view of graph; see Graph3DCanvas for the callbacks."""
+
+    frame = Graph3DFrame(parent, graph, **canvas_callbacks)
+    frame.Show()
+    return frame
@@ -12,6 +12,9 @@ import gui.main_window as m_main_window
 
 import gui.graph_canvas as m_graph_canvas
 
+import utils.edge_crossings as m_edge_crossings
+import utils.layout as m_layout
+
 
 # Layout algorithms
 def apply_spring_layout(graph_canvas: "m_graph_canvas.GraphCanvas"):
@@ -278,56 +281,9 @@ def apply_layered_layout(graph_canvas: "m_graph_canvas.GraphCanvas"):
     if not nodes:
         return
     
-    # Find layers using topological sort
-    in_degree = {}
-    for node in nodes:
-        in_degree[node.id] = 0
-    
-    for edge in graph_canvas.graph.get_all_edges():
-        if edge.target_id in in_degree:
-            in_degree[edge.target_id] += 1
-    
-    # Start with nodes that have no incoming edges
-    queue = [node for node in nodes if in_degree[node.id] == 0]
-    if not queue:
-        queue = [nodes[0]]  # If cyclic, start with first node
-    
-    layers = {}
-    layer = 0
-    processed = set()
-    
-    while queue:
-        current_layer = queue[:]
-        queue = []
-        layers[layer] = current_layer
-        
-        for node in current_layer:
-            processed.add(node.id)
-            
-            # Add children to next layer
-            for edge in graph_canvas.graph.get_all_edges():
-                if edge.source_id == node.id:
-                    target = graph_canvas.graph.get_node(edge.target_id)
-                    if target and target.id not in processed:
-                        in_degree[target.id] -= 1
-                        if in_degree[target.id] <= 0 and target not in queue:
-                            queue.append(target)
-        
-        layer += 1
-        if layer > len(nodes):  # Prevent infinite loop
-            break
-    
-    # Position nodes
-    layer_spacing = 200
-    node_spacing = 100
-    
-    for layer_num, layer_nodes in layers.items():
-        x = layer_num * layer_spacing
-        start_y = -(len(layer_nodes) - 1) * node_spacing / 2
-        
-        for i, node in enumerate(layer_nodes):
-            node.x = x
-            node.y = start_y + i * node_spacing
+    # Layers run left to right; cycles are broken and crossings reduced
+    m_layout.hierarchical_layout(graph_canvas.graph, "left-right",
+                                 level_spacing=200, node_spacing=100)
     
     graph_canvas.graph.modified = True
     graph_canvas.graph_modified.emit()
@@ -732,133 +688,47 @@ def apply_tree_layout(graph_canvas: "m_graph_canvas.GraphCanvas", event):
     print("DEBUG: Tree layout complete")
 
 
-def apply_hierarchical_layout(graph_canvas: "m_graph_canvas.GraphCanvas", event):
+def apply_hierarchical_layout(graph_canvas: "m_graph_canvas.GraphCanvas", event=None):
     """Apply hierarchical layout."""
 
-    nodes = graph_canvas.current_graph.get_all_nodes()
-    edges = graph_canvas.current_graph.get_all_edges()
+    nodes = graph_canvas.graph.get_all_nodes()
     
     if not nodes:
         return
     
     print(f"DEBUG: Applying hierarchical layout to {len(nodes)} nodes")
     
-    # Calculate in-degrees
-    in_degree = {}
-    for node in nodes:
-        in_degree[node.id] = 0
-    
-    for edge in edges:
-        if edge.target_id in in_degree:
-            in_degree[edge.target_id] += 1
-    
-    # Topological sort to find layers
-    layers = []
-    remaining = set(node.id for node in nodes)
-    
-    while remaining:
-        current_layer = []
-        for node_id in list(remaining):
-            if in_degree[node_id] == 0:
-                current_layer.append(node_id)
-                remaining.remove(node_id)
-        
-        if not current_layer:
-            # Handle cycles - add remaining nodes to final layer
-            current_layer = list(remaining)
-            remaining.clear()
-        
-        layers.append(current_layer)
-        
-        # Update in-degrees
-        for node_id in current_layer:
-            for edge in edges:
-                if edge.source_id == node_id and edge.target_id in remaining:
-                    in_degree[edge.target_id] -= 1
-    
-    # Position nodes in layers
-    y_spacing = 100
-    x_spacing = 150
-    
-    for level, layer in enumerate(layers):
-        y = level * y_spacing
-        start_x = -(len(layer) - 1) * x_spacing / 2
-        
-        for i, node_id in enumerate(layer):
-            node = graph_canvas.current_graph.get_node(node_id)
-            if node:
-                node.x = start_x + i * x_spacing
-                node.y = y
+    m_layout.hierarchical_layout(graph_canvas.graph, "top-down",
+                                 level_spacing=100, node_spacing=150)
     
     graph_canvas.zoom_to_fit()
     graph_canvas.Refresh()
     print("DEBUG: Hierarchical layout complete")
 
 
-def apply_non_overlapping_layout(graph_canvas: "m_graph_canvas.GraphCanvas", event):
+def apply_non_overlapping_layout(graph_canvas: "m_graph_canvas.GraphCanvas", event=None):
     """Apply non-overlapping layout algorithm."""
 
-    nodes = graph_canvas.current_graph.get_all_nodes()
+    nodes = graph_canvas.graph.get_all_nodes()
     if not nodes:
         return
         
     print(f"DEBUG: Applying non-overlapping layout to {len(nodes)} nodes")
     
-    # Start with a grid layout as base
-    import math
-    
-    grid_size = math.ceil(math.sqrt(len(nodes)))
-    spacing = 120  # Minimum spacing to prevent overlaps
-    
-    for i, node in enumerate(nodes):
-        row = i // grid_size
-        col = i % grid_size
-        node.x = col * spacing - (grid_size * spacing) / 2
-        node.y = row * spacing - (grid_size * spacing) / 2
-        
-    # Apply force-based repulsion to further separate overlapping nodes
-    for _ in range(50):  # Iterations
-        forces = {}
-        for node in nodes:
-            forces[node.id] = [0.0, 0.0]
-            
-        # Calculate repulsive forces between nodes
-        for i, node1 in enumerate(nodes):
-            for j, node2 in enumerate(nodes):
-                if i >= j:
-                    continue
-                    
-                dx = node2.x - node1.x
-                dy = node2.y - node1.y
-                distance = max(math.sqrt(dx * dx + dy * dy), 1.0)
-                
-                # If nodes are too close, apply repulsive force
-                if distance < spacing * 0.8:
-                    force_magnitude = (spacing * 0.8 -
-                                        distance) / distance * 10.0
-                    fx = dx * force_magnitude
-                    fy = dy * force_magnitude
-                    
-                    forces[node1.id][0] -= fx
-                    forces[node1.id][1] -= fy
-                    forces[node2.id][0] += fx
-                    forces[node2.id][1] += fy
-        
-        # Apply forces
-        for node in nodes:
-            node.x += forces[node.id][0] * 0.1
-            node.y += forces[node.id][1] * 0.1
+    # Push apart only the nodes that overlap, keeping the current layout
+    m_layout.remove_overlaps(graph_canvas.graph, padding=20.0)
     
     graph_canvas.zoom_to_fit()
     graph_canvas.Refresh()
     print("DEBUG: Non-overlapping layout complete")
 
 
-def apply_minimize_edge_overlap_layout(graph_canvas: "m_graph_canvas.GraphCanvas", event):
+def apply_minimize_edge_overlap_layout(graph_canvas: "m_graph_canvas.GraphCanvas", event=None,
+                                       candidate_nodes=4, partners=12):
     """Apply layout that minimizes edge overlaps."""
 
-    nodes = graph_canvas.current_graph.get_all_nodes()
-    edges = graph_canvas.current_graph.get_all_edges()
+    nodes = graph_canvas.graph.get_all_nodes()
+    edges = graph_canvas.graph.get_all_edges()
     if not nodes:
         return
         
@@ -867,8 +737,6 @@ def apply_minimize_edge_overlap_layout(graph_canvas: "m_graph_canvas.GraphCanvas
     )
     
     # Start with circular layout
-    import math
-    
     if len(nodes) == 1:
         nodes[0].x = 0
         nodes[0].y = 0
@@ -880,43 +748,41 @@ def apply_minimize_edge_overlap_layout(graph_canvas: "m_graph_canvas.GraphCanvas
             node.x = radius * math.cos(angle)
             node.y = radius * math.sin(angle)
     
-    # Iteratively optimize to reduce edge crossings
+    # Iteratively swap nodes to reduce edge crossings. Only a node whose edges
+    # cross can gain from a swap, so each round tries the most crossed nodes
+    # against the positions nearest their neighbours, and the index retests
+    # just the edges that move.
+    index = m_edge_crossings.EdgeCrossingIndex(graph_canvas.graph, edges)
+    print(f"DEBUG: {index.count} edge crossings before optimization")
     for iteration in range(100):
+        if index.count == 0:
+            break
         best_improvement = 0
         best_swap = None
         
-        # Try swapping positions of nodes to reduce edge crossings
-        for i in range(len(nodes)):
-            for j in range(i + 1, len(nodes)):
-                node1, node2 = nodes[i], nodes[j]
-                
-                # Count current crossings
-                current_crossings = graph_canvas.count_edge_crossings(edges)
-                
-                # Swap positions temporarily
-                node1.x, node2.x = node2.x, node1.x
-                node1.y, node2.y = node2.y, node1.y
-                
-                # Count crossings after swap
-                new_crossings = graph_canvas.count_edge_crossings(edges)
-                improvement = current_crossings - new_crossings
-                
+        scores = index.node_crossing_counts()
+        crossed = sorted((node_id for node_id, score in scores.items() if score > 0),
+                         key=lambda node_id: -scores[node_id])
+        for node_id in crossed[:candidate_nodes]:
+            centre = index.neighbour_centre(node_id)
+            if centre is None:
+                continue
+            for other_id in index.nearest_nodes(centre[0], centre[1], partners + 1):
+                if other_id == node_id:
+                    continue
+                improvement = -index.swap_delta(node_id, other_id)
                 if improvement > best_improvement:
                     best_improvement = improvement
-                    best_swap = (i, j)
-                
-                # Swap back
-                node1.x, node2.x = node2.x, node1.x
-                node1.y, node2.y = node2.y, node1.y
+                    best_swap = (node_id, other_id)
         
         # Apply best swap if found
         if best_swap:
-            node1, node2 = nodes[best_swap[0]], nodes[best_swap[1]]
-            node1.x, node2.x = node2.x, node1.x
-            node1.y, node2.y = node2.y, node1.y
+            index.swap_nodes(*best_swap)
         else:
             break  # No improvement found
     
+    index.apply_positions()
+    print(f"DEBUG: {index.count} edge crossings after optimization")
     graph_canvas.zoom_to_fit()
     graph_canvas.Refresh()
     print("DEBUG: Minimize edge overlap layout complete")
@@ -1250,7 +1116,7 @@ def on_minimize_edge_overlap_layout(window: "m_main_window.MainWindow", event):
                                 wx.PD_AUTO_HIDE | wx.PD_APP_MODAL)
     try:
         wx.SafeYield()  # Allow UI to update#
-        apply_minimize_edge_overlap_layout(window.canvas)
+        apply_minimize_edge_overlap_layout(window.canvas, event)
         window.current_graph.last_layout_applied = "minimize_edge_overlap"
         window.statusbar.SetStatusText("Minimize edge overlap layout applied", 0)
     finally:
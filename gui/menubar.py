@@ -95,6 +95,8 @@ def setup_menus(main_window: "m_main_window.MainWindow"):
         view_menu.AppendSeparator()
         background_item = view_menu.Append(wx.ID_ANY, "&Background Layers...",
                                          "Manage background images and layers")
+        graph_3d_item = view_menu.Append(wx.ID_ANY, "&3D Graph View...",
+                                         "Show the graph in 3D using node z-coordinates")
 
         # Layout menu
         layout_menu = wx.Menu()
@@ -254,6 +256,7 @@ def setup_menus(main_window: "m_main_window.MainWindow"):
         main_window.Bind(wx.EVT_MENU, partial(m_menubar_event_handler.on_toggle_status_bar, main_window), status_bar_item)
         
         main_window.Bind(wx.EVT_MENU, partial(m_menubar_event_handler.on_background_layers, main_window), background_item)
+        main_window.Bind(wx.EVT_MENU, partial(m_menubar_event_handler.on_show_graph_3d, main_window), graph_3d_item)
 
         main_window.Bind(wx.EVT_MENU, partial(m_layouts.on_spring_layout, main_window), spring_item)
         main_window.Bind(wx.EVT_MENU, partial(m_layouts.on_circle_layout, main_window), circle_item)
@@ -6,7 +6,10 @@
 import wx
 import wx.glcanvas
 import wx.lib.scrolledpanel
+import ast
+import ctypes
 import math
+import re
 import numpy as np
 from typing import Tuple, Optional, List, Dict
 from enum import Enum
@@ -20,6 +23,7 @@ import uuid
 from abc import ABC, abstractmethod
 import cv2  # For video playback
 import threading
+from collections import OrderedDict
 from pathlib import Path
 import random
 import colorsys
@@ -166,18 +170,115 @@ class NoiseType(Enum):
     SIMPLEX = "simplex"
     FRACTAL = "fractal"
 
-class MandelbrotGenerator:
-    """Generate Mandelbrot set fractals with dynamic detail scaling based on zoom."""
+_LOG2 = math.log(2.0)
+
+
+def _escape_time_grid(z, c, max_iterations, skip_mask=None):
+    """Vectorized escape-time iteration of z -> z*z + c with smooth coloring.
+
+    Every pixel is iterated at once; pixels that escape (|z| > 2) are recorded and
+    compacted out of the working set so later iterations only touch live pixels.
+    Returns the same smooth iteration count mandelbrot_point/julia_point return for
+    each pixel (max_iterations for points that never escape).
+    """
+    shape = np.shape(z)
+    z = np.array(z, dtype=np.complex128).ravel()
+    c = np.asarray(c, dtype=np.complex128)
+    c_is_grid = c.ndim > 0
+    if c_is_grid:
+        c = np.broadcast_to(c, shape).ravel()
+    result = np.full(z.size, float(max_iterations))
+    idx = np.arange(z.size)
+    if skip_mask is not None:
+        # Points known to be inside the set never escape - leave them at max_iterations
+        keep = ~np.asarray(skip_mask).ravel()
+        z, idx = z[keep], idx[keep]
+        if c_is_grid:
+            c = c[keep]
+    
+    for n in range(max_iterations):
+        if idx.size == 0:
+            break
+        mag2 = z.real * z.real + z.imag * z.imag
+        escaped = mag2 > 4.0
+        if escaped.any():
+            log_zn = 0.5 * np.log(mag2[escaped])
+            result[idx[escaped]] = n + 1 - np.log(log_zn) / _LOG2
+            alive = ~escaped
+            z, idx = z[alive], idx[alive]
+            if c_is_grid:
+                c = c[alive]
+        z = z * z + c
+    
+    return result.reshape(shape)
+
+
+def _fractal_palette(smooth_iterations, max_iterations):
+    """Map smooth iteration counts to the multi-band fractal palette (uint8 RGB)."""
+    smooth_iterations = np.asarray(smooth_iterations, dtype=np.float64)
+    hue = np.clip((smooth_iterations / max_iterations) % 1.0, 0.0, 1.0)
+    
+    # Same Red -> Orange -> Yellow -> Green -> Cyan -> Blue -> Purple bands as before
+    bands = [hue < 0.16, hue < 0.33, hue < 0.5, hue < 0.66, hue < 0.83]
+    zeros = np.zeros_like(hue)
+    ones = np.ones_like(hue)
+    r = np.select(bands, [ones, 1.0 - (hue - 0.16) * 6, zeros, zeros, (hue - 0.66) * 6], ones)
+    g = np.select(bands, [hue * 6, ones, ones, 1.0 - (hue - 0.5) * 6, zeros], zeros)
+    b = np.select(bands, [zeros, zeros, (hue - 0.33) * 6, ones, ones], 1.0 - (hue - 0.83) * 6)
+    
+    colored = (np.clip(np.stack([r, g, b], axis=-1), 0.0, 1.0) * 255).astype(np.uint8)
+    # Inside the set - black (account for smooth coloring)
+    colored[smooth_iterations >= max_iterations - 0.1] = 0
+    return colored
+
+
+class FractalResultCache:
+    """Small LRU cache of generated fractal frames keyed on (center, zoom, iterations, ...).
+    
+    Cached arrays are shared between callers, so put() makes them read-only.
+    """
+    
+    def __init__(self, max_entries=16):
+        self.max_entries = max_entries
+        self._entries = {}
+    
+    def get(self, key):
+        """Return a cached result (refreshing its recency) or None."""
+        value = self._entries.pop(key, None)
+        if value is not None:
+            self._entries[key] = value
+        return value
+    
+    def put(self, key, value):
+        """Store a result, evicting the least recently used entries."""
+        for array in (value if isinstance(value, tuple) else (value,)):
+            if isinstance(array, np.ndarray):
+                array.flags.writeable = False
+        self._entries.pop(key, None)
+        self._entries[key] = value
+        while len(self._entries) > self.max_entries:
+            self._entries.pop(next(iter(self._entries)))
+    
+    def clear(self):
+        self._entries.clear()
+    
+    def __len__(self):
+        return len(self._entries)
+
+
+class EscapeTimeFractal(ABC):
+    """Shared vectorized generation, tiling and caching for escape-time fractals."""
     
     def __init__(self, width=800, height=600, max_iter=100):
         self.width = width
         self.height = height
         self.max_iter = max_iter
         self.zoom = 1.0
-        self.center_x = -0.5
+        self.center_x = 0.0
         self.center_y = 0.0
         self.auto_detail = True  # Automatically adjust detail based on zoom
         self.base_iterations = 100  # Base iteration count
+        self.cache = FractalResultCache()
         
     def calculate_dynamic_iterations(self):
         """Calculate iteration count based on zoom level for dynamic detail."""
@@ -186,90 +287,63 @@ class MandelbrotGenerator:
         
         # Increase iterations logarithmically with zoom
         # More zoom = more detail needed to see fine structures
-        import math
         zoom_factor = max(1.0, self.zoom)
         dynamic_iterations = int(self.base_iterations * (1 + math.log10(zoom_factor) * 0.8))
         
         # Cap at reasonable maximum to prevent excessive computation
         return min(dynamic_iterations, 2000)
-        
-    def mandelbrot_point(self, c, max_iterations=None):
-        """Calculate iterations for a single complex point with smooth coloring."""
-        if max_iterations is None:
-            max_iterations = self.calculate_dynamic_iterations()
-            
-        z = 0
-        for n in range(max_iterations):
-            if abs(z) > 2:
-                # Smooth coloring using continuous escape time
-                import math
-                smooth_n = n + 1 - math.log(math.log(abs(z)))/math.log(2)
-                return smooth_n
-            z = z*z + c
-        return max_iterations
     
-    def generate(self):
-        """Generate the Mandelbrot set as a 2D array with dynamic detail."""
+    def cache_key(self, iterations):
+        """Key identifying one rendered frame."""
+        return (self.center_x, self.center_y, self.zoom, iterations, self.width, self.height)
+    
+    def pixel_grid(self, xs, ys):
+        """Map pixel column/row coordinates to points on the complex plane."""
+        real = (np.asarray(xs, dtype=np.float64) - self.width / 2) * (4.0 / self.width) / self.zoom + self.center_x
+        imag = (np.asarray(ys, dtype=np.float64) - self.height / 2) * (4.0 / self.height) / self.zoom + self.center_y
+        return real[np.newaxis, :] + 1j * imag[:, np.newaxis]
+    
+    @abstractmethod
+    def escape_times(self, points, iterations):
+        """Smooth escape-time counts for an array of complex points."""
+    
+    def generate_tile(self, x, y, tile_width, tile_height, iterations=None):
+        """Generate smooth iteration counts for one pixel tile of the current view."""
+        if iterations is None:
+            iterations = self.calculate_dynamic_iterations()
+        x_end = min(x + tile_width, self.width)
+        y_end = min(y + tile_height, self.height)
+        points = self.pixel_grid(np.arange(x, x_end), np.arange(y, y_end))
+        return self.escape_times(points, iterations)
+    
+    def generate(self, tile_size=256):
+        """Generate the fractal as a 2D array with dynamic detail (cached per view)."""
         current_iterations = self.calculate_dynamic_iterations()
-        result = np.zeros((self.height, self.width))
-        
-        print(f"DEBUG: Mandelbrot generation - Zoom: {self.zoom:.2f}, Dynamic Iterations: {current_iterations}")
-        
-        for y in range(self.height):
-            for x in range(self.width):
-                # Map pixel to complex plane
-                real = (x - self.width/2) * (4.0/self.width) / self.zoom + self.center_x
-                imag = (y - self.height/2) * (4.0/self.height) / self.zoom + self.center_y
-                c = complex(real, imag)
-                
-                result[y, x] = self.mandelbrot_point(c, current_iterations)
-        
+        key = self.cache_key(current_iterations)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        
+        result = np.empty((self.height, self.width))
+        # Work tile by tile so temporary arrays stay small for very large frames
+        for y in range(0, self.height, tile_size):
+            for x in range(0, self.width, tile_size):
+                tile = self.generate_tile(x, y, tile_size, tile_size, current_iterations)
+                result[y:y + tile.shape[0], x:x + tile.shape[1]] = tile
+        
+        self.cache.put(key, result)
         return result
     
     def generate_colored(self):
-        """Generate colored Mandelbrot set with enhanced detail visualization."""
-        mandelbrot_data = self.generate()
-        colored = np.zeros((self.height, self.width, 3), dtype=np.uint8)
-        current_iterations = self.calculate_dynamic_iterations()
-        
-        for y in range(self.height):
-            for x in range(self.width):
-                iterations = mandelbrot_data[y, x]
-                if iterations >= current_iterations - 0.1:  # Account for smooth coloring
-                    # Inside the set - black
-                    colored[y, x] = [0, 0, 0]
-                else:
-                    # Outside the set - enhanced color palette for high detail with bounds checking
-                    hue = max(0.0, min(1.0, (iterations / current_iterations) % 1.0))
-                    
-                    # Multi-band color scheme for better detail visibility
-                    if hue < 0.16:  # Red to Orange
-                        r, g, b = 1.0, hue * 6, 0.0
-                    elif hue < 0.33:  # Orange to Yellow
-                        r, g, b = 1.0 - (hue - 0.16) * 6, 1.0, 0.0
-                    elif hue < 0.5:  # Yellow to Green
-                        r, g, b = 0.0, 1.0, (hue - 0.33) * 6
-                    elif hue < 0.66:  # Green to Cyan
-                        r, g, b = 0.0, 1.0 - (hue - 0.5) * 6, 1.0
-                    elif hue < 0.83:  # Cyan to Blue
-                        r, g, b = (hue - 0.66) * 6, 0.0, 1.0
-                    else:  # Blue to Purple
-                        r, g, b = 1.0, 0.0, 1.0 - (hue - 0.83) * 6
-                    
-                    # Clamp RGB values and convert to uint8
-                    r = max(0.0, min(1.0, r))
-                    g = max(0.0, min(1.0, g))
-                    b = max(0.0, min(1.0, b))
-                    colored[y, x] = [int(r * 255), int(g * 255), int(b * 255)]
-        
-        return colored
+        """Generate the colored fractal with enhanced detail visualization."""
+        return _fractal_palette(self.generate(), self.calculate_dynamic_iterations())
     
     def set_zoom_region(self, center_x, center_y, zoom):
         """Set the zoom region for detailed fractal exploration."""
         self.center_x = center_x
         self.center_y = center_y
         self.zoom = zoom
-        print(f"DEBUG: Mandelbrot zoom region set - Center: ({center_x:.6f}, {center_y:.6f}), Zoom: {zoom:.2f}")
+        print(f"DEBUG: {type(self).__name__} zoom region set - Center: ({center_x:.6f}, {center_y:.6f}), Zoom: {zoom:.2f}")
     
     def get_zoom_info(self):
         """Get current zoom information and detail level."""
@@ -282,32 +356,48 @@ class MandelbrotGenerator:
             'detail_level': 'Ultra' if current_iterations > 1000 else 'High' if current_iterations > 500 else 'Medium' if current_iterations > 200 else 'Standard'
         }
 
-class JuliaGenerator:
+class MandelbrotGenerator(EscapeTimeFractal):
+    """Generate Mandelbrot set fractals with dynamic detail scaling based on zoom."""
+    
+    def __init__(self, width=800, height=600, max_iter=100):
+        super().__init__(width, height, max_iter)
+        self.center_x = -0.5
+        self.center_y = 0.0
+        
+    def mandelbrot_point(self, c, max_iterations=None):
+        """Calculate iterations for a single complex point with smooth coloring."""
+        if max_iterations is None:
+            max_iterations = self.calculate_dynamic_iterations()
+            
+        z = 0
+        for n in range(max_iterations):
+            if abs(z) > 2:
+                # Smooth coloring using continuous escape time
+                smooth_n = n + 1 - math.log(math.log(abs(z)))/math.log(2)
+                return smooth_n
+            z = z*z + c
+        return max_iterations
+    
+    def escape_times(self, points, iterations):
+        """Smooth escape-time counts for an array of points c."""
+        # Main cardioid and period-2 bulb are inside the set - skip iterating them
+        x = points.real
+        y2 = points.imag * points.imag
+        q = (x - 0.25) ** 2 + y2
+        interior = (q * (q + (x - 0.25)) < 0.25 * y2) | ((x + 1.0) ** 2 + y2 < 0.0625)
+        return _escape_time_grid(np.zeros_like(points), points, iterations, skip_mask=interior)
+    
+    def generate(self, tile_size=256):
+        """Generate the Mandelbrot set as a 2D array with dynamic detail."""
+        print(f"DEBUG: Mandelbrot generation - Zoom: {self.zoom:.2f}, Dynamic Iterations: {self.calculate_dynamic_iterations()}")
+        return super().generate(tile_size)
+
+class JuliaGenerator(EscapeTimeFractal):
     """Generate Julia set fractals with dynamic detail scaling based on zoom."""
     
     def __init__(self, width=800, height=600, max_iter=100, c_real=-0.7, c_imag=0.27015):
-        self.width = width
-        self.height = height
-        self.max_iter = max_iter
+        super().__init__(width, height, max_iter)
         self.c = complex(c_real, c_imag)
-        self.zoom = 1.0
-        self.center_x = 0.0
-        self.center_y = 0.0
-        self.auto_detail = True  # Automatically adjust detail based on zoom
-        self.base_iterations = 100  # Base iteration count
-        
-    def calculate_dynamic_iterations(self):
-        """Calculate iteration count based on zoom level for dynamic detail."""
-        if not self.auto_detail:
-            return self.max_iter
-        
-        # Increase iterations logarithmically with zoom
-        import math
-        zoom_factor = max(1.0, self.zoom)
-        dynamic_iterations = int(self.base_iterations * (1 + math.log10(zoom_factor) * 0.8))
-        
-        # Cap at reasonable maximum to prevent excessive computation
-        return min(dynamic_iterations, 2000)
     
     def julia_point(self, z, max_iterations=None):
         """Calculate iterations for a single complex point with smooth coloring."""
@@ -317,61 +407,23 @@ class JuliaGenerator:
         for n in range(max_iterations):
             if abs(z) > 2:
                 # Smooth coloring using continuous escape time
-                import math
                 smooth_n = n + 1 - math.log(math.log(abs(z)))/math.log(2)
                 return smooth_n
             z = z*z + self.c
         return max_iterations
     
-    def generate_colored(self):
-        """Generate colored Julia set with enhanced detail visualization."""
-        colored = np.zeros((self.height, self.width, 3), dtype=np.uint8)
-        current_iterations = self.calculate_dynamic_iterations()
-        
-        print(f"DEBUG: Julia generation - Zoom: {self.zoom:.2f}, Dynamic Iterations: {current_iterations}, C: {self.c}")
-        
-        for y in range(self.height):
-            for x in range(self.width):
-                # Map pixel to complex plane
-                real = (x - self.width/2) * (4.0/self.width) / self.zoom + self.center_x
-                imag = (y - self.height/2) * (4.0/self.height) / self.zoom + self.center_y
-                z = complex(real, imag)
-                
-                iterations = self.julia_point(z, current_iterations)
-                if iterations >= current_iterations - 0.1:  # Account for smooth coloring
-                    colored[y, x] = [0, 0, 0]
-                else:
-                    # Enhanced color palette for high detail with bounds checking
-                    hue = max(0.0, min(1.0, (iterations / current_iterations) % 1.0))
-                    
-                    # Multi-band color scheme for better detail visibility
-                    if hue < 0.16:  # Red to Orange
-                        r, g, b = 1.0, hue * 6, 0.0
-                    elif hue < 0.33:  # Orange to Yellow
-                        r, g, b = 1.0 - (hue - 0.16) * 6, 1.0, 0.0
-                    elif hue < 0.5:  # Yellow to Green
-                        r, g, b = 0.0, 1.0, (hue - 0.33) * 6
-                    elif hue < 0.66:  # Green to Cyan
-                        r, g, b = 0.0, 1.0 - (hue - 0.5) * 6, 1.0
-                    elif hue < 0.83:  # Cyan to Blue
-                        r, g, b = (hue - 0.66) * 6, 0.0, 1.0
-                    else:  # Blue to Purple
-                        r, g, b = 1.0, 0.0, 1.0 - (hue - 0.83) * 6
-                    
-                    # Clamp RGB values and convert to uint8
-                    r = max(0.0, min(1.0, r))
-                    g = max(0.0, min(1.0, g))
-                    b = max(0.0, min(1.0, b))
-                    colored[y, x] = [int(r * 255), int(g * 255), int(b * 255)]
-        
-        return colored
+    def cache_key(self, iterations):
+        """Key identifying one rendered frame (includes the Julia constant)."""
+        return super().cache_key(iterations) + (self.c,)
     
-    def set_zoom_region(self, center_x, center_y, zoom):
-        """Set the zoom region for detailed fractal exploration."""
-        self.center_x = center_x
-        self.center_y = center_y
-        self.zoom = zoom
-        print(f"DEBUG: Julia zoom region set - Center: ({center_x:.6f}, {center_y:.6f}), Zoom: {zoom:.2f}")
+    def escape_times(self, points, iterations):
+        """Smooth escape-time counts for an array of starting points z."""
+        return _escape_time_grid(points, self.c, iterations)
+    
+    def generate(self, tile_size=256):
+        """Generate the Julia set as a 2D array with dynamic detail."""
+        print(f"DEBUG: Julia generation - Zoom: {self.zoom:.2f}, Dynamic Iterations: {self.calculate_dynamic_iterations()}, C: {self.c}")
+        return super().generate(tile_size)
     
     def set_julia_constant(self, c_real, c_imag):
         """Set the Julia set constant for different fractal shapes."""
@@ -380,15 +432,174 @@ class JuliaGenerator:
     
     def get_zoom_info(self):
         """Get current zoom information and detail level."""
-        current_iterations = self.calculate_dynamic_iterations()
-        return {
-            'center_x': self.center_x,
-            'center_y': self.center_y,
-            'zoom': self.zoom,
-            'iterations': current_iterations,
-            'julia_constant': self.c,
-            'detail_level': 'Ultra' if current_iterations > 1000 else 'High' if current_iterations > 500 else 'Medium' if current_iterations > 200 else 'Standard'
-        }
+        info = super().get_zoom_info()
+        info['julia_constant'] = self.c
+        return info
+
+# ==================== FRACTAL GEOMETRY ====================
+
+_fractal_geometry_cache = FractalResultCache(max_entries=8)
+
+
+def cached_fractal_geometry(kind, parameters, level, builder):
+    """Return builder() cached per (kind, parameters, level); parameters must be hashable."""
+    key = (kind, parameters, level)
+    result = _fractal_geometry_cache.get(key)
+    if result is None:
+        result = builder()
+        _fractal_geometry_cache.put(key, result)
+    return result
+
+
+# Offsets of the 20 subcubes a Menger sponge keeps out of 27 (those with at most one middle coordinate)
+MENGER_OFFSETS = np.array([(i - 1, j - 1, k - 1)
+                           for i in range(3) for j in range(3) for k in range(3)
+                           if (i == 1) + (j == 1) + (k == 1) < 2], dtype=np.float64)
+
+
+def menger_sponge_centers(level, size=1.0):
+    """
+    Centers of the 20**level cubes of a Menger sponge as one (n, 3) array.
+    
+    Each level adds the 20 offsets scaled by the new cube size to every
+    existing center (a Kronecker-style sum), so cubes come out in the same
+    order as recursive subdivision. Cached per (size, level).
+    """
+    def build():
+        centers = np.zeros((1, 3))
+        cube_size = size
+        for _ in range(level):
+            cube_size /= 3.0
+            centers = (centers[:, np.newaxis, :] + cube_size * MENGER_OFFSETS).reshape(-1, 3)
+        return centers
+    return cached_fractal_geometry('menger', float(size), int(level), build)
+
+
+def expand_lsystem(axiom, rules, iterations):
+    """Rewrite an L-system axiom; characters without a rule are copied unchanged. Cached per rules and depth."""
+    rules = {str(k): str(v) for k, v in rules.items()}
+    
+    def build():
+        current = axiom
+        if all(len(symbol) == 1 for symbol in rules):
+            table = str.maketrans(rules)
+            for _ in range(iterations):
+                current = current.translate(table)
+        else:
+            for _ in range(iterations):
+                current = ''.join([rules.get(char, char) for char in current])
+        return current
+    return cached_fractal_geometry('lsystem', (axiom, tuple(sorted(rules.items()))), int(iterations), build)
+
+
+def _bracketed_cumsum(values, opens, closes, depth):
+    """
+    Running sum of values where every ']' restores the sum at its matching '['.
+    
+    The net change inside a bracket pair is the sum of the values at exactly
+    the pair's inner depth (deeper values are undone by inner pairs), so each
+    ']' gets a correction read from a per-depth running sum.
+    """
+    order = np.argsort(depth, kind='stable')
+    by_depth = np.empty_like(values)
+    by_depth[order] = np.cumsum(values[order], axis=0)
+    
+    # Pair brackets: within one nesting level, opens and closes alternate
+    brackets = np.flatnonzero(opens | closes)
+    level = depth[brackets] + closes[brackets]
+    paired = brackets[np.argsort(level, kind='stable')]
+    is_close = closes[paired]
+    close_positions = paired[is_close]
+    open_positions = paired[np.flatnonzero(is_close) - 1]
+    
+    corrected = values.copy()
+    corrected[close_positions] -= by_depth[close_positions - 1] - by_depth[open_positions]
+    return np.cumsum(corrected, axis=0)
+
+
+def turtle_segments(lstring, angle, length=1.0):
+    """
+    Interpret an L-system string as turtle graphics, returning an (n, 2, 3) array of line segments.
+    
+    'F' draws forward, '+'/'-' turn by angle degrees within the XY plane
+    (starting upward), '[' and ']' push and pop the turtle state; other
+    symbols are ignored. Headings and positions are computed for the whole
+    string at once.
+    """
+    codes = np.frombuffer(lstring.encode('utf-32-le'), dtype=np.uint32)
+    opens = codes == ord('[')
+    closes = codes == ord(']')
+    depth = np.cumsum(opens.astype(np.int64) - closes)
+    if len(depth) and depth.min() < 0:
+        # A ']' with nothing to pop is ignored
+        level = 0
+        for index in np.flatnonzero(opens | closes):
+            if opens[index]:
+                level += 1
+            elif level:
+                level -= 1
+            else:
+                closes[index] = False
+        depth = np.cumsum(opens.astype(np.int64) - closes)
+    
+    turn = math.radians(angle)
+    turns = (codes == ord('+')) * turn - (codes == ord('-')) * turn
+    heading = _bracketed_cumsum(turns, opens, closes, depth)
+    
+    forward = codes == ord('F')
+    steps = np.zeros((len(codes), 3))
+    steps[forward, 0] = np.sin(heading[forward]) * length
+    steps[forward, 1] = np.cos(heading[forward]) * length
+    positions = _bracketed_cumsum(steps, opens, closes, depth)
+    
+    ends = positions[forward]
+    return np.stack([ends - steps[forward], ends], axis=1)
+
+
+def ifs_chaos_game(transforms, iterations, walkers=4096, warmup=20, fallback=None):
+    """
+    Run the IFS chaos game with many independent walkers in parallel.
+    
+    transforms are (a, b, c, d, e, f, probability) rows mapping
+    (x, y) -> (a*x + b*y + e, c*x + d*y + f). Each step draws one random
+    number per walker and applies the first transform whose cumulative
+    probability reaches it. When the probabilities sum to less than one the
+    remaining draws pick transform fallback, or leave the walker in place
+    unrecorded when fallback is None. The first warmup steps of every walker
+    are discarded while it converges onto the attractor.
+    
+    Returns (points, choices): up to iterations (x, y) rows and the index of
+    the transform that produced each.
+    """
+    coefficients = np.asarray(transforms, dtype=np.float64).reshape(-1, 7)
+    cumulative = np.cumsum(coefficients[:, 6])
+    walkers = max(1, min(walkers, iterations))
+    steps = -(-iterations // walkers)
+    
+    x = np.zeros(walkers)
+    y = np.zeros(walkers)
+    points = np.empty((steps, walkers, 2))
+    choices = np.empty((steps, walkers), dtype=np.intp)
+    recorded = np.empty((steps, walkers), dtype=bool)
+    for step in range(-warmup, steps):
+        chosen = np.searchsorted(cumulative, np.random.random(walkers), side='left')
+        applied = chosen < len(coefficients)
+        if fallback is not None:
+            chosen[~applied] = fallback
+            applied[:] = True
+        a, b, c, d, e, f = coefficients[np.minimum(chosen, len(coefficients) - 1), :6].T
+        x, y = (np.where(applied, a * x + b * y + e, x),
+                np.where(applied, c * x + d * y + f, y))
+        if step >= 0:
+            points[step, :, 0] = x
+            points[step, :, 1] = y
+            choices[step] = chosen
+            recorded[step] = applied
+    
+    keep = recorded.ravel()
+    keep[iterations:] = False
+    return points.reshape(-1, 2)[keep], choices.ravel()[keep]
+
 
 class IFSGenerator:
     """Generate IFS (Iterated Function System) fractals like ferns and trees."""
@@ -415,60 +626,28 @@ class IFSGenerator:
         ]
     
     def generate_fern(self, iterations=100000):
-        """Generate Barnsley fern using IFS."""
-        points = []
-        x, y = 0.0, 0.0
-        
-        for _ in range(iterations):
-            # Choose transformation based on probability
-            rand = random.random()
-            cumulative_prob = 0.0
-            
-            for transform in self.fern_transforms:
-                a, b, c, d, e, f, prob = transform
-                cumulative_prob += prob
-                
-                if rand <= cumulative_prob:
-                    new_x = a * x + b * y + e
-                    new_y = c * x + d * y + f
-                    x, y = new_x, new_y
-                    
-                    # Convert to screen coordinates
-                    screen_x = int((x + 3) * self.width / 6)
-                    screen_y = int(self.height - (y + 1) * self.height / 12)
-                    
-                    if 0 <= screen_x < self.width and 0 <= screen_y < self.height:
-                        points.append((screen_x, screen_y))
-                    break
-        
-        return points
+        """Generate Barnsley fern using IFS, as an (n, 2) array of in-bounds (x, y) pixels."""
+        def to_screen(x, y):
+            return (x + 3) * self.width / 6, self.height - (y + 1) * self.height / 12
+        return self._chaos_game_pixels('fern', self.fern_transforms, iterations, to_screen)
     
     def generate_tree(self, iterations=50000):
-        """Generate tree-like fractal using IFS."""
-        points = []
-        x, y = 0.0, 0.0
-        
-        for _ in range(iterations):
-            rand = random.random()
-            cumulative_prob = 0.0
-            
-            for transform in self.tree_transforms:
-                a, b, c, d, e, f, prob = transform
-                cumulative_prob += prob
-                
-                if rand <= cumulative_prob:
-                    new_x = a * x + b * y + e
-                    new_y = c * x + d * y + f
-                    x, y = new_x, new_y
-                    
-                    screen_x = int((x + 1) * self.width / 2)
-                    screen_y = int(self.height - y * self.height)
-                    
-                    if 0 <= screen_x < self.width and 0 <= screen_y < self.height:
-                        points.append((screen_x, screen_y))
-                    break
-        
-        return points
+        """Generate tree-like fractal using IFS, as an (n, 2) array of in-bounds (x, y) pixels."""
+        def to_screen(x, y):
+            return (x + 1) * self.width / 2, self.height - y * self.height
+        return self._chaos_game_pixels('tree', self.tree_transforms, iterations, to_screen)
+    
+    def _chaos_game_pixels(self, name, transforms, iterations, to_screen):
+        """Run the chaos game and keep the points that land on screen (cached per transforms and size)."""
+        def build():
+            points, _ = ifs_chaos_game(transforms, iterations)
+            screen_x, screen_y = to_screen(points[:, 0], points[:, 1])
+            pixels = np.stack([np.trunc(screen_x), np.trunc(screen_y)], axis=-1).astype(np.int64)
+            inside = ((pixels[:, 0] >= 0) & (pixels[:, 0] < self.width) &
+                      (pixels[:, 1] >= 0) & (pixels[:, 1] < self.height))
+            return pixels[inside]
+        parameters = (name, tuple(map(tuple, transforms)), self.width, self.height)
+        return cached_fractal_geometry('ifs', parameters, iterations, build)
 
 class PerlinNoise:
     """Generate Perlin noise for natural-looking procedural textures."""
@@ -534,26 +713,57 @@ class PerlinNoise:
         
         return (res + 1) / 2  # Normalize to [0, 1]
     
+    def noise2d_array(self, x, y):
+        """Vectorized noise2d over arrays of non-negative coordinates."""
+        perm = np.asarray(self.p, dtype=np.int64)
+        grad = np.asarray(self.grad2, dtype=np.float64)
+        xi = np.asarray(x, dtype=np.float64).astype(np.int64)
+        yi = np.asarray(y, dtype=np.float64).astype(np.int64)
+        
+        # Find grid cell and relative coordinates within it
+        X = xi & 255
+        Y = yi & 255
+        x = x - xi
+        y = y - yi
+        u = self.fade(x)
+        v = self.fade(y)
+        
+        # Hash coordinates of 4 cube corners
+        A = perm[X] + Y
+        AA = perm[A]
+        AB = perm[A + 1]
+        B = perm[X + 1] + Y
+        BA = perm[B]
+        BB = perm[B + 1]
+        
+        def grad_dot(hash_val, dx, dy):
+            g = grad[hash_val & 7]
+            return g[..., 0] * dx + g[..., 1] * dy
+        
+        # Blend results from 4 corners
+        res = self.lerp(v,
+                       self.lerp(u, grad_dot(perm[AA], x, y),
+                                   grad_dot(perm[BA], x - 1, y)),
+                       self.lerp(u, grad_dot(perm[AB], x, y - 1),
+                                   grad_dot(perm[BB], x - 1, y - 1)))
+        
+        return (res + 1) / 2  # Normalize to [0, 1]
+    
     def generate_texture(self, width, height, scale=0.1, octaves=4, persistence=0.5):
         """Generate a texture using multiple octaves of Perlin noise."""
+        ys, xs = np.mgrid[0:height, 0:width].astype(np.float64)
         texture = np.zeros((height, width))
+        amplitude = 1
+        frequency = scale
+        max_value = 0
         
-        for y in range(height):
-            for x in range(width):
-                value = 0
-                amplitude = 1
-                frequency = scale
-                max_value = 0
-                
-                for _ in range(octaves):
-                    value += self.noise2d(x * frequency, y * frequency) * amplitude
-                    max_value += amplitude
-                    amplitude *= persistence
-                    frequency *= 2
-                
-                texture[y, x] = value / max_value
+        for _ in range(octaves):
+            texture += self.noise2d_array(xs * frequency, ys * frequency) * amplitude
+            max_value += amplitude
+            amplitude *= persistence
+            frequency *= 2
         
-        return texture
+        return texture / max_value
 
 class SimplexNoise:
     """Generate Simplex noise - improved version of Perlin noise."""
@@ -640,28 +850,83 @@ class SimplexNoise:
         # Add contributions and scale to [-1, 1]
         return 70.0 * (n0 + n1 + n2)
     
-    def generate_texture(self, width, height, scale=0.01, octaves=4, persistence=0.5):
-        """Generate texture using multiple octaves of Simplex noise."""
-        texture = np.zeros((height, width))
+    def noise2d_array(self, xin, yin):
+        """Vectorized noise2d over arrays of non-negative coordinates."""
+        perm = np.asarray(self.perm, dtype=np.int64)
+        grad = np.asarray(self.grad3, dtype=np.float64)
+        xin = np.asarray(xin, dtype=np.float64)
+        yin = np.asarray(yin, dtype=np.float64)
         
-        for y in range(height):
-            for x in range(width):
-                value = 0
-                amplitude = 1
-                frequency = scale
-                max_value = 0
-                
-                for _ in range(octaves):
-                    noise_val = self.noise2d(x * frequency, y * frequency)
-                    value += noise_val * amplitude
-                    max_value += amplitude
-                    amplitude *= persistence
-                    frequency *= 2
-                
-                # Normalize to [0, 1]
-                texture[y, x] = (value / max_value + 1) / 2
+        # Skew input space to determine which simplex cell we're in
+        s = (xin + yin) * self.F2
+        i = (xin + s).astype(np.int64)
+        j = (yin + s).astype(np.int64)
         
-        return texture
+        t = (i + j) * self.G2
+        x0 = xin - (i - t)
+        y0 = yin - (j - t)
+        
+        # Lower triangle (x0 > y0) or upper triangle
+        i1 = (x0 > y0).astype(np.int64)
+        j1 = 1 - i1
+        
+        # Offsets for middle and last corners
+        x1 = x0 - i1 + self.G2
+        y1 = y0 - j1 + self.G2
+        x2 = x0 - 1.0 + 2.0 * self.G2
+        y2 = y0 - 1.0 + 2.0 * self.G2
+        
+        # Work out hashed gradient indices
+        ii = i & 255
+        jj = j & 255
+        gi0 = perm[ii + perm[jj]] % 12
+        gi1 = perm[ii + i1 + perm[jj + j1]] % 12
+        gi2 = perm[ii + 1 + perm[jj + 1]] % 12
+        
+        # Calculate contributions from three corners
+        total = np.zeros_like(xin)
+        for gi, dx, dy in ((gi0, x0, y0), (gi1, x1, y1), (gi2, x2, y2)):
+            tc = 0.5 - dx * dx - dy * dy
+            g = grad[gi]
+            contribution = tc ** 4 * (g[..., 0] * dx + g[..., 1] * dy)
+            total += np.where(tc < 0, 0.0, contribution)
+        
+        # Add contributions and scale to [-1, 1]
+        return 70.0 * total
+    
+    def generate_texture(self, width, height, scale=0.01, octaves=4, persistence=0.5):
+        """Generate texture using multiple octaves of Simplex noise."""
+        ys, xs = np.mgrid[0:height, 0:width].astype(np.float64)
+        value = np.zeros((height, width))
+        amplitude = 1
+        frequency = scale
+        max_value = 0
+        
+        for _ in range(octaves):
+            value += self.noise2d_array(xs * frequency, ys * frequency) * amplitude
+            max_value += amplitude
+            amplitude *= persistence
+            frequency *= 2
+        
+        # Normalize to [0, 1]
+        return (value / max_value + 1) / 2
+
+def _hsv_to_rgb_array(h, s, v):
+    """Vectorized colorsys.hsv_to_rgb; returns an (..., 3) float array."""
+    h = np.asarray(h, dtype=np.float64)
+    v = np.asarray(v, dtype=np.float64)
+    i = np.floor(h * 6.0)
+    f = h * 6.0 - i
+    p = v * (1.0 - s)
+    q = v * (1.0 - s * f)
+    t = v * (1.0 - s * (1.0 - f))
+    i = i.astype(np.int64) % 6
+    conditions = [i == k for k in range(6)]
+    r = np.select(conditions, [v, q, p, p, t, v])
+    g = np.select(conditions, [t, v, v, q, p, p])
+    b = np.select(conditions, [p, p, t, v, v, q])
+    return np.stack([r, g, b], axis=-1)
+
 
 class RayMarcher:
     """Ray-marching renderer for distance fields - creates impossible geometry."""
@@ -764,8 +1029,99 @@ class RayMarcher:
         ])
         return gradient / np.linalg.norm(gradient)
     
+    def mandelbulb_sdf_batch(self, pos, power=8, iterations=10):
+        """Vectorized mandelbulb_sdf for an (N, 3) array of positions."""
+        pos = np.asarray(pos, dtype=np.float64)
+        z = pos.copy()
+        dr = np.ones(len(z))
+        r = np.zeros(len(z))
+        active = np.arange(len(z))
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for i in range(iterations):
+                if active.size == 0:
+                    break
+                za = z[active]
+                ra = np.sqrt(np.einsum('ij,ij->i', za, za))
+                r[active] = ra
+                # Points that escaped keep this r and stop iterating
+                alive = ~(ra > 2.0)
+                active, za, ra = active[alive], za[alive], ra[alive]
+                
+                # Convert to polar coordinates
+                theta = np.where(ra != 0, np.arccos(np.clip(za[:, 2] / ra, -1.0, 1.0)), 0.0)
+                phi = np.arctan2(za[:, 1], za[:, 0])
+                
+                # Scale and rotate the point
+                zr = ra ** power
+                theta = theta * power
+                phi = phi * power
+                
+                # Convert back to cartesian coordinates
+                z[active] = zr[:, np.newaxis] * np.stack([
+                    np.sin(theta) * np.cos(phi),
+                    np.sin(phi) * np.sin(theta),
+                    np.cos(theta)
+                ], axis=-1) + pos[active]
+                
+                dr[active] = (ra ** (power - 1.0)) * power * dr[active] + 1.0
+            
+            return 0.5 * np.log(r) * r / dr
+    
+    def scene_sdf_batch(self, pos, scene_type="mandelbulb"):
+        """Vectorized scene_sdf for an (N, 3) array of positions."""
+        if scene_type == "mandelbulb":
+            return self.mandelbulb_sdf_batch(pos)
+        elif scene_type == "spheres":
+            # Multiple spheres
+            d1 = np.linalg.norm(pos, axis=1) - 1.0
+            d2 = np.linalg.norm(pos - np.array([2.0, 0.0, 0.0]), axis=1) - 0.5
+            return np.minimum(d1, d2)
+        elif scene_type == "torus":
+            q = np.stack([np.hypot(pos[:, 0], pos[:, 2]) - 1.5, pos[:, 1]], axis=-1)
+            return np.linalg.norm(q, axis=1) - 0.5
+        else:
+            return np.linalg.norm(pos, axis=1) - 1.0
+    
+    def ray_march_batch(self, ray_origin, ray_directions, scene_type="mandelbulb"):
+        """March a packet of rays at once; returns hit distances (-1 for misses)."""
+        count = len(ray_directions)
+        total_distance = np.zeros(count)
+        result = np.full(count, -1.0)
+        active = np.arange(count)
+        
+        for _ in range(self.max_steps):
+            if active.size == 0:
+                break
+            current_pos = ray_origin + ray_directions[active] * total_distance[active, np.newaxis]
+            distance = self.scene_sdf_batch(current_pos, scene_type)
+            
+            hit = distance < self.min_distance
+            result[active[hit]] = total_distance[active[hit]]
+            
+            total_distance[active] += np.where(hit, 0.0, distance)
+            # Drop hits, misses past max_distance and NaN distances
+            alive = ~hit & (total_distance[active] <= self.max_distance)
+            active = active[alive]
+        
+        return result
+    
+    def calculate_normal_batch(self, pos, scene_type="mandelbulb"):
+        """Vectorized calculate_normal for an (N, 3) array of positions."""
+        epsilon = 0.001
+        gradient = np.empty_like(pos)
+        for axis in range(3):
+            offset = np.zeros(3)
+            offset[axis] = epsilon
+            gradient[:, axis] = (self.scene_sdf_batch(pos + offset, scene_type) -
+                                 self.scene_sdf_batch(pos - offset, scene_type))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return gradient / np.linalg.norm(gradient, axis=1, keepdims=True)
+    
     def render(self, camera_pos, camera_target, scene_type="mandelbulb"):
-        """Render the scene using ray marching."""
+        """Render the scene using ray marching (all pixels marched as one ray packet)."""
+        camera_pos = np.asarray(camera_pos, dtype=np.float64)
+        camera_target = np.asarray(camera_target, dtype=np.float64)
         image = np.zeros((self.height, self.width, 3), dtype=np.uint8)
         
         # Camera setup
@@ -775,46 +1131,44 @@ class RayMarcher:
         right = right / np.linalg.norm(right)
         up = np.cross(right, forward)
         
-        for y in range(self.height):
-            for x in range(self.width):
-                # Convert screen coordinates to normalized device coordinates
-                u = (x / self.width) * 2.0 - 1.0
-                v = (y / self.height) * 2.0 - 1.0
-                v = -v  # Flip Y axis
-                
-                # Calculate ray direction
-                ray_direction = forward + u * right + v * up
-                ray_direction = ray_direction / np.linalg.norm(ray_direction)
-                
-                # Ray march
-                distance = self.ray_march(camera_pos, ray_direction, scene_type)
-                
-                if distance > 0:
-                    # Hit - calculate lighting
-                    hit_pos = camera_pos + ray_direction * distance
-                    normal = self.calculate_normal(hit_pos, scene_type)
-                    
-                    # Simple lighting
-                    light_dir = np.array([1, 1, 1])
-                    light_dir = light_dir / np.linalg.norm(light_dir)
-                    
-                    diffuse = max(0, np.dot(normal, light_dir))
-                    
-                    # Color based on distance and lighting
-                    color_intensity = diffuse * (1.0 - distance / self.max_distance)
-                    
-                    if scene_type == "mandelbulb":
-                        # Fractal coloring
-                        hue = (distance * 0.1) % 1.0
-                        rgb = colorsys.hsv_to_rgb(hue, 0.8, color_intensity)
-                    else:
-                        rgb = (color_intensity, color_intensity * 0.8, color_intensity * 0.6)
-                    
-                    image[y, x] = [max(0, min(255, int(c * 255))) for c in rgb]
-                else:
-                    # Miss - background
-                    image[y, x] = [20, 20, 40]  # Dark blue background
+        # Convert screen coordinates to normalized device coordinates (Y flipped)
+        u = (np.arange(self.width) / self.width) * 2.0 - 1.0
+        v = -((np.arange(self.height) / self.height) * 2.0 - 1.0)
+        uu, vv = np.meshgrid(u, v)
+        ray_directions = (forward + uu.reshape(-1, 1) * right + vv.reshape(-1, 1) * up)
+        ray_directions /= np.linalg.norm(ray_directions, axis=1, keepdims=True)
+        
+        # Ray march
+        distance = self.ray_march_batch(camera_pos, ray_directions, scene_type)
+        hit = distance > 0
+        
+        # Miss - background
+        pixels = np.tile(np.array([20, 20, 40], dtype=np.uint8), (len(distance), 1))
+        
+        if hit.any():
+            # Hit - calculate lighting
+            hit_distance = distance[hit]
+            hit_pos = camera_pos + ray_directions[hit] * hit_distance[:, np.newaxis]
+            normal = self.calculate_normal_batch(hit_pos, scene_type)
+            
+            # Simple lighting
+            light_dir = np.array([1, 1, 1]) / np.sqrt(3.0)
+            diffuse = np.maximum(0, normal @ light_dir)
+            
+            # Color based on distance and lighting
+            color_intensity = diffuse * (1.0 - hit_distance / self.max_distance)
+            
+            if scene_type == "mandelbulb":
+                # Fractal coloring
+                hue = (hit_distance * 0.1) % 1.0
+                rgb = _hsv_to_rgb_array(hue, 0.8, color_intensity)
+            else:
+                rgb = np.stack([color_intensity, color_intensity * 0.8, color_intensity * 0.6], axis=-1)
+            
+            rgb = np.nan_to_num(rgb * 255)
+            pixels[hit] = np.clip(rgb.astype(np.int64), 0, 255).astype(np.uint8)
         
+        image[:] = pixels.reshape(self.height, self.width, 3)
         return image
 
 class MengerSponge:
@@ -822,202 +1176,327 @@ class MengerSponge:
     
     def __init__(self, iterations=3):
         self.iterations = iterations
-        self.cubes = []
+        self.size = 1.0
+        self.centers = np.zeros((0, 3))
         self.generate()
     
     def generate(self):
-        """Generate Menger sponge by recursive subdivision."""
-        # Start with a single cube
-        initial_cube = {
-            'center': np.array([0.0, 0.0, 0.0]),
-            'size': 1.0,
-            'level': 0
-        }
-        self.cubes = [initial_cube]
-        
-        for iteration in range(self.iterations):
-            new_cubes = []
-            
-            for cube in self.cubes:
-                if cube['level'] == iteration:
-                    # Subdivide this cube
-                    subdivided = self.subdivide_cube(cube)
-                    new_cubes.extend(subdivided)
-                else:
-                    new_cubes.append(cube)
-            
-            self.cubes = new_cubes
+        """Generate Menger sponge cube centers for the current iteration count (cached per level)."""
+        self.centers = menger_sponge_centers(self.iterations, self.size)
+    
+    @property
+    def cube_size(self):
+        """Edge length of every cube at the current level."""
+        return self.size / 3.0 ** self.iterations
+    
+    @property
+    def cubes(self):
+        """The cubes as {'center', 'size', 'level'} dicts (built on demand; prefer centers)."""
+        return [{'center': center, 'size': self.cube_size, 'level': self.iterations} for center in self.centers]
     
     def subdivide_cube(self, cube):
         """Subdivide a cube into 20 smaller cubes (removing 7 middle ones)."""
-        center = cube['center']
-        size = cube['size']
-        new_size = size / 3.0
-        level = cube['level'] + 1
-        
-        subcubes = []
-        
-        # Generate 27 potential subcubes
-        for i in range(3):
-            for j in range(3):
-                for k in range(3):
-                    # Skip the middle cubes that form the holes
-                    middle_count = (i == 1) + (j == 1) + (k == 1)
-                    if middle_count >= 2:  # Skip if 2 or more coordinates are middle
-                        continue
-                    
-                    new_center = center + new_size * np.array([i-1, j-1, k-1])
-                    subcubes.append({
-                        'center': new_center,
-                        'size': new_size,
-                        'level': level
-                    })
-        
-        return subcubes
+        new_size = cube['size'] / 3.0
+        centers = cube['center'] + new_size * MENGER_OFFSETS
+        return [{'center': center, 'size': new_size, 'level': cube['level'] + 1} for center in centers]
     
     def get_vertices(self):
-        """Get all vertices for rendering."""
-        all_vertices = []
-        
-        for cube in self.cubes:
-            center = cube['center']
-            size = cube['size'] / 2.0
-            
-            # 8 vertices of a cube
-            vertices = [
-                center + size * np.array([-1, -1, -1]),
-                center + size * np.array([1, -1, -1]),
-                center + size * np.array([1, 1, -1]),
-                center + size * np.array([-1, 1, -1]),
-                center + size * np.array([-1, -1, 1]),
-                center + size * np.array([1, -1, 1]),
-                center + size * np.array([1, 1, 1]),
-                center + size * np.array([-1, 1, 1])
-            ]
-            
-            all_vertices.extend(vertices)
+        """Get all vertices for rendering: the 8 corners of every cube, as an (n * 8, 3) array."""
+        corners = np.array([
+            [-1, -1, -1], [1, -1, -1], [1, 1, -1], [-1, 1, -1],
+            [-1, -1, 1], [1, -1, 1], [1, 1, 1], [-1, 1, 1],
+        ])
+        half_size = self.cube_size / 2.0
+        return (self.centers[:, np.newaxis, :] + half_size * corners).reshape(-1, 3)
+    
+    def get_mesh(self):
+        """
+        Vertex, normal and index buffers for the sponge's visible faces.
         
-        return np.array(all_vertices)
+        Cubes sit on a 3**level lattice, so a face is hidden exactly when the
+        neighboring lattice cell holds a cube too; only the other faces are
+        emitted, two triangles each. Cached per (size, level).
+        """
+        def build():
+            cells = 3 ** self.iterations
+            half_size = self.cube_size / 2.0
+            lattice = np.rint((self.centers + self.size / 2.0) / self.cube_size - 0.5).astype(np.int64)
+            occupied = np.zeros((cells + 2,) * 3, dtype=bool)
+            occupied[tuple((lattice + 1).T)] = True
+            
+            vertices, normals = [], []
+            corners = ProceduralShape3D.CUBE_CORNERS.reshape(6, 4, 3)
+            face_normals = ProceduralShape3D.CUBE_NORMALS[::4]
+            for corner_block, normal in zip(corners, face_normals):
+                neighbor = lattice + 1 + normal.astype(np.int64)
+                visible = ~occupied[tuple(neighbor.T)]
+                centers = self.centers[visible]
+                vertices.append((centers[:, np.newaxis, :] + half_size * corner_block).reshape(-1, 3))
+                normals.append(np.broadcast_to(normal, (len(centers) * 4, 3)))
+            
+            vertices = np.concatenate(vertices).astype(np.float32)
+            normals = np.concatenate(normals).astype(np.float32)
+            quads = np.arange(len(vertices) // 4, dtype=np.uint32)[:, np.newaxis] * 4
+            indices = (quads + np.array([0, 1, 2, 0, 2, 3], dtype=np.uint32)).ravel()
+            return vertices, normals, indices
+        return cached_fractal_geometry('menger_mesh', float(self.size), int(self.iterations), build)
+
+def _scale_rows(vectors, factors):
+    """Multiply each row of an (n, 3) array by a per-row factor, in place."""
+    # Column-wise loops are much faster than broadcasting against a length-3 inner axis
+    for axis in range(vectors.shape[1]):
+        vectors[:, axis] *= factors
+    return vectors
+
 
 class ParticleSystem:
-    """Advanced particle system for simulating complex phenomena."""
+    """
+    Advanced particle system for simulating complex phenomena.
+    
+    Particles are kept as a structure of arrays: positions, velocities, masses,
+    lives and colors live in arrays preallocated for max_particles, and the
+    first `count` rows are the live particles. Forces are vectorized kernels
+    called once per update with the live position/velocity/mass arrays, and
+    dead particles are compacted out so the live rows stay contiguous for
+    rendering straight from the arrays.
+    """
+    
+    GRAVITY = np.array([0.0, -9.81, 0.0], dtype=np.float32)
     
     def __init__(self, max_particles=10000):
         self.max_particles = max_particles
-        self.particles = []
+        self.count = 0
         self.forces = []
         
+        # Structure-of-arrays particle store
+        self.positions = np.zeros((max_particles, 3), dtype=np.float32)
+        self.velocities = np.zeros((max_particles, 3), dtype=np.float32)
+        self.masses = np.ones(max_particles, dtype=np.float32)
+        self.life = np.zeros(max_particles, dtype=np.float32)
+        self.max_life = np.ones(max_particles, dtype=np.float32)
+        self.base_colors = np.ones((max_particles, 3), dtype=np.float32)
+        self.colors = np.ones((max_particles, 4), dtype=np.float32)  # RGBA, faded by life
+        self.sizes = np.ones(max_particles, dtype=np.float32)
+        self._scratch = np.zeros((max_particles, 3), dtype=np.float32)
+        
+        # Parameters of the built-in force kernels
+        self.attractor_positions = np.zeros((0, 3), dtype=np.float32)
+        self.attractor_strengths = np.zeros(0, dtype=np.float32)
+        self.drag_coefficient = 0.0
+    
+    def __len__(self):
+        return self.count
+    
+    @property
+    def particles(self):
+        """Live particles as a list of dicts (a copy, for inspection only)."""
+        n = self.count
+        return [
+            {
+                'position': self.positions[i].copy(),
+                'velocity': self.velocities[i].copy(),
+                'mass': float(self.masses[i]),
+                'life': float(self.life[i]),
+                'max_life': float(self.max_life[i]),
+                'color': self.colors[i, :3].tolist(),
+                'size': float(self.sizes[i])
+            }
+            for i in range(n)
+        ]
+    
     def add_particle(self, position, velocity, mass=1.0, life=1.0, color=None):
         """Add a particle to the system."""
-        if len(self.particles) < self.max_particles:
-            particle = {
-                'position': np.array(position, dtype=float),
-                'velocity': np.array(velocity, dtype=float),
-                'acceleration': np.array([0.0, 0.0, 0.0]),
-                'mass': mass,
-                'life': life,
-                'max_life': life,
-                'color': color or [1.0, 1.0, 1.0],
-                'size': 1.0
-            }
-            self.particles.append(particle)
+        self.add_particles([position], [velocity], mass, life, [color or [1.0, 1.0, 1.0]])
     
-    def add_force(self, force_func):
-        """Add a force function that affects all particles."""
-        self.forces.append(force_func)
+    def add_particles(self, positions, velocities, masses=1.0, lives=1.0, colors=None):
+        """Add a batch of particles; rows beyond max_particles are dropped. Returns the number added."""
+        positions = np.asarray(positions, dtype=np.float32).reshape(-1, 3)
+        added = min(len(positions), self.max_particles - self.count)
+        if added <= 0:
+            return 0
+        
+        start, end = self.count, self.count + added
+        self.positions[start:end] = positions[:added]
+        self.velocities[start:end] = np.broadcast_to(
+            np.asarray(velocities, dtype=np.float32).reshape(-1, 3), positions.shape)[:added]
+        self.masses[start:end] = np.broadcast_to(np.asarray(masses, dtype=np.float32), len(positions))[:added]
+        lives = np.broadcast_to(np.asarray(lives, dtype=np.float32), len(positions))[:added]
+        self.life[start:end] = lives
+        self.max_life[start:end] = lives
+        if colors is None:
+            colors = [1.0, 1.0, 1.0]
+        self.base_colors[start:end] = np.broadcast_to(
+            np.asarray(colors, dtype=np.float32).reshape(-1, 3), positions.shape)[:added]
+        self.colors[start:end, :3] = self.base_colors[start:end]
+        self.colors[start:end, 3] = 0.8
+        self.sizes[start:end] = 1.0
+        self.count = end
+        return added
+    
+    def clear(self):
+        """Remove every particle."""
+        self.count = 0
     
-    def gravity_force(self, particle):
+    def add_force(self, force_func):
+        """
+        Add a force kernel that affects all particles.
+        
+        A kernel is called as force_func(positions, velocities, masses) with the
+        live (count, 3)/(count,) arrays and returns the (count, 3) forces, or
+        anything broadcastable to that shape. Adding the same kernel twice is a no-op.
+        """
+        if force_func not in self.forces:
+            self.forces.append(force_func)
+    
+    def add_attractor(self, position, strength=1.0):
+        """Add a point attractor and enable the attraction force."""
+        self.attractor_positions = np.vstack([
+            self.attractor_positions, np.asarray(position, dtype=np.float32).reshape(1, 3)])
+        self.attractor_strengths = np.append(self.attractor_strengths, np.float32(strength))
+        self.add_force(self.attraction_force)
+    
+    def set_drag(self, coefficient):
+        """Set the linear drag coefficient and enable the drag force."""
+        self.drag_coefficient = float(coefficient)
+        self.add_force(self.drag_force)
+    
+    def gravity_force(self, positions, velocities, masses):
         """Apply gravity force."""
-        return np.array([0.0, -9.81 * particle['mass'], 0.0])
-    
-    def attraction_force(self, particle, attractor_pos, strength=1.0):
-        """Apply attraction force towards a point."""
-        direction = attractor_pos - particle['position']
-        distance = np.linalg.norm(direction)
-        if distance > 0:
-            direction = direction / distance
-            force_magnitude = strength * particle['mass'] / (distance * distance + 0.1)
-            return direction * force_magnitude
-        return np.array([0.0, 0.0, 0.0])
+        forces = np.zeros_like(positions)
+        forces[:, 1] = masses * self.GRAVITY[1]
+        return forces
+    
+    def attraction_force(self, positions, velocities, masses):
+        """Apply attraction force towards every attractor: strength * m / (d^2 + 0.1)."""
+        forces = np.zeros_like(positions)
+        for attractor, strength in zip(self.attractor_positions, self.attractor_strengths):
+            direction = attractor - positions
+            distance_sq = np.einsum('ij,ij->i', direction, direction)
+            distance = np.sqrt(distance_sq)
+            # Particles sitting exactly on the attractor feel no force
+            scale = np.divide(strength * masses, distance * (distance_sq + 0.1),
+                              out=np.zeros_like(distance), where=distance > 0)
+            forces += _scale_rows(direction, scale)
+        return forces
+    
+    def drag_force(self, positions, velocities, masses):
+        """Apply linear drag opposing the velocity."""
+        return -self.drag_coefficient * velocities
     
     def update(self, dt):
         """Update all particles."""
-        particles_to_remove = []
+        n = self.count
+        if n == 0:
+            return
         
-        for i, particle in enumerate(self.particles):
-            # Reset acceleration
-            particle['acceleration'] = np.array([0.0, 0.0, 0.0])
-            
-            # Apply forces
+        positions = self.positions[:n]
+        velocities = self.velocities[:n]
+        masses = self.masses[:n]
+        
+        # Accumulate forces, then integrate (in place, reusing the scratch buffer)
+        if self.forces:
+            force = self._scratch[:n]
+            force.fill(0.0)
             for force_func in self.forces:
-                force = force_func(particle)
-                particle['acceleration'] += force / particle['mass']
-            
-            # Update velocity and position
-            particle['velocity'] += particle['acceleration'] * dt
-            particle['position'] += particle['velocity'] * dt
-            
-            # Update life
-            particle['life'] -= dt
-            if particle['life'] <= 0:
-                particles_to_remove.append(i)
-            
-            # Update visual properties based on life
-            life_ratio = particle['life'] / particle['max_life']
-            particle['size'] = life_ratio
-            
-            # Fade color
-            particle['color'] = [c * life_ratio for c in particle['color']]
+                force += force_func(positions, velocities, masses)
+            _scale_rows(force, dt / masses)
+            velocities += force
+        step = np.multiply(velocities, np.float32(dt), out=self._scratch[:n])
+        positions += step
+        
+        # Update life and drop dead particles
+        life = self.life[:n]
+        life -= dt
+        alive = life > 0
+        if not alive.all():
+            n = self._compact(alive)
+            life = self.life[:n]
+        
+        # Update visual properties based on life
+        life_ratio = np.divide(life, self.max_life[:n], out=self.sizes[:n])
+        for channel in range(3):
+            np.multiply(self.base_colors[:n, channel], life_ratio, out=self.colors[:n, channel])
+        np.multiply(life_ratio, np.float32(0.8), out=self.colors[:n, 3])
+    
+    def _compact(self, alive):
+        """Move the live rows to the front of every array; returns the new count."""
+        keep = np.flatnonzero(alive)
+        n = len(keep)
+        for array in (self.positions, self.velocities, self.masses, self.life,
+                      self.max_life, self.base_colors, self.colors, self.sizes):
+            array[:n] = array[keep]
+        self.count = n
+        return n
+    
+    def render_batches(self, size_scale=5.0):
+        """
+        Group live particles by point size for drawing.
+        
+        Fixed-function GL has one point size per draw call, so sizes are rounded
+        to whole pixels (at least 1). Yields (point_size, positions, colors) with
+        contiguous float32 arrays ready for glVertexPointer/glColorPointer.
+        """
+        n = self.count
+        if n == 0:
+            return
+        point_sizes = np.clip(np.rint(self.sizes[:n] * size_scale), 1, 255).astype(np.uint8)
+        counts = np.bincount(point_sizes)
+        present = np.flatnonzero(counts)
+        if len(present) == 1:
+            yield float(present[0]), self.positions[:n], self.colors[:n]
+            return
         
-        # Remove dead particles
-        for i in reversed(particles_to_remove):
-            del self.particles[i]
+        # Stable counting sort by size, then hand out contiguous slices
+        order = np.argsort(point_sizes, kind='stable')
+        positions = np.take(self.positions, order, axis=0)
+        colors = np.take(self.colors, order, axis=0)
+        start = 0
+        for point_size in present:
+            end = start + counts[point_size]
+            yield float(point_size), positions[start:end], colors[start:end]
+            start = end
     
     def emit_explosion(self, center, count=100, speed=5.0):
         """Emit particles in an explosion pattern."""
-        for _ in range(count):
-            # Random direction
-            direction = np.random.normal(0, 1, 3)
-            direction = direction / np.linalg.norm(direction)
-            
-            velocity = direction * speed * random.uniform(0.5, 1.5)
-            
-            # Random color (fire-like)
-            hue = random.uniform(0.0, 0.1)  # Red to yellow
-            rgb = colorsys.hsv_to_rgb(hue, 1.0, 1.0)
-            
-            self.add_particle(
-                position=center + np.random.normal(0, 0.1, 3),
-                velocity=velocity,
-                mass=random.uniform(0.5, 2.0),
-                life=random.uniform(1.0, 3.0),
-                color=rgb
-            )
+        # Random directions
+        directions = np.random.normal(0, 1, (count, 3))
+        directions /= np.linalg.norm(directions, axis=1)[:, np.newaxis]
+        velocities = directions * (speed * np.random.uniform(0.5, 1.5, count))[:, np.newaxis]
+        
+        # Random colors (fire-like)
+        hue = np.random.uniform(0.0, 0.1, count)  # Red to yellow
+        colors = _hsv_to_rgb_array(hue, 1.0, 1.0)
+        
+        self.add_particles(
+            np.asarray(center, dtype=float) + np.random.normal(0, 0.1, (count, 3)),
+            velocities,
+            masses=np.random.uniform(0.5, 2.0, count),
+            lives=np.random.uniform(1.0, 3.0, count),
+            colors=colors
+        )
     
     def emit_fountain(self, center, count=50, height=10.0):
         """Emit particles in a fountain pattern."""
-        for _ in range(count):
-            # Upward direction with some spread
-            direction = np.array([
-                random.uniform(-0.3, 0.3),
-                random.uniform(0.8, 1.0),
-                random.uniform(-0.3, 0.3)
-            ])
-            direction = direction / np.linalg.norm(direction)
-            
-            velocity = direction * height * random.uniform(0.7, 1.3)
-            
-            # Blue water-like color
-            hue = random.uniform(0.5, 0.7)
-            rgb = colorsys.hsv_to_rgb(hue, 0.8, 1.0)
-            
-            self.add_particle(
-                position=center,
-                velocity=velocity,
-                mass=1.0,
-                life=random.uniform(2.0, 4.0),
-                color=rgb
-            )
+        # Upward directions with some spread
+        directions = np.column_stack([
+            np.random.uniform(-0.3, 0.3, count),
+            np.random.uniform(0.8, 1.0, count),
+            np.random.uniform(-0.3, 0.3, count)
+        ])
+        directions /= np.linalg.norm(directions, axis=1)[:, np.newaxis]
+        velocities = directions * (height * np.random.uniform(0.7, 1.3, count))[:, np.newaxis]
+        
+        # Blue water-like colors
+        hue = np.random.uniform(0.5, 0.7, count)
+        colors = _hsv_to_rgb_array(hue, 0.8, 1.0)
+        
+        self.add_particles(
+            np.broadcast_to(np.asarray(center, dtype=float), (count, 3)),
+            velocities,
+            masses=1.0,
+            lives=np.random.uniform(2.0, 4.0, count),
+            colors=colors
+        )
 
 class LSystem:
     """L-System for generating complex plant-like structures."""
@@ -1064,73 +1543,117 @@ class LSystem:
     
     def generate(self, iterations):
         """Generate L-system string after n iterations."""
-        current = self.axiom
-        
-        for _ in range(iterations):
-            next_gen = ""
-            for char in current:
-                if char in self.rules:
-                    next_gen += self.rules[char]
-                else:
-                    next_gen += char
-            current = next_gen
-        
-        return current
+        return expand_lsystem(self.axiom, self.rules, iterations)
     
     def interpret(self, lstring):
-        """Interpret L-system string and generate 3D coordinates."""
-        stack = []
-        position = np.array([0.0, 0.0, 0.0])
-        direction = np.array([0.0, 1.0, 0.0])  # Start pointing up
-        right = np.array([1.0, 0.0, 0.0])
-        up = np.array([0.0, 0.0, 1.0])
-        
-        lines = []
-        
-        for char in lstring:
-            if char == 'F':
-                # Draw forward
-                new_position = position + direction * self.length
-                lines.append((position.copy(), new_position.copy()))
-                position = new_position
-            elif char == '+':
-                # Turn left (rotate around up axis)
-                angle_rad = math.radians(self.angle)
-                cos_a, sin_a = math.cos(angle_rad), math.sin(angle_rad)
-                new_direction = cos_a * direction + sin_a * right
-                new_right = -sin_a * direction + cos_a * right
-                direction = new_direction / np.linalg.norm(new_direction)
-                right = new_right / np.linalg.norm(new_right)
-            elif char == '-':
-                # Turn right
-                angle_rad = math.radians(-self.angle)
-                cos_a, sin_a = math.cos(angle_rad), math.sin(angle_rad)
-                new_direction = cos_a * direction + sin_a * right
-                new_right = -sin_a * direction + cos_a * right
-                direction = new_direction / np.linalg.norm(new_direction)
-                right = new_right / np.linalg.norm(new_right)
-            elif char == '[':
-                # Push state
-                stack.append((position.copy(), direction.copy(), right.copy(), up.copy()))
-            elif char == ']':
-                # Pop state
-                if stack:
-                    position, direction, right, up = stack.pop()
-        
-        return lines
+        """Interpret L-system string and generate 3D coordinates as an (n, 2, 3) array of (start, end) segments."""
+        return cached_fractal_geometry('turtle', (lstring, float(self.angle), float(self.length)), 0,
+                                       lambda: turtle_segments(lstring, self.angle, self.length))
+
+def parse_life_rule(rule):
+    """
+    Parse a Life-like rule string into (birth, survive) frozensets of neighbor counts.
+    
+    Accepts B/S notation ("B3/S23", "b36/s23") and the legacy S/B form
+    ("23/3"). Raises ValueError for anything else.
+    """
+    text = str(rule).strip().upper().replace(' ', '')
+    match = re.fullmatch(r'B([0-8]*)/?S([0-8]*)', text) or re.fullmatch(r'S([0-8]*)/?B([0-8]*)', text)
+    if match:
+        if text.startswith('B'):
+            birth, survive = match.group(1), match.group(2)
+        else:
+            survive, birth = match.group(1), match.group(2)
+    else:
+        match = re.fullmatch(r'([0-8]*)/([0-8]*)', text)
+        if not match:
+            raise ValueError(f"Invalid cellular automaton rule '{rule}' (expected e.g. 'B3/S23')")
+        survive, birth = match.group(1), match.group(2)
+    return frozenset(int(c) for c in birth), frozenset(int(c) for c in survive)
+
 
 class CellularAutomaton:
-    """Cellular automaton system including Conway's Game of Life."""
+    """
+    Cellular automaton system including Conway's Game of Life.
+    
+    Supports any Life-like B/S rule (Conway's B3/S23 by default). Each step
+    sums the eight neighbors of every cell at once from a padded copy of the
+    grid and looks the next state up in a rule table. Boundaries are
+    'clamped' (cells outside the grid are dead), 'toroidal' (edges wrap), or
+    'open', where the grid is a window onto an unbounded plane advanced by
+    HashLifeUniverse.
+    """
+    
+    BOUNDARIES = ('clamped', 'toroidal', 'open')
     
-    def __init__(self, width, height):
+    def __init__(self, width, height, rule='B3/S23', boundary='clamped'):
         self.width = width
         self.height = height
-        self.grid = np.zeros((height, width), dtype=int)
-        self.next_grid = np.zeros((height, width), dtype=int)
-        
+        self.grid = np.zeros((height, width), dtype=np.uint8)
+        self.next_grid = np.zeros((height, width), dtype=np.uint8)
+        self.generation = 0
+        self.set_rule(rule)
+        self.set_boundary(boundary)
+        
+        # Live/dead colors as packed RGBA words (bright green on black)
+        self.alive_color = (0, 255, 0, 255)
+        self.dead_color = (0, 0, 0, 255)
+        self._rgba = None
+        self._allocate_buffers()
+    
+    def _allocate_buffers(self):
+        """(Re)allocate the padded neighbor buffer and RGBA output for the current size."""
+        self._padded = np.zeros((self.height + 2, self.width + 2), dtype=np.uint8)
+        self._rgba = np.zeros((self.height, self.width, 4), dtype=np.uint8)
+        self._hashlife = None
+    
+    def resize(self, width, height):
+        """Resize the grid, clearing every cell."""
+        self.width = width
+        self.height = height
+        self.grid = np.zeros((height, width), dtype=np.uint8)
+        self.next_grid = np.zeros((height, width), dtype=np.uint8)
+        self.generation = 0
+        self._allocate_buffers()
+    
+    def set_rule(self, rule):
+        """Set the B/S rule, e.g. 'B3/S23' (Life), 'B36/S23' (HighLife), 'B2/S' (Seeds)."""
+        birth, survive = parse_life_rule(rule)
+        if getattr(self, 'boundary', None) == 'open' and 0 in birth:
+            raise ValueError("Rules with B0 cannot run on an unbounded plane")
+        self.rule = f"B{''.join(map(str, sorted(birth)))}/S{''.join(map(str, sorted(survive)))}"
+        self.birth = birth
+        self.survive = survive
+        # Next state indexed by cell * 9 + live neighbor count
+        table = np.zeros(18, dtype=np.uint8)
+        table[list(birth)] = 1
+        table[[9 + n for n in survive]] = 1
+        self._rule_table = table
+        self._hashlife = None
+    
+    def set_boundary(self, boundary):
+        """Set the edge handling: 'clamped', 'toroidal' or 'open' (unbounded, Hashlife)."""
+        if boundary not in self.BOUNDARIES:
+            raise ValueError(f"Unknown boundary '{boundary}', expected one of {self.BOUNDARIES}")
+        if boundary == 'open' and 0 in self.birth:
+            raise ValueError("Rules with B0 cannot run on an unbounded plane")
+        self.boundary = boundary
+        self._hashlife = None
+    
     def set_random_state(self, density=0.3):
         """Set random initial state."""
-        self.grid = (np.random.random((self.height, self.width)) < density).astype(int)
+        self.grid = (np.random.random((self.height, self.width)) < density).astype(np.uint8)
+        self._hashlife = None
+    
+    def set_pattern(self, x, y, pattern):
+        """Stamp a 2D 0/1 pattern with its top-left corner at (x, y), clipped to the grid."""
+        pattern = np.asarray(pattern, dtype=np.uint8)
+        x0, y0 = max(x, 0), max(y, 0)
+        x1 = min(x + pattern.shape[1], self.width)
+        y1 = min(y + pattern.shape[0], self.height)
+        if x1 > x0 and y1 > y0:
+            self.grid[y0:y1, x0:x1] = pattern[y0 - y:y1 - y, x0 - x:x1 - x]
+        self._hashlife = None
     
     def set_glider(self, x, y):
         """Set a glider pattern at position (x, y)."""
@@ -1139,11 +1662,7 @@ class CellularAutomaton:
             [0, 0, 1],
             [1, 1, 1]
         ]
-        
-        for dy, row in enumerate(pattern):
-            for dx, cell in enumerate(row):
-                if 0 <= y + dy < self.height and 0 <= x + dx < self.width:
-                    self.grid[y + dy, x + dx] = cell
+        self.set_pattern(x, y, pattern)
     
     def set_gosper_gun(self, x, y):
         """Set Gosper glider gun pattern."""
@@ -1158,59 +1677,285 @@ class CellularAutomaton:
             [0,0,0,0,0,0,0,0,0,0,0,1,0,0,0,1,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0],
             [0,0,0,0,0,0,0,0,0,0,0,0,1,1,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0]
         ]
-        
-        for dy, row in enumerate(pattern):
-            for dx, cell in enumerate(row):
-                if 0 <= y + dy < self.height and 0 <= x + dx < self.width:
-                    self.grid[y + dy, x + dx] = cell
+        self.set_pattern(x, y, pattern)
     
     def count_neighbors(self, x, y):
-        """Count living neighbors for Conway's Game of Life."""
+        """Count living neighbors of one cell, honoring the boundary mode."""
         count = 0
         for dy in [-1, 0, 1]:
             for dx in [-1, 0, 1]:
                 if dx == 0 and dy == 0:
                     continue
                 nx, ny = x + dx, y + dy
-                if 0 <= nx < self.width and 0 <= ny < self.height:
+                if self.boundary == 'toroidal':
+                    count += self.grid[ny % self.height, nx % self.width]
+                elif 0 <= nx < self.width and 0 <= ny < self.height:
                     count += self.grid[ny, nx]
-        return count
+        return int(count)
+    
+    def neighbor_counts(self):
+        """Live neighbor count of every cell as a uint8 array (box sum minus the cell)."""
+        padded = self._padded
+        grid = self.grid
+        padded[1:-1, 1:-1] = grid
+        if self.boundary == 'toroidal':
+            padded[0, 1:-1] = grid[-1]
+            padded[-1, 1:-1] = grid[0]
+            padded[:, 0] = padded[:, -2]
+            padded[:, -1] = padded[:, 1]
+        # Separable 3x3 box sum: vertical triples, then horizontal triples
+        rows = padded[:-2] + padded[1:-1]
+        rows += padded[2:]
+        counts = rows[:, :-2] + rows[:, 1:-1]
+        counts += rows[:, 2:]
+        counts -= grid
+        return counts
+    
+    def step(self, generations=1):
+        """Advance the automaton by a number of generations."""
+        if self.boundary == 'open':
+            self._step_hashlife(generations)
+            return
+        for _ in range(generations):
+            index = self.neighbor_counts()
+            index += self.grid * np.uint8(9)
+            np.take(self._rule_table, index, out=self.next_grid)
+            # Swap grids
+            self.grid, self.next_grid = self.next_grid, self.grid
+        self.generation += generations
     
     def update_conway(self):
-        """Update using Conway's Game of Life rules."""
-        for y in range(self.height):
-            for x in range(self.width):
-                neighbors = self.count_neighbors(x, y)
-                current = self.grid[y, x]
-                
-                if current == 1:  # Alive
-                    if neighbors < 2 or neighbors > 3:
-                        self.next_grid[y, x] = 0  # Dies
-                    else:
-                        self.next_grid[y, x] = 1  # Survives
-                else:  # Dead
-                    if neighbors == 3:
-                        self.next_grid[y, x] = 1  # Born
-                    else:
-                        self.next_grid[y, x] = 0  # Stays dead
+        """Advance one generation using the automaton's rule (Conway's B3/S23 by default)."""
+        self.step(1)
+    
+    def _step_hashlife(self, generations):
+        """Advance the unbounded universe and copy the visible window back into the grid."""
+        origin_x, origin_y = -(self.width // 2), -(self.height // 2)
+        if self._hashlife is None or self._hashlife_grid is not self.grid:
+            # (Re)build the universe from the grid when it was edited outside the engine
+            self._hashlife = HashLifeUniverse(self.rule)
+            self._hashlife.set_cells(self.grid, origin_x, origin_y)
+        self._hashlife.advance(generations)
+        self.grid = self._hashlife.get_cells(origin_x, origin_y, self.width, self.height)
+        self._hashlife_grid = self.grid
+        self.generation += generations
+    
+    def get_rgba_buffer(self):
+        """
+        Get the grid as a contiguous (height, width, 4) uint8 RGBA array.
         
-        # Swap grids
-        self.grid, self.next_grid = self.next_grid, self.grid
+        The array is reused between calls (filled in place), so it can be
+        passed straight to glTexSubImage2D without another copy.
+        """
+        palette = np.array([self.dead_color, self.alive_color], dtype=np.uint8).view(np.uint32).ravel()
+        np.take(palette, self.grid, out=self._rgba.view(np.uint32).reshape(self.height, self.width))
+        return self._rgba
     
     def get_colored_grid(self):
         """Get colored representation of the grid."""
-        colored = np.zeros((self.height, self.width, 3), dtype=np.uint8)
-        
-        for y in range(self.height):
-            for x in range(self.width):
-                if self.grid[y, x] == 1:
-                    # Living cells - bright green
-                    colored[y, x] = [0, 255, 0]
-                else:
-                    # Dead cells - black
-                    colored[y, x] = [0, 0, 0]
+        # Living cells - bright green, dead cells - black
+        return self.get_rgba_buffer()[:, :, :3].copy()
+
+
+class _HashLifeNode:
+    """Canonical quadtree node: level k covers 2^k x 2^k cells (a=nw, b=ne, c=sw, d=se)."""
+    
+    __slots__ = ('k', 'a', 'b', 'c', 'd', 'n')
+    
+    def __init__(self, k, a, b, c, d, n):
+        self.k = k
+        self.a = a
+        self.b = b
+        self.c = c
+        self.d = d
+        self.n = n
+
+
+class HashLifeUniverse:
+    """
+    Unbounded Life-like universe stored as a memoized quadtree (Hashlife).
+    
+    Identical subtrees are shared through an interning table and the future of
+    every subtree is cached, so large sparse or repetitive patterns can be
+    advanced by huge numbers of generations at once. The root is centred on
+    the origin: a level-k root covers cells [-2^(k-1), 2^(k-1)) on both axes,
+    with y growing downwards like grid rows.
+    """
+    
+    def __init__(self, rule='B3/S23', max_nodes=2000000):
+        self.birth, self.survive = parse_life_rule(rule)
+        if 0 in self.birth:
+            raise ValueError("Hashlife cannot run rules with B0")
+        self.max_nodes = max_nodes
+        self.generation = 0
+        self.off = _HashLifeNode(0, None, None, None, None, 0)
+        self.on = _HashLifeNode(0, None, None, None, None, 1)
+        self._nodes = {}
+        self._successors = {}
+        self._empty = [self.off]
+        self._rasters = {}
+        self.root = self.empty(3)
+    
+    @property
+    def population(self):
+        """Number of live cells."""
+        return self.root.n
+    
+    def join(self, a, b, c, d):
+        """Get the canonical node with the given quadrants."""
+        key = (a, b, c, d)
+        node = self._nodes.get(key)
+        if node is None:
+            node = _HashLifeNode(a.k + 1, a, b, c, d, a.n + b.n + c.n + d.n)
+            self._nodes[key] = node
+        return node
+    
+    def empty(self, k):
+        """Get the empty node of level k."""
+        while len(self._empty) <= k:
+            z = self._empty[-1]
+            self._empty.append(self.join(z, z, z, z))
+        return self._empty[k]
+    
+    def _centre(self, m):
+        """Embed m in the middle of an empty node one level up."""
+        z = self.empty(m.k - 1)
+        return self.join(self.join(z, z, z, m.a), self.join(z, z, m.b, z),
+                         self.join(z, m.c, z, z), self.join(m.d, z, z, z))
+    
+    def _inner(self, m):
+        """Get the centre quadrant-sized subnode of m (one level down)."""
+        return self.join(m.a.d, m.b.c, m.c.b, m.d.a)
+    
+    def _life_4x4(self, m):
+        """Advance the centre 2x2 of a level-2 node by one generation."""
+        cells = [[0] * 4 for _ in range(4)]
+        for qy, qx, quad in ((0, 0, m.a), (0, 2, m.b), (2, 0, m.c), (2, 2, m.d)):
+            cells[qy][qx] = quad.a.n
+            cells[qy][qx + 1] = quad.b.n
+            cells[qy + 1][qx] = quad.c.n
+            cells[qy + 1][qx + 1] = quad.d.n
+        
+        def next_cell(y, x):
+            count = sum(cells[y + dy][x + dx] for dy in (-1, 0, 1) for dx in (-1, 0, 1)) - cells[y][x]
+            alive = count in self.survive if cells[y][x] else count in self.birth
+            return self.on if alive else self.off
+        
+        return self.join(next_cell(1, 1), next_cell(1, 2), next_cell(2, 1), next_cell(2, 2))
+    
+    def _successor(self, m, j):
+        """Centre of m (level k-1) advanced by 2^j generations, j <= k-2."""
+        if m.n == 0:
+            return self.empty(m.k - 1)
+        key = (m, j)
+        result = self._successors.get(key)
+        if result is not None:
+            return result
+        
+        if m.k == 2:
+            result = self._life_4x4(m)
+        else:
+            sub = min(j, m.k - 3)
+            join, succ = self.join, self._successor
+            c1 = succ(join(m.a.a, m.a.b, m.a.c, m.a.d), sub)
+            c2 = succ(join(m.a.b, m.b.a, m.a.d, m.b.c), sub)
+            c3 = succ(join(m.b.a, m.b.b, m.b.c, m.b.d), sub)
+            c4 = succ(join(m.a.c, m.a.d, m.c.a, m.c.b), sub)
+            c5 = succ(join(m.a.d, m.b.c, m.c.b, m.d.a), sub)
+            c6 = succ(join(m.b.c, m.b.d, m.d.a, m.d.b), sub)
+            c7 = succ(join(m.c.a, m.c.b, m.c.c, m.c.d), sub)
+            c8 = succ(join(m.c.b, m.d.a, m.c.d, m.d.c), sub)
+            c9 = succ(join(m.d.a, m.d.b, m.d.c, m.d.d), sub)
+            if j < m.k - 2:
+                # Already advanced far enough - just reassemble the centre
+                result = join(join(c1.d, c2.c, c4.b, c5.a), join(c2.d, c3.c, c5.b, c6.a),
+                              join(c4.d, c5.c, c7.b, c8.a), join(c5.d, c6.c, c8.b, c9.a))
+            else:
+                result = join(succ(join(c1, c2, c4, c5), sub), succ(join(c2, c3, c5, c6), sub),
+                              succ(join(c4, c5, c7, c8), sub), succ(join(c5, c6, c8, c9), sub))
         
-        return colored
+        self._successors[key] = result
+        return result
+    
+    def advance(self, generations=1):
+        """Advance the universe by any number of generations."""
+        while generations > 0:
+            j = generations.bit_length() - 1
+            # Pad until the pattern sits in the inner quarter with room to grow 2^j cells
+            root = self.root
+            while root.k < j + 3 or self._inner(self._inner(root)).n != root.n:
+                root = self._centre(root)
+            self.root = self._successor(root, j)
+            generations -= 1 << j
+            self.generation += 1 << j
+            if len(self._nodes) > self.max_nodes:
+                # Drop the caches; existing nodes stay valid, only sharing is lost
+                self._nodes.clear()
+                self._successors.clear()
+                self._rasters.clear()
+                self._empty = [self.off]
+    
+    def set_cells(self, grid, x0=0, y0=0):
+        """Replace the universe with a 0/1 array whose top-left cell is at (x0, y0)."""
+        grid = np.asarray(grid).astype(bool)
+        height, width = grid.shape
+        extent = max(abs(x0), abs(y0), abs(x0 + width), abs(y0 + height), 4)
+        k = max(3, int(math.ceil(math.log2(extent))) + 1)
+        size = 1 << k
+        half = size >> 1
+        
+        # Place the grid in a power-of-two canvas centred on the origin
+        canvas = np.zeros((size, size), dtype=np.uint8)
+        canvas[y0 + half:y0 + half + height, x0 + half:x0 + half + width] = grid
+        
+        # Level 1 nodes straight from 2x2 blocks, then join 2x2 blocks of nodes upwards
+        codes = (canvas[0::2, 0::2] << 3) | (canvas[0::2, 1::2] << 2) | (canvas[1::2, 0::2] << 1) | canvas[1::2, 1::2]
+        leaves = (self.off, self.on)
+        level1 = [self.join(leaves[(code >> 3) & 1], leaves[(code >> 2) & 1], leaves[(code >> 1) & 1], leaves[code & 1])
+                  for code in range(16)]
+        nodes = [[level1[code] for code in row] for row in codes.tolist()]
+        while len(nodes) > 1:
+            nodes = [[self.join(nodes[r][c], nodes[r][c + 1], nodes[r + 1][c], nodes[r + 1][c + 1])
+                      for c in range(0, len(nodes), 2)] for r in range(0, len(nodes), 2)]
+        self.root = nodes[0][0]
+        self.generation = 0
+    
+    def get_cells(self, x0, y0, width, height):
+        """Rasterize the window [x0, x0+width) x [y0, y0+height) into a uint8 array."""
+        out = np.zeros((height, width), dtype=np.uint8)
+        half = 1 << (self.root.k - 1)
+        self._paint(self.root, -half, -half, out, x0, y0)
+        return out
+    
+    def _paint(self, node, ox, oy, out, x0, y0):
+        """Copy the live cells of node (top-left at ox, oy) that fall inside the window."""
+        size = 1 << node.k
+        height, width = out.shape
+        if (node.n == 0 or ox >= x0 + width or oy >= y0 + height
+                or ox + size <= x0 or oy + size <= y0):
+            return
+        if node.k <= 3:
+            block = self._raster(node)
+            sx0, sy0 = max(ox, x0), max(oy, y0)
+            sx1, sy1 = min(ox + size, x0 + width), min(oy + size, y0 + height)
+            out[sy0 - y0:sy1 - y0, sx0 - x0:sx1 - x0] = block[sy0 - oy:sy1 - oy, sx0 - ox:sx1 - ox]
+            return
+        half = size >> 1
+        self._paint(node.a, ox, oy, out, x0, y0)
+        self._paint(node.b, ox + half, oy, out, x0, y0)
+        self._paint(node.c, ox, oy + half, out, x0, y0)
+        self._paint(node.d, ox + half, oy + half, out, x0, y0)
+    
+    def _raster(self, node):
+        """Dense array of a small node, memoized per node."""
+        if node.k == 0:
+            return np.array([[node.n]], dtype=np.uint8)
+        block = self._rasters.get(node)
+        if block is None:
+            block = np.block([[self._raster(node.a), self._raster(node.b)],
+                              [self._raster(node.c), self._raster(node.d)]])
+            self._rasters[node] = block
+        return block
 
 
 class ProceduralGenerator:
@@ -1226,39 +1971,37 @@ class ProceduralGenerator:
     
     def generate_terrain_heightmap(self, width, height, octaves=6, persistence=0.5, scale=0.01):
         """Generate terrain heightmap using multi-octave Perlin noise."""
+        ys, xs = np.mgrid[0:height, 0:width].astype(np.float64)
         heightmap = np.zeros((height, width))
         
-        for y in range(height):
-            for x in range(width):
-                amplitude = 1.0
-                frequency = scale
-                noise_value = 0.0
-                
-                for octave in range(octaves):
-                    # Simple noise approximation (replace with proper Perlin if available)
-                    sample_x = x * frequency
-                    sample_y = y * frequency
-                    
-                    # Pseudo-random noise based on coordinates
-                    noise = self._pseudo_noise(sample_x, sample_y)
-                    noise_value += noise * amplitude
-                    
-                    amplitude *= persistence
-                    frequency *= 2.0
-                
-                heightmap[y, x] = noise_value
+        amplitude = 1.0
+        frequency = scale
+        for octave in range(octaves):
+            # Simple noise approximation (replace with proper Perlin if available)
+            heightmap += self._pseudo_noise(xs * frequency, ys * frequency) * amplitude
+            amplitude *= persistence
+            frequency *= 2.0
         
         # Normalize to 0-1 range
         heightmap = (heightmap - heightmap.min()) / (heightmap.max() - heightmap.min())
         return heightmap
     
     def _pseudo_noise(self, x, y):
-        """Simple pseudo-noise function."""
-        # Hash-based noise approximation
-        n = int(x * 57 + y * 113)
-        n = (n << 13) ^ n
-        n = (n * (n * n * 15731 + 789221) + 1376312589) & 0x7fffffff
-        return 1.0 - (n / 1073741824.0)
+        """Simple pseudo-noise function; x and y may be scalars or arrays."""
+        # Hash-based noise approximation. Only the low 31 bits survive the final
+        # mask, so wrapping uint32 arithmetic matches the exact integer result.
+        n = np.trunc(np.asarray(x, dtype=np.float64) * 57 + np.asarray(y, dtype=np.float64) * 113)
+        n = np.asarray(n.astype(np.int64).astype(np.uint32))
+        with np.errstate(over='ignore'):
+            n ^= n << np.uint32(13)
+            hashed = n * np.uint32(15731)
+            hashed *= n
+            hashed += np.uint32(789221)
+            hashed *= n
+            hashed += np.uint32(1376312589)
+        hashed &= np.uint32(0x7fffffff)
+        noise = 1.0 - hashed / 1073741824.0
+        return float(noise) if noise.ndim == 0 else noise
     
     def generate_maze(self, width, height):
         """Generate maze using recursive backtracking algorithm."""
@@ -1315,27 +2058,25 @@ class ProceduralGenerator:
             center_y = np.random.randint(height // 4, 3 * height // 4)
             district_centers.append((center_x, center_y))
         
-        # Assign each pixel to nearest district
-        for y in range(height):
-            for x in range(width):
-                min_dist = float('inf')
-                closest_district = 0
-                
-                for i, (cx, cy) in enumerate(district_centers):
-                    dist = np.sqrt((x - cx) ** 2 + (y - cy) ** 2)
-                    if dist < min_dist:
-                        min_dist = dist
-                        closest_district = i
-                
-                # Color districts differently
-                if closest_district == 0:
-                    city[y, x] = [100, 100, 150]  # Residential (blue-gray)
-                elif closest_district == 1:
-                    city[y, x] = [150, 100, 100]  # Commercial (red-gray)
-                elif closest_district == 2:
-                    city[y, x] = [100, 150, 100]  # Industrial (green-gray)
-                else:
-                    city[y, x] = [150, 150, 100]  # Mixed (yellow-gray)
+        # Assign each pixel to nearest district (first one wins ties)
+        centers = np.array(district_centers, dtype=np.float64).reshape(-1, 2)
+        ys, xs = np.ogrid[0:height, 0:width]
+        closest = np.zeros((height, width), dtype=np.intp)
+        min_dist = np.full((height, width), np.inf)
+        for i, (cx, cy) in enumerate(centers):
+            dist = np.sqrt((xs - cx) ** 2 + (ys - cy) ** 2)
+            closer = dist < min_dist
+            closest[closer] = i
+            min_dist[closer] = dist[closer]
+        
+        # Color districts differently
+        district_colors = np.array([
+            [100, 100, 150],  # Residential (blue-gray)
+            [150, 100, 100],  # Commercial (red-gray)
+            [100, 150, 100],  # Industrial (green-gray)
+            [150, 150, 100],  # Mixed (yellow-gray)
+        ], dtype=np.uint8)
+        city[:] = district_colors[np.minimum(closest, 3)]
         
         # Add main roads
         # Horizontal roads
@@ -1348,16 +2089,31 @@ class ProceduralGenerator:
             road_x = i * width // 4
             city[:, road_x-2:road_x+3] = [80, 80, 80]  # Dark gray roads
         
-        # Add buildings as darker squares
-        for _ in range(width * height // 200):  # Building density
-            bx = np.random.randint(5, width - 10)
-            by = np.random.randint(5, height - 10)
-            bw = np.random.randint(3, 8)
-            bh = np.random.randint(3, 8)
-            
-            # Don't place buildings on roads
-            if not np.any(city[by:by+bh, bx:bx+bw] == [80, 80, 80]):
-                city[by:by+bh, bx:bx+bw] = city[by:by+bh, bx:bx+bw] * 0.6  # Darker buildings
+        # Add buildings as darker squares. All building rectangles are drawn in
+        # one call (same random stream as drawing them one at a time).
+        building_count = width * height // 200  # Building density
+        if building_count > 0:
+            buildings = np.random.randint([5, 5, 3, 3], [width - 10, height - 10, 8, 8], size=(building_count, 4))
+            bx, by, bw, bh = buildings.T
+            
+            # Don't place buildings on roads: summed-area table of pixels with any road-colored channel
+            road = np.any(city == 80, axis=2)
+            table = np.zeros((height + 1, width + 1), dtype=np.int64)
+            table[1:, 1:] = road.cumsum(axis=0).cumsum(axis=1)
+            road_cells = table[by + bh, bx + bw] - table[by, bx + bw] - table[by + bh, bx] + table[by, bx]
+            keep = road_cells == 0
+            bx, by, bw, bh = bx[keep], by[keep], bw[keep], bh[keep]
+            
+            # Count how many buildings cover each pixel, then darken that many times
+            cover = np.zeros((height + 1, width + 1), dtype=np.int32)
+            np.add.at(cover, (by, bx), 1)
+            np.add.at(cover, (by, bx + bw), -1)
+            np.add.at(cover, (by + bh, bx), -1)
+            np.add.at(cover, (by + bh, bx + bw), 1)
+            cover = cover.cumsum(axis=0).cumsum(axis=1)[:height, :width]
+            for level in range(1, int(cover.max(initial=0)) + 1):
+                darker = cover >= level
+                city[darker] = city[darker] * 0.6  # Darker buildings
         
         return city
     
@@ -1434,14 +2190,11 @@ class ProceduralGenerator:
                 room_x = np.random.randint(1, width - room_width - 1)
                 room_y = np.random.randint(1, height - room_height - 1)
                 
-                # Check if room overlaps with existing rooms
-                overlap = False
-                for existing_room in rooms:
-                    ex, ey, ew, eh = existing_room
-                    if (room_x < ex + ew + 2 and room_x + room_width + 2 > ex and
-                        room_y < ey + eh + 2 and room_y + room_height + 2 > ey):
-                        overlap = True
-                        break
+                # Check if room overlaps with existing rooms (keeping a 2 cell gap)
+                placed = np.array(rooms, dtype=int).reshape(-1, 4)
+                ex, ey, ew, eh = placed.T
+                overlap = np.any((room_x < ex + ew + 2) & (room_x + room_width + 2 > ex) &
+                                 (room_y < ey + eh + 2) & (room_y + room_height + 2 > ey))
                 
                 if not overlap:
                     # Carve out room
@@ -1451,37 +2204,20 @@ class ProceduralGenerator:
                 
                 attempts += 1
         
-        # Connect rooms with corridors
-        for i in range(len(rooms) - 1):
-            room1 = rooms[i]
-            room2 = rooms[i + 1]
-            
-            # Get room centers
+        # Connect rooms with L-shaped corridors between consecutive room centers
+        for room1, room2 in zip(rooms, rooms[1:]):
             x1 = room1[0] + room1[2] // 2
             y1 = room1[1] + room1[3] // 2
             x2 = room2[0] + room2[2] // 2
             y2 = room2[1] + room2[3] // 2
             
-            # Create L-shaped corridor
             # Horizontal segment
-            if x1 < x2:
-                for x in range(x1, x2 + 1):
-                    if 0 <= x < width and 0 <= y1 < height:
-                        dungeon[y1, x] = 0
-            else:
-                for x in range(x2, x1 + 1):
-                    if 0 <= x < width and 0 <= y1 < height:
-                        dungeon[y1, x] = 0
+            if 0 <= y1 < height:
+                dungeon[y1, max(min(x1, x2), 0):max(x1, x2) + 1] = 0
             
             # Vertical segment
-            if y1 < y2:
-                for y in range(y1, y2 + 1):
-                    if 0 <= x2 < width and 0 <= y < height:
-                        dungeon[y, x2] = 0
-            else:
-                for y in range(y2, y1 + 1):
-                    if 0 <= x2 < width and 0 <= y < height:
-                        dungeon[y, x2] = 0
+            if 0 <= x2 < width:
+                dungeon[max(min(y1, y2), 0):max(y1, y2) + 1, x2] = 0
         
         return dungeon
 
@@ -1503,6 +2239,10 @@ class Shape(ABC):
         """Render the shape using OpenGL."""
         pass
     
+    def release(self):
+        """Free GPU resources held by the shape; called when it leaves the scene."""
+        pass
+    
     def apply_transformation(self):
         """Apply position, rotation, and scale transformations."""
         gl.glPushMatrix()
@@ -2084,6 +2824,260 @@ class CylinderShape(Shape):
         self.restore_transformation()
 
 
+# ==================== RETAINED GEOMETRY ====================
+
+def _buffer_offset(offset=0):
+    """Pointer argument for gl*Pointer/glDrawElements when reading from a bound buffer object."""
+    return ctypes.c_void_p(offset)
+
+
+class RetainedGeometry:
+    """
+    Vertex data uploaded to the GPU once and drawn with a single call.
+    
+    Vertices, colors, normals and texture coordinates are packed into float32
+    arrays and indices into uint32. The first draw uploads them to vertex
+    buffer objects; where buffer objects are unavailable it records a display
+    list instead, and if that fails too it draws from client-side arrays.
+    set_arrays() replaces the data and the next draw uploads it again.
+    
+    Without a color array the current glColor applies, so callers can reuse
+    one geometry in several colors.
+    """
+    
+    use_vbo = True  # Cleared for the whole process once buffer objects fail
+    
+    _ATTRIBUTES = (
+        ('vertices', gl.GL_VERTEX_ARRAY),
+        ('colors', gl.GL_COLOR_ARRAY),
+        ('normals', gl.GL_NORMAL_ARRAY),
+        ('texture_coords', gl.GL_TEXTURE_COORD_ARRAY),
+    )
+    
+    def __init__(self, mode, vertices=None, colors=None, normals=None, texture_coords=None, indices=None):
+        self.mode = mode
+        self._buffers = {}
+        self._display_list = None
+        self._uploaded = False
+        self.set_arrays(vertices, colors, normals, texture_coords, indices)
+    
+    def set_arrays(self, vertices=None, colors=None, normals=None, texture_coords=None, indices=None, mode=None):
+        """Replace the geometry; GPU copies are rebuilt on the next draw."""
+        self.release()
+        if mode is not None:
+            self.mode = mode
+        self.vertices = self._pack(vertices, 3)
+        count = len(self.vertices)
+        self.colors = self._pack(colors, None, count)
+        self.normals = self._pack(normals, 3, count)
+        self.texture_coords = self._pack(texture_coords, 2, count)
+        self.indices = None
+        if indices is not None and len(indices) > 0:
+            self.indices = np.ascontiguousarray(np.asarray(indices).ravel(), dtype=np.uint32)
+    
+    @staticmethod
+    def _pack(array, components, count=None):
+        """Contiguous float32 (n, components) array, or None when there is no data."""
+        if array is None or len(array) == 0:
+            return None if count is not None else np.zeros((0, components), dtype=np.float32)
+        array = np.asarray(array, dtype=np.float32)
+        if components is None:
+            components = array.shape[-1] if array.ndim > 1 else 3
+        array = array.reshape(-1, components)
+        if count is not None and len(array) != count:
+            if len(array) > count:
+                array = array[:count]
+            else:
+                # Vertices past the end of a short attribute list keep the last value
+                array = np.vstack([array, np.repeat(array[-1:], count - len(array), axis=0)])
+        return np.ascontiguousarray(array)
+    
+    @property
+    def vertex_count(self):
+        return len(self.vertices)
+    
+    @property
+    def element_count(self):
+        return len(self.indices) if self.indices is not None else len(self.vertices)
+    
+    def draw(self):
+        """Draw the geometry with one draw call."""
+        if self.element_count == 0:
+            return
+        if not self._uploaded:
+            self._upload()
+        if self._display_list is not None:
+            gl.glCallList(self._display_list)
+        else:
+            self._draw_arrays(bool(self._buffers))
+    
+    def _upload(self):
+        """Copy the arrays into buffer objects, or compile a display list as fallback."""
+        self._uploaded = True
+        if RetainedGeometry.use_vbo:
+            try:
+                for name, _ in self._ATTRIBUTES:
+                    self._upload_buffer(name, gl.GL_ARRAY_BUFFER, getattr(self, name))
+                self._upload_buffer('indices', gl.GL_ELEMENT_ARRAY_BUFFER, self.indices)
+                return
+            except Exception as e:
+                print(f"DEBUG: Vertex buffer upload failed, using display lists: {e}")
+                RetainedGeometry.use_vbo = False
+                self._delete_buffers()
+        
+        try:
+            self._display_list = gl.glGenLists(1)
+            gl.glNewList(self._display_list, gl.GL_COMPILE)
+            self._draw_arrays(False)
+            gl.glEndList()
+        except Exception as e:
+            print(f"DEBUG: Display list compilation failed, drawing client arrays: {e}")
+            self._display_list = None
+    
+    def _upload_buffer(self, name, target, array):
+        """Create one static buffer object holding array."""
+        if array is None:
+            return
+        buffer_id = gl.glGenBuffers(1)
+        self._buffers[name] = buffer_id
+        gl.glBindBuffer(target, buffer_id)
+        gl.glBufferData(target, array.nbytes, array, gl.GL_STATIC_DRAW)
+        gl.glBindBuffer(target, 0)
+    
+    def _draw_arrays(self, use_buffers):
+        """Issue the draw call from buffer objects or client-side arrays."""
+        enabled = []
+        try:
+            for name, client_state in self._ATTRIBUTES:
+                array = getattr(self, name)
+                if array is None:
+                    continue
+                if use_buffers:
+                    gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self._buffers[name])
+                    pointer = _buffer_offset()
+                else:
+                    pointer = array
+                gl.glEnableClientState(client_state)
+                enabled.append(client_state)
+                if name == 'vertices':
+                    gl.glVertexPointer(3, gl.GL_FLOAT, 0, pointer)
+                elif name == 'colors':
+                    gl.glColorPointer(array.shape[1], gl.GL_FLOAT, 0, pointer)
+                elif name == 'normals':
+                    gl.glNormalPointer(gl.GL_FLOAT, 0, pointer)
+                else:
+                    gl.glTexCoordPointer(2, gl.GL_FLOAT, 0, pointer)
+            
+            if self.indices is None:
+                gl.glDrawArrays(self.mode, 0, len(self.vertices))
+            elif use_buffers:
+                gl.glBindBuffer(gl.GL_ELEMENT_ARRAY_BUFFER, self._buffers['indices'])
+                gl.glDrawElements(self.mode, len(self.indices), gl.GL_UNSIGNED_INT, _buffer_offset())
+            else:
+                gl.glDrawElements(self.mode, len(self.indices), gl.GL_UNSIGNED_INT, self.indices)
+        finally:
+            for client_state in enabled:
+                gl.glDisableClientState(client_state)
+            if use_buffers:
+                gl.glBindBuffer(gl.GL_ARRAY_BUFFER, 0)
+                gl.glBindBuffer(gl.GL_ELEMENT_ARRAY_BUFFER, 0)
+            if self.colors is not None:
+                # Leave the current color where the last vertex color left it, as glColor would
+                gl.glColor4f(*np.append(self.colors[-1], 1.0)[:4])
+    
+    def _delete_buffers(self):
+        if self._buffers:
+            try:
+                gl.glDeleteBuffers(len(self._buffers), list(self._buffers.values()))
+            except Exception:
+                pass
+            self._buffers = {}
+    
+    def release(self):
+        """Free the GPU copies (buffer objects or display list)."""
+        self._delete_buffers()
+        if self._display_list is not None:
+            try:
+                gl.glDeleteLists(self._display_list, 1)
+            except Exception:
+                pass
+            self._display_list = None
+        self._uploaded = False
+
+
+class RetainedGeometryCache:
+    """
+    Named RetainedGeometry objects rebuilt only when their parameters change.
+    
+    get(name, key, builder) returns the cached geometry while key is equal to
+    the one it was built with; otherwise builder() is called for a new
+    (mode, arrays dict) pair and the geometry is refilled.
+    """
+    
+    def __init__(self):
+        self._entries = {}
+    
+    def get(self, name, key, builder):
+        entry = self._entries.get(name)
+        if entry is not None and entry[0] == key:
+            return entry[1]
+        mode, arrays = builder()
+        if entry is None:
+            geometry = RetainedGeometry(mode, **arrays)
+        else:
+            geometry = entry[1]
+            geometry.set_arrays(mode=mode, **arrays)
+        self._entries[name] = (key, geometry)
+        return geometry
+    
+    def draw(self, name, key, builder):
+        """Fetch (building if needed) and draw a geometry."""
+        self.get(name, key, builder).draw()
+    
+    def invalidate(self, *names):
+        """Force the named geometries (all when none given) to rebuild on next use, freeing their GPU copies now."""
+        for name in names or list(self._entries):
+            entry = self._entries.get(name)
+            if entry is not None:
+                entry[1].release()
+                self._entries[name] = (object(), entry[1])
+    
+    def discard(self, *names):
+        """Drop the named geometries and free their GPU copies."""
+        for name in names:
+            entry = self._entries.pop(name, None)
+            if entry is not None:
+                entry[1].release()
+    
+    def release(self):
+        """Free every GPU copy and empty the cache."""
+        for _, geometry in self._entries.values():
+            geometry.release()
+        self._entries.clear()
+
+
+def _strip_segment_indices(strip_count, strip_length, closed=False):
+    """GL_LINES index pairs for strip_count consecutive line strips (loops if closed)."""
+    starts = np.arange(strip_count, dtype=np.uint32)[:, np.newaxis] * strip_length
+    steps = np.arange(strip_length if closed else strip_length - 1, dtype=np.uint32)
+    first = starts + steps
+    second = starts + (steps + 1) % strip_length
+    return np.stack([first, second], axis=-1).ravel()
+
+
+def _triangle_edge_indices(indices):
+    """GL_LINES index pairs for the three edges of every triangle."""
+    triangles = np.asarray(indices, dtype=np.uint32).reshape(-1, 3)
+    return triangles[:, [0, 1, 1, 2, 2, 0]].ravel()
+
+
+def _sphere_points(lat, lon, radius):
+    """Points on a sphere for broadcastable latitude/longitude arrays, shape (..., 3)."""
+    cos_lat = np.cos(lat)
+    x, y, z = np.broadcast_arrays(cos_lat * np.cos(lon) * radius, np.sin(lat) * radius, cos_lat * np.sin(lon) * radius)
+    return np.stack([x, y, z], axis=-1)
+
+
 class MathematicalShape(Shape):
     """Base class for 3D mathematical objects in world space."""
     
@@ -2094,24 +3088,45 @@ class MathematicalShape(Shape):
         self.colors = []
         self.indices = []
         self.texture_coords = []
+        self.normals = []
         self.texture_id = None
         self.wireframe = False
         self.point_size = 1.0
+        self.geometry_cache = RetainedGeometryCache()  # GPU copy of the arrays above
+        self._geometry_version = 0
         
     @property
     def shape_id(self):
         """Compatibility property for shape_id."""
         return self.id
         
-    def set_geometry(self, vertices, colors=None, indices=None, texture_coords=None):
-        """Set the geometric data for this mathematical shape."""
-        self.vertices = np.array(vertices, dtype=np.float32)
+    def set_geometry(self, vertices, colors=None, indices=None, texture_coords=None, normals=None):
+        """Set the geometric data for this mathematical shape.
+        
+        Contiguous float32 (uint32 for indices) arrays are kept without copying.
+        """
+        self.vertices = np.ascontiguousarray(vertices, dtype=np.float32)
         if colors is not None:
-            self.colors = np.array(colors, dtype=np.float32)
+            self.colors = np.ascontiguousarray(colors, dtype=np.float32)
         if indices is not None:
-            self.indices = np.array(indices, dtype=np.uint32)
+            self.indices = np.ascontiguousarray(indices, dtype=np.uint32)
         if texture_coords is not None:
-            self.texture_coords = np.array(texture_coords, dtype=np.float32)
+            self.texture_coords = np.ascontiguousarray(texture_coords, dtype=np.float32)
+        if normals is not None:
+            self.normals = np.ascontiguousarray(normals, dtype=np.float32)
+        self.invalidate_geometry()
+    
+    def invalidate_geometry(self):
+        """Rebuild the GPU geometry on the next render, e.g. after editing the arrays in place."""
+        self._geometry_version += 1
+    
+    def release(self):
+        """Free the buffer objects or display lists of the retained geometry."""
+        self.geometry_cache.release()
+    
+    def _geometry_key(self):
+        arrays = (self.vertices, self.colors, self.indices, self.texture_coords, self.normals)
+        return (self._geometry_version,) + tuple(id(array) for array in arrays) + tuple(len(array) for array in arrays)
     
     def set_texture(self, image_data):
         """Set texture from image data."""
@@ -2170,44 +3185,39 @@ class MathematicalShape(Shape):
         self.restore_transformation()
     
     def _render_indexed(self):
-        """Render using indexed vertices."""
-        gl.glBegin(gl.GL_TRIANGLES)
-        for i in range(0, len(self.indices), 3):
-            for j in range(3):
-                idx = self.indices[i + j]
-                if len(self.colors) > idx:
-                    color = self.colors[idx]
-                    gl.glColor3f(color[0], color[1], color[2])
-                if len(self.texture_coords) > idx:
-                    tc = self.texture_coords[idx]
-                    gl.glTexCoord2f(tc[0], tc[1])
-                vertex = self.vertices[idx]
-                gl.glVertex3f(vertex[0], vertex[1], vertex[2])
-        gl.glEnd()
+        """Render indexed triangles from retained geometry."""
+        self.geometry_cache.draw('mesh', self._geometry_key(), self._build_geometry)
     
     def _render_arrays(self):
-        """Render using vertex arrays."""
-        # Determine primitive type based on vertex count
-        vertex_count = len(self.vertices)
-        
-        if vertex_count % 3 == 0:
-            gl.glBegin(gl.GL_TRIANGLES)
-        elif vertex_count % 4 == 0:
-            gl.glBegin(gl.GL_QUADS)
-        else:
+        """Render non-indexed vertices from retained geometry."""
+        geometry = self.geometry_cache.get('mesh', self._geometry_key(), self._build_geometry)
+        if geometry.mode == gl.GL_POINTS:
             gl.glPointSize(self.point_size)
-            gl.glBegin(gl.GL_POINTS)
-        
-        for i, vertex in enumerate(self.vertices):
-            if len(self.colors) > i:
-                color = self.colors[i]
-                gl.glColor3f(color[0], color[1], color[2])
-            if len(self.texture_coords) > i:
-                tc = self.texture_coords[i]
-                gl.glTexCoord2f(tc[0], tc[1])
-            gl.glVertex3f(vertex[0], vertex[1], vertex[2])
+        geometry.draw()
+    
+    def _build_geometry(self):
+        """Pack the shape's arrays for RetainedGeometry, choosing the primitive type."""
+        vertices = np.asarray(self.vertices, dtype=np.float32).reshape(-1, 3)
+        colors = None
+        if len(self.colors) > 0:
+            colors = np.asarray(self.colors, dtype=np.float32)[:, :3]  # Vertex colors are opaque RGB
+        texture_coords = self.texture_coords if len(self.texture_coords) > 0 else None
+        normals = self.normals if len(self.normals) > 0 else None
+        
+        indices = None
+        if len(self.indices) > 0:
+            mode = gl.GL_TRIANGLES
+            indices = np.asarray(self.indices, dtype=np.uint32).ravel()
+            indices = indices[:len(indices) - len(indices) % 3]
+        elif len(vertices) % 3 == 0:
+            mode = gl.GL_TRIANGLES
+        elif len(vertices) % 4 == 0:
+            mode = gl.GL_QUADS
+        else:
+            mode = gl.GL_POINTS
         
-        gl.glEnd()
+        return mode, {'vertices': vertices, 'colors': colors, 'normals': normals,
+                      'texture_coords': texture_coords, 'indices': indices}
 
 
 class FractalShape3D(MathematicalShape):
@@ -2307,6 +3317,104 @@ class FractalShape3D(MathematicalShape):
         return [max(0.0, min(1.0, r)), max(0.0, min(1.0, g)), max(0.0, min(1.0, b))]
 
 
+# ==================== EQUATION COMPILER ====================
+
+# Functions an equation may call, either bare (sin(x)) or through np./math. (np.sin(x))
+_EQUATION_FUNCTIONS = {
+    'sin': np.sin, 'cos': np.cos, 'tan': np.tan,
+    'arcsin': np.arcsin, 'arccos': np.arccos, 'arctan': np.arctan, 'arctan2': np.arctan2,
+    'asin': np.arcsin, 'acos': np.arccos, 'atan': np.arctan, 'atan2': np.arctan2,
+    'sinh': np.sinh, 'cosh': np.cosh, 'tanh': np.tanh,
+    'exp': np.exp, 'log': np.log, 'log2': np.log2, 'log10': np.log10,
+    'sqrt': np.sqrt, 'abs': np.abs, 'fabs': np.abs, 'sign': np.sign,
+    'floor': np.floor, 'ceil': np.ceil, 'hypot': np.hypot, 'power': np.power,
+    'mod': np.mod, 'fmod': np.fmod, 'minimum': np.minimum, 'maximum': np.maximum,
+    'min': np.minimum, 'max': np.maximum,
+}
+
+_EQUATION_CONSTANTS = {'pi': math.pi, 'e': math.e, 'tau': 2.0 * math.pi}
+
+_EQUATION_BINARY_OPS = {
+    ast.Add: np.add, ast.Sub: np.subtract, ast.Mult: np.multiply, ast.Div: np.true_divide,
+    ast.Pow: np.power, ast.Mod: np.mod, ast.FloorDiv: np.floor_divide,
+}
+
+_EQUATION_UNARY_OPS = {ast.USub: np.negative, ast.UAdd: np.positive}
+
+
+class CompiledEquation:
+    """
+    An equation string parsed once into a NumPy-vectorized callable.
+    
+    The expression is validated against a small AST whitelist (arithmetic,
+    numeric literals, known variable/parameter names, and the functions in
+    _EQUATION_FUNCTIONS) and turned into a tree of closures, so evaluating it
+    never goes through eval() and works the same on scalars and whole arrays.
+    Raises ValueError for anything outside the whitelist.
+    """
+    
+    def __init__(self, source, names=()):
+        self.source = source
+        self.names = set(names)
+        expression = source.strip().replace('^', '**')
+        try:
+            tree = ast.parse(expression, mode='eval')
+        except SyntaxError as e:
+            raise ValueError(f"Invalid equation '{source}': {e.msg}")
+        self._evaluate = self._compile(tree.body)
+    
+    def __call__(self, env):
+        """Evaluate the equation; env maps variable/parameter names to scalars or arrays."""
+        return self._evaluate(env)
+    
+    def _compile(self, node):
+        """Turn one AST node into a closure taking the evaluation environment."""
+        if isinstance(node, ast.Constant):
+            if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+                raise ValueError(f"Unsupported literal {node.value!r} in '{self.source}'")
+            value = float(node.value)
+            return lambda env: value
+        
+        if isinstance(node, ast.Name):
+            name = node.id
+            if name in self.names:
+                return lambda env: env[name]
+            if name in _EQUATION_CONSTANTS:
+                value = _EQUATION_CONSTANTS[name]
+                return lambda env: value
+            raise ValueError(f"Unknown name '{name}' in '{self.source}'")
+        
+        if isinstance(node, ast.BinOp) and type(node.op) in _EQUATION_BINARY_OPS:
+            op = _EQUATION_BINARY_OPS[type(node.op)]
+            left, right = self._compile(node.left), self._compile(node.right)
+            return lambda env: op(left(env), right(env))
+        
+        if isinstance(node, ast.UnaryOp) and type(node.op) in _EQUATION_UNARY_OPS:
+            op = _EQUATION_UNARY_OPS[type(node.op)]
+            operand = self._compile(node.operand)
+            return lambda env: op(operand(env))
+        
+        if isinstance(node, ast.Call) and not node.keywords:
+            func = self._resolve_function(node.func)
+            args = [self._compile(arg) for arg in node.args]
+            return lambda env: func(*[arg(env) for arg in args])
+        
+        raise ValueError(f"Unsupported syntax ({type(node).__name__}) in '{self.source}'")
+    
+    def _resolve_function(self, node):
+        """Look up a whitelisted function from a bare or np./math.-qualified name."""
+        if isinstance(node, ast.Name):
+            name = node.id
+        elif (isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name)
+              and node.value.id in ('np', 'numpy', 'math')):
+            name = node.attr
+        else:
+            name = None
+        if name not in _EQUATION_FUNCTIONS:
+            raise ValueError(f"Function not allowed in '{self.source}'")
+        return _EQUATION_FUNCTIONS[name]
+
+
 class DynamicalSystemEngine:
     """
     Core engine for generating fractals from dynamical systems.
@@ -2370,9 +3478,9 @@ class DynamicalSystemEngine:
                     key = key.strip()
                     value = value.strip()
                     try:
-                        # Try to evaluate as number
-                        params[key] = eval(value)
-                    except:
+                        # Numeric expressions (may refer to earlier parameters and pi/e)
+                        params[key] = float(CompiledEquation(value, params)(params))
+                    except (ValueError, TypeError, ArithmeticError):
                         params[key] = value
         except:
             pass
@@ -2384,26 +3492,42 @@ class DynamicalSystemEngine:
         return params
     
     def _parse_equations(self, equations_dict):
-        """Parse and compile equations for evaluation."""
+        """
+        Parse equations once into CompiledEquation callables.
+        
+        Equations may use x, y, z, w, any configured parameter and the whitelisted
+        math functions; anything else raises ValueError here instead of failing
+        on every pixel later.
+        """
+        names = {'x', 'y', 'z', 'w'} | set(self.parameters)
         parsed = {}
         for key, eq_str in equations_dict.items():
-            if eq_str.strip():
-                try:
-                    # Simple expression parser - replace common mathematical functions
-                    sanitized = eq_str.replace('^', '**')  # Power operator
-                    sanitized = sanitized.replace('sin', 'np.sin')
-                    sanitized = sanitized.replace('cos', 'np.cos')
-                    sanitized = sanitized.replace('exp', 'np.exp')
-                    sanitized = sanitized.replace('log', 'np.log')
-                    sanitized = sanitized.replace('sqrt', 'np.sqrt')
-                    sanitized = sanitized.replace('abs', 'np.abs')
-                    
-                    parsed[key] = sanitized
-                except:
-                    parsed[key] = "0"
+            if eq_str and eq_str.strip():
+                parsed[key] = CompiledEquation(eq_str, names)
         
         return parsed
     
+    def _evaluation_env(self, **variables):
+        """Build the evaluation environment for compiled equations."""
+        env = dict(self.parameters)
+        env.update(variables)
+        return env
+    
+    def _evaluate_equation(self, key, env, default, shape):
+        """Evaluate equation key over the arrays in env (default if it is not defined)."""
+        equation = self.equations.get(key)
+        if equation is None:
+            value = default
+        else:
+            value = equation(env)
+        return np.broadcast_to(np.asarray(value, dtype=np.float64), shape)
+    
+    def _report_progress(self, current, total, status):
+        """Forward progress to the callback; returns False if generation should stop."""
+        if self.progress_callback is None:
+            return not self.should_stop
+        return bool(self.progress_callback(current, total, status)) and not self.should_stop
+    
     def generate(self):
         """Generate fractal based on the dynamical system configuration."""
         if self.system_type == 'Discrete Map':
@@ -2425,34 +3549,13 @@ class DynamicalSystemEngine:
         # Create coordinate grids
         x_range = np.linspace(self.domain['x_min'], self.domain['x_max'], width)
         y_range = np.linspace(self.domain['y_min'], self.domain['y_max'], height)
+        x0, y0 = np.meshgrid(x_range, y_range)
         
-        # Initialize result array
-        result = np.zeros((height, width), dtype=np.float32)
+        result = self._iterate_grid(x0, y0)
+        if result is None:
+            return None  # Generation cancelled
         
         total_pixels = height * width
-        processed_pixels = 0
-        
-        # Iterate over each point in the grid with progress reporting
-        for i, y0 in enumerate(y_range):
-            # Check for cancellation
-            if self.progress_callback:
-                status = f"Computing row {i+1}/{height}"
-                should_continue = self.progress_callback(i * width, total_pixels, status)
-                if not should_continue:
-                    return None  # Generation cancelled
-            
-            for j, x0 in enumerate(x_range):
-                iterations = self._iterate_point(x0, y0)
-                result[i, j] = iterations
-                processed_pixels += 1
-                
-                # Update progress every 1000 pixels to avoid too frequent updates
-                if processed_pixels % 1000 == 0 and self.progress_callback:
-                    progress = int((processed_pixels / total_pixels) * 80)  # 80% for computation, 20% for coloring
-                    status = f"Processed {processed_pixels}/{total_pixels} pixels"
-                    should_continue = self.progress_callback(processed_pixels, total_pixels, status)
-                    if not should_continue:
-                        return None  # Generation cancelled
         
         # Progress update for coloring phase
         if self.progress_callback:
@@ -2467,165 +3570,167 @@ class DynamicalSystemEngine:
         
         return colored_result
     
-    def _iterate_point(self, x0, y0):
-        """Iterate a single point through the dynamical system with safety checks."""
-        x, y = x0, y0
-        z, w = 0.0, 0.0  # Additional variables if needed
-        
-        # Safety check for infinite/NaN initial values
-        if not (np.isfinite(x) and np.isfinite(y)):
-            return 0
+    def _iterate_grid(self, x0, y0):
+        """
+        Iterate a whole grid of starting points through the system at once.
         
-        for iteration in range(self.max_iterations):
-            # Create evaluation context
-            context = {
-                'x': x, 'y': y, 'z': z, 'w': w,
-                'np': np, **self.parameters
-            }
-            
-            try:
-                # Evaluate equations with timeout protection
-                if 'eq_0' in self.equations and self.equations['eq_0']:
-                    x_new = eval(self.equations['eq_0'], context)
-                    # Safety check for result
-                    if not np.isfinite(x_new):
-                        return iteration
-                else:
-                    x_new = x
-                
-                if 'eq_1' in self.equations and self.equations['eq_1']:
-                    y_new = eval(self.equations['eq_1'], context)
-                    # Safety check for result
-                    if not np.isfinite(y_new):
-                        return iteration
-                else:
-                    y_new = y
+        Returns a float32 array of (smooth) escape iterations with the same
+        per-point result _iterate_point gives, or None if cancelled. Points that
+        escape or blow up are recorded and compacted out of the working set, so
+        each iteration only evaluates the equations over the live points.
+        Progress is reported as 0-80% of the pixel count while iterating.
+        """
+        shape = np.shape(x0)
+        total_pixels = int(np.prod(shape))
+        result = np.full(total_pixels, float(self.max_iterations), dtype=np.float32)
+        
+        x = np.asarray(x0, dtype=np.float64).ravel()
+        y = np.asarray(y0, dtype=np.float64).ravel()
+        
+        # Non-finite starting points never iterate
+        idx = np.arange(total_pixels)
+        finite = np.isfinite(x) & np.isfinite(y)
+        result[~finite] = 0
+        idx, x, y = idx[finite], x[finite], y[finite]
+        z = np.zeros_like(x)
+        w = np.zeros_like(x)
+        
+        reported = -1
+        with np.errstate(all='ignore'):
+            for iteration in range(self.max_iterations):
+                if idx.size == 0:
+                    break
                 
-                if 'eq_2' in self.equations and self.equations['eq_2']:
-                    z_new = eval(self.equations['eq_2'], context)
-                    # Safety check for result
-                    if not np.isfinite(z_new):
-                        return iteration
-                else:
-                    z_new = z
+                # Check for cancellation whenever the reported percentage moves
+                percent = (iteration * 80) // self.max_iterations
+                if percent != reported:
+                    reported = percent
+                    status = f"Iteration {iteration + 1}/{self.max_iterations} ({idx.size} points active)"
+                    if not self._report_progress(total_pixels * percent // 100, total_pixels, status):
+                        return None  # Generation cancelled
                 
-                if 'eq_3' in self.equations and self.equations['eq_3']:
-                    w_new = eval(self.equations['eq_3'], context)
-                    # Safety check for result
-                    if not np.isfinite(w_new):
-                        return iteration
-                else:
-                    w_new = w
+                env = self._evaluation_env(x=x, y=y, z=z, w=w)
+                try:
+                    x_new = self._evaluate_equation('eq_0', env, x, x.shape)
+                    y_new = self._evaluate_equation('eq_1', env, y, x.shape)
+                    z_new = self._evaluate_equation('eq_2', env, z, x.shape)
+                    w_new = self._evaluate_equation('eq_3', env, w, x.shape)
+                except Exception as e:
+                    print(f"DEBUG: Equation evaluation failed at iteration {iteration}: {e}")
+                    result[idx] = iteration
+                    break
                 
-                # Check for escape condition
                 magnitude = np.sqrt(x_new*x_new + y_new*y_new + z_new*z_new + w_new*w_new)
                 
-                # Safety check for magnitude
-                if not np.isfinite(magnitude):
-                    return iteration
-                
-                if magnitude > self.escape_radius:
-                    # Smooth coloring with safety check
-                    if magnitude > 2.0:  # Only apply smooth coloring for reasonable values
-                        try:
-                            smooth_val = iteration + 1 - np.log(np.log(magnitude))/np.log(2)
-                            return smooth_val if np.isfinite(smooth_val) else iteration
-                        except:
-                            return iteration
-                    else:
-                        return iteration
-                
-                # Additional safety: check if values are getting too large
-                if magnitude > 1e10:
-                    return iteration
+                # Non-finite results, escapes and runaway values all stop at this iteration
+                failed = ~(np.isfinite(x_new) & np.isfinite(y_new) & np.isfinite(z_new)
+                           & np.isfinite(w_new) & np.isfinite(magnitude))
+                escaped = ~failed & (magnitude > self.escape_radius)
+                stopped = failed | escaped | (magnitude > 1e10)
+                
+                if stopped.any():
+                    values = np.full(idx.size, float(iteration))
+                    # Smooth coloring only for reasonable magnitudes
+                    smooth = escaped & (magnitude > 2.0)
+                    smooth_val = iteration + 1 - np.log(np.log(magnitude[smooth])) / _LOG2
+                    values[smooth] = np.where(np.isfinite(smooth_val), smooth_val, iteration)
+                    result[idx[stopped]] = values[stopped]
+                    
+                    alive = ~stopped
+                    idx = idx[alive]
+                    x_new, y_new, z_new, w_new = x_new[alive], y_new[alive], z_new[alive], w_new[alive]
                 
                 # Update for next iteration
                 x, y, z, w = x_new, y_new, z_new, w_new
-                
-            except (ZeroDivisionError, OverflowError, ValueError, FloatingPointError):
-                return iteration  # Return current iteration on mathematical error
-            except:
-                return iteration  # Return current iteration on any other error
         
-        return self.max_iterations
+        return result.reshape(shape)
+    
+    def _iterate_point(self, x0, y0):
+        """Iterate a single point through the dynamical system with safety checks."""
+        result = self._iterate_grid(np.array([x0], dtype=np.float64), np.array([y0], dtype=np.float64))
+        return float(result[0])
     
     def _generate_continuous_flow(self):
-        """Generate fractal for continuous dynamical systems dX/dt = F(X)."""
+        """
+        Generate fractal for continuous dynamical systems dX/dt = F(X).
+        
+        All trajectories are integrated together; a trajectory drops out of the
+        batch as soon as its derivative or position becomes non-finite or it
+        leaves the +/-1000 box, exactly where the per-trajectory loop stopped.
+        """
         # For continuous systems, we'll sample trajectories and look for attractors
         width = self.resolution
         height = int(self.resolution * 0.75)
         
-        # Create result array
-        result = np.zeros((height, width, 3), dtype=np.uint8)
-        
         # Sample initial conditions
         num_trajectories = min(5000, self.config.get('sample_count', 5000))
         dt = self.config.get('time_step', 0.01)
         trajectory_length = min(1000, self.max_iterations)
-        
-        # Generate multiple trajectories with progress tracking
-        for traj in range(num_trajectories):
-            # Check for cancellation
-            if self.progress_callback and traj % 50 == 0:
-                status = f"Computing trajectory {traj+1}/{num_trajectories}"
-                should_continue = self.progress_callback(traj, num_trajectories, status)
-                if not should_continue:
-                    return None  # Generation cancelled
-            
-            # Random initial condition
-            x = np.random.uniform(self.domain['x_min'], self.domain['x_max'])
-            y = np.random.uniform(self.domain['y_min'], self.domain['y_max'])
-            z = 0.0
-            
-            # Safety check for initial conditions
-            if not (np.isfinite(x) and np.isfinite(y) and np.isfinite(z)):
-                continue
-            
-            # Integrate trajectory
+        transient_steps = min(500, trajectory_length // 2)
+        max_derivative = 1000.0
+        
+        # Random initial conditions, drawn in the same (x, y) order as one trajectory at a time
+        initial = np.random.uniform(
+            [self.domain['x_min'], self.domain['y_min']],
+            [self.domain['x_max'], self.domain['y_max']],
+            size=(num_trajectories, 2))
+        x = initial[:, 0].copy()
+        y = initial[:, 1].copy()
+        z = np.zeros(num_trajectories)
+        
+        x_span = self.domain['x_max'] - self.domain['x_min']
+        y_span = self.domain['y_max'] - self.domain['y_min']
+        counts = np.zeros(height * width, dtype=np.int64)
+        
+        reported = -1
+        with np.errstate(all='ignore'):
             for step in range(trajectory_length):
-                # Evaluate derivatives
-                context = {'x': x, 'y': y, 'z': z, 'np': np, **self.parameters}
+                if x.size == 0:
+                    break
                 
+                # Check for cancellation
+                percent = (step * 100) // trajectory_length
+                if percent != reported:
+                    reported = percent
+                    status = f"Integrating step {step + 1}/{trajectory_length} ({x.size} trajectories)"
+                    current = num_trajectories * percent // 100
+                    if not self._report_progress(current, num_trajectories, status):
+                        return None  # Generation cancelled
+                
+                env = self._evaluation_env(x=x, y=y, z=z, w=np.zeros_like(x))
                 try:
-                    dx_dt = eval(self.equations.get('eq_0', '0'), context) if self.equations.get('eq_0') else 0
-                    dy_dt = eval(self.equations.get('eq_1', '0'), context) if self.equations.get('eq_1') else 0
-                    dz_dt = eval(self.equations.get('eq_2', '0'), context) if self.equations.get('eq_2') else 0
-                    
-                    # Safety checks for derivatives
-                    if not (np.isfinite(dx_dt) and np.isfinite(dy_dt) and np.isfinite(dz_dt)):
-                        break
-                    
-                    # Limit derivative magnitude to prevent explosion
-                    max_derivative = 1000.0
-                    dx_dt = np.clip(dx_dt, -max_derivative, max_derivative)
-                    dy_dt = np.clip(dy_dt, -max_derivative, max_derivative)
-                    dz_dt = np.clip(dz_dt, -max_derivative, max_derivative)
-                    
-                    # Euler integration (simple)
-                    x += dx_dt * dt
-                    y += dy_dt * dt
-                    z += dz_dt * dt
-                    
-                    # Safety checks for position
-                    if not (np.isfinite(x) and np.isfinite(y) and np.isfinite(z)):
-                        break
-                    
-                    # Check for escape from reasonable bounds
-                    if abs(x) > 1000 or abs(y) > 1000 or abs(z) > 1000:
-                        break
-                    
-                    # Skip transient behavior
-                    if step > min(500, trajectory_length // 2):
-                        # Map to pixel coordinates
-                        px = int((x - self.domain['x_min']) / (self.domain['x_max'] - self.domain['x_min']) * width)
-                        py = int((y - self.domain['y_min']) / (self.domain['y_max'] - self.domain['y_min']) * height)
-                        
-                        if 0 <= px < width and 0 <= py < height:
-                            # Increment pixel intensity
-                            result[py, px] = np.minimum(result[py, px] + 1, 255)
-                    
-                except:
+                    dx_dt = self._evaluate_equation('eq_0', env, 0.0, x.shape)
+                    dy_dt = self._evaluate_equation('eq_1', env, 0.0, x.shape)
+                    dz_dt = self._evaluate_equation('eq_2', env, 0.0, x.shape)
+                except Exception as e:
+                    print(f"DEBUG: Flow evaluation failed at step {step}: {e}")
                     break
+                
+                # Trajectories with non-finite derivatives stop before moving
+                alive = np.isfinite(dx_dt) & np.isfinite(dy_dt) & np.isfinite(dz_dt)
+                
+                # Limit derivative magnitude to prevent explosion, then Euler step
+                x = x + np.clip(dx_dt, -max_derivative, max_derivative) * dt
+                y = y + np.clip(dy_dt, -max_derivative, max_derivative) * dt
+                z = z + np.clip(dz_dt, -max_derivative, max_derivative) * dt
+                
+                # Stop on non-finite positions or escape from reasonable bounds
+                alive &= np.isfinite(x) & np.isfinite(y) & np.isfinite(z)
+                alive &= (np.abs(x) <= 1000) & (np.abs(y) <= 1000) & (np.abs(z) <= 1000)
+                x, y, z = x[alive], y[alive], z[alive]
+                
+                # Skip transient behavior
+                if step > transient_steps and x.size:
+                    # Map to pixel coordinates (truncating like int())
+                    px = np.trunc((x - self.domain['x_min']) / x_span * width)
+                    py = np.trunc((y - self.domain['y_min']) / y_span * height)
+                    inside = (px >= 0) & (px < width) & (py >= 0) & (py < height)
+                    flat = py[inside].astype(np.int64) * width + px[inside].astype(np.int64)
+                    counts += np.bincount(flat, minlength=counts.size)
+        
+        # Increment pixel intensity, saturating at 255
+        intensity = np.minimum(counts, 255).astype(np.uint8).reshape(height, width)
+        result = np.repeat(intensity[:, :, np.newaxis], 3, axis=2)
         
         # Final progress update
         if self.progress_callback:
@@ -2649,50 +3754,26 @@ class DynamicalSystemEngine:
                 {'a': 0.0, 'b': 0.0, 'c': 0.0, 'd': 0.16, 'e': 0.0, 'f': 0.0, 'p': 0.01}
             ]
         
-        # Initialize result
-        result = np.zeros((height, width, 3), dtype=np.uint8)
-        
-        # Generate points using IFS
-        x, y = 0.0, 0.0
+        # Generate points using IFS, many walkers at once; draws past the total probability use the first function
+        transforms = [[func[k] for k in ('a', 'b', 'c', 'd', 'e', 'f', 'p')] for func in ifs_functions]
         sample_count = self.config.get('sample_count', 100000)
+        points, chosen = ifs_chaos_game(transforms, sample_count, warmup=100, fallback=0)
         
-        for i in range(sample_count):
-            # Choose function probabilistically
-            r = np.random.random()
-            cumulative_p = 0.0
-            chosen_func = ifs_functions[0]
-            
-            for func in ifs_functions:
-                cumulative_p += func['p']
-                if r <= cumulative_p:
-                    chosen_func = func
-                    break
-            
-            # Apply transformation: [x_new, y_new] = [a*x + b*y + e, c*x + d*y + f]
-            x_new = chosen_func['a'] * x + chosen_func['b'] * y + chosen_func['e']
-            y_new = chosen_func['c'] * x + chosen_func['d'] * y + chosen_func['f']
-            
-            x, y = x_new, y_new
-            
-            # Skip initial iterations for convergence
-            if i > 100:
-                # Map to pixel coordinates
-                px = int((x - self.domain['x_min']) / (self.domain['x_max'] - self.domain['x_min']) * width)
-                py = int((y - self.domain['y_min']) / (self.domain['y_max'] - self.domain['y_min']) * height)
-                
-                if 0 <= px < width and 0 <= py < height:
-                    # Color based on function used
-                    color_idx = ifs_functions.index(chosen_func)
-                    if color_idx == 0:
-                        result[py, px] = np.minimum(result[py, px] + [0, 10, 0], 255)  # Green
-                    elif color_idx == 1:
-                        result[py, px] = np.minimum(result[py, px] + [10, 5, 0], 255)  # Brown
-                    elif color_idx == 2:
-                        result[py, px] = np.minimum(result[py, px] + [5, 10, 0], 255)  # Yellow-green
-                    else:
-                        result[py, px] = np.minimum(result[py, px] + [0, 5, 0], 255)  # Dark green
+        # Map to pixel coordinates (truncating like int())
+        px = np.trunc((points[:, 0] - self.domain['x_min']) / (self.domain['x_max'] - self.domain['x_min']) * width)
+        py = np.trunc((points[:, 1] - self.domain['y_min']) / (self.domain['y_max'] - self.domain['y_min']) * height)
+        inside = (px >= 0) & (px < width) & (py >= 0) & (py < height)
+        flat = py[inside].astype(np.int64) * width + px[inside].astype(np.int64)
         
-        return result
+        # Color based on function used: green, brown, yellow-green, then dark green for the rest
+        increments = np.array([[0, 10, 0], [10, 5, 0], [5, 10, 0], [0, 5, 0]])
+        colors = increments[np.minimum(chosen[inside], 3)]
+        result = np.empty((height * width, 3), dtype=np.uint8)
+        for channel in range(3):
+            totals = np.bincount(flat, weights=colors[:, channel], minlength=height * width)
+            result[:, channel] = np.minimum(totals, 255)  # Increments saturate at 255
+        
+        return result.reshape(height, width, 3)
     
     def _parse_ifs_functions(self):
         """Parse IFS function definitions from config."""
@@ -2712,60 +3793,70 @@ class DynamicalSystemEngine:
         # Create coordinate grids
         x_range = np.linspace(self.domain['x_min'], self.domain['x_max'], width)
         y_range = np.linspace(self.domain['y_min'], self.domain['y_max'], height)
-        
-        # Initialize result array
-        result = np.zeros((height, width), dtype=np.float32)
+        x0, y0 = np.meshgrid(x_range, y_range)
         
         noise_strength = self.config.get('noise_strength', 0.1)
         
-        # Iterate over each point in the grid
-        for i, y0 in enumerate(y_range):
-            for j, x0 in enumerate(x_range):
-                iterations = self._iterate_stochastic_point(x0, y0, noise_strength)
-                result[i, j] = iterations
+        result = self._iterate_stochastic_grid(x0, y0, noise_strength)
+        if result is None:
+            return None  # Generation cancelled
         
         # Convert to colored image
         return self._apply_coloring(result)
     
-    def _iterate_stochastic_point(self, x0, y0, noise_strength):
-        """Iterate a point with stochastic perturbations."""
-        x, y = x0, y0
+    def _iterate_stochastic_grid(self, x0, y0, noise_strength):
+        """Iterate a grid of points with stochastic perturbations; None if cancelled."""
+        shape = np.shape(x0)
+        total_pixels = int(np.prod(shape))
+        result = np.full(total_pixels, float(self.max_iterations), dtype=np.float32)
         
-        for iteration in range(self.max_iterations):
-            # Create evaluation context
-            context = {
-                'x': x, 'y': y, 'z': 0.0, 'w': 0.0,
-                'np': np, **self.parameters
-            }
-            
-            try:
-                # Evaluate equations
-                if 'eq_0' in self.equations and self.equations['eq_0']:
-                    x_new = eval(self.equations['eq_0'], context)
-                else:
-                    x_new = x
+        idx = np.arange(total_pixels)
+        x = np.asarray(x0, dtype=np.float64).ravel()
+        y = np.asarray(y0, dtype=np.float64).ravel()
+        
+        reported = -1
+        with np.errstate(all='ignore'):
+            for iteration in range(self.max_iterations):
+                if idx.size == 0:
+                    break
                 
-                if 'eq_1' in self.equations and self.equations['eq_1']:
-                    y_new = eval(self.equations['eq_1'], context)
-                else:
-                    y_new = y
+                percent = (iteration * 100) // self.max_iterations
+                if percent != reported:
+                    reported = percent
+                    status = f"Iteration {iteration + 1}/{self.max_iterations} ({idx.size} points active)"
+                    if not self._report_progress(total_pixels * percent // 100, total_pixels, status):
+                        return None  # Generation cancelled
+                
+                env = self._evaluation_env(x=x, y=y, z=np.zeros_like(x), w=np.zeros_like(x))
+                try:
+                    x_new = self._evaluate_equation('eq_0', env, x, x.shape)
+                    y_new = self._evaluate_equation('eq_1', env, y, x.shape)
+                except Exception as e:
+                    print(f"DEBUG: Equation evaluation failed at iteration {iteration}: {e}")
+                    result[idx] = iteration
+                    break
                 
                 # Add stochastic noise
-                x_new += np.random.normal(0, noise_strength)
-                y_new += np.random.normal(0, noise_strength)
+                x_new = x_new + np.random.normal(0, noise_strength, idx.size)
+                y_new = y_new + np.random.normal(0, noise_strength, idx.size)
                 
                 # Check for escape condition
-                magnitude = np.sqrt(x_new*x_new + y_new*y_new)
-                if magnitude > self.escape_radius:
-                    return iteration
+                escaped = np.sqrt(x_new*x_new + y_new*y_new) > self.escape_radius
+                if escaped.any():
+                    result[idx[escaped]] = iteration
+                    alive = ~escaped
+                    idx, x_new, y_new = idx[alive], x_new[alive], y_new[alive]
                 
                 # Update for next iteration
                 x, y = x_new, y_new
-                
-            except:
-                return iteration
         
-        return self.max_iterations
+        return result.reshape(shape)
+    
+    def _iterate_stochastic_point(self, x0, y0, noise_strength):
+        """Iterate a point with stochastic perturbations."""
+        result = self._iterate_stochastic_grid(
+            np.array([x0], dtype=np.float64), np.array([y0], dtype=np.float64), noise_strength)
+        return float(result[0])
     
     def _apply_coloring(self, iteration_data):
         """Apply coloring scheme to iteration data."""
@@ -2778,39 +3869,8 @@ class DynamicalSystemEngine:
     
     def _escape_time_coloring(self, iteration_data):
         """Apply escape time coloring with enhanced palette."""
-        height, width = iteration_data.shape
-        colored = np.zeros((height, width, 3), dtype=np.uint8)
-        
-        for y in range(height):
-            for x in range(width):
-                iterations = iteration_data[y, x]
-                
-                if iterations >= self.max_iterations - 0.1:
-                    colored[y, x] = [0, 0, 0]  # Black for points in the set
-                else:
-                    # Enhanced 6-band color palette
-                    hue = (iterations / self.max_iterations) % 1.0
-                    
-                    if hue < 0.16:  # Red to Orange
-                        r, g, b = 1.0, hue * 6, 0.0
-                    elif hue < 0.33:  # Orange to Yellow
-                        r, g, b = 1.0 - (hue - 0.16) * 6, 1.0, 0.0
-                    elif hue < 0.5:  # Yellow to Green
-                        r, g, b = 0.0, 1.0, (hue - 0.33) * 6
-                    elif hue < 0.66:  # Green to Cyan
-                        r, g, b = 0.0, 1.0 - (hue - 0.5) * 6, 1.0
-                    elif hue < 0.83:  # Cyan to Blue
-                        r, g, b = (hue - 0.66) * 6, 0.0, 1.0
-                    else:  # Blue to Purple
-                        r, g, b = 1.0, 0.0, 1.0 - (hue - 0.83) * 6
-                    
-                    # Clamp RGB values and convert to uint8
-                    r = max(0.0, min(1.0, r))
-                    g = max(0.0, min(1.0, g))
-                    b = max(0.0, min(1.0, b))
-                    colored[y, x] = [int(r * 255), int(g * 255), int(b * 255)]
-        
-        return colored
+        # Same 6-band palette as the Mandelbrot/Julia generators, black inside the set
+        return _fractal_palette(iteration_data, self.max_iterations)
 
 
 class ProceduralShape3D(MathematicalShape):
@@ -2818,144 +3878,548 @@ class ProceduralShape3D(MathematicalShape):
     
     def __init__(self, shape_id: str = None, procedural_type: str = "terrain"):
         super().__init__(shape_id, f"procedural_{procedural_type}")
-        self.procedural_type = procedural_type
-        self.height_scale = 1.0
-        self.wall_height = 1.0
-        self.building_height = 2.0
-        
-    def generate_terrain_geometry(self, heightmap):
-        """Generate 3D terrain from heightmap."""
-        height, width = heightmap.shape
-        vertices = []
-        colors = []
-        indices = []
-        
-        for y in range(height - 1):
-            for x in range(width - 1):
-                # Get height values
-                h00 = heightmap[y, x] * self.height_scale
-                h10 = heightmap[y, x + 1] * self.height_scale
-                h01 = heightmap[y + 1, x] * self.height_scale
-                h11 = heightmap[y + 1, x + 1] * self.height_scale
-                
-                # Normalize coordinates
-                x_norm = (x / width) * 4 - 2  # -2 to 2 range
-                y_norm = (y / height) * 4 - 2
-                x1_norm = ((x + 1) / width) * 4 - 2
-                y1_norm = ((y + 1) / height) * 4 - 2
-                
-                # Add vertices
-                base_idx = len(vertices)
-                vertices.extend([
-                    [x_norm, y_norm, h00],
-                    [x1_norm, y_norm, h10],
-                    [x1_norm, y1_norm, h11],
-                    [x_norm, y1_norm, h01]
-                ])
-                
-                # Add terrain colors based on height
-                colors.extend([
-                    self._height_to_terrain_color(h00),
-                    self._height_to_terrain_color(h10),
-                    self._height_to_terrain_color(h11),
-                    self._height_to_terrain_color(h01)
-                ])
-                
-                # Add indices
-                indices.extend([
-                    base_idx, base_idx + 1, base_idx + 2,
-                    base_idx, base_idx + 2, base_idx + 3
-                ])
+        self.procedural_type = procedural_type
+        self.height_scale = 1.0
+        self.wall_height = 1.0
+        self.building_height = 2.0
         
-        self.set_geometry(vertices, colors, indices)
+    # Unit cube corners as 6 quads (front, back, top, bottom, right, left) with their face normals
+    CUBE_CORNERS = np.array([
+        [-1, -1, -1], [1, -1, -1], [1, -1, 1], [-1, -1, 1],
+        [-1, 1, -1], [-1, 1, 1], [1, 1, 1], [1, 1, -1],
+        [-1, -1, 1], [1, -1, 1], [1, 1, 1], [-1, 1, 1],
+        [-1, -1, -1], [-1, 1, -1], [1, 1, -1], [1, -1, -1],
+        [1, -1, -1], [1, 1, -1], [1, 1, 1], [1, -1, 1],
+        [-1, -1, -1], [-1, -1, 1], [-1, 1, 1], [-1, 1, -1],
+    ], dtype=np.float32)
+    CUBE_NORMALS = np.repeat(np.array([
+        [0, -1, 0], [0, 1, 0], [0, 0, 1], [0, 0, -1], [1, 0, 0], [-1, 0, 0],
+    ], dtype=np.float32), 4, axis=0)
+    CUBE_INDICES = (np.arange(6, dtype=np.uint32)[:, np.newaxis] * 4 +
+                    np.array([0, 1, 2, 0, 2, 3], dtype=np.uint32)).ravel()
+    
+    TERRAIN_LEVELS = np.array([0.2, 0.4, 0.6, 0.8])
+    TERRAIN_COLORS = np.array([
+        [0.0, 0.4, 0.8],     # Water
+        [0.76, 0.7, 0.5],    # Beach
+        [0.13, 0.55, 0.13],  # Grass
+        [0.0, 0.39, 0.0],    # Hills
+        [1.0, 1.0, 1.0],     # Mountains
+    ], dtype=np.float32)
+    
+    def generate_terrain_geometry(self, heightmap):
+        """Generate 3D terrain from heightmap as one shared-vertex grid mesh."""
+        height, width = heightmap.shape
+        heights = np.asarray(heightmap, dtype=np.float64) * self.height_scale
+        
+        # One vertex per heightmap sample, -2 to 2 range
+        ys, xs = np.mgrid[0:height, 0:width]
+        vertices = np.empty((height, width, 3), dtype=np.float32)
+        vertices[..., 0] = (xs / width) * 4 - 2
+        vertices[..., 1] = (ys / height) * 4 - 2
+        vertices[..., 2] = heights
+        
+        # Normals from the height gradient
+        normals = np.ones((height, width, 3), dtype=np.float32)
+        if height > 1 and width > 1:
+            slope_y, slope_x = np.gradient(vertices[..., 2], 4.0 / height, 4.0 / width)
+            np.negative(slope_x, out=normals[..., 0])
+            np.negative(slope_y, out=normals[..., 1])
+            normals /= np.sqrt(slope_x * slope_x + slope_y * slope_y + 1.0)[..., np.newaxis]
+        
+        # Two triangles per grid cell: (top-left, top-right, bottom-right), (top-left, bottom-right, bottom-left)
+        first = np.arange(height - 1, dtype=np.uint32)[:, np.newaxis] * np.uint32(width) + np.arange(width - 1, dtype=np.uint32)
+        indices = np.empty((height - 1, width - 1, 6), dtype=np.uint32)
+        indices[..., 0] = indices[..., 3] = first
+        indices[..., 1] = first + 1
+        indices[..., 2] = indices[..., 4] = first + (width + 1)
+        indices[..., 5] = first + width
+        
+        self.set_geometry(vertices.reshape(-1, 3), self._terrain_colors(heights).reshape(-1, 3), indices.ravel(),
+                          normals=normals.reshape(-1, 3))
     
     def generate_maze_geometry(self, maze_data):
         """Generate 3D maze walls from 2D maze data."""
         height, width = maze_data.shape
-        vertices = []
-        colors = []
         wall_color = [0.5, 0.5, 0.5]  # Gray walls
         
-        for y in range(height):
-            for x in range(width):
-                if maze_data[y, x] == 1:  # Wall
-                    # Create a wall cube at this position
-                    x_pos = (x / width) * 4 - 2
-                    y_pos = (y / height) * 4 - 2
-                    
-                    # Add cube vertices for wall
-                    cube_vertices = self._create_cube_at(x_pos, y_pos, 0, 0.1, 0.1, self.wall_height)
-                    vertices.extend(cube_vertices)
-                    
-                    # Add colors for all vertices
-                    for _ in range(len(cube_vertices)):
-                        colors.append(wall_color)
+        # Create a wall cube at every wall cell
+        wall_y, wall_x = np.nonzero(np.asarray(maze_data) == 1)
+        centers = np.stack([(wall_x / width) * 4 - 2, (wall_y / height) * 4 - 2, np.zeros(len(wall_x))], axis=-1)
+        vertices, normals, indices = self._create_cubes(centers, [0.1, 0.1, self.wall_height])
+        colors = np.broadcast_to(np.array(wall_color, dtype=np.float32), vertices.shape)
         
-        self.set_geometry(vertices, colors)
+        self.set_geometry(vertices, colors, indices, normals=normals)
     
     def generate_city_geometry(self, city_data):
         """Generate 3D city buildings from city layout data."""
         height, width = city_data.shape[:2]
-        vertices = []
-        colors = []
         
-        for y in range(0, height, 4):  # Sample every 4th pixel for buildings
-            for x in range(0, width, 4):
-                if y < height and x < width:
-                    pixel = city_data[y, x]
-                    
-                    # Check if this is a building area (not road)
-                    if not np.array_equal(pixel, [80, 80, 80]):  # Not road color
-                        x_pos = (x / width) * 8 - 4
-                        y_pos = (y / height) * 8 - 4
-                        
-                        # Random building height based on district type
-                        building_height = np.random.uniform(0.5, self.building_height)
-                        
-                        # Create building cube
-                        cube_vertices = self._create_cube_at(x_pos, y_pos, building_height/2, 0.15, 0.15, building_height)
-                        vertices.extend(cube_vertices)
-                        
-                        # Use district color
-                        building_color = pixel / 255.0
-                        for _ in range(len(cube_vertices)):
-                            colors.append(building_color)
+        # Sample every 4th pixel for buildings, skipping road pixels
+        samples = np.asarray(city_data)[::4, ::4]
+        ys, xs = np.mgrid[0:height:4, 0:width:4]
+        buildings = ~np.all(samples == [80, 80, 80], axis=-1)
         
-        self.set_geometry(vertices, colors)
+        # Random building height per building, drawn in row order
+        building_heights = np.random.uniform(0.5, self.building_height, size=int(buildings.sum()))
+        centers = np.stack([(xs[buildings] / width) * 8 - 4, (ys[buildings] / height) * 8 - 4, building_heights / 2], axis=-1)
+        sizes = np.stack([np.full(len(centers), 0.15), np.full(len(centers), 0.15), building_heights], axis=-1)
+        vertices, normals, indices = self._create_cubes(centers, sizes)
+        
+        # Use district color
+        colors = np.repeat(samples[buildings] / 255.0, len(self.CUBE_CORNERS), axis=0)
+        
+        self.set_geometry(vertices, colors, indices, normals=normals)
     
     def _height_to_terrain_color(self, height):
         """Convert height to terrain color."""
-        h = height / self.height_scale  # Normalize
-        
-        if h < 0.2:  # Water
-            return [0.0, 0.4, 0.8]
-        elif h < 0.4:  # Beach
-            return [0.76, 0.7, 0.5]
-        elif h < 0.6:  # Grass
-            return [0.13, 0.55, 0.13]
-        elif h < 0.8:  # Hills
-            return [0.0, 0.39, 0.0]
-        else:  # Mountains
-            return [1.0, 1.0, 1.0]
+        return self._terrain_colors(height).tolist()
+    
+    def _terrain_colors(self, heights):
+        """Terrain colors for an array of heights, by height band."""
+        return self.TERRAIN_COLORS[np.searchsorted(self.TERRAIN_LEVELS, np.asarray(heights) / self.height_scale, side='right')]
     
     def _create_cube_at(self, x, y, z, width, depth, height):
         """Create cube vertices at specified position."""
-        w, d, h = width/2, depth/2, height/2
+        vertices, _, _ = self._create_cubes([[x, y, z]], [width, depth, height])
+        return vertices.tolist()
+    
+    def _create_cubes(self, centers, sizes):
+        """Vertex, normal and triangle index buffers for many axis-aligned cubes at once.
         
-        return [
-            # Front face
-            [x-w, y-d, z-h], [x+w, y-d, z-h], [x+w, y-d, z+h], [x-w, y-d, z+h],
-            # Back face  
-            [x-w, y+d, z-h], [x-w, y+d, z+h], [x+w, y+d, z+h], [x+w, y+d, z-h],
-            # Top face
-            [x-w, y-d, z+h], [x+w, y-d, z+h], [x+w, y+d, z+h], [x-w, y+d, z+h],
-            # Bottom face
-            [x-w, y-d, z-h], [x-w, y+d, z-h], [x+w, y+d, z-h], [x+w, y-d, z-h],
-            # Right face
-            [x+w, y-d, z-h], [x+w, y+d, z-h], [x+w, y+d, z+h], [x+w, y-d, z+h],
-            # Left face
-            [x-w, y-d, z-h], [x-w, y-d, z+h], [x-w, y+d, z+h], [x-w, y+d, z-h]
-        ]
+        centers is (n, 3); sizes is (n, 3) or one (width, depth, height) for all cubes.
+        """
+        centers = np.asarray(centers, dtype=np.float32).reshape(-1, 3)
+        half_sizes = np.broadcast_to(np.asarray(sizes, dtype=np.float32) / 2, centers.shape)
+        corner_count = len(self.CUBE_CORNERS)
+        
+        vertices = centers[:, np.newaxis, :] + self.CUBE_CORNERS * half_sizes[:, np.newaxis, :]
+        normals = np.broadcast_to(self.CUBE_NORMALS, vertices.shape)
+        indices = (np.arange(len(centers), dtype=np.uint32)[:, np.newaxis] * corner_count + self.CUBE_INDICES).ravel()
+        return vertices.reshape(-1, 3), normals.reshape(-1, 3), indices
+
+
+# ==================== TEXTURE STREAMING ====================
+
+class StreamingTexture:
+    """
+    A texture allocated once and refreshed in place for streamed media.
+    
+    upload() takes an (height, width, 3) RGB or (height, width, 4) RGBA uint8
+    array. Texture storage is (re)allocated only when the frame size or channel
+    count changes. Every other upload writes the pixels into the next pixel
+    unpack buffer of a small ring and updates the texture from it with
+    glTexSubImage2D, so the driver can still be transferring one frame while
+    the next is written. RGB frames are uploaded as RGB with an unpack
+    alignment of 1 instead of being expanded to RGBA. Where pixel buffer
+    objects are unavailable the pixels go to glTexSubImage2D from client memory.
+    """
+    
+    use_pbo = True  # Cleared for the whole process once pixel buffers fail
+    
+    def __init__(self, pbo_count=2):
+        self.pbo_count = max(1, pbo_count)
+        self.texture_id = None
+        self.size = None  # (width, height, channels) of the allocated storage
+        self.upload_count = 0
+        self._pbos = []
+        self._next_pbo = 0
+    
+    def upload(self, pixels):
+        """Replace the texture contents with an RGB or RGBA frame."""
+        pixels = np.ascontiguousarray(pixels, dtype=np.uint8)
+        if pixels.ndim != 3 or pixels.shape[2] not in (3, 4):
+            raise ValueError(f"Expected an (height, width, 3 or 4) frame, got shape {pixels.shape}")
+        height, width, channels = pixels.shape
+        pixel_format = gl.GL_RGB if channels == 3 else gl.GL_RGBA
+        
+        if self.texture_id is None:
+            self._create_texture()
+        gl.glBindTexture(gl.GL_TEXTURE_2D, self.texture_id)
+        gl.glPixelStorei(gl.GL_UNPACK_ALIGNMENT, 1)
+        try:
+            if self.size != (width, height, channels):
+                internal_format = gl.GL_RGB8 if channels == 3 else gl.GL_RGBA8
+                gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, internal_format, width, height,
+                               0, pixel_format, gl.GL_UNSIGNED_BYTE, pixels)
+                self.size = (width, height, channels)
+            elif not (StreamingTexture.use_pbo and self._upload_from_pbo(pixels, pixel_format)):
+                gl.glTexSubImage2D(gl.GL_TEXTURE_2D, 0, 0, 0, width, height,
+                                  pixel_format, gl.GL_UNSIGNED_BYTE, pixels)
+        finally:
+            gl.glPixelStorei(gl.GL_UNPACK_ALIGNMENT, 4)
+        self.upload_count += 1
+    
+    def _create_texture(self):
+        """Generate the texture object with clamped, linearly filtered sampling."""
+        self.texture_id = gl.glGenTextures(1)
+        gl.glBindTexture(gl.GL_TEXTURE_2D, self.texture_id)
+        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_WRAP_S, gl.GL_CLAMP_TO_EDGE)
+        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_WRAP_T, gl.GL_CLAMP_TO_EDGE)
+        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, gl.GL_LINEAR)
+        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAG_FILTER, gl.GL_LINEAR)
+        self.size = None
+    
+    def _upload_from_pbo(self, pixels, pixel_format):
+        """Update the bound texture through the next pixel buffer of the ring."""
+        height, width = pixels.shape[:2]
+        try:
+            if not self._pbos:
+                self._pbos = [int(buffer_id) for buffer_id in np.atleast_1d(gl.glGenBuffers(self.pbo_count))]
+            pbo = self._pbos[self._next_pbo]
+            self._next_pbo = (self._next_pbo + 1) % len(self._pbos)
+            
+            gl.glBindBuffer(gl.GL_PIXEL_UNPACK_BUFFER, pbo)
+            # Orphan the old storage so writing never waits on a transfer still in flight
+            gl.glBufferData(gl.GL_PIXEL_UNPACK_BUFFER, pixels.nbytes, None, gl.GL_STREAM_DRAW)
+            gl.glBufferSubData(gl.GL_PIXEL_UNPACK_BUFFER, 0, pixels.nbytes, pixels)
+            gl.glTexSubImage2D(gl.GL_TEXTURE_2D, 0, 0, 0, width, height,
+                              pixel_format, gl.GL_UNSIGNED_BYTE, _buffer_offset())
+            gl.glBindBuffer(gl.GL_PIXEL_UNPACK_BUFFER, 0)
+            return True
+        except Exception as e:
+            print(f"DEBUG: Pixel buffer upload failed, uploading from client memory: {e}")
+            StreamingTexture.use_pbo = False
+            try:
+                gl.glBindBuffer(gl.GL_PIXEL_UNPACK_BUFFER, 0)
+            except Exception:
+                pass
+            self._release_pbos()
+            return False
+    
+    def _release_pbos(self):
+        """Delete the pixel buffer ring."""
+        pbos, self._pbos = self._pbos, []
+        self._next_pbo = 0
+        if pbos:
+            try:
+                gl.glDeleteBuffers(len(pbos), pbos)
+            except Exception:
+                pass
+    
+    def release(self):
+        """Delete the texture and its pixel buffers."""
+        self._release_pbos()
+        if self.texture_id is not None:
+            try:
+                gl.glDeleteTextures([self.texture_id])
+            except Exception:
+                pass
+        self.texture_id = None
+        self.size = None
+
+
+class GifFramePool:
+    """
+    Animated GIF frames decoded on demand into a bounded LRU pool.
+    
+    Opening a GIF reads only its size and frame count. A frame is decoded when
+    it is first requested and stays in the pool until it is the least recently
+    used of more than ``capacity`` frames, where capacity is ``max_frames``
+    or fewer if those would exceed ``max_bytes``. GIF frames build on their
+    predecessors, so decoding seeks the open image: playing forward decodes
+    one frame per step and jumping backwards decodes again from the start.
+    
+    Frames are (height, width, 4) RGBA uint8 arrays. The pool is also a
+    sequence of its frames, so ``len(pool)`` and ``pool[i]`` work like the
+    old list of decoded frames.
+    """
+    
+    def __init__(self, path, max_frames=32, max_bytes=64 * 1024 * 1024):
+        self.path = path
+        self._image = Image.open(path)
+        self.width, self.height = self._image.size
+        self.frame_count = max(1, getattr(self._image, 'n_frames', 1))
+        frame_bytes = max(1, self.width * self.height * 4)
+        self.capacity = max(2, min(max_frames, max_bytes // frame_bytes))
+        
+        # Durations in seconds, known once a frame has been decoded (100 ms until then)
+        self.durations = [0.1] * self.frame_count
+        self._durations_read = False
+        self._frames = OrderedDict()  # frame index -> RGBA array, most recent last
+        self.decode_count = 0
+    
+    def __len__(self):
+        return self.frame_count
+    
+    def __getitem__(self, index):
+        if not -self.frame_count <= index < self.frame_count:
+            raise IndexError(f"GIF frame {index} out of range ({self.frame_count} frames)")
+        return self.get_frame(index % self.frame_count)
+    
+    def get_frame(self, index):
+        """The RGBA pixels of a frame, decoding it if it is not pooled."""
+        frame = self._frames.get(index)
+        if frame is not None:
+            self._frames.move_to_end(index)
+            return frame
+        
+        self._image.seek(index)
+        frame = np.asarray(self._image.convert('RGBA'))
+        self.durations[index] = self._image.info.get('duration', 100) / 1000.0
+        self.decode_count += 1
+        
+        self._frames[index] = frame
+        while len(self._frames) > self.capacity:
+            self._frames.popitem(last=False)
+        return frame
+    
+    def read_durations(self):
+        """Read every frame's duration up front, without pooling the frames."""
+        for index in range(self.frame_count):
+            self._image.seek(index)
+            self.durations[index] = self._image.info.get('duration', 100) / 1000.0
+        self._durations_read = True
+        return self.durations
+    
+    def frame_at(self, seconds):
+        """Index of the frame showing ``seconds`` into looping playback."""
+        if not self._durations_read:
+            self.read_durations()
+        ends = np.cumsum(self.durations)
+        if ends[-1] <= 0:
+            return 0
+        index = int(np.searchsorted(ends, seconds % ends[-1], side='right'))
+        return min(index, self.frame_count - 1)
+    
+    def close(self):
+        """Drop pooled frames and close the image file."""
+        self._frames.clear()
+        try:
+            self._image.close()
+        except Exception:
+            pass
+
+
+class VideoDecodePipeline:
+    """Long-lived video decoder streaming sequential frames into a ring buffer.
+    
+    One FFmpeg process (or an OpenCV capture when FFmpeg is unavailable) decodes
+    forward from the last seek point on a read-ahead thread, writing raw RGB
+    frames into a preallocated ring of about one second of video. The thread
+    stays at most ``read_ahead`` frames ahead of the last requested frame. A
+    request outside the buffered window restarts the decoder only when that is
+    cheaper than decoding forward, i.e. when a keyframe lies between the
+    current decode position and the target.
+    """
+    
+    def __init__(self, media_path, fps, width=768, height=432, frame_count=0,
+                 capacity=None, backend="ffmpeg"):
+        self.media_path = media_path
+        self.fps = fps if fps and fps > 0 else 30.0
+        self.width = width
+        self.height = height
+        self.frame_count = frame_count
+        self.backend = backend
+        self.capacity = max(4, int(math.ceil(capacity or self.fps)))
+        self.read_ahead = self.capacity - 2  # Never overwrite the requested frame or the one before it
+        self.min_seek_gap = max(2, self.capacity // 2)  # Decode forward rather than respawn for small gaps
+        
+        # Preallocated ring of raw frames; slot i holds frame _slot_frames[i]
+        self._frames = np.empty((self.capacity, height, width, 3), dtype=np.uint8)
+        self._slot_frames = np.full(self.capacity, -1, dtype=np.int64)
+        
+        self._condition = threading.Condition()
+        self._requested = 0
+        self._seek_to = 0  # Start decoding from the first frame
+        self._decode_pos = 0
+        self._eof = False
+        self._closed = False
+        self._failed = False
+        self._keyframes = None  # Sorted keyframe frame indices once probed
+        
+        self._process = None
+        self._capture = None
+        self._thread = None
+    
+    def start(self):
+        """Start the read-ahead thread (and the keyframe probe for FFmpeg)."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._decode_loop, daemon=True)
+        self._thread.start()
+        if self.backend == "ffmpeg":
+            threading.Thread(target=self._probe_keyframes, daemon=True).start()
+    
+    def close(self):
+        """Stop the read-ahead thread and the decoder process."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._close_decoder()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+        self._thread = None
+    
+    @property
+    def failed(self):
+        """True once the decoder could not be started."""
+        return self._failed
+    
+    def get_frame(self, frame_index, timeout=1.0):
+        """Get a vertically flipped copy of a frame, waiting up to ``timeout`` for the decoder."""
+        if self.frame_count and frame_index >= self.frame_count:
+            return None
+        if self._thread is None:
+            self.start()
+        
+        deadline = time.time() + timeout
+        with self._condition:
+            self._requested = frame_index
+            if not self._is_buffered(frame_index) and self._needs_seek(frame_index):
+                self._seek_to = frame_index
+            self._condition.notify_all()
+            
+            while not self._is_buffered(frame_index):
+                if self._closed or self._failed:
+                    return None
+                if self._eof and self._seek_to is None and frame_index >= self._decode_pos:
+                    return None  # Past the end of the stream
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return None
+                self._condition.wait(remaining)
+            
+            # Flip vertically for OpenGL; copying under the lock keeps the slot stable
+            return self._frames[frame_index % self.capacity][::-1].copy()
+    
+    def _is_buffered(self, frame_index):
+        """Check whether a frame currently sits in the ring (call with the lock held)."""
+        return self._slot_frames[frame_index % self.capacity] == frame_index
+    
+    def _needs_seek(self, frame_index):
+        """Decide between restarting the decoder and decoding forward (call with the lock held)."""
+        if self._seek_to is not None:
+            return True  # A restart is already pending, retarget it
+        if frame_index < self._decode_pos:
+            return True  # Behind the decoder and no longer buffered
+        gap = frame_index - self._decode_pos
+        if gap <= self.min_seek_gap:
+            return False
+        if self._keyframes is None:
+            return gap > self.capacity
+        # Seeking only helps if it lands on a keyframe past the current decode position
+        next_keyframe = np.searchsorted(self._keyframes, self._decode_pos, side='right')
+        return next_keyframe < len(self._keyframes) and self._keyframes[next_keyframe] <= frame_index
+    
+    def _decode_loop(self):
+        """Read-ahead thread: decode sequential frames into the ring."""
+        while True:
+            with self._condition:
+                while (not self._closed and self._seek_to is None and
+                       (self._eof or self._decode_pos >= self._requested + self.read_ahead)):
+                    self._condition.wait()
+                if self._closed:
+                    break
+                seek_to = self._seek_to
+                self._seek_to = None
+                if seek_to is not None:
+                    self._decode_pos = seek_to
+                    self._eof = False
+                    self._slot_frames[:] = -1
+                frame_index = self._decode_pos
+                slot = frame_index % self.capacity
+                self._slot_frames[slot] = -1  # Invalidate before overwriting
+            
+            if seek_to is not None and not self._open_decoder(seek_to):
+                with self._condition:
+                    self._failed = True
+                    self._condition.notify_all()
+                break
+            
+            ok = self._read_frame(self._frames[slot])
+            with self._condition:
+                if self._seek_to is not None:
+                    continue  # Frame belongs to the old position, drop it
+                if ok:
+                    self._slot_frames[slot] = frame_index
+                    self._decode_pos = frame_index + 1
+                else:
+                    self._eof = True
+                self._condition.notify_all()
+        
+        # The decoder may have been (re)opened after close() ran
+        self._close_decoder()
+    
+    def _open_decoder(self, frame_index):
+        """(Re)start the decoder at a frame index."""
+        self._close_decoder()
+        try:
+            if self.backend == "opencv":
+                self._capture = cv2.VideoCapture(self.media_path)
+                if not self._capture.isOpened():
+                    return False
+                if frame_index > 0:
+                    self._capture.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
+                return True
+            
+            # Input seeking: FFmpeg jumps to the keyframe before the timestamp and decodes forward
+            ffmpeg_cmd = [
+                'ffmpeg', '-ss', str(frame_index / self.fps), '-i', self.media_path,
+                '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-s', f'{self.width}x{self.height}',
+                '-an', '-loglevel', 'panic', '-'
+            ]
+            self._process = subprocess.Popen(ffmpeg_cmd, stdout=subprocess.PIPE,
+                                             stderr=subprocess.DEVNULL,
+                                             bufsize=self.width * self.height * 3)
+            return True
+        except Exception as e:
+            print(f"DEBUG: Failed to start video decoder: {e}")
+            return False
+    
+    def _read_frame(self, target):
+        """Read the next decoded frame into a ring slot. Returns False at end of stream."""
+        try:
+            if self._capture is not None:
+                ok, frame = self._capture.read()
+                if not ok:
+                    return False
+                frame = cv2.resize(frame, (self.width, self.height))
+                cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=target)
+                return True
+            
+            if self._process is None:
+                return False
+            view = memoryview(target).cast('B')
+            filled = 0
+            while filled < len(view):
+                count = self._process.stdout.readinto(view[filled:])
+                if not count:
+                    return False
+                filled += count
+            return True
+        except Exception:
+            return False
+    
+    def _close_decoder(self):
+        """Terminate the current decoder process or capture."""
+        process, self._process = self._process, None
+        if process is not None:
+            try:
+                process.kill()
+                process.stdout.close()
+                process.wait(timeout=1.0)
+            except Exception:
+                pass
+        capture, self._capture = self._capture, None
+        if capture is not None:
+            capture.release()
+    
+    def _probe_keyframes(self):
+        """Collect keyframe positions so seeks can tell when respawning pays off."""
+        try:
+            result = subprocess.run([
+                'ffprobe', '-v', 'error', '-select_streams', 'v:0', '-skip_frame', 'nokey',
+                '-show_entries', 'frame=pts_time', '-of', 'csv=p=0', self.media_path
+            ], capture_output=True, text=True, timeout=30)
+            if result.returncode != 0:
+                return
+            times = [float(line.split(',')[0]) for line in result.stdout.split() if line and line[0].isdigit()]
+            keyframes = np.unique(np.round(np.array(times) * self.fps).astype(np.int64))
+            with self._condition:
+                self._keyframes = keyframes
+        except Exception as e:
+            print(f"DEBUG: Keyframe probe failed: {e}")
 
 
 class MediaScreen(Screen):
@@ -2966,6 +4430,8 @@ class MediaScreen(Screen):
         self.media_type = media_type
         self.media_path = None
         self.media_texture_id = None
+        self.media_texture = StreamingTexture()  # Allocated once, refreshed in place
+        self._uploaded_frame = None  # Last video frame or GIF frame index sent to the texture
         self.media_data_loaded = False  # Track if media data is loaded
         self.image_data = None  # Store PIL Image data before OpenGL texture creation
         
@@ -2985,7 +4451,8 @@ class MediaScreen(Screen):
         
         # FFmpeg-based video processing
         self.ffmpeg_process = None
-        self.frame_cache = {}  # Dictionary for frame index -> frame data
+        self.decode_pipeline = None  # Long-lived VideoDecodePipeline, created on first frame request
+        self.frame_cache = OrderedDict()  # LRU of frame index -> frame data, most recent last
         self.cache_size_limit = 200  # Maximum number of cached frames (enough for most videos)
         self.max_cache_size = 30  # Cache 30 frames (~1 second at 30fps)
         
@@ -2998,7 +4465,7 @@ class MediaScreen(Screen):
         self.simple_cache_loaded = False
         
         # GIF-specific properties
-        self.gif_frames = []
+        self.gif_frames = []  # GifFramePool once a GIF is loaded
         self.gif_frame_index = 0
         self.gif_frame_durations = []
         self.gif_last_frame_time = 0.0
@@ -3040,6 +4507,7 @@ class MediaScreen(Screen):
         # UI update optimization
         self.last_ui_update = 0
         self.ui_update_interval = 1.0 / 60.0  # Limit UI updates to 60 FPS max
+        self.media_clock = time.time  # Offscreen rendering substitutes its fixed-timestep scene clock
         
     def load_media(self, file_path: str) -> bool:
         """Load media from the specified file path."""
@@ -3148,6 +4616,8 @@ class MediaScreen(Screen):
         """Load a video file with audio support."""
         try:
             print(f"DEBUG: Loading video data from {self.media_path}")
+            self._close_decode_pipeline()
+            self.frame_cache.clear()
             
             # Check if file exists and is readable
             if not os.path.exists(self.media_path):
@@ -3263,46 +4733,22 @@ class MediaScreen(Screen):
             return False
     
     def _load_gif(self) -> bool:
-        """Load an animated GIF."""
+        """Load an animated GIF; frames are decoded lazily into a bounded pool."""
         try:
             print(f"DEBUG: Starting GIF load for {self.media_path}")
-            gif_image = Image.open(self.media_path)
-            print(f"DEBUG: Opened GIF image, format: {gif_image.format}")
-            
-            # Extract all frames from the GIF
-            self.gif_frames = []
-            self.gif_frame_durations = []
+            if isinstance(self.gif_frames, GifFramePool):
+                self.gif_frames.close()
+            self.gif_frames = GifFramePool(self.media_path)
+            self.gif_frame_durations = self.gif_frames.durations
+            self.gif_frame_index = 0
+            self._uploaded_frame = None
             
-            frame_index = 0
-            while True:
-                try:
-                    gif_image.seek(frame_index)
-                    frame = gif_image.convert('RGBA')
-                    print(f"DEBUG: Processing frame {frame_index}, size: {frame.size}")
-                    
-                    # Store frame data
-                    self.gif_frames.append(frame.tobytes())
-                    
-                    # Get frame duration (in milliseconds)
-                    duration = gif_image.info.get('duration', 100)  # Default 100ms
-                    self.gif_frame_durations.append(duration / 1000.0)  # Convert to seconds
-                    print(f"DEBUG: Frame {frame_index} duration: {duration}ms")
-                    
-                    frame_index += 1
-                except EOFError:
-                    print(f"DEBUG: Reached end of GIF at frame {frame_index}")
-                    break
-            
-            if not self.gif_frames:
-                print(f"DEBUG: No frames found in GIF: {self.media_path}")
-                return False
-            
-            print(f"DEBUG: Extracted {len(self.gif_frames)} frames from GIF")
+            # Decode the first frame now so a broken file fails here, not while rendering
+            self.gif_frames.get_frame(0)
+            print(f"DEBUG: GIF has {len(self.gif_frames)} frames, pooling up to {self.gif_frames.capacity}")
             
-            # Store frame dimensions from first frame
-            first_frame_img = Image.open(self.media_path)
-            self.gif_width = first_frame_img.width
-            self.gif_height = first_frame_img.height
+            self.gif_width = self.gif_frames.width
+            self.gif_height = self.gif_frames.height
             
             # Mark data as loaded (texture creation deferred)
             self.media_data_loaded = True
@@ -3634,119 +5080,74 @@ class MediaScreen(Screen):
                 self.use_system_audio = False
     
     def _get_video_frame(self, frame_index):
-        """Extract frame with optimized caching and minimal blocking."""
+        """Get a frame from the LRU cache or the persistent decode pipeline."""
         try:
             # Check if frame index is within video bounds
             if hasattr(self, 'video_frame_count') and frame_index >= self.video_frame_count:
                 return None
             
-            # Initialize cache
-            if not hasattr(self, 'frame_cache'):
-                self.frame_cache = {}
-                self.cache_size_limit = 100  # Increased cache size for better performance
-            
             # Check cache first (FAST PATH)
             if frame_index in self.frame_cache:
+                self.frame_cache.move_to_end(frame_index)
                 return self.frame_cache[frame_index]
             
-            # For uncached frames, try to extract quickly
-            timestamp = frame_index / self.video_fps
-            
-            # Test basic video access first (only once)
-            if not hasattr(self, '_video_tested'):
-                test_cmd = ['ffprobe', '-v', 'quiet', '-print_format', 'json', '-show_format', self.media_path]
-                try:
-                    test_result = subprocess.run(test_cmd, capture_output=True, text=True, timeout=3)
-                    self._video_tested = (test_result.returncode == 0)
-                    if not self._video_tested:
-                        return None
-                except Exception:
-                    self._video_tested = False
-                    return None
-            
-            # Optimized FFmpeg command with faster seeking
-            ffmpeg_cmd = [
-                'ffmpeg', '-ss', str(timestamp), '-i', self.media_path,
-                '-vframes', '1', '-f', 'rawvideo', '-pix_fmt', 'rgb24',
-                '-s', '768x432', '-an', '-loglevel', 'panic', '-'  # 'panic' reduces overhead
-            ]
-            
-            try:
-                # Reduced timeout for faster failure detection
-                result = subprocess.run(ffmpeg_cmd, stdout=subprocess.PIPE, 
-                                      stderr=subprocess.PIPE, timeout=5)
-                
-                if result.returncode == 0 and len(result.stdout) == 768 * 432 * 3:
-                    # Convert to numpy array
-                    frame = np.frombuffer(result.stdout, dtype=np.uint8)
-                    frame = frame.reshape((432, 768, 3))
-                    frame = np.flipud(frame)
-                
-                    # Cache management - remove oldest entries if cache is full
-                    if len(self.frame_cache) >= self.cache_size_limit:
-                        old_keys = sorted(self.frame_cache.keys())[:10]  # Remove more at once
-                        for key in old_keys:
-                            del self.frame_cache[key]
-                
-                    # Store in cache
-                    self.frame_cache[frame_index] = frame.copy()
-                    return frame
-            
-            except subprocess.TimeoutExpired:
-                # Frame extraction timed out - return None to avoid blocking
-                pass
-            except Exception:
-                # Any other error - return None to avoid blocking
-                pass
-            
-            return None
+            pipeline = self._get_decode_pipeline()
+            if pipeline is None:
+                return None
+            frame = pipeline.get_frame(frame_index)
+            if frame is not None:
+                self._cache_video_frame(frame_index, frame)
+            return frame
             
         except Exception:
             return None
     
+    def _cache_video_frame(self, frame_index, frame):
+        """Store a frame in the LRU cache, evicting the least recently used ones."""
+        if not isinstance(self.frame_cache, OrderedDict):
+            self.frame_cache = OrderedDict(self.frame_cache)
+        self.frame_cache[frame_index] = frame
+        self.frame_cache.move_to_end(frame_index)
+        while len(self.frame_cache) > max(1, self.cache_size_limit):
+            self.frame_cache.popitem(last=False)
+    
+    def _get_decode_pipeline(self):
+        """Get the running decode pipeline, starting one for the current video if needed."""
+        pipeline = self.decode_pipeline
+        if pipeline is not None and pipeline.media_path == self.media_path and not pipeline.failed:
+            return pipeline
+        if pipeline is not None:
+            pipeline.close()
+            self.decode_pipeline = None
+            if pipeline.failed:
+                return None  # Don't respawn a decoder that cannot open this file
+        if not self.media_path:
+            return None
+        
+        # OpenCV only when FFprobe was unavailable at load time
+        backend = "opencv" if self.video_capture is not None else "ffmpeg"
+        self.decode_pipeline = VideoDecodePipeline(
+            self.media_path, self.video_fps, frame_count=self.video_frame_count, backend=backend)
+        self.decode_pipeline.start()
+        return self.decode_pipeline
+    
+    def _close_decode_pipeline(self):
+        """Shut down the decode pipeline and its decoder process."""
+        if self.decode_pipeline is not None:
+            self.decode_pipeline.close()
+            self.decode_pipeline = None
+    
     def _start_frame_preloader(self):
         """Start background frame preloading for smoother playback."""
-        if self.preload_thread is None or not self.preload_thread.is_alive():
-            self.preload_active = True
-            self.preload_thread = threading.Thread(target=self._preload_frames_worker, daemon=True)
-            self.preload_thread.start()
+        # The decode pipeline's read-ahead thread does the preloading
+        self._get_decode_pipeline()
     
     def _stop_frame_preloader(self):
         """Stop background frame preloading."""
         self.preload_active = False
         if self.preload_thread and self.preload_thread.is_alive():
             self.preload_thread.join(timeout=1.0)
-    
-    def _preload_frames_worker(self):
-        """Background worker to preload frames ahead of current playback position."""
-        while self.preload_active and self.video_playing:
-            try:
-                current_frame = getattr(self, 'current_frame_index', 0)
-                
-                # Preload frames ahead of current position
-                for i in range(1, self.preload_ahead_frames + 1):
-                    if not self.preload_active:
-                        break
-                        
-                    target_frame = current_frame + i
-                    
-                    # Skip if frame is already cached or beyond video length
-                    if (target_frame in getattr(self, 'frame_cache', {}) or 
-                        target_frame >= getattr(self, 'video_frame_count', 0)):
-                        continue
-                    
-                    # Preload the frame (this will cache it)
-                    self._get_video_frame(target_frame)
-                    
-                    # Small delay to avoid overwhelming the system
-                    time.sleep(0.01)
-                
-                # Sleep before next preload cycle
-                time.sleep(0.1)
-                
-            except Exception:
-                # Continue preloading even if individual frames fail
-                time.sleep(0.1)
+        self._close_decode_pipeline()
     
     def _prepare_simple_playback(self):
         """Pre-extract a few frames for simple playback fallback."""
@@ -4441,74 +5842,32 @@ class MediaScreen(Screen):
         try:
             if (self.media_type == MediaType.IMAGE or self.media_type == MediaType.WEB) and self.image_data:
                 print(f"DEBUG: Creating OpenGL texture for {self.media_type.value} {self.name}")
-                # Generate OpenGL texture for image
-                self.media_texture_id = gl.glGenTextures(1)
-                gl.glBindTexture(gl.GL_TEXTURE_2D, self.media_texture_id)
-                
-                gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_WRAP_S, gl.GL_CLAMP_TO_EDGE)
-                gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_WRAP_T, gl.GL_CLAMP_TO_EDGE)
-                gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, gl.GL_LINEAR)
-                gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAG_FILTER, gl.GL_LINEAR)
-                
-                gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, gl.GL_RGBA, self.image_data.width, self.image_data.height, 
-                               0, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, self.image_data.tobytes())
-                
+                self._stream_to_texture(np.asarray(self.image_data))
                 print(f"DEBUG: Created image texture {self.media_texture_id} for {self.name}")
                 
             elif self.media_type == MediaType.GIF and self.gif_frames:
                 print(f"DEBUG: Creating OpenGL texture for GIF {self.name}")
-                # Generate OpenGL texture for GIF
-                self.media_texture_id = gl.glGenTextures(1)
-                gl.glBindTexture(gl.GL_TEXTURE_2D, self.media_texture_id)
-                
-                gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_WRAP_S, gl.GL_CLAMP_TO_EDGE)
-                gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_WRAP_T, gl.GL_CLAMP_TO_EDGE)
-                gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, gl.GL_LINEAR)
-                gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAG_FILTER, gl.GL_LINEAR)
-                
-                # Initialize with first frame
-                gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, gl.GL_RGBA, self.gif_width, self.gif_height,
-                               0, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, self.gif_frames[0])
-                
+                # Initialize with the current frame
+                self._stream_to_texture(self.gif_frames.get_frame(self.gif_frame_index))
+                self._uploaded_frame = self.gif_frame_index
                 print(f"DEBUG: Created GIF texture {self.media_texture_id} for {self.name}")
                 
             elif self.media_type == MediaType.VIDEO:
                 print(f"DEBUG: Creating OpenGL texture for video {self.name}")
                 try:
-                    # Generate OpenGL texture for video
-                    print(f"DEBUG: Generating OpenGL texture...")
-                    self.media_texture_id = gl.glGenTextures(1)
-                    print(f"DEBUG: Generated texture ID: {self.media_texture_id}")
-                    
-                    gl.glBindTexture(gl.GL_TEXTURE_2D, self.media_texture_id)
-                    
-                    gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_WRAP_S, gl.GL_CLAMP_TO_EDGE)
-                    gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_WRAP_T, gl.GL_CLAMP_TO_EDGE)
-                    gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, gl.GL_LINEAR)
-                    gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAG_FILTER, gl.GL_LINEAR)
-                    
                     # Get first frame using FFmpeg to initialize texture
                     print(f"DEBUG: Getting first frame from video using FFmpeg...")
                     frame = self._get_video_frame(0)
                     
                     if frame is not None:
                         height, width = frame.shape[:2]
-                        print(f"DEBUG: Frame dimensions: {width}x{height}")
-                        
-                        # Add alpha channel
-                        print(f"DEBUG: Adding alpha channel...")
-                        frame_rgba = np.dstack([frame, np.full((height, width), 255, dtype=np.uint8)])
-                        
-                        print(f"DEBUG: Creating OpenGL texture with frame data...")
-                        gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, gl.GL_RGBA, width, height,
-                                       0, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, frame_rgba.tobytes())
-                        
+                        # RGB frames are uploaded as they are, without adding an alpha channel
+                        self._stream_to_texture(frame)
+                        self._uploaded_frame = frame
                         print(f"DEBUG: Created video texture {self.media_texture_id} for {self.name} ({width}x{height})")
                     else:
                         print(f"DEBUG: Failed to get first frame from video {self.name}")
                         return
-                    
-                    print(f"DEBUG: Successfully created video texture {self.media_texture_id} for {self.name}")
                 except Exception as video_texture_error:
                     print(f"DEBUG: Exception creating video texture: {video_texture_error}")
                     import traceback
@@ -4522,9 +5881,14 @@ class MediaScreen(Screen):
             import traceback
             traceback.print_exc()
     
+    def _stream_to_texture(self, pixels):
+        """Upload an RGB or RGBA frame into the screen's persistent texture."""
+        self.media_texture.upload(pixels)
+        self.media_texture_id = self.media_texture.texture_id
+    
     def update_media_texture(self):
         """Update the media texture with current frame/animation state."""
-        current_time = time.time()
+        current_time = self.media_clock()
         
         # Throttle UI updates to prevent overwhelming the main thread
         if current_time - self.last_ui_update < self.ui_update_interval:
@@ -4540,21 +5904,13 @@ class MediaScreen(Screen):
         self.last_ui_update = current_time
         
         if self.media_type == MediaType.VIDEO and self.current_frame is not None:
+            # The playback thread replaces current_frame rather than writing into it,
+            # so the reference can be uploaded without copying
             with self.frame_lock:
-                frame = self.current_frame.copy()
-            
-            # Convert to RGBA
-            if len(frame.shape) == 3 and frame.shape[2] == 3:
-                height, width = frame.shape[:2]
-                # Add alpha channel
-                frame_rgba = np.dstack([frame, np.full((height, width), 255, dtype=np.uint8)])
-            else:
-                frame_rgba = frame
-                height, width = frame.shape[:2]
-            
-            gl.glBindTexture(gl.GL_TEXTURE_2D, self.media_texture_id)
-            gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, gl.GL_RGBA, width, height,
-                           0, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, frame_rgba.tobytes())
+                frame = self.current_frame
+            if frame is not self._uploaded_frame:
+                self._stream_to_texture(frame)
+                self._uploaded_frame = frame
         
         elif self.media_type == MediaType.GIF and self.gif_frames:
             # Check if it's time to advance to next frame
@@ -4565,11 +5921,10 @@ class MediaScreen(Screen):
                 self.gif_last_frame_time = current_time
                 print(f"DEBUG: GIF frame advanced from {old_index} to {self.gif_frame_index}")
             
-            # Update texture with current frame
-            frame_data = self.gif_frames[self.gif_frame_index]
-            gl.glBindTexture(gl.GL_TEXTURE_2D, self.media_texture_id)
-            gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, gl.GL_RGBA, self.gif_width, self.gif_height,
-                           0, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, frame_data)
+            # Update texture only when the frame changed
+            if self.gif_frame_index != self._uploaded_frame:
+                self._stream_to_texture(self.gif_frames.get_frame(self.gif_frame_index))
+                self._uploaded_frame = self.gif_frame_index
         
         elif self.media_type == MediaType.WEB and self.web_auto_refresh:
             # Check if it's time to refresh the website
@@ -4577,20 +5932,21 @@ class MediaScreen(Screen):
                 print(f"DEBUG: Refreshing website: {self.web_url}")
                 if self._capture_website_screenshot() and self.image_data:
                     # Update texture with new screenshot
-                    gl.glBindTexture(gl.GL_TEXTURE_2D, self.media_texture_id)
-                    gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, gl.GL_RGBA, self.image_data.width, self.image_data.height, 
-                                   0, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, self.image_data.tobytes())
+                    self._stream_to_texture(np.asarray(self.image_data))
                     print(f"DEBUG: Website texture updated")
         
         elif self.media_type == MediaType.IMAGE and self.image_data:
             # Handle dynamic image updates (like animated Game of Life)
             # Check if we need to update the texture (for animated content)
             if hasattr(self, 'is_animated_game_of_life') and self.is_animated_game_of_life:
-                # Always update texture for animated Game of Life
-                gl.glBindTexture(gl.GL_TEXTURE_2D, self.media_texture_id)
-                gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, gl.GL_RGBA, self.image_data.width, self.image_data.height,
-                               0, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, self.image_data.tobytes())
-                print(f"DEBUG: Updated Game of Life texture for generation {getattr(self, 'gol_generation', 'unknown')}")
+                # Only upload when the automaton produced a new generation
+                if getattr(self, 'gol_frame_dirty', False):
+                    self._upload_game_of_life_frame()
+    
+    def _upload_game_of_life_frame(self):
+        """Upload the automaton's RGBA buffer in place (no PIL round trip, no reallocation)."""
+        self._stream_to_texture(self.cellular_automaton.get_rgba_buffer())
+        self.gol_frame_dirty = False
     
     def cleanup(self):
         """Clean up media resources."""
@@ -4611,42 +5967,568 @@ class MediaScreen(Screen):
             self.audio_channel.stop()
             self.audio_channel = None
         
-        if self.audio_file and os.path.exists(self.audio_file):
-            try:
-                os.unlink(self.audio_file)
-                print(f"DEBUG: Temporary audio file cleaned up")
-            except Exception as e:
-                print(f"DEBUG: Error cleaning up audio file: {e}")
-            self.audio_file = None
+        if self.audio_file and os.path.exists(self.audio_file):
+            try:
+                os.unlink(self.audio_file)
+                print(f"DEBUG: Temporary audio file cleaned up")
+            except Exception as e:
+                print(f"DEBUG: Error cleaning up audio file: {e}")
+            self.audio_file = None
+        
+        if self.video_capture:
+            self.video_capture.release()
+            self.video_capture = None
+        
+        if isinstance(self.gif_frames, GifFramePool):
+            self.gif_frames.close()
+        self.gif_frames = []
+        
+        self.media_texture.release()
+        self.media_texture_id = None
+        self._uploaded_frame = None
+    
+    def to_dict(self):
+        """Serialize media screen to dictionary."""
+        data = super().to_dict()
+        data.update({
+            'media_type': self.media_type.value if self.media_type else None,
+            'media_path': self.media_path
+        })
+        return data
+    
+    def from_dict(self, data: dict):
+        """Deserialize media screen from dictionary."""
+        super().from_dict(data)
+        
+        media_type_str = data.get('media_type')
+        if media_type_str:
+            self.media_type = MediaType(media_type_str)
+        
+        media_path = data.get('media_path')
+        if media_path and os.path.exists(media_path):
+            self.load_media(media_path)
+
+
+# ==================== BATCHED SCREEN RAY ENGINE ====================
+
+_SCREEN_LIGHT_DIR = np.array([1.0, 1.0, 1.0]) / math.sqrt(3.0)
+
+# Same order as SphereRenderer.get_cube_face_color so ties resolve identically
+_CUBE_FACE_NORMALS = np.array([
+    [0.0, 0.0, 1.0],
+    [0.0, 0.0, -1.0],
+    [0.0, 1.0, 0.0],
+    [0.0, -1.0, 0.0],
+    [1.0, 0.0, 0.0],
+    [-1.0, 0.0, 0.0]
+])
+_CUBE_FACE_COLORS = np.array([
+    [1.0, 0.0, 0.0],    # Front face (+Z) - RED
+    [0.0, 0.0, 1.0],    # Back face (-Z) - BLUE
+    [0.0, 1.0, 0.0],    # Top face (+Y) - GREEN
+    [1.0, 1.0, 0.0],    # Bottom face (-Y) - YELLOW
+    [1.0, 0.5, 0.0],    # Right face (+X) - ORANGE
+    [0.5, 0.0, 1.0]     # Left face (-X) - PURPLE
+])
+
+
+def _rotation_matrix_xyz(rotation_degrees):
+    """Local-to-world rotation matching glRotatef applied X, then Y, then Z."""
+    rx, ry, rz = np.radians(np.asarray(rotation_degrees, dtype=np.float64))
+    cos_x, sin_x = math.cos(rx), math.sin(rx)
+    cos_y, sin_y = math.cos(ry), math.sin(ry)
+    cos_z, sin_z = math.cos(rz), math.sin(rz)
+    R_x = np.array([[1, 0, 0], [0, cos_x, -sin_x], [0, sin_x, cos_x]])
+    R_y = np.array([[cos_y, 0, sin_y], [0, 1, 0], [-sin_y, 0, cos_y]])
+    R_z = np.array([[cos_z, -sin_z, 0], [sin_z, cos_z, 0], [0, 0, 1]])
+    return R_z @ R_y @ R_x
+
+
+def _normalize_rows(vectors):
+    """Normalize an (N, 3) array row by row."""
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _cube_face_colors(normals):
+    """Vectorized SphereRenderer.get_cube_face_color for an (N, 3) normal array."""
+    dots = _normalize_rows(normals) @ _CUBE_FACE_NORMALS.T
+    return _CUBE_FACE_COLORS[np.argmax(dots, axis=1)]
+
+
+def _ray_box_batch(origins, directions, box_size):
+    """Slab test of a ray packet against an axis-aligned box centred at the origin.
+    
+    Mirrors SphereRenderer.ray_box_intersection; returns (hit, t, points, normals)
+    with t set to inf for rays that miss.
+    """
+    ray_dir = np.where(np.abs(directions) < 1e-8, np.sign(directions) * 1e-8, directions)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t1 = (-box_size - origins) / ray_dir
+        t2 = (box_size - origins) / ray_dir
+    t_near = np.max(np.minimum(t1, t2), axis=1)
+    t_far = np.min(np.maximum(t1, t2), axis=1)
+    hit = ~(t_near > t_far) & ~(t_far < 0)
+    t = np.where(t_near > 0, t_near, t_far)
+    t = np.where(hit, t, np.inf)
+    
+    points = np.zeros_like(origins)
+    normals = np.zeros_like(origins)
+    if hit.any():
+        points[hit] = origins[hit] + t[hit, None] * directions[hit]
+        rel_pos = points[hit]
+        axis = np.argmax(np.abs(rel_pos / box_size), axis=1)
+        rows = np.arange(len(axis))
+        face = np.zeros_like(rel_pos)
+        face[rows, axis] = np.where(rel_pos[rows, axis] > 0, 1.0, -1.0)
+        normals[hit] = face
+    return hit, t, points, normals
+
+
+def _ray_rotated_box_batch(origins, directions, box_center, box_size, rotation):
+    """Ray packet against a box rotated by the local-to-world matrix ``rotation``."""
+    # Row vectors: v @ R applies R.T, i.e. the world-to-local transform
+    local_origins = (origins - box_center) @ rotation
+    local_directions = directions @ rotation
+    hit, t, points, normals = _ray_box_batch(local_origins, local_directions, box_size)
+    points[hit] = points[hit] @ rotation.T + box_center
+    normals[hit] = normals[hit] @ rotation.T
+    return hit, t, points, normals
+
+
+def _ray_cone_batch(origins, directions, axis, cone_angle, cone_length, infinite):
+    """Vectorized SphereRenderer.ray_cone_intersection for a ray packet."""
+    cos_angle = math.cos(math.radians(cone_angle))
+    cos_angle_sq = cos_angle * cos_angle
+    k = (1 - cos_angle_sq) / cos_angle_sq
+    ox, oy, oz = origins[:, 0], origins[:, 1], origins[:, 2]
+    dx, dy, dz = directions[:, 0], directions[:, 1], directions[:, 2]
+    a = dx * dx + dy * dy - dz * dz * k
+    b = 2.0 * (ox * dx + oy * dy - oz * dz * k)
+    c = ox * ox + oy * oy - oz * oz * k
+    
+    discriminant = b * b - 4 * a * c
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sqrt_discriminant = np.sqrt(np.maximum(discriminant, 0.0))
+        t1 = (-b - sqrt_discriminant) / (2.0 * a)
+        t2 = (-b + sqrt_discriminant) / (2.0 * a)
+    t = np.where(t1 > 0.001, t1, t2)
+    hit = (discriminant >= 0) & (t > 0.001)
+    t = np.where(hit, t, np.inf)
+    
+    points = np.zeros_like(origins)
+    points[hit] = origins[hit] + t[hit, None] * directions[hit]
+    if not infinite:
+        dist_along_axis = points @ axis
+        # Fixed base radius so cone size is independent of sphere scale
+        hit &= (dist_along_axis >= 0) & (dist_along_axis <= cone_length * 1.0)
+        t = np.where(hit, t, np.inf)
+    
+    normals = np.zeros_like(origins)
+    normals[:, :2] = points[:, :2]
+    lengths = np.linalg.norm(normals, axis=1)
+    nonzero = hit & (lengths > 0)
+    normals[nonzero] /= lengths[nonzero, None]
+    return hit, t, points, normals
+
+
+def _sdf_box_batch(points, center, size):
+    """Vectorized SphereRenderer.sdf_box for an (N, 3) point array."""
+    q = np.abs(points - center) - size
+    outside = np.linalg.norm(np.maximum(q, 0.0), axis=1)
+    return outside + np.minimum(np.max(q, axis=1), 0.0)
+
+
+class RayPacketScene:
+    """Per-frame snapshot of everything the screen ray tracer reads.
+    
+    Taking the snapshot once per frame keeps canvas lookups out of the per-ray
+    path, and keeps the scene picklable for the tile worker processes.
+    """
+    
+    def __init__(self, render_mode="ray_tracing", max_bounces=1, bg_color=(0.1, 0.1, 0.1),
+                 cube_position=(2.0, 0.0, 2.0), cube_size=0.3, cube_rotation=(0.0, 0.0, 0.0),
+                 cone=None, cone_color=(1.0, 1.0, 1.0)):
+        self.render_mode = render_mode
+        self.max_bounces = max_bounces
+        self.bg_color = np.array(bg_color, dtype=np.float64)[:3]
+        self.cube_position = np.array(cube_position, dtype=np.float64)
+        self.cube_size = np.full(3, float(cube_size))
+        self.cube_rotation = np.array(cube_rotation, dtype=np.float64)
+        self.cube_matrix = _rotation_matrix_xyz(self.cube_rotation)
+        # (axis, angle_degrees, length, infinite) or None when the cone is not traced
+        self.cone = cone
+        self.cone_color = np.array(cone_color, dtype=np.float64)[:3]
+    
+    @classmethod
+    def from_renderer(cls, renderer):
+        """Snapshot the scene the scalar trace_ray path would see for this frame."""
+        canvas = getattr(renderer, '_canvas_ref', None)
+        cube_position = (2.0, 0.0, 2.0)
+        cube_size = 0.3
+        cube_rotation = (0.0, 0.0, 0.0)
+        if canvas:
+            if hasattr(canvas, 'rainbow_cube_position'):
+                cube_position = canvas.rainbow_cube_position
+            if hasattr(canvas, 'rainbow_cube_size'):
+                cube_size = canvas.rainbow_cube_size
+            if hasattr(canvas, 'object_rotations'):
+                cube_rotation = canvas.object_rotations.get("cube", cube_rotation)
+        
+        # Sphere and cone stay out of the traced scene: the camera sits inside both
+        return cls(
+            render_mode=renderer.screen_render_mode,
+            max_bounces=renderer.screen_max_bounces,
+            bg_color=getattr(renderer, 'ray_tracing_bg_color', (0.1, 0.1, 0.1)),
+            cube_position=cube_position,
+            cube_size=cube_size,
+            cube_rotation=cube_rotation,
+            cone_color=renderer.cone_color
+        )
+    
+    def trace(self, origins, directions):
+        """Trace a packet of rays and return an (N, 3) float color array."""
+        origins = np.asarray(origins, dtype=np.float64)
+        directions = np.asarray(directions, dtype=np.float64)
+        if self.render_mode == "ray_marching":
+            return self._trace_marching(origins, directions, 0)
+        return self._trace_rays(origins, directions, 0)
+    
+    def closest_hit(self, origins, directions):
+        """Nearest intersection per ray: (hit, t, points, normals, material)."""
+        hit, t, points, normals = _ray_rotated_box_batch(
+            origins, directions, self.cube_position, self.cube_size, self.cube_matrix)
+        material = np.where(hit, 1, 0)
+        if self.cone is not None:
+            axis, angle, length, infinite = self.cone
+            c_hit, c_t, c_points, c_normals = _ray_cone_batch(
+                origins, directions, axis, angle, length, infinite)
+            closer = c_hit & (c_t < t)
+            t = np.where(closer, c_t, t)
+            points[closer] = c_points[closer]
+            normals[closer] = c_normals[closer]
+            material[closer] = 2
+            hit = hit | closer
+        return hit, t, points, normals, material
+    
+    def _base_colors(self, normals, material):
+        """Material colors for a packet of hits."""
+        colors = np.empty_like(normals)
+        cube = material == 1
+        colors[cube] = _cube_face_colors(normals[cube])
+        colors[~cube] = self.cone_color
+        return colors
+    
+    def _trace_rays(self, origins, directions, depth):
+        """Batched trace_ray: diffuse shading plus one compacted batch per bounce."""
+        colors = np.zeros((len(origins), 3))
+        if depth > self.max_bounces:
+            return colors
+        colors[:] = self.bg_color
+        hit, t, points, normals, material = self.closest_hit(origins, directions)
+        if not hit.any():
+            return colors
+        
+        normals = normals[hit]
+        points = points[hit]
+        ray_dirs = directions[hit]
+        diffuse = np.maximum(0.0, normals @ _SCREEN_LIGHT_DIR)
+        color = self._base_colors(normals, material[hit]) * (0.3 + diffuse * 0.7)[:, None]
+        
+        if depth < self.max_bounces and self.render_mode in ["path_tracing", "pbr"]:
+            # Only rays that hit spawn secondaries, so the next batch is compacted
+            reflect_dirs = ray_dirs - 2.0 * np.sum(ray_dirs * normals, axis=1)[:, None] * normals
+            reflect_color = self._trace_rays(points + 0.001 * normals, reflect_dirs, depth + 1)
+            color = 0.7 * color + 0.3 * reflect_color
+        
+        colors[hit] = np.clip(color, 0.0, 1.0)
+        return colors
+    
+    def scene_sdf(self, points):
+        """Batched SphereRenderer.scene_sdf (distance only; every surface is the cube)."""
+        return _sdf_box_batch(points, self.cube_position, self.cube_size)
+    
+    def calculate_normals(self, points, epsilon=0.001):
+        """Batched central-difference SDF gradient."""
+        normals = np.empty_like(points)
+        for axis in range(3):
+            offset = np.zeros(3)
+            offset[axis] = epsilon
+            normals[:, axis] = self.scene_sdf(points + offset) - self.scene_sdf(points - offset)
+        lengths = np.linalg.norm(normals, axis=1)
+        flat = lengths == 0
+        normals[flat] = [0.0, 1.0, 0.0]
+        lengths[flat] = 1.0
+        return normals / lengths[:, None]
+    
+    def ray_march(self, origins, directions, max_steps=64, max_distance=20.0, epsilon=0.001):
+        """Batched ray_march; marches only the rays still in flight each step."""
+        count = len(origins)
+        distance = np.zeros(count)
+        hit = np.zeros(count, dtype=bool)
+        active = np.arange(count)
+        for _ in range(max_steps):
+            if len(active) == 0:
+                break
+            step = self.scene_sdf(origins[active] + directions[active] * distance[active, None])
+            landed = step < epsilon
+            hit[active[landed]] = True
+            escaped = distance[active] > max_distance
+            marching = ~landed & ~escaped
+            active = active[marching]
+            distance[active] += step[marching]
+        
+        points = origins + directions * distance[:, None]
+        normals = np.zeros_like(points)
+        if hit.any():
+            normals[hit] = self.calculate_normals(points[hit], epsilon)
+        return hit, distance, points, normals
+    
+    def _trace_marching(self, origins, directions, depth):
+        """Batched trace_ray_marching with compacted reflection batches."""
+        colors = np.zeros((len(origins), 3))
+        if depth > self.max_bounces:
+            return colors
+        colors[:] = self.bg_color
+        hit, distance, points, normals = self.ray_march(origins, directions)
+        if not hit.any():
+            return colors
+        
+        normals = normals[hit]
+        points = points[hit]
+        ray_dirs = directions[hit]
+        diffuse = np.maximum(0.0, normals @ _SCREEN_LIGHT_DIR)
+        view_dirs = -ray_dirs
+        reflect_light = 2.0 * (normals @ _SCREEN_LIGHT_DIR)[:, None] * normals - _SCREEN_LIGHT_DIR
+        specular = 0.3 * np.maximum(0.0, np.sum(view_dirs * reflect_light, axis=1)) ** 32
+        color = _cube_face_colors(normals) * (0.2 + diffuse * 0.7)[:, None] + specular[:, None]
+        
+        if depth < self.max_bounces:
+            reflect_dirs = ray_dirs - 2.0 * np.sum(ray_dirs * normals, axis=1)[:, None] * normals
+            reflect_color = self._trace_marching(points + 0.01 * normals, reflect_dirs, depth + 1)
+            color = 0.8 * color + 0.2 * reflect_color
         
-        if self.video_capture:
-            self.video_capture.release()
-            self.video_capture = None
+        colors[hit] = np.clip(color, 0.0, 1.0)
+        return colors
+
+
+def _trace_ray_tile(task):
+    """Pool worker: trace one tile of a ray packet."""
+    scene, origins, directions = task
+    return scene.trace(origins, directions)
+
+
+class RayTileScheduler:
+    """Splits large ray packets into tiles and traces them on a process pool.
+    
+    Small packets (the default screen resolution) are traced inline, since the
+    vectorized tracer finishes them faster than a round trip to the pool.
+    """
+    
+    def __init__(self, workers=None, min_rays_per_tile=16384):
+        self.workers = workers if workers is not None else max(1, (os.cpu_count() or 1) - 1)
+        self.min_rays_per_tile = min_rays_per_tile
+        self._pool = None
+    
+    def trace(self, scene, origins, directions):
+        """Trace a ray packet, in parallel tiles when it is large enough."""
+        count = len(origins)
+        tile_count = min(self.workers, count // self.min_rays_per_tile)
+        if tile_count < 2:
+            return scene.trace(origins, directions)
+        
+        bounds = np.linspace(0, count, tile_count + 1).astype(int)
+        tasks = [(scene, origins[start:end], directions[start:end])
+                 for start, end in zip(bounds[:-1], bounds[1:])]
+        try:
+            pool = self._get_pool()
+            return np.concatenate(pool.map(_trace_ray_tile, tasks))
+        except Exception as e:
+            print(f"DEBUG: Tile pool unavailable ({e}), tracing inline")
+            self.close()
+            self.workers = 1
+            return scene.trace(origins, directions)
+    
+    def _get_pool(self):
+        """Create the worker pool on first use."""
+        if self._pool is None:
+            import multiprocessing
+            # Spawn rather than fork: the parent holds live GL and wx state
+            self._pool = multiprocessing.get_context("spawn").Pool(self.workers)
+        return self._pool
+    
+    def close(self):
+        """Shut down the worker pool."""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool = None
+
+
+def _camera_rays(camera, px, py, width, height):
+    """Primary rays through image-plane sample positions given in pixel units.
+    
+    ``camera`` is (position, direction, right, up, half_width, half_height,
+    is_orthographic); a pixel centre is at (x + 0.5, y + 0.5).
+    """
+    camera_pos, camera_dir, right, up, half_width, half_height, is_orthographic = camera
+    u = 2.0 * (np.asarray(px, dtype=np.float64) / width) - 1.0
+    v = 2.0 * (np.asarray(py, dtype=np.float64) / height) - 1.0
+    offsets = u.reshape(-1, 1) * half_width * right + v.reshape(-1, 1) * half_height * up
+    
+    if is_orthographic:
+        # Parallel rays: origin varies, direction is constant
+        origins = camera_pos + offsets
+        directions = np.broadcast_to(camera_dir, offsets.shape)
+    else:
+        # Rays converge at the camera point
+        origins = np.broadcast_to(camera_pos, offsets.shape)
+        directions = camera_dir + offsets
+    directions = _normalize_rows(np.asarray(directions, dtype=np.float64))
+    return np.array(origins, dtype=np.float64), directions
+
+
+def _halton(index, base):
+    """Element ``index`` (1-based) of the Halton low-discrepancy sequence."""
+    result = 0.0
+    fraction = 1.0 / base
+    while index > 0:
+        result += fraction * (index % base)
+        index //= base
+        fraction /= base
+    return result
+
+
+class ProgressiveScreenRenderer:
+    """Time-budgeted, progressively refined screen frames.
+    
+    A frame starts with a coarse block-filled pass, is refined by interleaved
+    passes down to one ray per pixel, and then accumulates jittered samples
+    until ``samples`` per pixel are reached for anti-aliasing. Changing the
+    camera or the scene restarts the frame.
+    """
+    
+    def __init__(self):
+        self.width = 0
+        self.height = 0
+        self.samples = 1
+        self.image = None  # uint8 (height, width, 3), what the texture should show
+        self._key = None
+        self._camera = None
+        self._scene = None
+        self._passes = []  # Pending (xs, ys, block, jitter) passes
+        self._cursor = 0
+        self._coarse_pending = False
+        self._color = None  # Per-pixel sample sums
+        self._weight = None  # Per-pixel sample counts
+        self._fill = None  # Block-filled preview for pixels without a sample yet
+        self._rays_per_ms = None
+    
+    @property
+    def is_refining(self):
+        """True while the current frame still has passes to trace."""
+        return bool(self._passes)
+    
+    def configure(self, camera, scene, width, height, step, samples=1):
+        """Restart the frame if anything the image depends on changed; returns True on restart."""
+        values = [np.ravel(np.asarray(value, dtype=np.float64)) for value in camera] + [
+            scene.bg_color, scene.cube_position, scene.cube_size, scene.cube_rotation]
+        key = (width, height, step, max(1, int(samples)), scene.render_mode, scene.max_bounces,
+               tuple(np.round(np.concatenate(values), 9)))
+        if key == self._key:
+            return False
         
-        if self.media_texture_id:
-            gl.glDeleteTextures([self.media_texture_id])
-            self.media_texture_id = None
+        self._key = key
+        self._camera = camera
+        self._scene = scene
+        self.width, self.height, self.samples = width, height, max(1, int(samples))
+        self._color = np.zeros((height, width, 3))
+        self._weight = np.zeros((height, width))
+        self._fill = np.zeros((height, width, 3))
+        self.image = np.zeros((height, width, 3), dtype=np.uint8)
+        self._passes = self._build_passes(max(1, int(step)))
+        self._cursor = 0
+        self._coarse_pending = True
+        return True
     
-    def to_dict(self):
-        """Serialize media screen to dictionary."""
-        data = super().to_dict()
-        data.update({
-            'media_type': self.media_type.value if self.media_type else None,
-            'media_path': self.media_path
-        })
-        return data
+    def _build_passes(self, step):
+        """Coarse-to-fine interleaved pixel passes followed by jittered AA passes."""
+        passes = []
+        done = np.zeros((self.height, self.width), dtype=bool)
+        block = step
+        while True:
+            ys, xs = np.mgrid[0:self.height:block, 0:self.width:block]
+            keep = ~done[ys, xs]
+            xs, ys = xs[keep], ys[keep]
+            done[ys, xs] = True
+            if len(xs):
+                passes.append((xs, ys, block, (0.0, 0.0)))
+            if block == 1:
+                break
+            block = max(1, block // 2)
+        
+        if self.samples > 1:
+            ys, xs = np.mgrid[0:self.height, 0:self.width]
+            xs, ys = xs.ravel(), ys.ravel()
+            for sample in range(1, self.samples):
+                jitter = (_halton(sample, 2) - 0.5, _halton(sample, 3) - 0.5)
+                passes.append((xs, ys, 0, jitter))
+        return passes
     
-    def from_dict(self, data: dict):
-        """Deserialize media screen from dictionary."""
-        super().from_dict(data)
+    def advance(self, scheduler, budget_ms=12.0):
+        """Trace pending rays for about ``budget_ms``; returns the dirty row range or None.
         
-        media_type_str = data.get('media_type')
-        if media_type_str:
-            self.media_type = MediaType(media_type_str)
+        The coarse pass of a new frame always completes so the screen never
+        shows an empty image.
+        """
+        if not self._passes:
+            return None
+        start = time.perf_counter()
+        deadline = start + budget_ms / 1000.0
+        dirty_lo, dirty_hi = self.height, 0
+        
+        while self._passes:
+            xs, ys, block, jitter = self._passes[0]
+            remaining = len(xs) - self._cursor
+            if self._coarse_pending or self._rays_per_ms is None:
+                count = remaining if self._coarse_pending else min(remaining, 1024)
+            else:
+                time_left_ms = (deadline - time.perf_counter()) * 1000.0
+                count = min(remaining, max(256, int(self._rays_per_ms * time_left_ms)))
+            
+            chunk_start = time.perf_counter()
+            chunk_xs = xs[self._cursor:self._cursor + count]
+            chunk_ys = ys[self._cursor:self._cursor + count]
+            origins, directions = _camera_rays(
+                self._camera, chunk_xs + 0.5 + jitter[0], chunk_ys + 0.5 + jitter[1],
+                self.width, self.height)
+            colors = scheduler.trace(self._scene, origins, directions)
+            elapsed_ms = (time.perf_counter() - chunk_start) * 1000.0
+            if elapsed_ms > 0:
+                self._rays_per_ms = count / elapsed_ms
+            
+            self._color[chunk_ys, chunk_xs] += colors
+            self._weight[chunk_ys, chunk_xs] += 1
+            for dy in range(block):
+                for dx in range(block):
+                    self._fill[np.minimum(chunk_ys + dy, self.height - 1),
+                               np.minimum(chunk_xs + dx, self.width - 1)] = colors
+            dirty_lo = min(dirty_lo, int(chunk_ys.min()))
+            dirty_hi = max(dirty_hi, min(self.height, int(chunk_ys.max()) + max(block, 1)))
+            
+            self._cursor += count
+            if self._cursor >= len(xs):
+                self._passes.pop(0)
+                self._cursor = 0
+                self._coarse_pending = False
+            if not self._coarse_pending and time.perf_counter() >= deadline:
+                break
         
-        media_path = data.get('media_path')
-        if media_path and os.path.exists(media_path):
-            self.load_media(media_path)
+        if dirty_hi <= dirty_lo:
+            return None
+        rows = slice(dirty_lo, dirty_hi)
+        weight = self._weight[rows, :, None]
+        display = np.where(weight > 0, self._color[rows] / np.maximum(weight, 1), self._fill[rows])
+        self.image[rows] = (display * 255).astype(np.uint8)
+        return dirty_lo, dirty_hi
 
 
 class SphereRenderer:
@@ -4769,12 +6651,16 @@ class SphereRenderer:
         self.screen_texture_id = None
         self.screen_texture_data = None
         self.screen_needs_update = True  # Force initial update
+        self.ray_tile_scheduler = RayTileScheduler()  # Batched ray packets, pooled only for large frames
+        self.progressive_screen = ProgressiveScreenRenderer()  # Coarse-to-fine screen frames
+        self.screen_frame_budget_ms = 12.0  # Tracing time per paint once the coarse pass is shown
         
         # Geometry data
         self.vertices = []
         self.indices = []
         self.normals = []
         self.texture_coords = []
+        self.geometry_cache = RetainedGeometryCache()  # Sphere and grid meshes kept on the GPU
         
         # Shape and screen management
         self.shapes = {}  # Dictionary of shape_id -> Shape
@@ -4814,82 +6700,31 @@ class SphereRenderer:
     
     def generate_sphere_geometry(self):
         """Generate sphere vertices, indices, and normals."""
-        self.vertices = []
-        self.indices = []
-        self.normals = []
-        self.texture_coords = []
-        
-        # Generate vertices
-        for i in range(self.resolution + 1):
-            lat = math.pi * (-0.5 + float(i) / self.resolution)
-            sin_lat = math.sin(lat)
-            cos_lat = math.cos(lat)
-            
-            for j in range(self.resolution + 1):
-                lon = 2 * math.pi * float(j) / self.resolution
-                sin_lon = math.sin(lon)
-                cos_lon = math.cos(lon)
-                
-                # Vertex position
-                x = cos_lat * cos_lon * self.radius
-                y = sin_lat * self.radius
-                z = cos_lat * sin_lon * self.radius
-                
-                self.vertices.extend([x, y, z])
-                
-                # Normal (same as normalized position for sphere)
-                self.normals.extend([cos_lat * cos_lon, sin_lat, cos_lat * sin_lon])
-                
-                # Texture coordinates
-                u = float(j) / self.resolution
-                v = float(i) / self.resolution
-                self.texture_coords.extend([u, v])
-        
-        # Generate indices for triangles
-        for i in range(self.resolution):
-            for j in range(self.resolution):
-                first = i * (self.resolution + 1) + j
-                second = first + self.resolution + 1
-                
-                # First triangle
-                self.indices.extend([first, second, first + 1])
-                # Second triangle
-                self.indices.extend([second, second + 1, first + 1])
+        normals, texture_coords, self.indices = self._sphere_grid_arrays(self.resolution)
+        self.normals = normals.ravel()
+        self.vertices = (normals * self.radius).ravel()
+        self.texture_coords = texture_coords.ravel()
+        self.geometry_cache.invalidate('sphere_surface', 'sphere_edges')
     
     def generate_wireframe_geometry(self):
         """Generate separate geometry for wireframe with adjustable density."""
-        self.wireframe_vertices = []
-        self.wireframe_indices = []
-        
-        # Generate vertices for wireframe
-        for i in range(self.wireframe_resolution + 1):
-            lat = math.pi * (-0.5 + float(i) / self.wireframe_resolution)
-            sin_lat = math.sin(lat)
-            cos_lat = math.cos(lat)
-            
-            for j in range(self.wireframe_resolution + 1):
-                lon = 2 * math.pi * float(j) / self.wireframe_resolution
-                sin_lon = math.sin(lon)
-                cos_lon = math.cos(lon)
-                
-                # Vertex position
-                x = cos_lat * cos_lon * self.radius
-                y = sin_lat * self.radius
-                z = cos_lat * sin_lon * self.radius
-                
-                self.wireframe_vertices.extend([x, y, z])
-        
-        # Generate indices for wireframe triangles
-        for i in range(self.wireframe_resolution):
-            for j in range(self.wireframe_resolution):
-                first = i * (self.wireframe_resolution + 1) + j
-                second = first + self.wireframe_resolution + 1
-                
-                # First triangle
-                self.wireframe_indices.extend([first, second, first + 1])
-                # Second triangle
-                self.wireframe_indices.extend([second, second + 1, first + 
-1])
+        normals, _, self.wireframe_indices = self._sphere_grid_arrays(self.wireframe_resolution)
+        self.wireframe_vertices = (normals * self.radius).ravel()
+        self.geometry_cache.invalidate('wireframe')
+    
+    @staticmethod
+    def _sphere_grid_arrays(resolution):
+        """Unit normals, texture coordinates and triangle indices of a latitude/longitude grid."""
+        steps = np.arange(resolution + 1) / resolution
+        normals = _sphere_points(math.pi * (steps[:, np.newaxis] - 0.5), 2 * math.pi * steps[np.newaxis, :], 1.0)
+        u, v = np.meshgrid(steps, steps)
+        texture_coords = np.stack([u, v], axis=-1)
+        
+        first = (np.arange(resolution)[:, np.newaxis] * (resolution + 1) + np.arange(resolution)).ravel()
+        second = first + resolution + 1
+        # Two triangles per grid cell
+        indices = np.stack([first, second, first + 1, second, second + 1, first + 1], axis=-1).ravel()
+        return normals.reshape(-1, 3), texture_coords.reshape(-1, 2), indices
     
     # ==================== RAY TRACING SYSTEM ====================
     
@@ -5342,6 +7177,16 @@ class SphereRenderer:
         
         return np.clip(color, 0.0, 1.0)
     
+    def generate_primary_rays(self, camera_pos, camera_dir, right, up, half_width, half_height,
+                              render_width, render_height, step=1, is_orthographic=False):
+        """Generate the primary rays for every step-th pixel as (origins, directions, grid_shape)."""
+        xs = np.arange(0, render_width, step)
+        ys = np.arange(0, render_height, step)
+        x_grid, y_grid = np.meshgrid(xs + 0.5, ys + 0.5)
+        camera = (camera_pos, camera_dir, right, up, half_width, half_height, is_orthographic)
+        origins, directions = _camera_rays(camera, x_grid.ravel(), y_grid.ravel(), render_width, render_height)
+        return origins, directions, (len(ys), len(xs))
+    
     # ==================== RAY MARCHING (SDF) SYSTEM ====================
     
     def sdf_sphere(self, point, center, radius):
@@ -5576,8 +7421,9 @@ class SphereRenderer:
         print(f"DEBUG: Screen resolution: {self.screen_resolution}x{self.screen_resolution}")
         
         current_time = time.time()
-        # Always update if screen_needs_update is True (user interaction)
-        if not self.screen_needs_update and current_time - self.screen_last_update < self.screen_update_rate:
+        # Always update if screen_needs_update is True (user interaction) or a frame is still refining
+        if (not self.screen_needs_update and not self.progressive_screen.is_refining and
+                current_time - self.screen_last_update < self.screen_update_rate):
             return  # Don't update too frequently for automatic updates only
         
         self.screen_last_update = current_time
@@ -5598,8 +7444,6 @@ class SphereRenderer:
             render_width = width // 4  # Even lower for path tracing
             render_height = height // 4
         
-        image_data = np.zeros((render_height, render_width, 3), dtype=np.uint8)
-        
         # Set up virtual camera - match simple mode camera setup exactly
         camera_pos = self.position.copy()  # Actual sphere center
         
@@ -5701,154 +7545,43 @@ class SphereRenderer:
         # Optimized ray tracing - skip pixels for speed
         step = 2 if self.screen_render_mode == "ray_tracing" else 4
         
-        total_rays = 0
-        rainbow_cube_hits = 0
-        background_hits = 0
-        
-        print(f"DEBUG: Starting ray trace with step={step}, resolution={render_width}x{render_height}")
-        
-        # MANUAL TEST: Test perfect ray toward cube
-        test_origin = np.array([0.0, 0.0, 0.0])
-        test_direction = np.array([0.70710678, 0.0, 0.70710678])  # Perfect direction to cube
-        cube_pos = np.array([2.0, 0.0, 2.0])
-        # Use the same size as simple mode for consistency
-        if hasattr(self, '_canvas_ref') and self._canvas_ref and hasattr(self._canvas_ref, 'rainbow_cube_size'):
-            cube_size = self._canvas_ref.rainbow_cube_size
-            cube_size = np.array([cube_size, cube_size, cube_size])
-        else:
-            cube_size = np.array([0.3, 0.3, 0.3])  # Match simple mode default
+        # Progressive frame: the coarse step pass first, then refinement under the frame budget
+        camera = (camera_pos, camera_dir, right, up, half_width, half_height, is_orthographic)
+        scene = RayPacketScene.from_renderer(self)
+        progressive = self.progressive_screen
+        if progressive.configure(camera, scene, render_width, render_height, step, self.screen_samples):
+            print(f"DEBUG: Restarting progressive ray trace with step={step}, resolution={render_width}x{render_height}")
         
-        print(f"DEBUG: MANUAL RAY TEST:")
-        print(f"  - Test ray origin: {test_origin}")
-        print(f"  - Test ray direction: {test_direction}")
-        print(f"  - Cube position: {cube_pos}")
-        print(f"  - Cube size: {cube_size}")
+        dirty_rows = progressive.advance(self.ray_tile_scheduler, self.screen_frame_budget_ms)
+        if dirty_rows is None:
+            return  # Frame already converged, texture is current
         
-        # Test the intersection
-        hit, t, hit_point, normal = self.ray_box_intersection(test_origin, test_direction, cube_pos, cube_size)
-        print(f"  - Manual test result: hit={hit}")
-        if hit:
-            print(f"  - Manual test t: {t:.3f}")
-            print(f"  - Manual test hit point: {hit_point}")
-            print(f"  - Manual test normal: {normal}")
-            
-            # Test the color we'd get
-            test_color = self.trace_ray(test_origin, test_direction)
-            print(f"  - Manual test color: {test_color}")
-        else:
-            print(f"  - Manual test FAILED - no intersection detected!")
-            
-        # Also test why the camera rays have Y-components
-        print(f"DEBUG: Camera ray analysis:")
-        print(f"  - Camera direction should be: [0.707, 0, 0.707]")
-        print(f"  - Actual camera direction: {camera_dir}")
-        print(f"  - Camera right vector: {right}")
-        print(f"  - Camera up vector: {up}")
-        print(f"  - Problem: Camera not aligned with XZ plane!")
-        
-        for y in range(0, render_height, step):
-            for x in range(0, render_width, step):
-                total_rays += 1
-                # Calculate ray direction
-                u = (x + 0.5) / render_width
-                v = (y + 0.5) / render_height
-                
-                # Convert to [-1, 1] range with center offset adjustment
-                u = 2.0 * u - 1.0  # Standard U coordinate
-                v = 2.0 * v - 1.0  # Standard V coordinate
-                
-                if is_orthographic:
-                    # Orthographic projection - parallel rays
-                    # Ray origin varies, ray direction is constant
-                    ray_origin_offset = u * half_width * right + v * half_height * up  # up vector already flipped above
-                    ray_origin = camera_pos + ray_origin_offset
-                    ray_dir = camera_dir  # All rays have same direction
-                else:
-                    # Perspective projection - rays converge at camera point
-                    ray_origin = camera_pos
-                    ray_dir = camera_dir + u * half_width * right + v * half_height * up  # up vector already flipped above
-                ray_dir = ray_dir / np.linalg.norm(ray_dir)
-                
-                # Debug ray directions to see if they're perpendicular to camera direction
-                if total_rays <= 10:  # Debug first few rays
-                    dot_with_camera = np.dot(ray_dir, camera_dir)
-                    print(f"DEBUG: Ray {total_rays} at pixel ({x},{y})")
-                    print(f"  - Camera direction: {camera_dir}")
-                    print(f"  - Ray direction: {ray_dir}")
-                    print(f"  - Dot with camera: {dot_with_camera:.6f} (should be close to 1.0 for center rays)")
-                    print(f"  - u={u:.3f}, v={v:.3f}")
-                    print(f"  - right component: {u * half_width}")
-                    print(f"  - up component: {v * half_height}")
-                
-                # Also check center ray specifically
-                if abs(u) < 0.1 and abs(v) < 0.1:  # Near center
-                    dot_with_camera = np.dot(ray_dir, camera_dir)
-                    print(f"DEBUG: CENTER RAY - should match camera direction closely")
-                    print(f"  - Camera direction: {camera_dir}")
-                    print(f"  - Center ray direction: {ray_dir}")
-                    print(f"  - Dot product: {dot_with_camera:.6f} (should be ~1.0)")
-                    if dot_with_camera < 0.9:
-                        print(f"  - ⚠️ CENTER RAY IS NOT ALIGNED WITH CAMERA!")
-                
-                # Choose rendering method based on mode
-                if self.screen_render_mode == "ray_marching":
-                    color = self.trace_ray_marching(ray_origin, ray_dir)
-                else:
-                    color = self.trace_ray(ray_origin, ray_dir)
-                
-                    # Count hits for debugging - fix the color detection
-                    if np.any(color > 0.4) and color[0] > color[1] and color[0] > color[2]:  # Red-ish color (cube hit)
-                        rainbow_cube_hits += 1
-                    elif np.allclose(color, [0.1, 0.1, 0.1], atol=0.05):  
-                        # Background color
-                        background_hits += 1
-                
-                # Convert to 8-bit
-                pixel_color = (color * 255).astype(np.uint8)
-                
-                # Debug color conversion for non-background pixels
-                if not np.allclose(color, [0.1, 0.1, 0.1], atol=0.05) and total_rays <= 10:
-                    print(f"DEBUG COLOR: pixel({x},{y}) - float_color={color}, uint8_color={pixel_color}")
-                
-                # Fill a block of pixels for speed
-                for dy in range(step):
-                    for dx in range(step):
-                        py = min(y + dy, render_height - 1)
-                        px = min(x + dx, render_width - 1)
-                        image_data[py, px] = pixel_color  # Fixed: Remove Y flip to match simple mode
-        
-        # Store the low-res image data for now (we could upscale later if needed)
-        self.screen_current_size = (render_width, render_height)
-        
-        print(f"DEBUG: ===== RAY TRACING TEXTURE COMPLETED =====")
-        print(f"DEBUG: Ray tracing statistics:")
-        print(f"  - Total rays cast: {total_rays}")
-        print(f"  - Red cube hits: {rainbow_cube_hits}")
-        print(f"  - Background hits: {background_hits}")
-        print(f"  - Other hits: {total_rays - rainbow_cube_hits - background_hits}")
-        print(f"  - Cube hit percentage: {(rainbow_cube_hits/total_rays*100):.2f}%")
-        
-        if rainbow_cube_hits == 0:
-            print(f"DEBUG: ⚠️  NO CUBE HITS DETECTED!")
-            print(f"DEBUG: This suggests the camera is not pointing toward the cube")
-            print(f"DEBUG: Camera direction: {camera_dir}")
-            print(f"DEBUG: Expected direction to cube: {cube_dir}")
-            print(f"DEBUG: Angle between them: {angle_to_cube:.1f}°")
-        print(f"DEBUG: Ray tracing texture updated successfully!")
-        print(f"DEBUG: ==============================================")
+        image_data = progressive.image  # No Y flip, matches simple mode
+        print(f"DEBUG: Progressive ray trace updated rows {dirty_rows[0]}-{dirty_rows[1]}, refining: {progressive.is_refining}")
         
         # Store the image data
         self.screen_texture_data = image_data
         
-        # Create OpenGL texture
-        if self.screen_texture_id is None:
-            self.screen_texture_id = gl.glGenTextures(1)
-        
-        gl.glBindTexture(gl.GL_TEXTURE_2D, self.screen_texture_id)
-        gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, gl.GL_RGB, render_width, render_height, 0, 
-                       gl.GL_RGB, gl.GL_UNSIGNED_BYTE, image_data)
-        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, gl.GL_NEAREST)  # Nearest for pixelated look
-        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAG_FILTER, gl.GL_NEAREST)
+        # Create OpenGL texture, or upload only the rows this pass touched
+        gl.glPixelStorei(gl.GL_UNPACK_ALIGNMENT, 1)
+        if self.screen_texture_id is None or getattr(self, 'screen_current_size', None) != (render_width, render_height):
+            if self.screen_texture_id is None:
+                self.screen_texture_id = gl.glGenTextures(1)
+            gl.glBindTexture(gl.GL_TEXTURE_2D, self.screen_texture_id)
+            gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, gl.GL_RGB, render_width, render_height, 0, 
+                           gl.GL_RGB, gl.GL_UNSIGNED_BYTE, image_data)
+            gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, gl.GL_NEAREST)  # Nearest for pixelated look
+            gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAG_FILTER, gl.GL_NEAREST)
+            self.screen_current_size = (render_width, render_height)
+        else:
+            y0, y1 = dirty_rows
+            gl.glBindTexture(gl.GL_TEXTURE_2D, self.screen_texture_id)
+            gl.glTexSubImage2D(gl.GL_TEXTURE_2D, 0, 0, y0, render_width, y1 - y0,
+                               gl.GL_RGB, gl.GL_UNSIGNED_BYTE, np.ascontiguousarray(image_data[y0:y1]))
+    
+    def is_screen_refining(self):
+        """Check whether the ray-traced screen still has progressive passes pending."""
+        return self.screen_enabled and self.progressive_screen.is_refining
     
     def create_placeholder_texture(self):
         """Create a simple placeholder texture for the screen."""
@@ -6052,16 +7785,8 @@ class SphereRenderer:
             gl.glDisable(gl.GL_CULL_FACE)  # Show all wireframe lines
             
             # Render triangle edges
-            gl.glBegin(gl.GL_LINES)
-            for i in range(0, len(self.indices), 3):
-                # Draw three edges of each triangle
-                for j in range(3):
-                    idx1 = self.indices[i + j] * 3
-                    idx2 = self.indices[i + ((j + 1) % 3)] * 3
-                    
-                    gl.glVertex3f(self.vertices[idx1], self.vertices[idx1 + 1], self.vertices[idx1 + 2])
-                    gl.glVertex3f(self.vertices[idx2], self.vertices[idx2 + 1], self.vertices[idx2 + 2])
-            gl.glEnd()
+            self.geometry_cache.draw('sphere_edges', None, lambda: (gl.GL_LINES, {
+                'vertices': self.vertices, 'indices': _triangle_edge_indices(self.indices)}))
             gl.glEnable(gl.GL_CULL_FACE)
         else:
             # Render solid sphere surface
@@ -6091,13 +7816,8 @@ class SphereRenderer:
                 gl.glDisable(gl.GL_LIGHTING)
             
             # Render triangles
-            gl.glBegin(gl.GL_TRIANGLES)
-            for i in range(0, len(self.indices), 3):
-                for j in range(3):
-                    idx = self.indices[i + j] * 3
-                    gl.glNormal3f(self.normals[idx], self.normals[idx + 1], self.normals[idx + 2])
-                    gl.glVertex3f(self.vertices[idx], self.vertices[idx + 1], self.vertices[idx + 2])
-            gl.glEnd()
+            self.geometry_cache.draw('sphere_surface', None, lambda: (gl.GL_TRIANGLES, {
+                'vertices': self.vertices, 'normals': self.normals, 'indices': self.indices}))
             
             if self.lighting_enabled:
                 gl.glDisable(gl.GL_LIGHTING)
@@ -6116,29 +7836,24 @@ class SphereRenderer:
         gl.glColor4f(*self.grid_colors[GridType.LONGITUDE_LATITUDE])
         gl.glLineWidth(2.0)
         
-        # Longitude lines (meridians)
-        for i in range(self.longitude_lines):
-            angle = 2 * math.pi * i / self.longitude_lines
-            gl.glBegin(gl.GL_LINE_STRIP)
-            for j in range(self.resolution + 1):
-                lat = math.pi * (-0.5 + float(j) / self.resolution)
-                x = math.cos(lat) * math.cos(angle) * self.radius
-                y = math.sin(lat) * self.radius
-                z = math.cos(lat) * math.sin(angle) * self.radius
-                gl.glVertex3f(x, y, z)
-            gl.glEnd()
+        key = (self.radius, self.resolution, self.longitude_lines, self.latitude_lines)
+        self.geometry_cache.draw('longitude_latitude', key, self._build_longitude_latitude_grid)
+    
+    def _build_longitude_latitude_grid(self):
+        """Meridian strips followed by parallel loops, as GL_LINES segments."""
+        meridian_angles = 2 * np.pi * np.arange(self.longitude_lines) / self.longitude_lines
+        meridian_lats = np.pi * (-0.5 + np.arange(self.resolution + 1) / self.resolution)
+        meridians = _sphere_points(meridian_lats[np.newaxis, :], meridian_angles[:, np.newaxis], self.radius)
         
-        # Latitude lines (parallels)
-        for i in range(self.latitude_lines + 1):
-            lat = math.pi * (-0.5 + float(i) / self.latitude_lines)
-            gl.glBegin(gl.GL_LINE_LOOP)
-            for j in range(self.resolution):
-                lon = 2 * math.pi * j / self.resolution
-                x = math.cos(lat) * math.cos(lon) * self.radius
-                y = math.sin(lat) * self.radius
-                z = math.cos(lat) * math.sin(lon) * self.radius
-                gl.glVertex3f(x, y, z)
-            gl.glEnd()
+        parallel_lats = np.pi * (-0.5 + np.arange(self.latitude_lines + 1) / self.latitude_lines)
+        parallel_lons = 2 * np.pi * np.arange(self.resolution) / self.resolution
+        parallels = _sphere_points(parallel_lats[:, np.newaxis], parallel_lons[np.newaxis, :], self.radius)
+        
+        indices = np.concatenate([
+            _strip_segment_indices(self.longitude_lines, self.resolution + 1),
+            _strip_segment_indices(self.latitude_lines + 1, self.resolution, closed=True) + meridians[..., 0].size])
+        return gl.GL_LINES, {'vertices': np.concatenate([meridians.reshape(-1, 3), parallels.reshape(-1, 3)]),
+                             'indices': indices}
     
     def render_concentric_circles(self):
         """Render concentric circles on sphere surface."""
@@ -6149,18 +7864,16 @@ class SphereRenderer:
         gl.glLineWidth(2.0)
         
         # Render circles at different latitudes
-        for i in range(self.concentric_rings):
-            lat = math.pi * (-0.4 + 0.8 * i / (self.concentric_rings - 1))
-            radius_at_lat = math.cos(lat) * self.radius
-            y = math.sin(lat) * self.radius
-            
-            gl.glBegin(gl.GL_LINE_LOOP)
-            for j in range(64):  # Higher resolution for smooth circles
-                angle = 2 * math.pi * j / 64
-                x = radius_at_lat * math.cos(angle)
-                z = radius_at_lat * math.sin(angle)
-                gl.glVertex3f(x, y, z)
-            gl.glEnd()
+        key = (self.radius, self.concentric_rings)
+        self.geometry_cache.draw('concentric_circles', key, lambda: (gl.GL_LINES, {
+            'vertices': self._latitude_rings(self.concentric_rings, 64),
+            'indices': _strip_segment_indices(self.concentric_rings, 64, closed=True)}))
+    
+    def _latitude_rings(self, ring_count, segments):
+        """Points of ring_count circles spread between latitudes -0.4*pi and 0.4*pi, shape (ring_count * segments, 3)."""
+        lats = np.pi * (-0.4 + 0.8 * np.arange(ring_count) / max(ring_count - 1, 1))
+        angles = 2 * np.pi * np.arange(segments) / segments  # Higher resolution for smooth circles
+        return _sphere_points(lats[:, np.newaxis], angles[np.newaxis, :], self.radius).reshape(-1, 3)
     
     def render_dot_particles(self):
         """Render dot particles distributed on sphere surface."""
@@ -6169,27 +7882,21 @@ class SphereRenderer:
         
         gl.glColor4f(*self.grid_colors[GridType.DOT_PARTICLES])
         gl.glPointSize(3.0)
-    
-        gl.glBegin(gl.GL_POINTS)
         
-        # Generate pseudo-random points using Fibonacci spiral
+        self.geometry_cache.draw('dot_particles', (self.radius, self.dot_density), self._build_dot_particles)
+    
+    def _build_dot_particles(self):
+        """Pseudo-random points on the sphere using a Fibonacci spiral."""
         golden_ratio = (1 + math.sqrt(5)) / 2
-        for i in range(self.dot_density):
-            # Fibonacci spiral distribution
-            theta = 2 * math.pi * i / golden_ratio
-            phi = math.acos(1 - 2 * (i + 0.5) / self.dot_density)
-            
-            x = math.sin(phi) * math.cos(theta) * self.radius
-            y = math.cos(phi) * self.radius
-            z = math.sin(phi) * math.sin(theta) * self.radius
-            
-            gl.glVertex3f(x, y, z)
-        
-        gl.glEnd()
+        i = np.arange(self.dot_density)
+        theta = 2 * np.pi * i / golden_ratio
+        phi = np.arccos(1 - 2 * (i + 0.5) / self.dot_density)
+        vertices = np.stack([np.sin(phi) * np.cos(theta), np.cos(phi), np.sin(phi) * np.sin(theta)], axis=-1) * self.radius
+        return gl.GL_POINTS, {'vertices': vertices}
     
     def render_dynamic_particles(self, particle_system):
-        """Render dynamic particles from the mathematical particle system."""
-        if not particle_system or not particle_system.particles:
+        """Render dynamic particles straight from the particle system's position/color arrays."""
+        if not particle_system or not particle_system.count:
             return
         
         # Enable blending for nice particle effects
@@ -6199,21 +7906,18 @@ class SphereRenderer:
         # Disable depth writing so particles don't occlude each other harshly
         gl.glDepthMask(gl.GL_FALSE)
         
-        for particle in particle_system.particles:
-            # Set particle color with alpha based on life
-            life_ratio = particle['life'] / particle['max_life']
-            color = particle['color']
-            gl.glColor4f(color[0], color[1], color[2], life_ratio * 0.8)
-            
-            # Set point size based on particle size
-            point_size = max(1.0, particle['size'] * 5.0)
-            gl.glPointSize(point_size)
-            
-            # Render the particle
-            gl.glBegin(gl.GL_POINTS)
-            pos = particle['position']
-            gl.glVertex3f(pos[0], pos[1], pos[2])
-            gl.glEnd()
+        gl.glEnableClientState(gl.GL_VERTEX_ARRAY)
+        gl.glEnableClientState(gl.GL_COLOR_ARRAY)
+        try:
+            # One draw call per point size (alpha already follows particle life)
+            for point_size, positions, colors in particle_system.render_batches():
+                gl.glPointSize(point_size)
+                gl.glVertexPointer(3, gl.GL_FLOAT, 0, positions)
+                gl.glColorPointer(4, gl.GL_FLOAT, 0, colors)
+                gl.glDrawArrays(gl.GL_POINTS, 0, len(positions))
+        finally:
+            gl.glDisableClientState(gl.GL_COLOR_ARRAY)
+            gl.glDisableClientState(gl.GL_VERTEX_ARRAY)
         
         # Restore depth writing
         gl.glDepthMask(gl.GL_TRUE)
@@ -6239,34 +7943,21 @@ class SphereRenderer:
             gl.glLineWidth(line_width)
             
             # Render grid pattern similar to the reference image
-            # Horizontal rings
-            for i in range(8):
-                lat = math.pi * (-0.4 + 0.8 * i / 7)
-                radius_at_lat = math.cos(lat) * self.radius
-                y = math.sin(lat) * self.radius
-                
-                gl.glBegin(gl.GL_LINE_LOOP)
-                for j in range(64):
-                    angle = 2 * math.pi * j / 64
-                    x = radius_at_lat * math.cos(angle)
-                    z = radius_at_lat * math.sin(angle)
-                    gl.glVertex3f(x, y, z)
-                gl.glEnd()
-            
-            # Vertical meridians
-            for i in range(12):
-                angle = 2 * math.pi * i / 12
-                gl.glBegin(gl.GL_LINE_STRIP)
-                for j in range(32):
-                    lat = math.pi * (-0.5 + float(j) / 31)
-                    x = math.cos(lat) * math.cos(angle) * self.radius
-                    y = math.sin(lat) * self.radius
-                    z = math.cos(lat) * math.sin(angle) * self.radius
-                    gl.glVertex3f(x, y, z)
-                gl.glEnd()
+            self.geometry_cache.draw('neon_lines', self.radius, self._build_neon_lines)
         
         gl.glDisable(gl.GL_BLEND)
     
+    def _build_neon_lines(self):
+        """Eight horizontal rings followed by twelve vertical meridians, as GL_LINES segments."""
+        rings = self._latitude_rings(8, 64)
+        meridian_angles = 2 * np.pi * np.arange(12) / 12
+        meridian_lats = np.pi * (-0.5 + np.arange(32) / 31)
+        meridians = _sphere_points(meridian_lats[np.newaxis, :], meridian_angles[:, np.newaxis], self.radius).reshape(-1, 3)
+        indices = np.concatenate([
+            _strip_segment_indices(8, 64, closed=True),
+            _strip_segment_indices(12, 32) + len(rings)])
+        return gl.GL_LINES, {'vertices': np.concatenate([rings, meridians]), 'indices': indices}
+    
     def render_wireframe(self):
         """Render wireframe representation of the sphere with adjustable density."""
         if GridType.WIREFRAME not in self.active_grids:
@@ -6279,16 +7970,8 @@ class SphereRenderer:
         gl.glDisable(gl.GL_CULL_FACE)
         
         # Render triangle edges using wireframe geometry
-        gl.glBegin(gl.GL_LINES)
-        for i in range(0, len(self.wireframe_indices), 3):
-            # Draw three edges of each triangle
-            for j in range(3):
-                idx1 = self.wireframe_indices[i + j] * 3
-                idx2 = self.wireframe_indices[i + ((j + 1) % 3)] * 3
-                
-                gl.glVertex3f(self.wireframe_vertices[idx1], self.wireframe_vertices[idx1 + 1], self.wireframe_vertices[idx1 + 2])
-                gl.glVertex3f(self.wireframe_vertices[idx2], self.wireframe_vertices[idx2 + 1], self.wireframe_vertices[idx2 + 2])
-        gl.glEnd()
+        self.geometry_cache.draw('wireframe', None, lambda: (gl.GL_LINES, {
+            'vertices': self.wireframe_vertices, 'indices': _triangle_edge_indices(self.wireframe_indices)}))
         
         # Re-enable face culling
         gl.glEnable(gl.GL_CULL_FACE)
@@ -7338,8 +9021,8 @@ class SphereRenderer:
             sphere_frame = self._canvas_ref.sphere_frame
             if hasattr(sphere_frame, 'math_systems') and 'particles' in sphere_frame.math_systems:
                 particles = sphere_frame.math_systems['particles']
-                if particles.particles:  # Only log when particles exist
-                    print(f"DEBUG: Rendering {len(particles.particles)} dynamic particles")
+                if particles.count:  # Only log when particles exist
+                    print(f"DEBUG: Rendering {particles.count} dynamic particles")
                 self.render_dynamic_particles(particles)
         
         # Always render vector last (on top of everything)
@@ -8793,10 +10476,16 @@ class SphereRenderer:
     def remove_shape(self, shape_id: str) -> bool:
         """Remove a shape from the scene."""
         if shape_id in self.shapes:
-            del self.shapes[shape_id]
+            self.shapes.pop(shape_id).release()
             return True
         return False
     
+    def clear_shapes(self):
+        """Remove every shape from the scene."""
+        for shape in self.shapes.values():
+            shape.release()
+        self.shapes.clear()
+    
     def get_shape(self, shape_id: str) -> Optional[Shape]:
         """Get a shape by ID."""
         return self.shapes.get(shape_id)
@@ -9570,7 +11259,7 @@ class SphereRenderer:
             'vector_orientation_enabled': self.vector_orientation_enabled,
             
             # Grid properties
-            'active_grids': list(self.active_grids),
+            'active_grids': [grid.value for grid in self.active_grids],
             'longitude_lines': self.longitude_lines,
             'latitude_lines': self.latitude_lines,
             'concentric_rings': self.concentric_rings,
@@ -9616,7 +11305,12 @@ class SphereRenderer:
         self.vector_orientation_enabled = scene_data.get('vector_orientation_enabled', False)
         
         # Load grid properties
-        self.active_grids = set(scene_data.get('active_grids', []))
+        self.active_grids = set()
+        for grid in scene_data.get('active_grids', []):
+            try:
+                self.active_grids.add(GridType(grid))
+            except ValueError:
+                print(f"DEBUG: Skipping unknown grid type in scene: {grid}")
         self.longitude_lines = scene_data.get('longitude_lines', 16)
         self.latitude_lines = scene_data.get('latitude_lines', 12)
         self.concentric_rings = scene_data.get('concentric_rings', 8)
@@ -9624,7 +11318,7 @@ class SphereRenderer:
         self.neon_intensity = scene_data.get('neon_intensity', 1.0)
         
         # Load shapes
-        self.shapes.clear()
+        self.clear_shapes()
         shapes_data = scene_data.get('shapes', [])
         for shape_data in shapes_data:
             shape = self._create_shape_from_dict(shape_data)
@@ -10432,7 +12126,7 @@ class Sphere3DCanvas(wx.glcanvas.GLCanvas):
                     # Check if it's time to update this screen
                     if current_time - screen.gol_last_update >= screen.gol_config['update_interval']:
                         # Update the cellular automaton
-                        screen.cellular_automaton.update_conway()
+                        screen.cellular_automaton.step()
                         screen.gol_generation += 1
                         screen.gol_last_update = current_time
                         
@@ -10441,20 +12135,22 @@ class Sphere3DCanvas(wx.glcanvas.GLCanvas):
                             print(f"DEBUG: Game of Life reached max generations ({screen.gol_config['max_generations']})")
                             continue
                         
-                        # Update the screen texture with new frame
-                        new_frame = screen.cellular_automaton.get_colored_grid()
-                        if screen.load_image_from_array(new_frame):
-                            print(f"DEBUG: Updated Game of Life generation {screen.gol_generation}")
+                        # The texture is refreshed from the automaton's RGBA buffer on the next draw
+                        screen.gol_frame_dirty = True
         
         # Update particle systems if available
         should_refresh = False
         if hasattr(self, 'sphere_frame') and hasattr(self.sphere_frame, 'math_systems'):
             particles = self.sphere_frame.math_systems.get('particles')
-            if particles and particles.particles:
+            if particles is not None and particles.count:
                 # Update particles with 33ms delta time (~30 FPS)
                 particles.update(0.033)
                 should_refresh = True
         
+        # Keep repainting while the ray-traced screen is still refining
+        if self.sphere.is_screen_refining():
+            should_refresh = True
+        
         # Only refresh if we have media screens, active particles, or animated Game of Life
         if has_media_screens or should_refresh or has_animated_gol:
             self.Refresh()
@@ -11493,6 +13189,395 @@ class Sphere3DCanvas(wx.glcanvas.GLCanvas):
             print(f"Error loading canvas scene: {e}")
             raise
 
+
+# ==================== OFFSCREEN BATCH RENDERING ====================
+
+class OffscreenGLContext:
+    """
+    A window-less OpenGL context whose default framebuffer is a pixel buffer.
+    
+    Uses an EGL pbuffer surface, or an OSMesa buffer on machines without any
+    GPU driver. PyOpenGL picks its platform when OpenGL is first imported, so
+    PYOPENGL_PLATFORM must be set to "egl" or "osmesa" before this module is
+    imported (scripts/render_sphere_scene.py does this).
+    """
+    
+    def __init__(self, width, height, samples=4):
+        import OpenGL.platform
+        self.width = width
+        self.height = height
+        platform_name = type(OpenGL.platform.PLATFORM).__name__.lower()
+        if 'osmesa' in platform_name:
+            self.backend = 'osmesa'
+        elif 'egl' in platform_name:
+            self.backend = 'egl'
+        else:
+            raise RuntimeError(f"Offscreen rendering needs PYOPENGL_PLATFORM=egl or osmesa "
+                               f"set before OpenGL is imported (current platform: {platform_name})")
+        
+        self._egl = None
+        self._display = None
+        self._surface = None
+        self._context = None
+        self._buffer = None
+        if self.backend == 'osmesa':
+            self._create_osmesa()
+        else:
+            self._create_egl(samples)
+        self.make_current()
+    
+    def _create_egl(self, samples):
+        """Create a pbuffer surface and context, with multisampling when available."""
+        from OpenGL import EGL
+        self._egl = EGL
+        display = EGL.eglGetDisplay(EGL.EGL_DEFAULT_DISPLAY)
+        major, minor = EGL.EGLint(), EGL.EGLint()
+        if not EGL.eglInitialize(display, ctypes.pointer(major), ctypes.pointer(minor)):
+            raise RuntimeError("Could not initialize the EGL display")
+        
+        config = EGL.EGLConfig()
+        count = EGL.EGLint()
+        for sample_count in sorted({samples, 0}, reverse=True):
+            attributes = [EGL.EGL_SURFACE_TYPE, EGL.EGL_PBUFFER_BIT,
+                          EGL.EGL_RED_SIZE, 8, EGL.EGL_GREEN_SIZE, 8, EGL.EGL_BLUE_SIZE, 8,
+                          EGL.EGL_ALPHA_SIZE, 8, EGL.EGL_DEPTH_SIZE, 24, EGL.EGL_STENCIL_SIZE, 8,
+                          EGL.EGL_RENDERABLE_TYPE, EGL.EGL_OPENGL_BIT]
+            if sample_count:
+                attributes += [EGL.EGL_SAMPLE_BUFFERS, 1, EGL.EGL_SAMPLES, sample_count]
+            attributes.append(EGL.EGL_NONE)
+            attribute_array = (EGL.EGLint * len(attributes))(*attributes)
+            if (EGL.eglChooseConfig(display, attribute_array, ctypes.pointer(config), 1, ctypes.pointer(count))
+                    and count.value):
+                break
+        else:
+            raise RuntimeError("No EGL configuration supports offscreen OpenGL rendering")
+        
+        surface_attributes = (EGL.EGLint * 5)(EGL.EGL_WIDTH, self.width, EGL.EGL_HEIGHT, self.height, EGL.EGL_NONE)
+        surface = EGL.eglCreatePbufferSurface(display, config, surface_attributes)
+        if surface == EGL.EGL_NO_SURFACE:
+            raise RuntimeError(f"Could not create a {self.width}x{self.height} EGL pbuffer")
+        EGL.eglBindAPI(EGL.EGL_OPENGL_API)
+        context = EGL.eglCreateContext(display, config, EGL.EGL_NO_CONTEXT, None)
+        if context == EGL.EGL_NO_CONTEXT:
+            raise RuntimeError("Could not create an EGL OpenGL context")
+        self._display, self._surface, self._context = display, surface, context
+    
+    def _create_osmesa(self):
+        """Create a software-rendered context drawing into a client-side buffer."""
+        from OpenGL import osmesa, arrays
+        self._context = osmesa.OSMesaCreateContextExt(osmesa.OSMESA_RGBA, 24, 8, 0, None)
+        if not self._context:
+            raise RuntimeError("Could not create an OSMesa context")
+        self._buffer = arrays.GLubyteArray.zeros((self.height, self.width, 4))
+    
+    def make_current(self):
+        """Make this context current on the calling thread."""
+        if self.backend == 'osmesa':
+            from OpenGL import osmesa
+            if not osmesa.OSMesaMakeCurrent(self._context, self._buffer, gl.GL_UNSIGNED_BYTE,
+                                            self.width, self.height):
+                raise RuntimeError("Could not make the OSMesa context current")
+        elif not self._egl.eglMakeCurrent(self._display, self._surface, self._surface, self._context):
+            raise RuntimeError("Could not make the EGL context current")
+    
+    def destroy(self):
+        """Release the context and its surface."""
+        if self._context is None:
+            return
+        try:
+            if self.backend == 'osmesa':
+                from OpenGL import osmesa
+                osmesa.OSMesaDestroyContext(self._context)
+            else:
+                EGL = self._egl
+                EGL.eglMakeCurrent(self._display, EGL.EGL_NO_SURFACE, EGL.EGL_NO_SURFACE, EGL.EGL_NO_CONTEXT)
+                EGL.eglDestroyContext(self._display, self._context)
+                EGL.eglDestroySurface(self._display, self._surface)
+        except Exception as e:
+            print(f"DEBUG: Error destroying offscreen context: {e}")
+        self._context = None
+
+
+class OffscreenSceneRenderer:
+    """
+    Renders saved sphere scenes without a window, one frame per call.
+    
+    Stands in for Sphere3DCanvas: it carries the canvas state that scene files
+    and the sphere renderer read (orbit camera, unified screen, rainbow cube)
+    and draws with the canvas's own methods, so a frame matches what the
+    editor shows for the same scene. Everything is drawn into the default
+    framebuffer of an OffscreenGLContext, which the screen framebuffers set
+    up by setup_framebuffer/_init_screen_framebuffer restore to after their
+    passes.
+    
+    Frames are a function of scene time only: the camera orbits at
+    ``orbit_speed`` and the sphere spins at ``spin_speed`` degrees per second
+    from their saved angles, and GIF screens show the frame for that time.
+    Video screens show their first frame.
+    """
+    
+    # Scene state and drawing shared with the interactive canvas
+    load_canvas_scene_from_dict = Sphere3DCanvas.load_canvas_scene_from_dict
+    init_opengl = Sphere3DCanvas.init_opengl
+    setup_framebuffer = Sphere3DCanvas.setup_framebuffer
+    setup_unified_screen_system = Sphere3DCanvas.setup_unified_screen_system
+    sync_raytracing_screen_with_unified = Sphere3DCanvas.sync_raytracing_screen_with_unified
+    update_ray_tracing_camera = Sphere3DCanvas.update_ray_tracing_camera
+    update_screen_position_for_sphere_move = Sphere3DCanvas.update_screen_position_for_sphere_move
+    update_sphere_ray_tracing_view = Sphere3DCanvas.update_sphere_ray_tracing_view
+    update_sphere_view_vector = Sphere3DCanvas.update_sphere_view_vector
+    update_view_vector = Sphere3DCanvas.update_view_vector
+    setup_viewport = Sphere3DCanvas.setup_viewport
+    setup_camera = Sphere3DCanvas.setup_camera
+    render_simple_sphere_view = Sphere3DCanvas.render_simple_sphere_view
+    draw_rainbow_cube = Sphere3DCanvas.draw_rainbow_cube
+    draw_simple_2d_screen = Sphere3DCanvas.draw_simple_2d_screen
+    draw_unified_screen = Sphere3DCanvas.draw_unified_screen
+    
+    def __init__(self, width=640, height=480, samples=4):
+        self.width = width
+        self.height = height
+        self.context = OffscreenGLContext(width, height, samples)
+        self.init_gl = False
+        
+        self.sphere = SphereRenderer()
+        self.sphere._canvas_ref = self
+        
+        # Canvas state, with the same defaults as Sphere3DCanvas
+        self.camera_distance = 5.0
+        self.camera_rotation_x = 0.0
+        self.camera_rotation_y = 0.0
+        self.camera_position = np.array([0.0, 0.0, 0.0])
+        self.camera_projection = "perspective"
+        self.stepped_in_screen_id = None
+        self.stepped_in_camera = None
+        self.mouse_dragging = False
+        self.rainbow_cube_position = np.array([2.0, 0.0, 2.0])
+        self.rainbow_cube_size = 0.3
+        self.view_vector = np.array([0.0, 0.0, -1.0])
+        self.screen_enabled = True
+        self.screen_render_mode = "simple"
+        self.screen_projection = "perspective"
+        self.screen_position = np.array([-3.0, 0.0, 0.0])
+        self.screen_width = 2.0
+        self.screen_height = 1.5
+        self.background_color = np.array([0.1, 0.1, 0.1, 1.0])
+        self.framebuffer_width = 256
+        self.framebuffer_height = 192
+        self.framebuffer_id = None
+        self.texture_id = None
+        self.object_rotations = {
+            "sphere": np.array([0.0, 0.0, 0.0]),
+            "cube": np.array([0.0, 0.0, 0.0]),
+            "screen": np.array([0.0, 0.0, 0.0])
+        }
+        
+        # Animation driven by the scene clock
+        self.orbit_speed = 0.0  # Camera yaw, degrees per second
+        self.spin_speed = 0.0  # Sphere yaw, degrees per second
+        self.scene_time = 0.0
+        self._base_camera_rotation_y = self.camera_rotation_y
+        self._base_sphere_rotation = self.sphere.rotation.copy()
+    
+    # Canvas methods the shared drawing code calls
+    def SetCurrent(self, context):
+        """Make the offscreen context current."""
+        context.make_current()
+    
+    def GetSize(self):
+        """Size of the offscreen framebuffer."""
+        return wx.Size(self.width, self.height)
+    
+    def Refresh(self):
+        """Nothing to repaint; frames are rendered on request."""
+    
+    def load_scene(self, scene):
+        """Load a scene file path or the dictionary saved by Sphere3DFrame."""
+        if isinstance(scene, (str, Path)):
+            with open(scene, 'r') as f:
+                scene = json.load(f)
+        
+        self.context.make_current()
+        if "sphere_data" in scene:
+            self.sphere.load_scene_from_dict(scene["sphere_data"])
+        if "canvas_data" in scene:
+            self.load_canvas_scene_from_dict(scene["canvas_data"])
+        
+        self._base_camera_rotation_y = self.camera_rotation_y
+        self._base_sphere_rotation = self.sphere.rotation.copy()
+        for screen in self.sphere.screens.values():
+            if isinstance(screen, MediaScreen):
+                screen.media_clock = lambda: self.scene_time
+    
+    def set_time(self, seconds):
+        """Move the scene clock and everything animated by it."""
+        self.scene_time = seconds
+        self.camera_rotation_y = self._base_camera_rotation_y + self.orbit_speed * seconds
+        rotation = self._base_sphere_rotation.copy()
+        rotation[1] += self.spin_speed * seconds
+        self.sphere.rotation = rotation
+        
+        for screen in self.sphere.screens.values():
+            if not isinstance(screen, MediaScreen):
+                continue
+            screen.last_ui_update = -math.inf  # Frames may be rendered out of order; never throttle
+            if isinstance(screen.gif_frames, GifFramePool):
+                screen.gif_frame_index = screen.gif_frames.frame_at(seconds)
+                screen.gif_last_frame_time = seconds
+        # Ray-traced screens refresh every frame instead of on a wall-clock interval
+        self.sphere.screen_needs_update = True
+    
+    def render_frame(self, seconds=0.0):
+        """Render the scene at a time and return the image as an (height, width, 3) RGB array."""
+        self.context.make_current()
+        self.set_time(seconds)
+        if not self.init_gl:
+            self.init_opengl()
+            # Each editor frame starts from the GL state the previous one left behind (lighting,
+            # blending), not from init_opengl's, so settle that state with one discarded frame
+            self._draw_frame()
+        self._draw_frame()
+        return self.read_pixels()
+    
+    def _draw_frame(self):
+        """The same passes as Sphere3DCanvas.on_paint, without swapping buffers."""
+        self.update_view_vector()
+        if self.screen_render_mode == "simple":
+            self.render_simple_sphere_view()
+        
+        gl.glClear(gl.GL_COLOR_BUFFER_BIT | gl.GL_DEPTH_BUFFER_BIT)
+        self.setup_viewport()
+        self.setup_camera()
+        self.sphere.render()
+        self.draw_rainbow_cube()
+        self.draw_unified_screen()
+        self.sphere.render_screens(self)
+    
+    def read_pixels(self):
+        """Copy the default framebuffer into a top-down RGB array."""
+        gl.glPixelStorei(gl.GL_PACK_ALIGNMENT, 1)
+        data = gl.glReadPixels(0, 0, self.width, self.height, gl.GL_RGB, gl.GL_UNSIGNED_BYTE)
+        return np.frombuffer(data, dtype=np.uint8).reshape(self.height, self.width, 3)[::-1].copy()
+    
+    def close(self):
+        """Release screens, media and the context."""
+        self.context.make_current()
+        for screen in self.sphere.screens.values():
+            if isinstance(screen, MediaScreen):
+                screen.cleanup()
+        self.context.destroy()
+
+
+VIDEO_EXTENSIONS = ('.mp4', '.mov', '.mkv', '.webm', '.avi')
+
+
+def render_scene_frames(scene, frames, width=640, height=480, fps=30.0, output_dir=None,
+                        orbit_speed=0.0, spin_speed=0.0, samples=4):
+    """Render frame numbers of a scene at a fixed timestep of 1/fps seconds.
+    
+    With output_dir each frame is written there as frame_NNNNN.png and the
+    paths are returned; otherwise the RGB arrays are returned.
+    """
+    renderer = OffscreenSceneRenderer(width, height, samples)
+    try:
+        renderer.load_scene(scene)
+        renderer.orbit_speed = orbit_speed
+        renderer.spin_speed = spin_speed
+        results = []
+        for frame_number in frames:
+            image = renderer.render_frame(frame_number / fps)
+            if output_dir is None:
+                results.append(image)
+                continue
+            path = os.path.join(output_dir, f"frame_{frame_number:05d}.png")
+            Image.fromarray(image, 'RGB').save(path)
+            results.append(path)
+        return results
+    finally:
+        renderer.close()
+
+
+def _render_frame_chunk(job):
+    """Pool worker: render one contiguous frame range (each worker owns its own context)."""
+    frames = range(job['start'], job['stop'])
+    results = render_scene_frames(job['scene'], frames, job['width'], job['height'], job['fps'],
+                                  job['output_dir'], job['orbit_speed'], job['spin_speed'], job['samples'])
+    if job['output_dir'] is None:
+        # Raw bytes pickle far more cheaply than arrays on the way back to the parent
+        return [image.tobytes() for image in results]
+    return results
+
+
+def _open_ffmpeg_writer(path, width, height, fps):
+    """Start FFmpeg reading raw RGB frames from stdin."""
+    ffmpeg_cmd = [
+        'ffmpeg', '-y', '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-s', f'{width}x{height}',
+        '-r', str(fps), '-i', '-', '-an',
+        '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-pix_fmt', 'yuv420p',
+        '-loglevel', 'error', path
+    ]
+    return subprocess.Popen(ffmpeg_cmd, stdin=subprocess.PIPE)
+
+
+def batch_render_scene(scene, output, start=0, stop=1, fps=30.0, width=640, height=480,
+                       workers=1, chunk_size=None, orbit_speed=0.0, spin_speed=0.0, samples=4):
+    """Render frames [start, stop) of a scene to PNG files or a video.
+    
+    output is a directory for PNG frames, or a file ending in one of
+    VIDEO_EXTENSIONS, which is encoded by piping frames to FFmpeg in order.
+    With workers > 1 the frame range is split into contiguous chunks rendered
+    by a pool of processes, each with its own offscreen context. Returns the
+    PNG paths, or the video path.
+    """
+    if isinstance(scene, (str, Path)):
+        with open(scene, 'r') as f:
+            scene = json.load(f)
+    
+    to_video = str(output).lower().endswith(VIDEO_EXTENSIONS)
+    output_dir = None if to_video else str(output)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    
+    frame_count = max(0, stop - start)
+    workers = max(1, min(workers, frame_count or 1))
+    if chunk_size is None:
+        chunk_size = max(1, math.ceil(frame_count / workers))
+    jobs = [dict(scene=scene, start=chunk_start, stop=min(chunk_start + chunk_size, stop),
+                 width=width, height=height, fps=fps, output_dir=output_dir,
+                 orbit_speed=orbit_speed, spin_speed=spin_speed, samples=samples)
+            for chunk_start in range(start, stop, chunk_size)]
+    print(f"DEBUG: Rendering {frame_count} frames in {len(jobs)} chunks on {workers} worker(s)")
+    
+    writer = _open_ffmpeg_writer(str(output), width, height, fps) if to_video else None
+    results = []
+    pool = None
+    try:
+        if workers > 1:
+            # Spawned workers start with no GL state inherited from this process
+            import multiprocessing
+            pool = multiprocessing.get_context('spawn').Pool(workers)
+            chunks = pool.imap(_render_frame_chunk, jobs)
+        else:
+            chunks = map(_render_frame_chunk, jobs)
+        
+        for chunk in chunks:
+            if writer is None:
+                results.extend(chunk)
+                continue
+            for frame_bytes in chunk:
+                writer.stdin.write(frame_bytes)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+        if writer is not None:
+            writer.stdin.close()
+            if writer.wait() != 0:
+                raise RuntimeError(f"FFmpeg failed to encode {output}")
+    
+    return str(output) if to_video else results
+
+
 class Sphere3DFrame(wx.Frame):
     """Main frame for 3D sphere visualization with menu controls."""
     
@@ -14636,7 +16721,7 @@ class Sphere3DFrame(wx.Frame):
         result = wx.MessageBox(f"This will remove all {len(shapes)} shapes. Continue?", 
                               "Clear All Shapes", wx.YES_NO | wx.ICON_QUESTION)
         if result == wx.YES:
-            self.sphere.shapes.clear()
+            self.sphere.clear_shapes()
             self.canvas.Refresh()
             wx.MessageBox("All shapes cleared.", "Shapes Cleared", wx.OK | wx.ICON_INFORMATION)
     
@@ -15147,12 +17232,12 @@ class Sphere3DFrame(wx.Frame):
                 # Clear existing cache if new size is smaller
                 if cache_size < old_size and hasattr(screen, 'frame_cache'):
                     if len(screen.frame_cache) > cache_size:
-                        # Keep only the most recent frames
-                        sorted_keys = sorted(screen.frame_cache.keys())
-                        keys_to_remove = sorted_keys[:-cache_size] if cache_size > 0 else sorted_keys
+                        # Keep only the most recently used frames
+                        old_count = len(screen.frame_cache)
+                        keys_to_remove = list(screen.frame_cache.keys())[:old_count - cache_size]
                         for key in keys_to_remove:
                             del screen.frame_cache[key]
-                        print(f"DEBUG: Trimmed cache for {screen.name} from {len(sorted_keys)} to {len(screen.frame_cache)} frames")
+                        print(f"DEBUG: Trimmed cache for {screen.name} from {old_count} to {len(screen.frame_cache)} frames")
                 
                 updated_count += 1
                 print(f"DEBUG: Updated cache size for {screen.name}: {old_size} -> {cache_size} frames")
@@ -15764,9 +17849,7 @@ class Sphere3DFrame(wx.Frame):
             
             # Create image from points
             image_array = np.zeros((ifs.height, ifs.width, 3), dtype=np.uint8)
-            for x, y in points:
-                if 0 <= x < ifs.width and 0 <= y < ifs.height:
-                    image_array[y, x] = [0, 255, 0]  # Green fern
+            image_array[points[:, 1], points[:, 0]] = [0, 255, 0]  # Green fern
             
             # Create based on user choice
             if config['display_type'] == 'screen':
@@ -15791,11 +17874,8 @@ class Sphere3DFrame(wx.Frame):
             texture = perlin.generate_texture(512, 512, scale=0.05, octaves=6)
             
             # Convert to RGB
-            colored_texture = np.zeros((512, 512, 3), dtype=np.uint8)
-            for y in range(512):
-                for x in range(512):
-                    intensity = int(texture[y, x] * 255)
-                    colored_texture[y, x] = [intensity, intensity, intensity]
+            intensity = (texture * 255).astype(np.uint8)
+            colored_texture = np.repeat(intensity[:, :, np.newaxis], 3, axis=2)
                 
             # Create based on user choice
             if config['display_type'] == 'screen':
@@ -16039,7 +18119,7 @@ class Sphere3DFrame(wx.Frame):
             particles.add_force(particles.gravity_force)
             explosion_pos = np.array(config['position'])
             particles.emit_explosion(explosion_pos, count=200, speed=8.0)
-            print(f"DEBUG: Created explosion with {len(particles.particles)} total particles")
+            print(f"DEBUG: Created explosion with {particles.count} total particles")
             
             wx.MessageBox(f"Particle explosion created at position ({explosion_pos[0]:.1f}, {explosion_pos[1]:.1f}, {explosion_pos[2]:.1f})!\n\nParticles will move and fall realistically with gravity physics.", 
                          "Particle Explosion Created", wx.OK | wx.ICON_INFORMATION)
@@ -16108,18 +18188,37 @@ class Sphere3DFrame(wx.Frame):
         
         width_sizer = wx.BoxSizer(wx.HORIZONTAL)
         width_sizer.Add(wx.StaticText(scrolled_panel, label="Width:"), 0, wx.ALL | wx.CENTER, 5)
-        width_ctrl = wx.SpinCtrl(scrolled_panel, value="100", min=50, max=200)
+        width_ctrl = wx.SpinCtrl(scrolled_panel, value="100", min=50, max=1024)
         width_sizer.Add(width_ctrl, 1, wx.ALL | wx.EXPAND, 5)
         grid_box.Add(width_sizer, 0, wx.ALL | wx.EXPAND, 5)
         
         height_sizer = wx.BoxSizer(wx.HORIZONTAL)
         height_sizer.Add(wx.StaticText(scrolled_panel, label="Height:"), 0, wx.ALL | wx.CENTER, 5)
-        height_ctrl = wx.SpinCtrl(scrolled_panel, value="100", min=50, max=200)
+        height_ctrl = wx.SpinCtrl(scrolled_panel, value="100", min=50, max=1024)
         height_sizer.Add(height_ctrl, 1, wx.ALL | wx.EXPAND, 5)
         grid_box.Add(height_sizer, 0, wx.ALL | wx.EXPAND, 5)
         
         main_sizer.Add(grid_box, 0, wx.ALL | wx.EXPAND, 10)
         
+        # Rule settings
+        rule_box = wx.StaticBoxSizer(wx.VERTICAL, scrolled_panel, "Rules")
+        
+        rule_sizer = wx.BoxSizer(wx.HORIZONTAL)
+        rule_sizer.Add(wx.StaticText(scrolled_panel, label="Rule (B/S):"), 0, wx.ALL | wx.CENTER, 5)
+        rule_ctrl = wx.TextCtrl(scrolled_panel, value="B3/S23")
+        rule_ctrl.SetToolTip("Birth/survival neighbor counts, e.g. B3/S23 (Life), B36/S23 (HighLife), B2/S (Seeds)")
+        rule_sizer.Add(rule_ctrl, 1, wx.ALL | wx.EXPAND, 5)
+        rule_box.Add(rule_sizer, 0, wx.ALL | wx.EXPAND, 5)
+        
+        edge_sizer = wx.BoxSizer(wx.HORIZONTAL)
+        edge_sizer.Add(wx.StaticText(scrolled_panel, label="Edges:"), 0, wx.ALL | wx.CENTER, 5)
+        edge_choice = wx.Choice(scrolled_panel, choices=["Clamped", "Toroidal (wrap)", "Unbounded (Hashlife)"])
+        edge_choice.SetSelection(0)
+        edge_sizer.Add(edge_choice, 1, wx.ALL | wx.EXPAND, 5)
+        rule_box.Add(edge_sizer, 0, wx.ALL | wx.EXPAND, 5)
+        
+        main_sizer.Add(rule_box, 0, wx.ALL | wx.EXPAND, 10)
+        
         # Animation settings
         anim_box = wx.StaticBoxSizer(wx.VERTICAL, scrolled_panel, "Animation Settings")
         
@@ -16248,6 +18347,8 @@ class Sphere3DFrame(wx.Frame):
                 'infinite_mode': infinite_radio.GetValue(),
                 'initial_state': initial_state,
                 'density': density_ctrl.GetValue(),
+                'rule': rule_ctrl.GetValue().strip() or 'B3/S23',
+                'boundary': CellularAutomaton.BOUNDARIES[edge_choice.GetSelection()],
                 'display_type': 'screen' if screen_radio.GetValue() else 'world',
                 'position': [x_ctrl.GetValue(), y_ctrl.GetValue(), z_ctrl.GetValue()],
                 'update_interval': 1.0 / fps_ctrl.GetValue(),
@@ -16414,22 +18515,15 @@ class Sphere3DFrame(wx.Frame):
         # Create image array
         image = np.zeros((height, width, 3), dtype=np.uint8)
         
-        if not lines:
+        segments = np.asarray(lines, dtype=np.float64).reshape(-1, 2, 3)
+        if len(segments) == 0:
             return image
         
         # Find bounds of the line segments
-        all_points = []
-        for line in lines:
-            all_points.extend(line)
-        
-        if not all_points:
-            return image
-        
-        xs = [p[0] for p in all_points]
-        ys = [p[1] for p in all_points]
-        
-        min_x, max_x = min(xs), max(xs)
-        min_y, max_y = min(ys), max(ys)
+        xs = segments[:, :, 0]
+        ys = segments[:, :, 1]
+        min_x, max_x = xs.min(), xs.max()
+        min_y, max_y = ys.min(), ys.max()
         
         # Add padding
         padding = 0.1
@@ -16466,57 +18560,33 @@ class Sphere3DFrame(wx.Frame):
             color = [255, 255, 255]  # White default
         
         # Draw lines
-        for line in lines:
-            if len(line) >= 2:
-                x1 = int(line[0][0] * scale + offset_x)
-                y1 = int(line[0][1] * scale + offset_y)
-                x2 = int(line[1][0] * scale + offset_x)
-                y2 = int(line[1][1] * scale + offset_y)
-                
-                # Simple line drawing (Bresenham's algorithm)
-                self._draw_line(image, x1, y1, x2, y2, color)
+        pixel_x = np.trunc(xs * scale + offset_x).astype(np.int64)
+        pixel_y = np.trunc(ys * scale + offset_y).astype(np.int64)
+        self._draw_lines(image, pixel_x[:, 0], pixel_y[:, 0], pixel_x[:, 1], pixel_y[:, 1], color)
         
         return image
     
-    def _draw_line(self, image, x0, y0, x1, y1, color):
-        """Draw a line on the image using Bresenham's algorithm."""
+    def _draw_lines(self, image, x0, y0, x1, y1, color):
+        """Draw many integer line segments at once, one pixel per step along the major axis."""
         height, width = image.shape[:2]
+        steps = np.maximum(np.abs(x1 - x0), np.abs(y1 - y0))
         
-        dx = abs(x1 - x0)
-        dy = abs(y1 - y0)
-        
-        sx = 1 if x0 < x1 else -1
-        sy = 1 if y0 < y1 else -1
+        # One sample per pixel step of every segment, endpoints included
+        segment = np.repeat(np.arange(len(steps)), steps + 1)
+        starts = np.cumsum(steps + 1) - (steps + 1)
+        t = (np.arange(len(segment)) - starts[segment]) / np.maximum(steps[segment], 1)
+        x = np.rint(x0[segment] + (x1 - x0)[segment] * t).astype(np.int64)
+        y = np.rint(y0[segment] + (y1 - y0)[segment] * t).astype(np.int64)
         
-        err = dx - dy
-        
-        x, y = x0, y0
-        
-        while True:
-            # Plot point if within bounds
-            if 0 <= x < width and 0 <= y < height:
-                image[y, x] = color
-            
-            if x == x1 and y == y1:
-                break
-                
-            e2 = 2 * err
-            
-            if e2 > -dy:
-                err -= dy
-                x += sx
-                
-            if e2 < dx:
-                err += dx
-                y += sy
+        inside = (x >= 0) & (x < width) & (y >= 0) & (y < height)
+        image[y[inside], x[inside]] = color
     
     def create_animated_game_of_life_screen(self, cellular, config):
         """Create animated screen for Game of Life with real-time updates."""
         # Resize the cellular automaton to match config
-        cellular.width = config['width']
-        cellular.height = config['height']
-        cellular.grid = np.zeros((config['height'], config['width']), dtype=int)
-        cellular.next_grid = np.zeros((config['height'], config['width']), dtype=int)
+        cellular.set_rule(config.get('rule', 'B3/S23'))
+        cellular.set_boundary(config.get('boundary', 'clamped'))
+        cellular.resize(config['width'], config['height'])
         
         # Set initial state again with new size
         if config['initial_state'] == 'random':
@@ -16542,6 +18612,7 @@ class Sphere3DFrame(wx.Frame):
             media_screen.gol_config = config
             media_screen.gol_generation = 0
             media_screen.gol_last_update = time.time()
+            media_screen.gol_frame_dirty = False
             
             # Add to scene
             if config['display_type'] == 'screen':
@@ -16573,9 +18644,7 @@ class Sphere3DFrame(wx.Frame):
             
             # Create image from points
             image_array = np.zeros((ifs.height, ifs.width, 3), dtype=np.uint8)
-            for x, y in points:
-                if 0 <= x < ifs.width and 0 <= y < ifs.height:
-                    image_array[y, x] = [139, 69, 19]  # Brown tree color
+            image_array[points[:, 1], points[:, 0]] = [139, 69, 19]  # Brown tree color
             
             # Create based on user choice
             if config['display_type'] == 'screen':
@@ -16597,40 +18666,38 @@ class Sphere3DFrame(wx.Frame):
                 return
                 
             menger = self.math_systems['menger']
-            vertices = menger.get_vertices()
             
             if config['display_type'] == 'screen':
                 # Create a 2D projection image of the Menger sponge for screen display
                 image_array = np.zeros((512, 512, 3), dtype=np.uint8)
                 # Project 3D vertices to 2D for visualization
-                for vertex in vertices[::10]:  # Sample vertices
-                    x = int((vertex[0] + 1) * 128) % 512  # Map to image coordinates
-                    y = int((vertex[1] + 1) * 128) % 512
-                    if 0 <= x < 512 and 0 <= y < 512:
-                        image_array[y, x] = [255, 128, 0]  # Orange color
+                vertices = menger.get_vertices()[::10]  # Sample vertices
+                x = np.trunc((vertices[:, 0] + 1) * 128).astype(np.int64) % 512  # Map to image coordinates
+                y = np.trunc((vertices[:, 1] + 1) * 128).astype(np.int64) % 512
+                image_array[y, x] = [255, 128, 0]  # Orange color
                 
                 self.create_math_graphics_screen(image_array, "3D Menger Sponge", config)
                 wx.MessageBox(f"Menger sponge projection displayed on screen!\n\nThis 2D projection shows the fractal structure with recursive hole patterns.", 
                              "Menger Sponge Screen Created", wx.OK | wx.ICON_INFORMATION)
             else:  # world
-                # Create 3D shapes from the Menger sponge vertices
+                # One mesh of the sponge's visible cube faces, drawn in a single call
+                vertices, normals, indices = menger.get_mesh()
                 base_pos = config['position']
-                for i, vertex in enumerate(vertices[::50]):  # Sample every 50th vertex to avoid too many shapes
-                    cube_shape = CubeShape(f"menger_cube_{i}")
-                    # Position relative to the configured base position
-                    cube_shape.set_position(
-                        base_pos[0] + vertex[0] * 0.5, 
-                        base_pos[1] + vertex[1] * 0.5, 
-                        base_pos[2] + vertex[2] * 0.5
-                    )
-                    cube_shape.set_scale(0.02)  # Very small cubes
-                    cube_shape.color = np.array([1.0, 0.5, 0.0, 0.8])  # Orange semi-transparent
-                    
-                    # Add the cube to the 3D scene
-                    self.canvas.sphere.add_shape(cube_shape)
+                sponge = MathematicalShape(f"menger_sponge_{len(self.canvas.sphere.shapes)}", "menger_sponge")
+                sponge.position = np.array(base_pos, dtype=np.float32)
+                sponge.scale = np.array([0.5, 0.5, 0.5], dtype=np.float32)
+                
+                # Orange, shaded per face direction so the holes stay readable without lighting
+                light = np.array([0.3, 0.5, 0.8]) / np.linalg.norm([0.3, 0.5, 0.8])
+                shade = 0.55 + 0.45 * np.clip(normals @ light, 0.0, 1.0)
+                colors = shade[:, np.newaxis] * np.array([1.0, 0.5, 0.0])
+                sponge.set_geometry(vertices, colors, indices, normals=normals)
+                
+                # Add the sponge to the 3D scene
+                self.canvas.sphere.add_shape(sponge)
                 
                 self.canvas.Refresh()
-                wx.MessageBox(f"3D Menger sponge added to world!\n\nAdded {len(vertices)//50} small cubes representing the fractal structure.\nThis shows the recursive hole-drilling pattern in 3D space!", 
+                wx.MessageBox(f"3D Menger sponge added to world!\n\nAdded {len(menger.centers)} cubes ({len(indices) // 6} visible faces) representing the fractal structure.\nThis shows the recursive hole-drilling pattern in 3D space!", 
                              "3D Menger Sponge Added", wx.OK | wx.ICON_INFORMATION)
         except Exception as e:
             wx.MessageBox(f"Error generating Menger sponge: {str(e)}", "Error", wx.OK | wx.ICON_ERROR)
@@ -16647,16 +18714,8 @@ class Sphere3DFrame(wx.Frame):
             texture = simplex.generate_texture(512, 512, scale=0.02, octaves=5)
             
             # Convert to colorful RGB (blue-green gradient)
-            colored_texture = np.zeros((512, 512, 3), dtype=np.uint8)
-            for y in range(512):
-                for x in range(512):
-                    intensity = texture[y, x]
-                    # Create a blue-green gradient
-                    colored_texture[y, x] = [
-                        int(intensity * 100),      # Low red
-                        int(intensity * 200),      # Medium green
-                        int(intensity * 255)       # High blue
-                    ]
+            # Create a blue-green gradient (low red, medium green, high blue)
+            colored_texture = (texture[:, :, np.newaxis] * np.array([100, 200, 255])).astype(np.uint8)
             
             # Create based on user choice
             if config['display_type'] == 'screen':
@@ -16951,7 +19010,7 @@ class Sphere3DFrame(wx.Frame):
             
             # Create fountain at specified position
             particles.emit_fountain(fountain_pos, count=150, height=12.0)
-            print(f"DEBUG: Created fountain with {len(particles.particles)} total particles")
+            print(f"DEBUG: Created fountain with {particles.count} total particles")
             
             wx.MessageBox(f"Particle fountain created at position ({fountain_pos[0]:.1f}, {fountain_pos[1]:.1f}, {fountain_pos[2]:.1f})!\n\nParticles will shoot upward and fall gracefully with realistic physics.", 
                          "Particle Fountain Created", wx.OK | wx.ICON_INFORMATION)
@@ -36,6 +36,9 @@ from .dag_algorithms import (
     critical_path,
     shortest_paths_dag,
     transitive_closure,
+    transitive_reduction,
+    is_reachable,
+    ReachabilityIndex,
     longest_path_dag,
     minimum_height_dag,
     is_dag,
@@ -46,7 +49,7 @@ from .dag_algorithms import (
 from .graph_algorithms import (
     depth_first_search,
     breadth_first_search,
-    dijkstra_shortest_path,
+    dijkstra_shortest_path_tree,
     a_star_search,
     bellman_ford_shortest_path,
     kruskal_minimum_spanning_tree,
@@ -63,6 +66,7 @@ from .hypergraph_algorithms import (
     hypergraph_cut,
     hypergraph_clustering,
     minimal_transversals,
+    iter_minimal_transversals,
     dual_hypergraph,
     set_cover_approximation,
     connected_components_hypergraph,
@@ -73,12 +77,14 @@ from .nested_graph_algorithms import (
     flatten_nested_graph,
     recursive_traversal,
     pattern_matching,
+    iter_pattern_matches,
     hierarchical_clustering,
     query_nested_graph
 )
 
 from .ubergraph_algorithms import (
     semantic_subgraph_matching,
+    iter_semantic_matches,
     ontology_based_query,
     hypergraph_to_ubergraph,
     provenance_tracking,
@@ -87,6 +93,11 @@ from .ubergraph_algorithms import (
     inference_engine
 )
 
+from .subgraph_matching import (
+    edge_pairs,
+    iter_subgraph_matches
+)
+
 from .graph_properties import (
     is_cyclic,
     analyze_connectivity,
@@ -135,6 +146,9 @@ __all__ = [
     'critical_path',
     'shortest_paths_dag',
     'transitive_closure',
+    'transitive_reduction',
+    'is_reachable',
+    'ReachabilityIndex',
     'longest_path_dag',
     'minimum_height_dag',
     'is_dag',
@@ -144,7 +158,7 @@ __all__ = [
     # Graph algorithms
     'depth_first_search',
     'breadth_first_search',
-    'dijkstra_shortest_path',
+    'dijkstra_shortest_path_tree',
     'a_star_search',
     'bellman_ford_shortest_path',
     'kruskal_minimum_spanning_tree',
@@ -160,6 +174,7 @@ __all__ = [
     'hypergraph_cut',
     'hypergraph_clustering',
     'minimal_transversals',
+    'iter_minimal_transversals',
     'dual_hypergraph',
     'set_cover_approximation',
     'connected_components_hypergraph',
@@ -169,11 +184,13 @@ __all__ = [
     'flatten_nested_graph',
     'recursive_traversal',
     'pattern_matching',
+    'iter_pattern_matches',
     'hierarchical_clustering',
     'query_nested_graph',
     
     # Ubergraph algorithms
     'semantic_subgraph_matching',
+    'iter_semantic_matches',
     'ontology_based_query',
     'hypergraph_to_ubergraph',
     'provenance_tracking',
@@ -181,6 +198,10 @@ __all__ = [
     'recursive_edge_matching',
     'inference_engine',
     
+    # Subgraph matching
+    'edge_pairs',
+    'iter_subgraph_matches',
+    
     # Graph properties
     'is_cyclic',
     'analyze_connectivity',
@@ -6,6 +6,8 @@ Algorithms for directed acyclic graphs (DAGs).
 from typing import List, Set, Dict, Optional, Any, Tuple
 from collections import defaultdict, deque
 
+import numpy as np
+
 import models.dag_graph as m_dag_graph
 import models.node as m_node
 import models.edge as m_edge
@@ -15,6 +17,8 @@ import models.edge as m_edge
 def is_dag(graph: m_dag_graph.DAGGraph) -> bool:
     """Check if graph is actually a DAG (no cycles)."""
 
+    if isinstance(graph, m_dag_graph.DAGGraph):
+        return graph.is_acyclic()
     try:
         topological_sort_kahn(graph)
         return True
@@ -25,6 +29,10 @@ def is_dag(graph: m_dag_graph.DAGGraph) -> bool:
 def topological_sort_kahn(graph: m_dag_graph.DAGGraph) -> List[m_node.Node]:
     """Perform topological sort using Kahn's algorithm."""
 
+    # A DAGGraph keeps its order current as edges change
+    if isinstance(graph, m_dag_graph.DAGGraph):
+        return graph.get_topological_sort()
+
     # Calculate in-degree for each node
     in_degree = defaultdict(int)
     for edge in graph.get_all_edges():
@@ -84,6 +92,9 @@ def topological_sort_dfs(graph: m_dag_graph.DAGGraph) -> List[m_node.Node]:
 def detect_cycle(graph: m_dag_graph.DAGGraph) -> Optional[List[m_node.Node]]:
     """Detect a cycle in the graph if one exists."""
 
+    if isinstance(graph, m_dag_graph.DAGGraph) and graph.is_acyclic():
+        return None
+
     visited = set()
     rec_stack = set()
     cycle = []
@@ -174,26 +185,245 @@ def shortest_paths_dag(graph: m_dag_graph.DAGGraph, source_id: str,
     return dist
 
 
+# Bits per word of a packed reachability row
+_WORD_BITS = 64
+
+
+class ReachabilityIndex:
+    """Packed-bitset reachability over a DAG with incremental edge insertion.
+
+    Row i of the bit matrix holds every node reachable from node i by a path
+    of at least one edge, so a reachability query is a single bit test.
+    """
+
+    def __init__(self, graph: Optional[m_dag_graph.DAGGraph] = None):
+        self._ids: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._successors: List[Set[int]] = []
+        self._rows = np.zeros((0, 1), dtype=np.uint64)
+        if graph is not None:
+            self._build(graph)
+
+    def _build(self, graph: m_dag_graph.DAGGraph) -> None:
+        """Index the graph and fill the rows in reverse topological order."""
+
+        for node in graph.get_all_nodes():
+            self._register(node.id)
+        self._reserve(len(self._ids))
+        in_degree = [0] * len(self._ids)
+        for edge in graph.get_all_edges():
+            source = self._index.get(edge.source_id)
+            target = self._index.get(edge.target_id)
+            if source is None or target is None or target in self._successors[source]:
+                continue
+            self._successors[source].add(target)
+            in_degree[target] += 1
+
+        if isinstance(graph, m_dag_graph.DAGGraph):
+            order = [self._index[node_id] for node_id in graph.get_topological_order()]
+        else:
+            # Kahn's algorithm over the index lists instead of per-node edge scans
+            order = [i for i, degree in enumerate(in_degree) if degree == 0]
+            for i in order:
+                for target in self._successors[i]:
+                    in_degree[target] -= 1
+                    if in_degree[target] == 0:
+                        order.append(target)
+        if len(order) != len(self._ids):
+            raise ValueError("Graph contains a cycle")
+
+        rows = self._rows
+        for i in reversed(order):
+            successors = list(self._successors[i])
+            if not successors:
+                continue
+            rows[i] = np.bitwise_or.reduce(rows[successors], axis=0)
+            for target in successors:
+                rows[i, target // _WORD_BITS] |= np.uint64(1 << (target % _WORD_BITS))
+
+    def _register(self, node_id: str) -> int:
+        index = len(self._ids)
+        self._ids.append(node_id)
+        self._index[node_id] = index
+        self._successors.append(set())
+        return index
+
+    def _reserve(self, count: int) -> None:
+        """Grow the bit matrix so it holds at least count rows and columns."""
+
+        rows, words = self._rows.shape
+        if count <= rows and count <= words * _WORD_BITS:
+            return
+        size = max(count, 2 * rows, 1)
+        grown = np.zeros((size, (size + _WORD_BITS - 1) // _WORD_BITS), dtype=np.uint64)
+        grown[:rows, :words] = self._rows
+        self._rows = grown
+
+    def _bit(self, index: int) -> Tuple[int, np.uint64]:
+        return index // _WORD_BITS, np.uint64(1 << (index % _WORD_BITS))
+
+    def _members(self, row: np.ndarray) -> List[str]:
+        bits = np.unpackbits(row.view(np.uint8), bitorder='little')
+        return [self._ids[i] for i in np.flatnonzero(bits[:len(self._ids)])]
+
+    def __contains__(self, node_id: str) -> bool:
+        return node_id in self._index
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add_node(self, node_id: str) -> None:
+        """Add an isolated node."""
+
+        if node_id not in self._index:
+            self._reserve(len(self._ids) + 1)
+            self._register(node_id)
+
+    def can_reach(self, source_id: str, target_id: str) -> bool:
+        """True if a path of at least one edge leads from source to target."""
+
+        source = self._index.get(source_id)
+        target = self._index.get(target_id)
+        if source is None or target is None:
+            return False
+        word, mask = self._bit(target)
+        return bool(self._rows[source, word] & mask)
+
+    def descendants(self, node_id: str) -> Set[str]:
+        """All nodes reachable from a node."""
+
+        if node_id not in self._index:
+            return set()
+        return set(self._members(self._rows[self._index[node_id]]))
+
+    def _ancestor_indices(self, index: int) -> np.ndarray:
+        word, mask = self._bit(index)
+        return np.flatnonzero(self._rows[:len(self._ids), word] & mask)
+
+    def ancestors(self, node_id: str) -> Set[str]:
+        """All nodes that can reach a node."""
+
+        if node_id not in self._index:
+            return set()
+        return {self._ids[i] for i in self._ancestor_indices(self._index[node_id])}
+
+    def add_edge(self, source_id: str, target_id: str) -> bool:
+        """Record an edge, updating only the rows of the source and its ancestors.
+
+        Raises ValueError if the edge would close a cycle. Returns True if the
+        edge made new pairs reachable.
+        """
+
+        if source_id == target_id or self.can_reach(target_id, source_id):
+            raise ValueError("Graph contains a cycle")
+        self.add_node(source_id)
+        self.add_node(target_id)
+        source = self._index[source_id]
+        target = self._index[target_id]
+        self._successors[source].add(target)
+        if self.can_reach(source_id, target_id):
+            return False
+
+        reached = self._rows[target].copy()
+        word, mask = self._bit(target)
+        reached[word] |= mask
+        affected = np.append(self._ancestor_indices(source), source)
+        self._rows[affected] |= reached
+        return True
+
+    def closure(self) -> Dict[str, Set[str]]:
+        """Map each node to the set of nodes it can reach."""
+
+        return {node_id: set(self._members(self._rows[i])) for i, node_id in enumerate(self._ids)}
+
+    def reduction(self) -> List[Tuple[str, str]]:
+        """Edges of the transitive reduction as (source_id, target_id) pairs.
+
+        An edge u->v is redundant when v is reachable from another successor
+        of u, which takes one OR of the successor rows per node.
+        """
+
+        kept = []
+        for source, successors in enumerate(self._successors):
+            successors = list(successors)
+            if len(successors) > 1:
+                covered = np.bitwise_or.reduce(self._rows[successors], axis=0)
+            else:
+                covered = None
+            for target in successors:
+                word, mask = self._bit(target)
+                if covered is None or not covered[word] & mask:
+                    kept.append((self._ids[source], self._ids[target]))
+        return kept
+
+
 def transitive_closure(graph: m_dag_graph.DAGGraph) -> Dict[str, Set[str]]:
     """Compute the transitive closure of the DAG."""
 
-    closure = {node.id: set() for node in graph.get_all_nodes()}
-    
-    # Initialize with direct edges
+    try:
+        return ReachabilityIndex(graph).closure()
+    except ValueError:
+        pass
+
+    # Cyclic input: search from every node over the successor lists
+    successors = defaultdict(set)
     for edge in graph.get_all_edges():
-        closure[edge.source_id].add(edge.target_id)
-    
-    # Floyd-Warshall algorithm
-    nodes = list(graph.get_all_nodes())
-    for k in nodes:
-        for i in nodes:
-            for j in nodes:
-                if k.id in closure[i.id] and j.id in closure[k.id]:
-                    closure[i.id].add(j.id)
-    
+        successors[edge.source_id].add(edge.target_id)
+    closure = {}
+    for node in graph.get_all_nodes():
+        reached = set()
+        stack = list(successors[node.id])
+        while stack:
+            node_id = stack.pop()
+            if node_id not in reached:
+                reached.add(node_id)
+                stack.extend(successors[node_id])
+        closure[node.id] = reached
     return closure
 
 
+def transitive_reduction(graph: m_dag_graph.DAGGraph) -> List[m_edge.Edge]:
+    """
+    Edges that remain after removing every edge implied by a longer path.
+
+    Only defined for acyclic graphs; raises ValueError if the graph has a
+    cycle.
+    """
+
+    kept = set(ReachabilityIndex(graph).reduction())
+    result = []
+    for edge in graph.get_all_edges():
+        pair = (edge.source_id, edge.target_id)
+        if pair in kept:
+            kept.discard(pair)
+            result.append(edge)
+    return result
+
+
+def is_reachable(graph: m_dag_graph.DAGGraph, source_id: str, target_id: str,
+                 index: Optional[ReachabilityIndex] = None) -> bool:
+    """
+    Check whether a path of at least one edge leads from one node to another.
+
+    Searches forward from the source, so only what it reaches is visited.
+    For many queries on one graph, build a ReachabilityIndex once and pass
+    it as index.
+    """
+
+    if index is not None:
+        return index.can_reach(source_id, target_id)
+    visited = set()
+    stack = [source_id]
+    while stack:
+        for edge in graph.get_edges_from_node(stack.pop()):
+            if edge.target_id == target_id:
+                return True
+            if edge.target_id not in visited:
+                visited.add(edge.target_id)
+                stack.append(edge.target_id)
+    return False
+
+
 def longest_path_dag(graph: m_dag_graph.DAGGraph, weights: Dict[str, float]) -> Dict[str, float]:
     """Find longest paths from each node in a weighted DAG."""
 
@@ -249,6 +479,9 @@ def count_paths(graph: m_dag_graph.DAGGraph, source_id: str, target_id: str) ->
 def layer_assignment(graph: m_dag_graph.DAGGraph) -> Dict[str, int]:
     """Assign nodes to layers for visualization."""
 
+    if isinstance(graph, m_dag_graph.DAGGraph):
+        return graph.get_levels()
+
     # Use longest path from any source as layer number
     layers = {node.id: 0 for node in graph.get_all_nodes()}
     
@@ -3,7 +3,8 @@ Algorithms for hypergraphs.
 """
 
 
-from typing import List, Set, Dict, Optional, Any, Tuple, Callable
+import time
+from typing import List, Set, Dict, Optional, Any, Tuple, Callable, Iterator
 from collections import defaultdict, deque
 import numpy as np
 
@@ -18,35 +19,34 @@ def hypergraph_traversal(graph: m_hypergraph.Hypergraph, start_id: str,
     visited_nodes = set()
     visited_edges = set()
     result = []
-    
-    def visit_node(node_id: str) -> None:
-        if node_id in visited_nodes:
-            return
-        
-        node = graph.get_node(node_id)
-        if node:
-            visited_nodes.add(node_id)
+
+    # Explicit stack of iterators emulating the recursive node -> hyperedge ->
+    # node descent, so long hyperedge chains cannot hit the recursion limit.
+    # Each incidence is followed at most once via the graph's incidence index.
+    stack = [iter([start_id])]
+    while stack:
+        item = next(stack[-1], None)
+        if item is None:
+            stack.pop()
+            continue
+
+        if isinstance(item, str):
+            if item in visited_nodes:
+                continue
+            node = graph.get_node(item)
+            if not node:
+                continue
+            visited_nodes.add(item)
             result.append(node)
             if visit_func:
                 visit_func(node)
-            
             # Visit all hyperedges containing this node
-            for edge in graph.get_node_hyperedges(node_id):
-                visit_edge(edge.id)
-    
-    def visit_edge(edge_id: str) -> None:
-        if edge_id in visited_edges:
-            return
-        
-        edge = graph.get_edge(edge_id)
-        if isinstance(edge, m_hypergraph.HypergraphEdge):
-            visited_edges.add(edge_id)
-            
+            stack.append(iter(graph.get_node_hyperedges(item)))
+        elif item.id not in visited_edges and isinstance(item, m_hypergraph.HypergraphEdge):
+            visited_edges.add(item.id)
             # Visit all nodes in the hyperedge
-            for node_id in edge.source_ids + edge.target_ids:
-                visit_node(node_id)
-    
-    visit_node(start_id)
+            stack.append(iter(item.source_ids + item.target_ids))
+
     return result
 
 
@@ -160,67 +160,118 @@ def hypergraph_clustering(graph: m_hypergraph.Hypergraph, k: int,
     return clusters
 
 
-def minimal_transversals(graph: m_hypergraph.Hypergraph) -> List[Set[str]]:
-    """Find all minimal transversals (hitting sets) of the hypergraph."""
-
-    def is_minimal_transversal(nodes: Set[str], transversal: Set[str]) -> bool:
-        """Check if transversal is minimal."""
+def iter_minimal_transversals(graph: m_hypergraph.Hypergraph, max_results: Optional[int] = None,
+                              time_budget: Optional[float] = None) -> Iterator[Set[str]]:
+    """
+    Yield the minimal transversals (hitting sets) of the hypergraph one at a time.
 
-        # Must hit all edges
-        for edge in graph.get_all_edges():
-            if isinstance(edge, m_hypergraph.HypergraphEdge):
-                if not (set(edge.source_ids) & transversal or
-                       set(edge.target_ids) & transversal):
-                    return False
-        
-        # Must be minimal
-        for node in transversal:
-            smaller = transversal - {node}
-            all_hit = True
-            for edge in graph.get_all_edges():
-                if isinstance(edge, m_hypergraph.HypergraphEdge):
-                    if not (set(edge.source_ids) & smaller or
-                           set(edge.target_ids) & smaller):
-                        all_hit = False
-                        break
-            if all_hit:
-                return False
-        
-        return True
-    
-    def extend_transversal(nodes: Set[str], current: Set[str],
-                          remaining: Set[str]) -> List[Set[str]]:
-        """Recursively find all minimal transversals."""
+    Uses the MMCS search of Murakami and Uno: a transversal is grown one vertex
+    at a time from the uncovered hyperedge with the fewest candidates, and a
+    branch is cut as soon as some chosen vertex stops being the only hitter of
+    any hyperedge, so every leaf is a distinct minimal transversal. Vertex sets
+    are int bitmasks. Stops after max_results transversals or once time_budget
+    seconds have passed since the first request.
+    """
 
-        result = []
-        
-        # Check if current set is a minimal transversal
-        if is_minimal_transversal(nodes, current):
-            result.append(current)
-            return result
-        
-        # Try extending with each remaining node
-        for node in remaining:
-            new_current = current | {node}
-            new_remaining = {n for n in remaining if n > node}  # Lexicographic order
-            result.extend(extend_transversal(nodes, new_current, new_remaining))
-        
-        return result
-    
-    # Get all nodes that appear in edges
-    nodes = set()
+    # Index the vertices and the hyperedges they belong to
+    vertex_ids: List[str] = []
+    vertex_index: Dict[str, int] = {}
+    masks: List[int] = []
+    incident: List[List[int]] = []
     for edge in graph.get_all_edges():
-        if isinstance(edge, m_hypergraph.HypergraphEdge):
-            nodes.update(edge.source_ids)
-            nodes.update(edge.target_ids)
-    
-    return extend_transversal(nodes, set(), nodes)
+        if not isinstance(edge, m_hypergraph.HypergraphEdge):
+            continue
+        mask = 0
+        for node_id in edge.source_ids + edge.target_ids:
+            if node_id not in vertex_index:
+                vertex_index[node_id] = len(vertex_ids)
+                vertex_ids.append(node_id)
+                incident.append([])
+            bit = 1 << vertex_index[node_id]
+            if not mask & bit:
+                mask |= bit
+                incident[vertex_index[node_id]].append(len(masks))
+        masks.append(mask)
+
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+    uncovered = set(range(len(masks)))
+    # Per hyperedge: how many chosen vertices hit it, and which one when only one does
+    hits = [0] * len(masks)
+    owner = [-1] * len(masks)
+    # Per vertex: the hyperedges it alone hits among the chosen vertices
+    critical: List[Set[int]] = [set() for _ in vertex_ids]
+    chosen: List[int] = []
+    stopped = False
+
+    def choose(v: int) -> List[Tuple[int, int]]:
+        """Add a vertex; returns the (vertex, edge) critical pairs it took away."""
+
+        lost = []
+        for e in incident[v]:
+            hits[e] += 1
+            if hits[e] == 1:
+                uncovered.discard(e)
+                owner[e] = v
+                critical[v].add(e)
+            elif hits[e] == 2:
+                critical[owner[e]].discard(e)
+                lost.append((owner[e], e))
+        chosen.append(v)
+        return lost
+
+    def unchoose(v: int, lost: List[Tuple[int, int]]) -> None:
+        chosen.pop()
+        for e in incident[v]:
+            hits[e] -= 1
+            if hits[e] == 0:
+                uncovered.add(e)
+        critical[v].clear()
+        for u, e in lost:
+            critical[u].add(e)
+
+    def search(candidates: int) -> Iterator[Set[str]]:
+        nonlocal stopped
+        if not uncovered:
+            yield {vertex_ids[v] for v in chosen}
+            return
+        if deadline is not None and time.perf_counter() > deadline:
+            stopped = True
+            return
+
+        edge = min(uncovered, key=lambda e: bin(masks[e] & candidates).count("1"))
+        branch = masks[edge] & candidates
+        candidates &= ~branch
+        while branch and not stopped:
+            low = branch & -branch
+            branch ^= low
+            v = low.bit_length() - 1
+            lost = choose(v)
+            if all(critical[u] for u, _ in lost):
+                yield from search(candidates)
+            unchoose(v, lost)
+            candidates |= low
+
+    found = 0
+    if max_results is not None and max_results <= 0:
+        return
+    for transversal in search((1 << len(vertex_ids)) - 1):
+        yield transversal
+        found += 1
+        if max_results is not None and found >= max_results:
+            return
+
+
+def minimal_transversals(graph: m_hypergraph.Hypergraph, max_results: Optional[int] = None,
+                         time_budget: Optional[float] = None) -> List[Set[str]]:
+    """Find all minimal transversals (hitting sets) of the hypergraph."""
+
+    return list(iter_minimal_transversals(graph, max_results, time_budget))
 
 
 def dual_hypergraph(graph: m_hypergraph.Hypergraph) -> m_hypergraph.Hypergraph:
     """Construct the dual hypergraph."""
 
-    dual = Hypergraph(name=f"Dual of {graph.name}")
+    dual = m_hypergraph.Hypergraph(name=f"Dual of {graph.name}")
     
     # Create nodes for each hyperedge
     edge_to_node = {}
@@ -244,8 +295,10 @@ def dual_hypergraph(graph: m_hypergraph.Hypergraph) -> m_hypergraph.Hypergraph:
             
             if sources or targets:
                 edge = m_hypergraph.HypergraphEdge()
-                edge.source_ids = sources
-                edge.target_ids = targets
+                for source_id in sources:
+                    edge.add_source(source_id)
+                for target_id in targets:
+                    edge.add_target(target_id)
                 dual.add_edge(edge)
     
     return dual
@@ -287,13 +340,15 @@ def connected_components_hypergraph(graph: m_hypergraph.Hypergraph) -> List[Set[
 
     components = []
     unvisited = set(node.id for node in graph.get_all_nodes())
+    visited_edges = set()
     
     while unvisited:
         # Start new component
         start = next(iter(unvisited))
         component = set()
         
-        # Traverse component
+        # Traverse component; each hyperedge is expanded once, so the cost is
+        # proportional to the number of incidences in the component
         stack = [start]
         while stack:
             node_id = stack.pop()
@@ -303,6 +358,9 @@ def connected_components_hypergraph(graph: m_hypergraph.Hypergraph) -> List[Set[
                 
                 # Add all nodes connected through hyperedges
                 for edge in graph.get_node_hyperedges(node_id):
+                    if edge.id in visited_edges:
+                        continue
+                    visited_edges.add(edge.id)
                     stack.extend(n for n in edge.source_ids + edge.target_ids
                                if n in unvisited)
         
@@ -3,13 +3,14 @@ Algorithms for nested graphs.
 """
 
 
-from typing import List, Set, Dict, Optional, Any, Tuple, Callable
+from typing import List, Set, Dict, Optional, Any, Tuple, Callable, Iterator
 from collections import defaultdict, deque
 
 import models.nested_graph as m_nested_graph
 import models.basic_graph as m_basic_graph
 import models.node as m_node
 import models.edge as m_edge
+import models.algorithms.subgraph_matching as m_subgraph_matching
 
 
 # Flatten a nested graph into a graph (i.e. a graph that has no nested graphs)
@@ -101,8 +102,9 @@ def recursive_traversal(graph: m_nested_graph.NestedGraph,
 
 
 # Pattern matching
-def pattern_matching(graph: m_nested_graph.NestedGraph, pattern: m_nested_graph.NestedGraph) -> List[Dict[str, str]]:
-    """Find all occurrences of pattern in graph."""
+def iter_pattern_matches(graph: m_nested_graph.NestedGraph,
+                         pattern: m_nested_graph.NestedGraph) -> Iterator[Dict[str, str]]:
+    """Yield occurrences of pattern in graph as pattern node id -> graph node id."""
 
     def is_match(node1: m_nested_graph.NestedNode, node2: m_nested_graph.NestedNode) -> bool:
         """Check if two nodes match."""
@@ -130,59 +132,23 @@ def pattern_matching(graph: m_nested_graph.NestedGraph, pattern: m_nested_graph.
             len(graph1.get_all_edges()) != len(graph2.get_all_edges())):
             return False
         
-        # Try to find bijective mapping between nodes
-        def find_mapping(nodes1: List[m_nested_graph.NestedNode], nodes2: List[m_nested_graph.NestedNode],
-                        mapping: Dict[str, str]) -> Optional[Dict[str, str]]:
-            if not nodes1:
-                # Check if edge structure matches under mapping
-                for edge2 in graph2.get_all_edges():
-                    found_match = False
-                    for edge1 in graph1.get_all_edges():
-                        if (mapping[edge2.source_id] == edge1.source_id and
-                            mapping[edge2.target_id] == edge1.target_id):
-                            found_match = True
-                            break
-                    if not found_match:
-                        return None
-                return mapping
-            
-            node1 = nodes1[0]
-            remaining1 = nodes1[1:]
-            
-            # Try matching with each available node in graph2
-            for i, node2 in enumerate(nodes2):
-                if is_match(node1, node2):
-                    new_mapping = mapping.copy()
-                    new_mapping[node2.id] = node1.id
-                    result = find_mapping(remaining1,
-                                       nodes2[:i] + nodes2[i+1:],
-                                       new_mapping)
-                    if result:
-                        return result
-            
-            return None
-        
-        return bool(find_mapping(list(graph1.get_all_nodes()),
-                               list(graph2.get_all_nodes()), {}))
-    
-    matches = []
+        # A bijection that carries every edge of graph2 onto graph1
+        mapping = m_subgraph_matching.iter_subgraph_matches(
+            graph2, graph1, node_match=lambda node2, node1: is_match(node1, node2),
+            node_key=lambda node: node.text)
+        return next(mapping, None) is not None
     
-    # Try matching pattern at each node
-    for node in graph.get_all_nodes():
-        if isinstance(node, m_nested_graph.NestedNode):
-            mapping = {}
-            pattern_root = next(iter(pattern.get_all_nodes()))
-            if pattern_root and is_match(node, pattern_root):
-                # Found potential match, try to extend
-                if node.subgraph and pattern_root.subgraph:
-                    if is_subgraph_match(node.subgraph, pattern_root.subgraph):
-                        mapping[pattern_root.id] = node.id
-                        matches.append(mapping)
-                else:
-                    mapping[pattern_root.id] = node.id
-                    matches.append(mapping)
-    
-    return matches
+    if not pattern.get_all_nodes():
+        return
+    yield from m_subgraph_matching.iter_subgraph_matches(
+        pattern, graph, node_match=lambda pattern_node, node: is_match(node, pattern_node),
+        node_key=lambda node: node.text)
+
+
+def pattern_matching(graph: m_nested_graph.NestedGraph, pattern: m_nested_graph.NestedGraph) -> List[Dict[str, str]]:
+    """Find all occurrences of pattern in graph."""
+
+    return list(iter_pattern_matches(graph, pattern))
 
 
 # Hierarchical clustering of a nested graph into k clusters (agglomerative clustering)
@@ -0,0 +1,153 @@
+"""
+Subgraph matching shared by the nested graph and ubergraph algorithms.
+
+A VF2-style search maps pattern nodes to graph nodes one at a time. Each
+pattern node gets a candidate list up front, filtered by a hashable key
+(label or type), by in/out degree and by a caller predicate. Pattern nodes
+are visited in connectivity order, so after the first one every node is
+drawn from the neighbours of an already mapped node, and a candidate is
+rejected as soon as an edge to a mapped node is missing or it has too few
+free neighbours left. Matches are streamed as they are found.
+"""
+
+
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple
+
+import models.base_graph as m_base_graph
+import models.node as m_node
+
+
+def edge_pairs(graph: m_base_graph.BaseGraph) -> List[Tuple[str, str]]:
+    """Directed (source, target) node pairs of every edge, with hyperedges expanded."""
+
+    node_ids = {node.id for node in graph.get_all_nodes()}
+    pairs = []
+    for edge in graph.get_all_edges():
+        sources = edge.source_ids or ([edge.source_id] if edge.source_id else [])
+        targets = edge.target_ids or ([edge.target_id] if edge.target_id else [])
+        for source_id in sources:
+            for target_id in targets:
+                if source_id in node_ids and target_id in node_ids:
+                    pairs.append((source_id, target_id))
+    return pairs
+
+
+def iter_subgraph_matches(pattern: m_base_graph.BaseGraph, graph: m_base_graph.BaseGraph,
+                          node_match: Optional[Callable[[m_node.Node, m_node.Node], bool]] = None,
+                          node_key: Optional[Callable[[m_node.Node], Hashable]] = None,
+                          pattern_edges: Optional[Iterable[Tuple[str, str]]] = None,
+                          graph_edges: Optional[Iterable[Tuple[str, str]]] = None) -> Iterator[Dict[str, str]]:
+    """
+    Yield every injective mapping of pattern node ids to graph node ids that
+    keeps each pattern edge (same direction) and satisfies node_match.
+
+    node_key must give equal keys to nodes that can match; node_match is
+    called as node_match(pattern_node, graph_node). Edges default to
+    edge_pairs of each graph.
+    """
+
+    pattern_nodes = {node.id: node for node in pattern.get_all_nodes()}
+    graph_nodes = {node.id: node for node in graph.get_all_nodes()}
+    if not pattern_nodes:
+        yield {}
+        return
+
+    p_out, p_in = _adjacency(pattern_nodes, edge_pairs(pattern) if pattern_edges is None else pattern_edges)
+    g_out, g_in = _adjacency(graph_nodes, edge_pairs(graph) if graph_edges is None else graph_edges)
+
+    # Candidate filtering by key, degree and predicate
+    if node_key is not None:
+        buckets: Dict[Hashable, List[str]] = {}
+        for node_id, node in graph_nodes.items():
+            buckets.setdefault(node_key(node), []).append(node_id)
+    domains: Dict[str, Set[str]] = {}
+    for p, pattern_node in pattern_nodes.items():
+        pool = graph_nodes if node_key is None else buckets.get(node_key(pattern_node), ())
+        domain = {g for g in pool
+                  if len(g_out[g]) >= len(p_out[p]) and len(g_in[g]) >= len(p_in[p])
+                  and (p not in p_out[p] or g in g_out[g])
+                  and (node_match is None or node_match(pattern_node, graph_nodes[g]))}
+        if not domain:
+            return
+        domains[p] = domain
+
+    order = _matching_order(domains, p_out, p_in)
+    position = {p: i for i, p in enumerate(order)}
+    # Earlier-ordered neighbours of each pattern node, split by edge direction
+    earlier_out = {p: [q for q in p_out[p] if position[q] < position[p]] for p in order}
+    earlier_in = {p: [q for q in p_in[p] if position[q] < position[p]] for p in order}
+    later_count = {p: sum(1 for q in p_out[p] | p_in[p] if position[q] > position[p]) for p in order}
+
+    mapping: Dict[str, str] = {}
+    used: Set[str] = set()
+
+    def candidates(p: str) -> Iterator[str]:
+        # Draw from the neighbourhood of a mapped node when there is one
+        if earlier_in[p]:
+            pool = g_out[mapping[earlier_in[p][0]]]
+        elif earlier_out[p]:
+            pool = g_in[mapping[earlier_out[p][0]]]
+        else:
+            pool = domains[p]
+        domain = domains[p]
+        return iter([g for g in pool if g in domain and g not in used])
+
+    def feasible(p: str, g: str) -> bool:
+        for q in earlier_in[p]:
+            if g not in g_out[mapping[q]]:
+                return False
+        for q in earlier_out[p]:
+            if g not in g_in[mapping[q]]:
+                return False
+        # Look-ahead: enough unmapped neighbours for the pattern's unmapped ones
+        if later_count[p]:
+            free = sum(1 for h in g_out[g] | g_in[g] if h not in used and h != g)
+            if free < later_count[p]:
+                return False
+        return True
+
+    stack = [candidates(order[0])]
+    while stack:
+        p = order[len(stack) - 1]
+        if p in mapping:
+            used.discard(mapping.pop(p))
+        for g in stack[-1]:
+            if feasible(p, g):
+                mapping[p] = g
+                used.add(g)
+                break
+        else:
+            stack.pop()
+            continue
+        if len(stack) == len(order):
+            yield dict(mapping)
+        else:
+            stack.append(candidates(order[len(stack)]))
+
+
+def _adjacency(nodes: Dict[str, Any], pairs: Iterable[Tuple[str, str]]) -> Tuple[Dict[str, Set[str]], Dict[str, Set[str]]]:
+    outgoing = {node_id: set() for node_id in nodes}
+    incoming = {node_id: set() for node_id in nodes}
+    for source_id, target_id in pairs:
+        if source_id in nodes and target_id in nodes:
+            outgoing[source_id].add(target_id)
+            incoming[target_id].add(source_id)
+    return outgoing, incoming
+
+
+def _matching_order(domains: Dict[str, Set[str]], outgoing: Dict[str, Set[str]],
+                    incoming: Dict[str, Set[str]]) -> List[str]:
+    """Order pattern nodes so each is tied to as many earlier ones as possible."""
+
+    neighbours = {p: (outgoing[p] | incoming[p]) - {p} for p in domains}
+    order: List[str] = []
+    links = {p: 0 for p in domains}
+    while links:
+        # Most links to ordered nodes, then fewest candidates, then highest degree
+        p = max(links, key=lambda q: (links[q], -len(domains[q]), len(neighbours[q])))
+        del links[p]
+        order.append(p)
+        for q in neighbours[p]:
+            if q in links:
+                links[q] += 1
+    return order
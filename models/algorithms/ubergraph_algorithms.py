@@ -3,103 +3,87 @@ Algorithms for ubergraphs (graphs with edges as nodes).
 """
 
 
-from typing import List, Set, Dict, Optional, Any, Tuple, Callable
+from typing import List, Set, Dict, Optional, Any, Tuple, Callable, Iterator
 from collections import defaultdict, deque
 
 import models.ubergraph as m_ubergraph
 import models.node as m_node
 import models.edge as m_edge
+import models.algorithms.subgraph_matching as m_subgraph_matching
 
 
-def semantic_subgraph_matching(graph: m_ubergraph.Ubergraph, pattern: m_ubergraph.Ubergraph,
-                             similarity_func: Callable[[m_node.Node, m_node.Node], float],
-                             threshold: float = 0.8) -> List[Dict[str, str]]:
-    """Find semantic matches of pattern in graph."""
-
-    def node_similarity(node1: m_node.Node, node2: m_node.Node) -> float:
-        """Compute semantic similarity between nodes."""
+def iter_semantic_matches(graph: m_ubergraph.Ubergraph, pattern: m_ubergraph.Ubergraph,
+                          similarity_func: Callable[[m_node.Node, m_node.Node], float],
+                          threshold: float = 0.8) -> Iterator[Dict[str, str]]:
+    """Yield semantic matches of pattern in graph, mapping pattern ids to graph ids."""
 
-        return similarity_func(node1, node2)
-    
-    def edge_similarity(edge1: m_ubergraph.UberEdge, edge2: m_ubergraph.UberEdge) -> float:
-        """Compute similarity between edges based on structure."""
+    def edge_similarity(edge1: m_ubergraph.UberEdge, edge2: m_ubergraph.UberEdge,
+                        mapping: Dict[str, str]) -> float:
+        """Compute similarity between edges based on structure, through the mapping."""
 
         # Compare source and target sets
-        source_overlap = len(set(edge1.source_ids) & set(edge2.source_ids))
-        source_union = len(set(edge1.source_ids) | set(edge2.source_ids))
-        target_overlap = len(set(edge1.target_ids) & set(edge2.target_ids))
-        target_union = len(set(edge1.target_ids) | set(edge2.target_ids))
+        sources1 = {mapping.get(i, i) for i in edge1.source_ids}
+        targets1 = {mapping.get(i, i) for i in edge1.target_ids}
+        source_overlap = len(sources1 & set(edge2.source_ids))
+        source_union = len(sources1 | set(edge2.source_ids))
+        target_overlap = len(targets1 & set(edge2.target_ids))
+        target_union = len(targets1 | set(edge2.target_ids))
         
         source_sim = source_overlap / source_union if source_union > 0 else 1.0
         target_sim = target_overlap / target_union if target_union > 0 else 1.0
         
         return (source_sim + target_sim) / 2
     
-    def find_matches(pattern_nodes: List[m_node.Node], graph_nodes: List[m_node.Node],
-                    pattern_edges: List[m_ubergraph.UberEdge], graph_edges: List[m_ubergraph.UberEdge],
-                    current_mapping: Dict[str, str]) -> List[Dict[str, str]]:
-        """Recursively find all valid mappings."""
+    def match_edges(pattern_edges: List[m_ubergraph.UberEdge],
+                    mapping: Dict[str, str]) -> Iterator[Dict[str, str]]:
+        """Assign pattern edges to distinct graph edges once the nodes are mapped."""
 
-        if not pattern_nodes and not pattern_edges:
-            return [current_mapping]
-        
-        results = []
-        
-        if pattern_nodes:
-            # Try matching next pattern node
-            pattern_node = pattern_nodes[0]
-            remaining_pattern_nodes = pattern_nodes[1:]
-            
-            for graph_node in graph_nodes:
-                if (graph_node.id not in current_mapping.values() and
-                    node_similarity(pattern_node, graph_node) >= threshold):
-                    # Try this mapping
-                    new_mapping = current_mapping.copy()
-                    new_mapping[pattern_node.id] = graph_node.id
-                    
-                    results.extend(find_matches(
-                        remaining_pattern_nodes,
-                        [n for n in graph_nodes if n.id != graph_node.id],
-                        pattern_edges,
-                        graph_edges,
-                        new_mapping
-                    ))
+        if not pattern_edges:
+            yield dict(mapping)
+            return
         
-        elif pattern_edges:
-            # Try matching next pattern edge
-            pattern_edge = pattern_edges[0]
-            remaining_pattern_edges = pattern_edges[1:]
-            
-            for graph_edge in graph_edges:
-                if (graph_edge.id not in current_mapping.values() and
-                    edge_similarity(pattern_edge, graph_edge) >= threshold):
-                    # Try this mapping
-                    new_mapping = current_mapping.copy()
-                    new_mapping[pattern_edge.id] = graph_edge.id
-                    
-                    results.extend(find_matches(
-                        pattern_nodes,
-                        graph_nodes,
-                        remaining_pattern_edges,
-                        [e for e in graph_edges if e.id != graph_edge.id],
-                        new_mapping
-                    ))
+        pattern_edge = pattern_edges[0]
+        ends = {mapping.get(i, i) for i in pattern_edge.source_ids + pattern_edge.target_ids}
+        # Above 0.5 a match must share a mapped end, so only incident edges qualify
+        if threshold > 0.5 and ends:
+            pool = {}
+            for end in ends:
+                pool.update(dict.fromkeys(incident.get(end, ())))
+        else:
+            pool = graph_edges
         
-        return results
+        used = set(mapping.values())
+        for graph_edge_id in pool:
+            graph_edge = graph_edges[graph_edge_id]
+            if (graph_edge_id not in used and
+                edge_similarity(pattern_edge, graph_edge, mapping) >= threshold):
+                mapping[pattern_edge.id] = graph_edge_id
+                yield from match_edges(pattern_edges[1:], mapping)
+                del mapping[pattern_edge.id]
     
-    # Get nodes and edges that can be matched
-    pattern_nodes = [n for n in pattern.get_all_nodes()
-                    if not isinstance(n, m_ubergraph.UberEdge)]
+    # Get edges that can be matched
     pattern_edges = [e for e in pattern.get_all_edges()
                     if isinstance(e, m_ubergraph.UberEdge) and e.metadata.get("is_uber_node")]
+    graph_edges = {e.id: e for e in graph.get_all_edges()
+                   if isinstance(e, m_ubergraph.UberEdge) and e.metadata.get("is_uber_node")}
+    incident: Dict[str, List[str]] = defaultdict(list)
+    for edge in graph_edges.values():
+        for end in set(edge.source_ids + edge.target_ids):
+            incident[end].append(edge.id)
     
-    graph_nodes = [n for n in graph.get_all_nodes()
-                  if not isinstance(n, m_ubergraph.UberEdge)]
-    graph_edges = [e for e in graph.get_all_edges()
-                  if isinstance(e, m_ubergraph.UberEdge) and e.metadata.get("is_uber_node")]
-    
-    return find_matches(pattern_nodes, graph_nodes,
-                       pattern_edges, graph_edges, {})
+    # Nodes must be similar enough and keep the pattern's edges between them
+    for mapping in m_subgraph_matching.iter_subgraph_matches(
+            pattern, graph,
+            node_match=lambda pattern_node, graph_node: similarity_func(pattern_node, graph_node) >= threshold):
+        yield from match_edges(pattern_edges, mapping)
+
+
+def semantic_subgraph_matching(graph: m_ubergraph.Ubergraph, pattern: m_ubergraph.Ubergraph,
+                             similarity_func: Callable[[m_node.Node, m_node.Node], float],
+                             threshold: float = 0.8) -> List[Dict[str, str]]:
+    """Find semantic matches of pattern in graph."""
+
+    return list(iter_semantic_matches(graph, pattern, similarity_func, threshold))
 
 
 def ontology_based_query(graph: m_ubergraph.Ubergraph,
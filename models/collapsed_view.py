@@ -0,0 +1,248 @@
+"""
+Collapsed-container view over a graph.
+
+Collapsing a container hides everything nested in it and draws the edges
+that leave it as meta-edges ending at the container. The view derives this
+from the node hierarchy (child_ids / is_expanded) without touching any edge
+endpoints, so expanding needs no undo step. Each hidden node maps to the
+visible collapsed container that covers it, and edges that cross a collapsed
+boundary are grouped by their visible endpoints with a count per group.
+Toggling a container only visits its descendants and their incident edges;
+edges added, removed or reconnected in the graph are picked up on the next
+query by replaying the graph's log of changed edge ids.
+"""
+
+
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import models.graph as m_graph
+import models.node as m_node
+
+
+class CollapsedView:
+    """
+    Visible-graph view of a Graph whose containers may be collapsed.
+
+    The visible flags of hidden nodes and of edges replaced by a meta-edge
+    are kept in sync so drawing and hit testing skip them.
+    """
+
+    def __init__(self, graph: "m_graph.Graph"):
+        """Build the view from the containers' current expanded state."""
+
+        self.graph = graph
+        # Hidden node id -> id of the visible collapsed container covering it
+        self._representative: Dict[str, str] = {}
+        # Edge id -> visible (source, target) for edges drawn through a meta-edge
+        self._edge_ends: Dict[str, Tuple[str, str]] = {}
+        # Visible (source, target) -> ids of the edges it aggregates
+        self._meta_edges: Dict[Tuple[str, str], Dict[str, None]] = {}
+        # Edges hidden by the view, restored when their endpoints reappear.
+        # Deleted ones stay listed so an undo that brings them back hidden
+        # still gets them shown again.
+        self._hidden_edges: Set[str] = set()
+
+        for node in graph.get_all_nodes():
+            self._restore_redirected_edges(node)
+        for node in graph.get_all_nodes():
+            if node.is_container and not node.is_expanded and node.id not in self._representative:
+                self._hide_contents(node)
+        self._edge_version = graph.edge_version
+
+    def sync(self):
+        """Re-sync the edges the graph changed since the last call."""
+
+        if self._edge_version == self.graph.edge_version:
+            return
+        changed = self.graph.edges_changed_since(self._edge_version)
+        self._edge_version = self.graph.edge_version
+        if changed is None:
+            # Too many changes to replay, or the graph was cleared
+            changed = dict.fromkeys(self.graph.edges)
+            changed.update(dict.fromkeys(self._edge_ends))
+            changed.update(dict.fromkeys(self._hidden_edges))
+        self.refresh_edges(changed)
+
+    def representative(self, node_id: str) -> str:
+        """Get the visible node that stands in for a node."""
+
+        return self._representative.get(node_id, node_id)
+
+    def is_hidden(self, node_id: str) -> bool:
+        """Check whether a node is inside a collapsed container."""
+
+        return node_id in self._representative
+
+    def is_edge_aggregated(self, edge_id: str) -> bool:
+        """Check whether an edge is currently drawn as part of a meta-edge."""
+
+        self.sync()
+        return edge_id in self._edge_ends
+
+    def meta_edges(self) -> List[Tuple[str, str, int]]:
+        """Get (source_id, target_id, edge_count) for every meta-edge."""
+
+        self.sync()
+        return [(source, target, len(edge_ids)) for (source, target), edge_ids in self._meta_edges.items()]
+
+    def meta_edge_ids(self, source_id: str, target_id: str) -> List[str]:
+        """Get the ids of the edges aggregated between two visible nodes."""
+
+        self.sync()
+        return list(self._meta_edges.get((source_id, target_id), ()))
+
+    def collapse(self, container_id: str, recursive: bool = False) -> int:
+        """
+        Collapse a container, and with recursive also every container inside it.
+
+        Returns the number of containers that changed state.
+        """
+
+        container = self.graph.get_node(container_id)
+        if container is None or not container.is_container:
+            return 0
+        self.sync()
+        changed = 0
+        if recursive:
+            for node in self._descendants(container):
+                if node.is_container and node.is_expanded:
+                    node.is_expanded = False
+                    changed += 1
+        if container.is_expanded:
+            container.is_expanded = False
+            changed += 1
+        # Inside a collapsed ancestor nothing visible changes
+        if not self.is_hidden(container_id):
+            self._hide_contents(container)
+        return changed
+
+    def expand(self, container_id: str, recursive: bool = False) -> int:
+        """
+        Expand a container, and with recursive also every container inside it.
+
+        Returns the number of containers that changed state.
+        """
+
+        container = self.graph.get_node(container_id)
+        if container is None or not container.is_container:
+            return 0
+        self.sync()
+        changed = 0
+        if recursive:
+            for node in self._descendants(container):
+                if node.is_container and not node.is_expanded:
+                    node.is_expanded = True
+                    changed += 1
+        if not container.is_expanded:
+            container.is_expanded = True
+            changed += 1
+        if not self.is_hidden(container_id):
+            self._reveal_contents(container)
+        return changed
+
+    def refresh_edges(self, edge_ids: Iterable[str]):
+        """Re-sync edges that were added, removed or reconnected."""
+
+        for edge_id in edge_ids:
+            self._update_edge(edge_id)
+
+    def _descendants(self, container: "m_node.Node") -> List["m_node.Node"]:
+        """All nodes nested in a container, depth first."""
+
+        found = []
+        seen = {container.id}
+        stack = list(container.child_ids)
+        while stack:
+            node_id = stack.pop()
+            if node_id in seen:
+                continue
+            seen.add(node_id)
+            node = self.graph.get_node(node_id)
+            if node is None:
+                continue
+            found.append(node)
+            stack.extend(node.child_ids)
+        return found
+
+    def _hide_contents(self, container: "m_node.Node"):
+        """Map everything inside a visible collapsed container onto it."""
+
+        touched: Dict[str, None] = {}
+        for node in self._descendants(container):
+            self._representative[node.id] = container.id
+            node.visible = False
+            touched.update(dict.fromkeys(self.graph.get_incident_edge_ids(node.id)))
+        self.refresh_edges(touched)
+
+    def _reveal_contents(self, container: "m_node.Node"):
+        """Show a visible expanded container's contents down to the next collapsed level."""
+
+        touched: Dict[str, None] = {}
+        seen = {container.id}
+        # Each entry carries the collapsed container covering it, or None
+        stack: List[Tuple[str, Optional[str]]] = [(child_id, None) for child_id in container.child_ids]
+        while stack:
+            node_id, cover = stack.pop()
+            if node_id in seen:
+                continue
+            seen.add(node_id)
+            node = self.graph.get_node(node_id)
+            if node is None:
+                continue
+            if cover is None:
+                self._representative.pop(node_id, None)
+                node.visible = True
+                if node.is_container and not node.is_expanded:
+                    cover = node_id
+            else:
+                self._representative[node_id] = cover
+                node.visible = False
+            stack.extend((child_id, cover) for child_id in node.child_ids)
+            touched.update(dict.fromkeys(self.graph.get_incident_edge_ids(node_id)))
+        self.refresh_edges(touched)
+
+    def _update_edge(self, edge_id: str):
+        """Move an edge to the meta-edge matching its current visible endpoints."""
+
+        ends = self._edge_ends.pop(edge_id, None)
+        if ends is not None:
+            group = self._meta_edges[ends]
+            del group[edge_id]
+            if not group:
+                del self._meta_edges[ends]
+
+        edge = self.graph.get_edge(edge_id)
+        if edge is None:
+            return
+        source = self.representative(edge.source_id)
+        target = self.representative(edge.target_id)
+        if source == edge.source_id and target == edge.target_id:
+            if edge_id in self._hidden_edges:
+                self._hidden_edges.discard(edge_id)
+                edge.visible = True
+            return
+
+        self._hidden_edges.add(edge_id)
+        edge.visible = False
+        if source == target:
+            # Both ends sit in the same collapsed container
+            return
+        self._edge_ends[edge_id] = (source, target)
+        self._meta_edges.setdefault((source, target), {})[edge_id] = None
+
+    def _restore_redirected_edges(self, node: "m_node.Node"):
+        """Undo endpoint rewrites recorded by older versions of collapse."""
+
+        redirected = getattr(node, 'redirected_edges', None)
+        if not redirected:
+            return
+        for edge_id, original_node_id in redirected.items():
+            edge = self.graph.get_edge(edge_id)
+            if edge is None:
+                continue
+            if edge.source_id == node.id:
+                edge.source_id = original_node_id
+            elif edge.target_id == node.id:
+                edge.target_id = original_node_id
+            self.graph.reindex_edge(edge_id)
+        redirected.clear()
@@ -8,19 +8,123 @@ from typing import Dict, List, Set, Optional, Any, Tuple
 import models.base_graph as m_base_graph
 import models.node as m_node
 import models.edge as m_edge
+import models.topological_order as m_topological_order
 
 
 class DAGGraph(m_base_graph.BaseGraph):
-    """A graph that represents a directed acyclic graph."""
+    """
+    A graph that represents a directed acyclic graph.
+
+    A topological order and level assignment are kept up to date as edges
+    are added and removed. Edges that would close a cycle are still stored
+    so cyclic input can be loaded and analyzed, but they are held outside
+    the order until a removal lets them fit.
+    """
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.metadata["graph_type"] = "dag"
+        self._topology = m_topological_order.TopologicalOrder()
+        # Node id -> ids of the edges leaving / entering it
+        self._outgoing: Dict[str, Dict[str, None]] = {}
+        self._incoming: Dict[str, Dict[str, None]] = {}
+        # Edges not in the order because they close a cycle
+        self._cyclic_edges: Dict[str, None] = {}
+
+    def add_node(self, node: "m_node.Node") -> None:
+        """Add a node to the graph."""
+
+        super().add_node(node)
+        self._topology.add_node(node.id)
+
+    def remove_node(self, node_id: str) -> bool:
+        """Remove a node and its connected edges from the graph."""
+
+        if node_id not in self._nodes:
+            return False
+        for edge_id in list(self._outgoing.get(node_id, ())) + list(self._incoming.get(node_id, ())):
+            self.remove_edge(edge_id)
+        del self._nodes[node_id]
+        self._selected_nodes.discard(node_id)
+        self._topology.remove_node(node_id)
+        return True
+
+    def add_edge(self, edge: "m_edge.Edge") -> None:
+        """Add an edge to the graph, keeping the topological order current."""
+
+        if edge.id in self._edges:
+            self.remove_edge(edge.id)
+        super().add_edge(edge)
+        self._outgoing.setdefault(edge.source_id, {})[edge.id] = None
+        self._incoming.setdefault(edge.target_id, {})[edge.id] = None
+        try:
+            self._topology.add_edge(edge.source_id, edge.target_id)
+        except ValueError:
+            self._cyclic_edges[edge.id] = None
+
+    def remove_edge(self, edge_id: str) -> bool:
+        """Remove an edge from the graph."""
+
+        edge = self._edges.get(edge_id)
+        if not super().remove_edge(edge_id):
+            return False
+        self._outgoing[edge.source_id].pop(edge_id, None)
+        self._incoming[edge.target_id].pop(edge_id, None)
+        if edge_id in self._cyclic_edges:
+            del self._cyclic_edges[edge_id]
+        else:
+            self._topology.remove_edge(edge.source_id, edge.target_id)
+            # The removal may have broken the cycle a held-back edge closed
+            for pending_id in list(self._cyclic_edges):
+                pending = self._edges[pending_id]
+                try:
+                    self._topology.add_edge(pending.source_id, pending.target_id)
+                except ValueError:
+                    continue
+                del self._cyclic_edges[pending_id]
+        return True
+
+    def get_edges_from_node(self, node_id: str) -> List["m_edge.Edge"]:
+        """Get all edges that start from a node."""
+
+        return [self._edges[edge_id] for edge_id in self._outgoing.get(node_id, ())]
+
+    def get_edges_to_node(self, node_id: str) -> List["m_edge.Edge"]:
+        """Get all edges that end at a node."""
+
+        return [self._edges[edge_id] for edge_id in self._incoming.get(node_id, ())]
+
+    def is_acyclic(self) -> bool:
+        """Check whether the graph has no cycles, without searching it."""
+
+        return not self._cyclic_edges
+
+    def would_create_cycle(self, source_id: str, target_id: str) -> bool:
+        """Check whether an edge from source to target would close a cycle."""
+
+        return self._topology.would_create_cycle(source_id, target_id)
+
+    def get_topological_order(self) -> List[str]:
+        """Get node ids in the maintained topological order."""
+
+        if self._cyclic_edges:
+            raise ValueError("Graph contains a cycle")
+        return [node_id for node_id in self._topology.order() if node_id in self._nodes]
+
+    def get_levels(self) -> Dict[str, int]:
+        """Get the length of the longest path ending at each node."""
+
+        if self._cyclic_edges:
+            raise ValueError("Graph contains a cycle")
+        levels = self._topology.levels()
+        return {node_id: levels[node_id] for node_id in self._nodes}
 
     def validate(self) -> List[str]:
         """Validate the DAG structure. Returns a list of error messages."""
 
         errors = super().validate()
+        if not self._cyclic_edges:
+            return errors
         
         # Check for cycles using DFS
         def has_cycle(node_id: str, visited: Set[str], path: Set[str]) -> bool:
@@ -89,31 +193,7 @@ class DAGGraph(m_base_graph.BaseGraph):
     def get_topological_sort(self) -> List["m_node.Node"]:
         """Get nodes in topological order."""
 
-        # Kahn's algorithm
-        result = []
-        in_degree = {node.id: 0 for node in self._nodes.values()}
-        
-        # Calculate in-degrees
-        for edge in self._edges.values():
-            in_degree[edge.target_id] += 1
-        
-        # Start with nodes that have no incoming edges
-        queue = [node.id for node, degree in in_degree.items() if degree == 0]
-        
-        while queue:
-            current = queue.pop(0)
-            result.append(self.get_node(current))
-            
-            # Reduce in-degree of neighbors
-            for edge in self.get_edges_from_node(current):
-                in_degree[edge.target_id] -= 1
-                if in_degree[edge.target_id] == 0:
-                    queue.append(edge.target_id)
-        
-        if len(result) != len(self._nodes):
-            raise ValueError("Graph contains a cycle")
-        
-        return result
+        return [self._nodes[node_id] for node_id in self.get_topological_order()]
 
     def get_longest_path(self, source_id: str, target_id: str) -> List["m_node.Node"]:
         """Get the longest path between two nodes."""
@@ -169,38 +249,25 @@ class DAGGraph(m_base_graph.BaseGraph):
     def get_layers(self) -> List[List["m_node.Node"]]:
         """Get nodes organized in layers based on longest path from any source."""
 
-        layers: Dict[str, int] = {}
-        
-        # Calculate longest path length to each node
-        for node in self._nodes.values():
-            max_layer = 0
-            for ancestor in self.get_ancestors(node.id):
-                path = self.get_longest_path(ancestor.id, node.id)
-                max_layer = max(max_layer, len(path) - 1)
-            layers[node.id] = max_layer
+        layers = self.get_levels()
         
         # Group nodes by layer
         max_layer = max(layers.values()) if layers else 0
         result = [[] for _ in range(max_layer + 1)]
         
-        for node_id, layer in layers.items():
-            result[layer].append(self.get_node(node_id))
+        for node_id in self.get_topological_order():
+            result[layers[node_id]].append(self._nodes[node_id])
         
         return result
 
     def add_edge_safe(self, source_id: str, target_id: str) -> Optional["m_edge.Edge"]:
         """Add an edge only if it won't create a cycle."""
 
-        # Temporarily add the edge
-        edge = Edge(source_id=source_id, target_id=target_id)
-        self.add_edge(edge)
-        
-        # Check for cycles
-        errors = self.validate()
-        
-        if errors:
-            # Remove the edge if it creates a cycle
-            self.remove_edge(edge.id)
+        if source_id not in self._nodes or target_id not in self._nodes:
+            return None
+        if self._cyclic_edges or self.would_create_cycle(source_id, target_id):
             return None
         
+        edge = m_edge.Edge(source_id=source_id, target_id=target_id)
+        self.add_edge(edge)
         return edge
@@ -9,6 +9,11 @@ from typing import Dict, List, Any, Optional, Tuple, Set
 
 import models.node as m_node
 import models.edge as m_edge
+import models.hyperedge_index as m_hyperedge_index
+
+
+# Edge changes remembered for edges_changed_since before older ones are dropped
+EDGE_LOG_LIMIT = 4096
 
 
 class Graph:
@@ -36,6 +41,13 @@ class Graph:
         # Graph data
         self.nodes: Dict[str, m_node.Node] = {}
         self.edges: Dict[str, Edge] = {}
+        self._hyperedge_index = m_hyperedge_index.HyperedgeIndex()
+        # Bumped whenever an edge is added, removed or reconnected; the log
+        # holds the edge id behind each bump from _edge_log_start on, or None
+        # for a change to every edge
+        self.edge_version = 0
+        self._edge_log: List[Optional[str]] = []
+        self._edge_log_start = 0
 
         # Graph properties
         self.selected_nodes: Set[str] = set()
@@ -79,6 +91,8 @@ class Graph:
                 if hasattr(edge, 'target_ids') and isinstance(edge.target_ids, list):
                     if node_id in edge.target_ids:
                         edge.target_ids = [nid for nid in edge.target_ids if nid != node_id]
+                if self._hyperedge_index.update_edge(edge):
+                    self._edge_changed(edge_id)
             except Exception:
                 pass
 
@@ -111,6 +125,8 @@ class Graph:
 
         print(f"DEBUG: Adding edge {edge.id} to graph: {edge.source_id} -> {edge.target_id}")
         self.edges[edge.id] = edge
+        self._hyperedge_index.add_edge(edge)
+        self._edge_changed(edge.id)
         self.modified = True
         print(f"DEBUG: Total edges in graph: {len(self.edges)}")
         return edge.id
@@ -144,6 +160,8 @@ class Graph:
                 pass
 
         del self.edges[edge_id]
+        self._hyperedge_index.remove_edge(edge_id)
+        self._edge_changed(edge_id)
         self.selected_edges.discard(edge_id)
         self.modified = True
         return True
@@ -166,6 +184,67 @@ class Graph:
             if edge.source_id == node_id or edge.target_id == node_id
         ]
 
+    def get_incident_edge_ids(self, node_id: str) -> List[str]:
+        """Get the ids of all edges touching a node, from the incidence index."""
+
+        return self._hyperedge_index.edges_of_node(node_id)
+
+    def reindex_edge(self, edge_id: str):
+        """Refresh the hyperedge index after an edge's endpoints were changed in place."""
+
+        edge = self.edges.get(edge_id)
+        if edge is None:
+            self._hyperedge_index.remove_edge(edge_id)
+        else:
+            self._hyperedge_index.add_edge(edge)
+        self._edge_changed(edge_id)
+
+    def _edge_changed(self, edge_id: Optional[str]):
+        """Bump edge_version and log the changed edge (None for all of them)."""
+
+        self.edge_version += 1
+        self._edge_log.append(edge_id)
+        if len(self._edge_log) > EDGE_LOG_LIMIT:
+            dropped = len(self._edge_log) - EDGE_LOG_LIMIT // 2
+            del self._edge_log[:dropped]
+            self._edge_log_start += dropped
+
+    def edges_changed_since(self, version: int) -> Optional[List[str]]:
+        """
+        Get the ids of edges added, removed or reconnected after an
+        edge_version, or None when every edge has to be rechecked.
+        """
+
+        if version < self._edge_log_start or version > self.edge_version:
+            return None
+        changes = self._edge_log[version - self._edge_log_start:]
+        if None in changes:
+            return None
+        return list(dict.fromkeys(changes))
+
+    def get_node_hyperedges(self, node_id: str) -> List[m_edge.Edge]:
+        """Get all hyperedges that include a node."""
+
+        return [
+            self.edges[edge_id]
+            for edge_id in self._hyperedge_index.edges_of_node(node_id)
+            if edge_id in self.edges and self.edges[edge_id].is_hyperedge
+        ]
+
+    def get_connected_hyperedges(self, edge_id: str) -> List[m_edge.Edge]:
+        """Get all hyperedges that share at least one node with an edge."""
+
+        edge = self.edges.get(edge_id)
+        if edge is None:
+            return []
+        self._hyperedge_index.update_edge(edge)
+        connected = []
+        for other_id in self._hyperedge_index.adjacent_edges(edge_id):
+            other = self.edges.get(other_id)
+            if other is not None and other_id != edge_id and other.is_hyperedge:
+                connected.append(other)
+        return connected
+
     def get_edge_between_nodes(self, source_id: str,
                                target_id: str) -> Optional[m_edge.Edge]:
         """Get the edge between two nodes (if exists)."""
@@ -250,11 +329,9 @@ class Graph:
             
             # If this is a hyperedge, select all connected hyperedges
             if edge.is_hyperedge:
-                for other_edge in self.edges.values():
-                    if other_edge.id != edge_id and other_edge.is_hyperedge:
-                        if edge.shares_nodes_with(other_edge):
-                            self.selected_edges.add(other_edge.id)
-                            other_edge.selected = True
+                for other_edge in self.get_connected_hyperedges(edge_id):
+                    self.selected_edges.add(other_edge.id)
+                    other_edge.selected = True
             
             print(f"DEBUG: Total selected edges: {len(self.selected_edges)}")
         else:
@@ -271,11 +348,9 @@ class Graph:
             
             # If this is a hyperedge, deselect all connected hyperedges
             if edge.is_hyperedge:
-                for other_edge in self.edges.values():
-                    if other_edge.id != edge_id and other_edge.is_hyperedge:
-                        if edge.shares_nodes_with(other_edge):
-                            self.selected_edges.discard(other_edge.id)
-                            other_edge.selected = False
+                for other_edge in self.get_connected_hyperedges(edge_id):
+                    self.selected_edges.discard(other_edge.id)
+                    other_edge.selected = False
             
             print(f"DEBUG: Total selected edges: {len(self.selected_edges)}")
         else:
@@ -409,6 +484,8 @@ class Graph:
 
         self.nodes.clear()
         self.edges.clear()
+        self._hyperedge_index.clear()
+        self._edge_changed(None)
         self.selected_nodes.clear()
         self.selected_edges.clear()
         self.modified = True
@@ -452,6 +529,7 @@ class Graph:
         for edge_data in data.get('edges', []):
             edge = m_edge.Edge.from_dict(edge_data)
             graph.edges[edge.id] = edge
+            graph._hyperedge_index.add_edge(edge)
 
         graph.modified = False
         return graph
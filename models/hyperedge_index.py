@@ -0,0 +1,147 @@
+"""
+Incidence index for hyperedge connectivity queries.
+"""
+
+
+from typing import Dict, FrozenSet, Iterable, List
+
+import models.edge as m_edge
+
+
+def edge_members(edge: "m_edge.Edge") -> FrozenSet[str]:
+    """Get every node id an edge touches (primary endpoints and hyperedge lists)."""
+
+    members = set(getattr(edge, 'source_ids', None) or [])
+    members.update(getattr(edge, 'target_ids', None) or [])
+    members.add(edge.source_id)
+    members.add(edge.target_id)
+    members.discard(None)
+    return frozenset(members)
+
+
+class HyperedgeIndex:
+    """
+    Maintains a node -> edge incidence map and an edge adjacency map.
+
+    The adjacency map stores, for every edge, the edges it shares at least one
+    node with together with the number of shared nodes. Both structures are
+    updated incrementally, so every update and query only touches the
+    incidences of the nodes involved.
+
+    Edges whose endpoint lists are mutated in place must be passed to
+    ``update_edge`` so the snapshot kept for them stays current.
+    """
+
+    def __init__(self, edges: Iterable["m_edge.Edge"] = ()):
+        """Initialize the index, optionally from an iterable of edges."""
+
+        # Incidence sets are dicts so edges come back in insertion order
+        self._incidence: Dict[str, Dict[str, None]] = {}
+        self._members: Dict[str, FrozenSet[str]] = {}
+        self._adjacency: Dict[str, Dict[str, int]] = {}
+        for edge in edges:
+            self.add_edge(edge)
+
+    def add_edge(self, edge: "m_edge.Edge") -> None:
+        """Index an edge, replacing any previous entry with the same id."""
+
+        if edge.id in self._members:
+            self.update_edge(edge)
+            return
+        self._members[edge.id] = frozenset()
+        self._adjacency[edge.id] = {}
+        self._attach(edge.id, edge_members(edge))
+
+    def remove_edge(self, edge_id: str) -> None:
+        """Drop an edge from the index."""
+
+        members = self._members.get(edge_id)
+        if members is None:
+            return
+        self._detach(edge_id, members)
+        del self._members[edge_id]
+        del self._adjacency[edge_id]
+
+    def update_edge(self, edge: "m_edge.Edge") -> bool:
+        """Re-sync an edge whose endpoints may have changed. Returns True if it did."""
+
+        old = self._members.get(edge.id)
+        if old is None:
+            self.add_edge(edge)
+            return True
+        new = edge_members(edge)
+        if new == old:
+            return False
+        self._detach(edge.id, old - new)
+        self._attach(edge.id, new - old)
+        return True
+
+    def clear(self) -> None:
+        """Remove every entry from the index."""
+
+        self._incidence.clear()
+        self._members.clear()
+        self._adjacency.clear()
+
+    def edges_of_node(self, node_id: str) -> List[str]:
+        """Get the ids of all edges incident to a node."""
+
+        return list(self._incidence.get(node_id, ()))
+
+    def members_of_edge(self, edge_id: str) -> FrozenSet[str]:
+        """Get the indexed node ids of an edge."""
+
+        return self._members.get(edge_id, frozenset())
+
+    def adjacent_edges(self, edge_id: str) -> List[str]:
+        """Get the ids of all edges sharing at least one node with an edge."""
+
+        return list(self._adjacency.get(edge_id, ()))
+
+    def shared_node_count(self, edge_id: str, other_id: str) -> int:
+        """Get the number of nodes two edges have in common."""
+
+        return self._adjacency.get(edge_id, {}).get(other_id, 0)
+
+    def _attach(self, edge_id: str, nodes: FrozenSet[str]) -> None:
+        """Add incidences between an edge and a set of nodes."""
+
+        if not nodes:
+            return
+        adjacency = self._adjacency[edge_id]
+        for node_id in nodes:
+            incident = self._incidence.setdefault(node_id, {})
+            for other_id in incident:
+                adjacency[other_id] = adjacency.get(other_id, 0) + 1
+                other_adj = self._adjacency[other_id]
+                other_adj[edge_id] = other_adj.get(edge_id, 0) + 1
+            incident[edge_id] = None
+        self._members[edge_id] = self._members[edge_id] | nodes
+
+    def _detach(self, edge_id: str, nodes: FrozenSet[str]) -> None:
+        """Remove incidences between an edge and a set of nodes."""
+
+        if not nodes:
+            return
+        adjacency = self._adjacency[edge_id]
+        for node_id in nodes:
+            incident = self._incidence.get(node_id)
+            if not incident or edge_id not in incident:
+                continue
+            del incident[edge_id]
+            for other_id in incident:
+                self._decrement(adjacency, other_id)
+                self._decrement(self._adjacency[other_id], edge_id)
+            if not incident:
+                del self._incidence[node_id]
+        self._members[edge_id] = self._members[edge_id] - nodes
+
+    @staticmethod
+    def _decrement(counts: Dict[str, int], key: str) -> None:
+        """Decrement a shared-node counter, dropping it at zero."""
+
+        remaining = counts.get(key, 0) - 1
+        if remaining > 0:
+            counts[key] = remaining
+        else:
+            counts.pop(key, None)
@@ -3,18 +3,30 @@ Hypergraph model that supports edges connecting multiple nodes.
 """
 
 
+import weakref
 from typing import Dict, List, Set, Optional, Any, Tuple
 
 import models.base_graph as m_base_graph
 import models.node as m_node
 import models.edge as m_edge
+import models.hyperedge_index as m_hyperedge_index
 
 
 class HypergraphEdge(m_edge.Edge):
-    """Extended edge class for hypergraphs."""
+    """
+    Extended edge class for hypergraphs.
+
+    add_source, add_target and their removals refresh the incidence index
+    of the Hypergraph holding the edge. Edits made directly to source_ids
+    or target_ids must be followed by the graph's reindex_edge.
+    """
     
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+    def __init__(self, source_id: Optional[str] = None, target_id: Optional[str] = None,
+                 *args, directed: bool = True, **kwargs):
+        if "id" in kwargs:
+            kwargs.setdefault("edge_id", kwargs.pop("id"))
+        super().__init__(source_id, target_id, *args, **kwargs)
+        self.directed = directed
         self.is_hyperedge = True
         self.source_ids: List[str] = []
         self.target_ids: List[str] = []
@@ -22,6 +34,14 @@ class HypergraphEdge(m_edge.Edge):
         self.to_connection_point = 0.75    # Default to 75%
         self.split_arrows = False
         self.hyperedge_visualization = "lines"  # Default visualization type
+        self._graph = None  # Weak reference to the Hypergraph indexing this edge
+
+    def _reindex(self) -> None:
+        """Refresh the owning graph's incidence index after an endpoint change."""
+
+        graph = self._graph() if self._graph is not None else None
+        if graph is not None and graph.get_edge(self.id) is self:
+            graph.reindex_edge(self.id)
 
     def add_source(self, node_id: str) -> None:
         """Add a source node to the hyperedge."""
@@ -30,6 +50,7 @@ class HypergraphEdge(m_edge.Edge):
             self.source_ids.append(node_id)
             if not self.source_id:  # Set primary source if none exists
                 self.source_id = node_id
+            self._reindex()
 
     def add_target(self, node_id: str) -> None:
         """Add a target node to the hyperedge."""
@@ -38,6 +59,7 @@ class HypergraphEdge(m_edge.Edge):
             self.target_ids.append(node_id)
             if not self.target_id:  # Set primary target if none exists
                 self.target_id = node_id
+            self._reindex()
 
     def remove_source(self, node_id: str) -> None:
         """Remove a source node from the hyperedge."""
@@ -46,6 +68,7 @@ class HypergraphEdge(m_edge.Edge):
             self.source_ids.remove(node_id)
             if self.source_id == node_id:
                 self.source_id = self.source_ids[0] if self.source_ids else None
+            self._reindex()
 
     def remove_target(self, node_id: str) -> None:
         """Remove a target node from the hyperedge."""
@@ -54,6 +77,7 @@ class HypergraphEdge(m_edge.Edge):
             self.target_ids.remove(node_id)
             if self.target_id == node_id:
                 self.target_id = self.target_ids[0] if self.target_ids else None
+            self._reindex()
 
     def set_from_connection_point(self, value: float) -> None:
         """Set the 'from' connection point, ensuring it's not greater than 'to'."""
@@ -101,6 +125,7 @@ class Hypergraph(m_base_graph.BaseGraph):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.metadata["graph_type"] = "hypergraph"
+        self._hyperedge_index = m_hyperedge_index.HyperedgeIndex()
 
     def add_edge(self, edge: m_edge.Edge) -> None:
         """Add an edge, converting to hyperedge if needed."""
@@ -120,6 +145,30 @@ class Hypergraph(m_base_graph.BaseGraph):
             edge = hyperedge
         
         super().add_edge(edge)
+        self._hyperedge_index.add_edge(edge)
+        edge._graph = weakref.ref(self)
+
+    def remove_edge(self, edge_id: str) -> bool:
+        """Remove an edge and drop it from the incidence index."""
+
+        removed = super().remove_edge(edge_id)
+        if removed:
+            self._hyperedge_index.remove_edge(edge_id)
+        return removed
+
+    def reindex_edge(self, edge_id: str) -> None:
+        """Refresh the incidence index after an edge's node lists were changed in place."""
+
+        edge = self._edges.get(edge_id)
+        if edge is None:
+            self._hyperedge_index.remove_edge(edge_id)
+        else:
+            self._hyperedge_index.add_edge(edge)
+
+    def get_hyperedge_index(self) -> m_hyperedge_index.HyperedgeIndex:
+        """Get the node/hyperedge incidence index."""
+
+        return self._hyperedge_index
 
     def create_hyperedge(self, source_ids: List[str], target_ids: List[str], directed: bool = True) -> HypergraphEdge:
         """Create and add a new hyperedge."""
@@ -135,13 +184,13 @@ class Hypergraph(m_base_graph.BaseGraph):
     def get_node_hyperedges(self, node_id: str) -> List[HypergraphEdge]:
         """Get all hyperedges that include this node."""
 
-        return [
-            edge for edge in self._edges.values()
-            if edge.is_hyperedge and (
-                node_id in edge.source_ids or
-                node_id in edge.target_ids
-            )
-        ]
+        hyperedges = []
+        for edge_id in self._hyperedge_index.edges_of_node(node_id):
+            edge = self._edges.get(edge_id)
+            if edge is not None and edge.is_hyperedge and (
+                    node_id in edge.source_ids or node_id in edge.target_ids):
+                hyperedges.append(edge)
+        return hyperedges
 
     def get_connected_hyperedges(self, edge_id: str) -> List[HypergraphEdge]:
         """Get all hyperedges that share nodes with this edge."""
@@ -150,15 +199,12 @@ class Hypergraph(m_base_graph.BaseGraph):
         if not edge or not edge.is_hyperedge:
             return []
         
+        self._hyperedge_index.update_edge(edge)
         connected = []
-        for other in self._edges.values():
-            if other.is_hyperedge and other.id != edge_id:
-                # Check if edges share any nodes
-                if (set(edge.source_ids) & set(other.source_ids) or
-                    set(edge.source_ids) & set(other.target_ids) or
-                    set(edge.target_ids) & set(other.source_ids) or
-                    set(edge.target_ids) & set(other.target_ids)):
-                    connected.append(other)
+        for other_id in self._hyperedge_index.adjacent_edges(edge_id):
+            other = self._edges.get(other_id)
+            if other is not None and other.is_hyperedge and other_id != edge_id:
+                connected.append(other)
         
         return connected
 
@@ -201,21 +247,19 @@ class Hypergraph(m_base_graph.BaseGraph):
                 node = m_node.Node(text=f"Edge {edge.id}")
                 line.add_node(node)
         
-        # Create edges between nodes that share vertices
+        # Create edges between nodes that share vertices, walking only the
+        # adjacency pairs recorded in the incidence index
         edges = list(self._edges.values())
+        position = {edge.id: i for i, edge in enumerate(edges)}
         for i, edge1 in enumerate(edges):
             if not edge1.is_hyperedge:
                 continue
-            for edge2 in edges[i+1:]:
-                if not edge2.is_hyperedge:
+            for edge2 in sorted(self.get_connected_hyperedges(edge1.id),
+                                key=lambda e: position.get(e.id, -1)):
+                if position.get(edge2.id, -1) <= i:
                     continue
-                # Check if edges share any nodes
-                if (set(edge1.source_ids) & set(edge2.source_ids) or
-                    set(edge1.source_ids) & set(edge2.target_ids) or
-                    set(edge1.target_ids) & set(edge2.source_ids) or
-                    set(edge1.target_ids) & set(edge2.target_ids)):
-                    line_edge = m_edge.Edge(source_id=edge1.id, target_id=edge2.id)
-                    line.add_edge(line_edge)
+                line_edge = m_edge.Edge(source_id=edge1.id, target_id=edge2.id)
+                line.add_edge(line_edge)
         
         return line
 
@@ -0,0 +1,195 @@
+"""
+Online topological order for a directed acyclic graph.
+
+Keeps a position for every node so that each edge points from a lower to a
+higher position, and repairs it after each inserted edge with the
+Pearce-Kelly algorithm: only nodes whose positions lie between the new
+edge's endpoints are searched and renumbered. A cycle is detected during
+that bounded search, so rejecting a bad edge costs no more than accepting
+a good one. Levels (longest path from any source) are updated by walking
+forward from the edge's target until they stop changing.
+"""
+
+
+import heapq
+from typing import Dict, Iterable, List, Optional
+
+
+class TopologicalOrder:
+    """Incrementally maintained topological order and level assignment."""
+
+    def __init__(self):
+        # Node id -> position; positions are unique but may have gaps
+        self._position: Dict[str, int] = {}
+        self._next_position = 0
+        # Node id -> neighbour id -> number of parallel edges
+        self._successors: Dict[str, Dict[str, int]] = {}
+        self._predecessors: Dict[str, Dict[str, int]] = {}
+        self._level: Dict[str, int] = {}
+        self._order: Optional[List[str]] = []
+
+    def __contains__(self, node_id: str) -> bool:
+        return node_id in self._position
+
+    def __len__(self) -> int:
+        return len(self._position)
+
+    def add_node(self, node_id: str) -> None:
+        """Add a node at the end of the order."""
+
+        if node_id in self._position:
+            return
+        self._position[node_id] = self._next_position
+        self._next_position += 1
+        self._successors[node_id] = {}
+        self._predecessors[node_id] = {}
+        self._level[node_id] = 0
+        if self._order is not None:
+            self._order.append(node_id)
+
+    def remove_node(self, node_id: str) -> None:
+        """Remove a node and every edge touching it."""
+
+        if node_id not in self._position:
+            return
+        for target in list(self._successors[node_id]):
+            self._successors[node_id][target] = 1
+            self.remove_edge(node_id, target)
+        for source in list(self._predecessors[node_id]):
+            self._predecessors[node_id][source] = 1
+            self.remove_edge(source, node_id)
+        del self._position[node_id]
+        del self._successors[node_id]
+        del self._predecessors[node_id]
+        del self._level[node_id]
+        self._order = None
+
+    def has_edge(self, source_id: str, target_id: str) -> bool:
+        return target_id in self._successors.get(source_id, ())
+
+    def would_create_cycle(self, source_id: str, target_id: str) -> bool:
+        """Check whether adding source -> target would close a cycle."""
+
+        if source_id == target_id:
+            return True
+        if source_id not in self._position or target_id not in self._position:
+            return False
+        upper = self._position[source_id]
+        if self._position[target_id] > upper:
+            return False
+        return self._forward(target_id, source_id, upper) is None
+
+    def add_edge(self, source_id: str, target_id: str) -> None:
+        """Add an edge and repair the order; raises ValueError on a cycle."""
+
+        if source_id == target_id:
+            raise ValueError("Graph contains a cycle")
+        self.add_node(source_id)
+        self.add_node(target_id)
+        successors = self._successors[source_id]
+        if target_id in successors:
+            successors[target_id] += 1
+            self._predecessors[target_id][source_id] += 1
+            return
+
+        lower = self._position[target_id]
+        upper = self._position[source_id]
+        if lower < upper:
+            forward = self._forward(target_id, source_id, upper)
+            if forward is None:
+                raise ValueError("Graph contains a cycle")
+            backward = self._backward(source_id, lower)
+            self._reorder(backward, forward)
+
+        successors[target_id] = 1
+        self._predecessors[target_id][source_id] = 1
+        self._relevel([target_id])
+
+    def remove_edge(self, source_id: str, target_id: str) -> None:
+        """Remove one edge; the order stays valid, levels may drop."""
+
+        successors = self._successors.get(source_id)
+        if not successors or target_id not in successors:
+            return
+        successors[target_id] -= 1
+        self._predecessors[target_id][source_id] -= 1
+        if successors[target_id] == 0:
+            del successors[target_id]
+            del self._predecessors[target_id][source_id]
+            self._relevel([target_id])
+
+    def _forward(self, start: str, stop: str, upper: int) -> Optional[List[str]]:
+        """Nodes reachable from start below position upper, or None if stop is reached."""
+
+        visited = {start}
+        stack = [start]
+        while stack:
+            node_id = stack.pop()
+            for target in self._successors[node_id]:
+                if target == stop:
+                    return None
+                if target not in visited and self._position[target] < upper:
+                    visited.add(target)
+                    stack.append(target)
+        return list(visited)
+
+    def _backward(self, start: str, lower: int) -> List[str]:
+        """Nodes that reach start from above position lower."""
+
+        visited = {start}
+        stack = [start]
+        while stack:
+            node_id = stack.pop()
+            for source in self._predecessors[node_id]:
+                if source not in visited and self._position[source] > lower:
+                    visited.add(source)
+                    stack.append(source)
+        return list(visited)
+
+    def _reorder(self, backward: List[str], forward: List[str]) -> None:
+        """Give the backward set the lowest of the affected positions."""
+
+        position = self._position
+        backward.sort(key=position.__getitem__)
+        forward.sort(key=position.__getitem__)
+        slots = sorted(position[node_id] for node_id in backward + forward)
+        for node_id, slot in zip(backward + forward, slots):
+            position[node_id] = slot
+        self._order = None
+
+    def _relevel(self, start_ids: Iterable[str]) -> None:
+        """Recompute levels from the given nodes forward, in topological order."""
+
+        heap = [(self._position[node_id], node_id) for node_id in start_ids]
+        heapq.heapify(heap)
+        queued = {node_id for _, node_id in heap}
+        while heap:
+            _, node_id = heapq.heappop(heap)
+            queued.discard(node_id)
+            predecessors = self._predecessors[node_id]
+            level = 1 + max(self._level[source] for source in predecessors) if predecessors else 0
+            if level == self._level[node_id]:
+                continue
+            self._level[node_id] = level
+            for target in self._successors[node_id]:
+                if target not in queued:
+                    queued.add(target)
+                    heapq.heappush(heap, (self._position[target], target))
+
+    def position(self, node_id: str) -> int:
+        return self._position[node_id]
+
+    def order(self) -> List[str]:
+        """Node ids in topological order."""
+
+        if self._order is None:
+            self._order = sorted(self._position, key=self._position.__getitem__)
+        return list(self._order)
+
+    def level(self, node_id: str) -> int:
+        return self._level[node_id]
+
+    def levels(self) -> Dict[str, int]:
+        """Map each node to the length of the longest path ending at it."""
+
+        return dict(self._level)
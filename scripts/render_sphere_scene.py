@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Render a saved sphere scene without a window.
+
+Writes PNG frames to a directory, or a video through FFmpeg when the output
+ends in .mp4/.mov/.mkv/.webm/.avi. Frames are rendered at a fixed timestep
+of 1/fps seconds and can be split across worker processes:
+
+    python scripts/render_sphere_scene.py scene.json thumbs/ --frames 0
+    python scripts/render_sphere_scene.py scene.json turntable.mp4 --frames 0:240 --orbit 45 --workers 4
+
+Uses EGL by default; pass --backend osmesa on machines without a GPU driver.
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+
+def parse_frames(text):
+    """Parse "N" (one frame) or "START:STOP" (STOP exclusive)."""
+    if ':' in text:
+        start, stop = text.split(':', 1)
+        return int(start or 0), int(stop)
+    frame = int(text)
+    return frame, frame + 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render a sphere scene JSON to PNG frames or a video.")
+    parser.add_argument("scene", help="Scene file saved from the sphere editor")
+    parser.add_argument("output", help="Directory for PNG frames, or a video file")
+    parser.add_argument("--frames", type=parse_frames, default=(0, 1), help="N or START:STOP (default 0)")
+    parser.add_argument("--fps", type=float, default=30.0, help="Frames per second of scene time")
+    parser.add_argument("--size", default="640x480", help="WIDTHxHEIGHT (default 640x480)")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes")
+    parser.add_argument("--chunk-size", type=int, default=None, help="Frames per worker task")
+    parser.add_argument("--orbit", type=float, default=0.0, help="Camera orbit, degrees per second")
+    parser.add_argument("--spin", type=float, default=0.0, help="Sphere spin, degrees per second")
+    parser.add_argument("--samples", type=int, default=4, help="Multisampling samples (0 to disable)")
+    parser.add_argument("--backend", choices=("egl", "osmesa"), default="egl")
+    args = parser.parse_args(argv)
+    width, height = (int(value) for value in args.size.lower().split('x'))
+
+    # PyOpenGL picks its platform on first import, so this has to happen before importing the renderer
+    os.environ['PYOPENGL_PLATFORM'] = args.backend
+    if args.backend == "egl" and not (os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY')):
+        os.environ.setdefault('EGL_PLATFORM', 'surfaceless')
+
+    project_root = str(Path(__file__).resolve().parent.parent)
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+    from gui.sphere_3d import batch_render_scene
+
+    start, stop = args.frames
+    result = batch_render_scene(args.scene, args.output, start, stop, fps=args.fps,
+                                width=width, height=height, workers=args.workers,
+                                chunk_size=args.chunk_size, orbit_speed=args.orbit,
+                                spin_speed=args.spin, samples=args.samples)
+    if isinstance(result, list):
+        print(f"Rendered {len(result)} frames to {args.output}")
+    else:
+        print(f"Rendered {stop - start} frames to {result}")
+
+
+if __name__ == "__main__":
+    main()
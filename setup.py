@@ -42,6 +42,7 @@ setup(
 	entry_points={
 		"console_scripts": [
 			"dependency-chart=main:main",
+			"dependency-chart-batch=utils.batch:main",
 		],
 		"gui_scripts": [
 			"dependency-chart-gui=main:main",
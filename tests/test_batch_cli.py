@@ -0,0 +1,149 @@
+"""
+Batch command-line tool tests.
+
+Converts a directory of graphs through every format, applies a layout,
+streams analyses to a JSON Lines report and checks that a worker pool
+produces the same records as a single process.
+"""
+
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import unittest
+
+# Ensure project root is on sys.path for "utils" imports
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+
+class BatchCliTest(unittest.TestCase):
+    def setUp(self):
+        try:
+            import utils.batch as m_batch
+            import models.graph as m_graph
+        except Exception as e:
+            self.skipTest(f"batch tool dependencies not available: {e}")
+        self.batch = m_batch
+        self.m_graph = m_graph
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.inputs = os.path.join(self.root, "in")
+        with contextlib.redirect_stdout(io.StringIO()):
+            for index in range(6):
+                rng = random.Random(index)
+                graph = m_graph.Graph(f"g{index}")
+                nodes = [graph.create_node(rng.uniform(0, 300), rng.uniform(0, 300), text=f"n{i}")
+                         for i in range(12)]
+                for _ in range(15):
+                    source, target = sorted(rng.sample(range(12), 2))
+                    graph.create_edge(nodes[source].id, nodes[target].id)
+                folder = os.path.join(self.inputs, "nested") if index % 3 == 0 else self.inputs
+                self.batch.write_graph(graph, os.path.join(folder, f"g{index}.json"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _main(self, *argv):
+        with contextlib.redirect_stderr(io.StringIO()):
+            return self.batch.main(list(argv))
+
+    def _load(self, path):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return self.batch.read_graph(path)
+
+    def test_convert_round_trip_keeps_structure(self):
+        previous, source = "in", self.inputs
+        for fmt in ("gml", "graphml", "json"):
+            target = os.path.join(self.root, f"from_{previous}_{fmt}")
+            self.assertEqual(self._main("convert", source, "-r", "-o", target, "--to", fmt, "-j", "1"), 0)
+            previous, source = fmt, target
+
+        for relative in ("g1.json", os.path.join("nested", "g3.json")):
+            original = self._load(os.path.join(self.inputs, relative))
+            converted = self._load(os.path.join(source, relative))
+            self.assertEqual(sorted(n.text for n in original.get_all_nodes()),
+                             sorted(n.text for n in converted.get_all_nodes()))
+            self.assertEqual(sorted((e.source_id, e.target_id) for e in original.get_all_edges()),
+                             sorted((e.source_id, e.target_id) for e in converted.get_all_edges()))
+
+    def test_layout_writes_positions(self):
+        output = os.path.join(self.root, "grid")
+        report = os.path.join(self.root, "grid.jsonl")
+        self.assertEqual(self._main("layout", self.inputs, "-r", "-o", output, "-a", "grid_layout",
+                                    "-p", "cols=4", "-p", "spacing=10", "--report", report, "-j", "1"), 0)
+        graph = self._load(os.path.join(output, "g2.json"))
+        self.assertEqual(sorted({node.x for node in graph.get_all_nodes()}), [0, 10, 20, 30])
+        with open(report) as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(len(records), 6)
+        self.assertTrue(all(record["layout"] == "grid_layout" for record in records))
+
+    def test_analyze_streams_records_and_pool_matches_serial(self):
+        reports = {}
+        for workers in ("1", "2"):
+            path = os.path.join(self.root, f"report{workers}.jsonl")
+            self.assertEqual(self._main("analyze", self.inputs, "-r", "-o", path, "-a", "stats",
+                                        "-a", "components", "-a", "is_dag", "-j", workers), 0)
+            with open(path) as f:
+                records = [json.loads(line) for line in f]
+            for record in records:
+                record.pop("seconds")
+            reports[workers] = sorted(records, key=lambda record: record["input"])
+        self.assertEqual(reports["1"], reports["2"])
+        first = reports["1"][0]
+        self.assertEqual(first["analyses"]["stats"]["node_count"], 12)
+        self.assertTrue(first["analyses"]["is_dag"])
+        self.assertEqual(sum(len(component) for component in first["analyses"]["components"]), 12)
+
+    def test_analyze_has_no_report_flag(self):
+        # analyze writes its records to --output; a separate --report would be ignored
+        with self.assertRaises(SystemExit):
+            self._main("analyze", self.inputs, "-a", "stats", "--report", os.path.join(self.root, "r.jsonl"))
+
+    def test_colliding_outputs_are_rejected(self):
+        # Same stem in another directory and with another extension
+        other = os.path.join(self.root, "other")
+        with contextlib.redirect_stdout(io.StringIO()):
+            graph = self._load(os.path.join(self.inputs, "g1.json"))
+            self.batch.write_graph(graph, os.path.join(other, "g1.dot"))
+        output = os.path.join(self.root, "out")
+        args = self.batch.build_parser().parse_args(["convert", self.inputs, other, "-o", output, "--to", "graphml"])
+        with self.assertRaises(ValueError):
+            self.batch.build_jobs(args)
+        with self.assertRaises(SystemExit):
+            self._main("convert", self.inputs, other, "-o", output, "--to", "graphml")
+        self.assertFalse(os.path.exists(output))
+        # Without a common target format the names stay distinct
+        self.assertEqual(self._main("convert", self.inputs, other, "-o", output, "-j", "1"), 0)
+
+    def test_failed_analysis_keeps_the_others(self):
+        cyclic = os.path.join(self.root, "cyclic.json")
+        with contextlib.redirect_stdout(io.StringIO()):
+            graph = self.m_graph.Graph("cyclic")
+            a, b = graph.create_node(0, 0, text="a"), graph.create_node(50, 0, text="b")
+            graph.create_edge(a.id, b.id)
+            graph.create_edge(b.id, a.id)
+            self.batch.write_graph(graph, cyclic)
+        record = self.batch.process_job({"input": cyclic, "analyses": ["stats", "layers", "is_dag"]})
+        self.assertEqual(record["status"], "ok")
+        self.assertEqual(record["analyses"]["stats"]["node_count"], 2)
+        self.assertFalse(record["analyses"]["is_dag"])
+        self.assertIn("error", record["analyses"]["layers"])
+
+    def test_bad_input_is_reported_not_raised(self):
+        broken = os.path.join(self.inputs, "broken.json")
+        with open(broken, "w") as f:
+            f.write("{not json")
+        record = self.batch.process_job({"input": broken, "analyses": ["stats"]})
+        self.assertEqual(record["status"], "error")
+        self.assertEqual(self._main("analyze", broken, "-o", os.path.join(self.root, "r.jsonl"),
+                                    "-a", "stats"), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+"""
+Canvas3D projection tests.
+
+Compares the batched projection with the original one-point-at-a-time
+matrix pipeline and checks that cached camera and world matrices follow
+in-place changes.
+"""
+
+import importlib.util
+import math
+import os
+import sys
+import unittest
+
+# Ensure project root is on sys.path for "gui" imports
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+
+def _load_canvas_module():
+    # "3d_canvas" is not a valid module name for an import statement
+    spec = importlib.util.spec_from_file_location("gui_3d_canvas", os.path.join(PROJECT_ROOT, "gui", "3d_canvas.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _reference_projection(point, world_matrix, view_matrix, projection_matrix, width, height):
+    import numpy as np
+    clip_point = projection_matrix @ (view_matrix @ (world_matrix @ np.append(point, 1.0)))
+    if abs(clip_point[3]) < 1e-6:
+        return -999999, -999999, -1.0
+    ndc_point = clip_point[:3] / clip_point[3]
+    ndc_x = np.clip(ndc_point[0], -10.0, 10.0)
+    ndc_y = np.clip(ndc_point[1], -10.0, 10.0)
+    screen_x = int(np.clip((ndc_x + 1.0) * 0.5 * width, -32767, 32767))
+    screen_y = int(np.clip((1.0 - ndc_y) * 0.5 * height, -32767, 32767))
+    return screen_x, screen_y, ndc_point[2]
+
+
+class CanvasProjectionTest(unittest.TestCase):
+    def setUp(self):
+        try:
+            self.canvas = _load_canvas_module()
+        except Exception as e:
+            self.skipTest(f"3d_canvas dependencies not available: {e}")
+
+    def test_batch_matches_per_point_pipeline(self):
+        import numpy as np
+        rng = np.random.RandomState(3)
+        camera = self.canvas.Camera3D()
+        for trial in range(40):
+            camera.position = rng.uniform(-8, 8, 3)
+            camera.rotation = np.array([rng.uniform(-89, 89), rng.uniform(0, 360), rng.uniform(-180, 180)])
+            camera.projection_mode = list(self.canvas.ProjectionMode)[trial % 2]
+            view_matrix = camera.get_view_matrix()
+            projection_matrix = camera.get_projection_matrix(4 / 3)
+            world_matrix = np.eye(4)
+            points = rng.uniform(-12, 12, (50, 3))
+
+            screen, depth, drawable = self.canvas.project_points(
+                points, projection_matrix @ view_matrix @ world_matrix, 800, 600)
+            for point, xy, z, ok in zip(points, screen, depth, drawable):
+                expected = _reference_projection(point, world_matrix, view_matrix, projection_matrix, 800, 600)
+                # Folding three multiplies into one may move a point across a pixel boundary
+                self.assertLessEqual(abs(int(xy[0]) - expected[0]), 1)
+                self.assertLessEqual(abs(int(xy[1]) - expected[1]), 1)
+                self.assertAlmostEqual(float(z), expected[2], places=9)
+                self.assertEqual(bool(ok), expected[2] > 0 and max(map(abs, expected[:2])) < 32767)
+
+    def test_matrices_follow_in_place_changes(self):
+        camera = self.canvas.Camera3D()
+        view_matrix = camera.get_view_matrix()
+        self.assertIs(camera.get_view_matrix(), view_matrix)
+        camera.rotation[1] += 30.0
+        rotated = camera.get_view_matrix()
+        self.assertIsNot(rotated, view_matrix)
+        self.assertAlmostEqual(camera.forward[2], math.sin(math.radians(30.0)))
+        camera.position += camera.forward
+        self.assertIsNot(camera.get_view_matrix(), rotated)
+
+        projection_matrix = camera.get_projection_matrix(1.5)
+        self.assertIs(camera.get_projection_matrix(1.5), projection_matrix)
+        camera.zoom(5.0)
+        self.assertIsNot(camera.get_projection_matrix(1.5), projection_matrix)
+        self.assertIsNot(camera.get_projection_matrix(2.0), camera.get_projection_matrix(1.5))
+
+    def test_grid_segments_alternate_directions(self):
+        import numpy as np
+        segments = self.canvas.grid_line_segments(2, 0.5)
+        self.assertEqual(segments.shape, (10, 2, 3))
+        np.testing.assert_array_equal(segments[0], [[-1.0, 0, -1.0], [-1.0, 0, 1.0]])
+        np.testing.assert_array_equal(segments[1], [[-1.0, 0, -1.0], [1.0, 0, -1.0]])
+        np.testing.assert_array_equal(segments[7], [[-1.0, 0, 0.5], [1.0, 0, 0.5]])
+
+    def test_view_limit_mask(self):
+        import numpy as np
+        camera = self.canvas.Camera3D()
+        points = np.array([[0, 0, 0], [10, 0, 0], [10.5, 0, 0], [0, -11, 3]])
+        self.assertEqual(camera.points_in_view_limits(points).tolist(), [True] * 4)
+        camera.use_view_limits = True
+        mask = camera.points_in_view_limits(points)
+        self.assertEqual(mask.tolist(), [camera.point_in_view_limits(point) for point in points])
+        self.assertEqual(mask.tolist(), [True, True, False, False])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+"""
+Cellular automaton engine tests.
+
+Compares the vectorized neighbor-sum stepping with a per-cell reference,
+checks rule parsing and toroidal edges, and validates the Hashlife universe
+against the dense engine.
+"""
+
+import random
+import unittest
+import sys
+import os
+
+# Ensure project root is on sys.path for "gui" imports
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+
+GLIDER = [[0, 1, 0], [0, 0, 1], [1, 1, 1]]
+R_PENTOMINO = [[0, 1, 1], [1, 1, 0], [0, 1, 0]]
+
+
+def _reference_step(grid, birth, survive):
+    height, width = len(grid), len(grid[0])
+    result = [[0] * width for _ in range(height)]
+    for y in range(height):
+        for x in range(width):
+            count = sum(grid[y + dy][x + dx]
+                        for dy in (-1, 0, 1) for dx in (-1, 0, 1)
+                        if (dx or dy) and 0 <= y + dy < height and 0 <= x + dx < width)
+            result[y][x] = int(count in (survive if grid[y][x] else birth))
+    return result
+
+
+class CellularAutomatonTest(unittest.TestCase):
+    def setUp(self):
+        try:
+            import gui.sphere_3d as m_sphere_3d
+        except Exception as e:
+            self.skipTest(f"sphere_3d dependencies not available: {e}")
+        self.sphere = m_sphere_3d
+
+    def test_parse_rules(self):
+        parse = self.sphere.parse_life_rule
+        self.assertEqual(parse("B3/S23"), (frozenset({3}), frozenset({2, 3})))
+        self.assertEqual(parse("b36/s23"), (frozenset({3, 6}), frozenset({2, 3})))
+        self.assertEqual(parse("23/3"), (frozenset({3}), frozenset({2, 3})))
+        self.assertEqual(parse("B2/S"), (frozenset({2}), frozenset()))
+        with self.assertRaises(ValueError):
+            parse("B9/S23")
+
+    def test_matches_per_cell_reference(self):
+        for rule, birth, survive in (("B3/S23", {3}, {2, 3}), ("B36/S23", {3, 6}, {2, 3}), ("B2/S", {2}, set())):
+            automaton = self.sphere.CellularAutomaton(37, 23, rule=rule)
+            automaton.set_random_state(0.35)
+            expected = automaton.grid.tolist()
+            for _ in range(5):
+                automaton.update_conway()
+                expected = _reference_step(expected, birth, survive)
+                self.assertEqual(automaton.grid.tolist(), expected)
+
+    def test_toroidal_glider_wraps_around(self):
+        automaton = self.sphere.CellularAutomaton(16, 12, boundary='toroidal')
+        automaton.set_pattern(2, 2, GLIDER)
+        start = automaton.grid.copy()
+        # A glider moves one cell diagonally every 4 generations; 48 generations
+        # move it 12 cells each way, a whole lap vertically but 12 of 16 columns
+        automaton.step(48)
+        import numpy as np
+        self.assertTrue((automaton.grid == np.roll(np.roll(start, 12, axis=0), 12, axis=1)).all())
+        self.assertEqual(automaton.generation, 48)
+
+    def test_rgba_buffer_is_reused(self):
+        automaton = self.sphere.CellularAutomaton(8, 6)
+        automaton.set_glider(1, 1)
+        first = automaton.get_rgba_buffer()
+        self.assertEqual(first.shape, (6, 8, 4))
+        self.assertTrue(first.flags['C_CONTIGUOUS'])
+        self.assertEqual(first[1, 2].tolist(), [0, 255, 0, 255])
+        self.assertEqual(first[0, 0].tolist(), [0, 0, 0, 255])
+        automaton.update_conway()
+        self.assertIs(automaton.get_rgba_buffer(), first)
+        self.assertEqual(automaton.get_colored_grid().shape, (6, 8, 3))
+
+    def test_hashlife_matches_dense_engine(self):
+        rng = random.Random(5)
+        dense = self.sphere.CellularAutomaton(160, 160)
+        dense.set_pattern(78, 78, R_PENTOMINO)
+        for _ in range(6):
+            dense.set_pattern(rng.randint(40, 110), rng.randint(40, 110), GLIDER)
+        universe = self.sphere.HashLifeUniverse("B3/S23")
+        universe.set_cells(dense.grid, -80, -80)
+
+        for generations in (1, 3, 16, 37):
+            dense.step(generations)
+            universe.advance(generations)
+            self.assertEqual(universe.get_cells(-80, -80, 160, 160).tolist(), dense.grid.tolist())
+
+    def test_hashlife_jumps_far_ahead(self):
+        universe = self.sphere.HashLifeUniverse()
+        universe.set_cells(GLIDER, 0, 0)
+        universe.advance(4 * 100000)
+        self.assertEqual(universe.population, 5)
+        self.assertEqual(universe.get_cells(100000, 100000, 3, 3).tolist(), GLIDER)
+
+    def test_open_boundary_window(self):
+        automaton = self.sphere.CellularAutomaton(20, 20, boundary='open')
+        automaton.set_glider(16, 16)
+        automaton.step(16)
+        # The glider has left the visible window but still exists in the universe
+        self.assertEqual(int(automaton.grid.sum()), 0)
+        self.assertEqual(automaton._hashlife.population, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,197 @@
+"""
+Collapsed-container view tests.
+
+Checks that collapsing and expanding nested containers leaves edge endpoints
+untouched, and that hidden nodes and meta-edge counts match a recomputation
+from the container hierarchy after every toggle.
+"""
+
+import os
+import random
+import sys
+import unittest
+
+# Ensure project root is on sys.path for "models" imports
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+
+def expected_view(graph):
+    """Representatives and meta-edge counts recomputed from scratch."""
+
+    parent = {}
+    for node in graph.get_all_nodes():
+        for child_id in node.child_ids:
+            parent[child_id] = node.id
+    representative = {}
+    for node in graph.get_all_nodes():
+        # The outermost collapsed ancestor covers the node
+        cover = node.id
+        ancestor = parent.get(node.id)
+        while ancestor is not None:
+            if not graph.get_node(ancestor).is_expanded:
+                cover = ancestor
+            ancestor = parent.get(ancestor)
+        representative[node.id] = cover
+    meta = {}
+    for edge in graph.get_all_edges():
+        ends = (representative[edge.source_id], representative[edge.target_id])
+        if ends != (edge.source_id, edge.target_id) and ends[0] != ends[1]:
+            meta[ends] = meta.get(ends, 0) + 1
+    return representative, meta
+
+
+class CollapsedViewTest(unittest.TestCase):
+    def setUp(self):
+        try:
+            import models.collapsed_view as m_collapsed_view
+            import models.graph as m_graph
+        except Exception as e:
+            self.skipTest(f"collapsed view dependencies not available: {e}")
+        self.m_collapsed_view = m_collapsed_view
+        self.m_graph = m_graph
+
+    def _nested_graph(self, rng, node_count, edge_count):
+        graph = self.m_graph.Graph()
+        nodes = [graph.create_node(i, 0, text=f"n{i}") for i in range(node_count)]
+        # Each node may sit inside an earlier one, giving a random forest
+        for index, node in enumerate(nodes[1:], start=1):
+            if rng.random() < 0.7:
+                container = nodes[rng.randrange(index)]
+                container.add_child(node.id)
+                node.parent_id = container.id
+        for _ in range(edge_count):
+            graph.create_edge(rng.choice(nodes).id, rng.choice(nodes).id)
+        return graph
+
+    def _assert_matches(self, graph, view):
+        representative, meta = expected_view(graph)
+        for node in graph.get_all_nodes():
+            self.assertEqual(view.representative(node.id), representative[node.id])
+            self.assertEqual(node.visible, representative[node.id] == node.id)
+        self.assertEqual({(s, t): c for s, t, c in view.meta_edges()}, meta)
+        for edge in graph.get_all_edges():
+            ends = (representative[edge.source_id], representative[edge.target_id])
+            self.assertEqual(edge.visible, ends == (edge.source_id, edge.target_id))
+
+    def test_toggles_match_recomputation(self):
+        rng = random.Random(4)
+        for _ in range(15):
+            graph = self._nested_graph(rng, rng.randint(2, 30), rng.randint(0, 60))
+            endpoints = {edge.id: (edge.source_id, edge.target_id) for edge in graph.get_all_edges()}
+            view = self.m_collapsed_view.CollapsedView(graph)
+            containers = [node.id for node in graph.get_all_nodes() if node.is_container]
+            if not containers:
+                continue
+            for _ in range(25):
+                container_id = rng.choice(containers)
+                recursive = rng.random() < 0.3
+                if rng.random() < 0.5:
+                    view.collapse(container_id, recursive=recursive)
+                else:
+                    view.expand(container_id, recursive=recursive)
+                self._assert_matches(graph, view)
+            self.assertEqual({edge.id: (edge.source_id, edge.target_id) for edge in graph.get_all_edges()},
+                             endpoints)
+            # A fresh view over the same state agrees with the incremental one
+            fresh = self.m_collapsed_view.CollapsedView(graph)
+            self.assertEqual(sorted(fresh.meta_edges()), sorted(view.meta_edges()))
+
+    def test_meta_edge_counts_and_legacy_redirects(self):
+        graph = self.m_graph.Graph()
+        box = graph.create_node(0, 0, text="box")
+        inner = [graph.create_node(i, 0, text=f"in{i}") for i in range(3)]
+        outside = graph.create_node(0, 100, text="out")
+        for node in inner:
+            box.add_child(node.id)
+        for node in inner:
+            graph.create_edge(node.id, outside.id)
+        internal = graph.create_edge(inner[0].id, inner[1].id)
+
+        view = self.m_collapsed_view.CollapsedView(graph)
+        self.assertEqual(view.collapse(box.id), 1)
+        self.assertEqual(view.meta_edges(), [(box.id, outside.id, 3)])
+        self.assertFalse(internal.visible)
+        self.assertFalse(view.is_edge_aggregated(internal.id))
+
+        # Deleting an aggregated edge lowers the count
+        removed = graph.get_edge_between_nodes(inner[0].id, outside.id)
+        self.assertIn(removed.id, view.meta_edge_ids(box.id, outside.id))
+        graph.remove_edge(removed.id)
+        self.assertEqual(view.meta_edges(), [(box.id, outside.id, 2)])
+        self.assertEqual(view.expand(box.id), 1)
+        self.assertEqual(view.meta_edges(), [])
+        self.assertTrue(all(node.visible for node in inner))
+
+        # Edges rewritten by the old collapse code are put back
+        edge = graph.get_edge_between_nodes(inner[2].id, outside.id)
+        edge.source_id = box.id
+        box.add_redirected_edge(edge.id, inner[2].id)
+        graph.reindex_edge(edge.id)
+        self.m_collapsed_view.CollapsedView(graph)
+        self.assertEqual(edge.source_id, inner[2].id)
+        self.assertEqual(box.get_redirected_edges(), {})
+
+    def test_edge_changes_resync_the_view(self):
+        import utils.commands as m_commands
+
+        graph = self.m_graph.Graph()
+        box = graph.create_node(0, 0, text="box")
+        inner = [graph.create_node(i, 0, text=f"in{i}") for i in range(2)]
+        outside = [graph.create_node(i, 100, text=f"out{i}") for i in range(2)]
+        for node in inner:
+            box.add_child(node.id)
+        edge = graph.create_edge(inner[0].id, outside[0].id)
+        view = self.m_collapsed_view.CollapsedView(graph)
+        view.collapse(box.id)
+
+        # Deleting an aggregated edge and undoing brings it back aggregated
+        command = m_commands.DeleteEdgeCommand(graph, edge.id)
+        command.execute()
+        self.assertEqual(view.meta_edges(), [])
+        command.undo()
+        self.assertEqual(view.meta_edges(), [(box.id, outside[0].id, 1)])
+        self.assertFalse(graph.get_edge(edge.id).visible)
+
+        # A new edge into a hidden node is hidden and aggregated
+        added = graph.create_edge(outside[1].id, inner[1].id)
+        self.assertTrue(view.is_edge_aggregated(added.id))
+        self.assertFalse(added.visible)
+
+        # Reconnecting an edge out of the container shows it again
+        m_commands.ChangeEdgeConnectionCommand(graph, added.id, outside[1].id, inner[1].id,
+                                               outside[1].id, outside[0].id).execute()
+        self.assertFalse(view.is_edge_aggregated(added.id))
+        self.assertTrue(added.visible)
+
+        view.expand(box.id)
+        self.assertEqual(view.meta_edges(), [])
+        self.assertTrue(all(edge.visible for edge in graph.get_all_edges()))
+
+    def test_sync_replays_only_changed_edges(self):
+        graph = self.m_graph.Graph()
+        box = graph.create_node(0, 0, text="box")
+        inner = graph.create_node(0, 0, text="inner")
+        box.add_child(inner.id)
+        others = [graph.create_node(i, 100, text=f"out{i}") for i in range(20)]
+        for node in others:
+            graph.create_edge(inner.id, node.id)
+        view = self.m_collapsed_view.CollapsedView(graph)
+        view.collapse(box.id)
+
+        refreshed = []
+        original = view.refresh_edges
+        view.refresh_edges = lambda edge_ids: (refreshed.append(list(edge_ids)), original(refreshed[-1]))
+        added = graph.create_edge(others[0].id, inner.id)
+        self.assertTrue(view.is_edge_aggregated(added.id))
+        self.assertEqual(refreshed, [[added.id]])
+
+        # Clearing the graph falls back to a full resync
+        graph.clear()
+        self.assertEqual(view.meta_edges(), [])
+        self.assertEqual(len(refreshed[-1]), 21)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+"""
+DAG reachability index tests.
+
+Compares bitset reachability, closure and transitive reduction against a
+brute-force search on random DAGs, including after incremental edge inserts,
+and checks how cyclic input is handled.
+"""
+
+import os
+import random
+import sys
+import time
+import unittest
+
+# Ensure project root is on sys.path for "models" imports
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+
+def reachable_sets(node_ids, pairs):
+    """Nodes reachable from each node by depth-first search."""
+
+    successors = {node_id: set() for node_id in node_ids}
+    for source, target in pairs:
+        successors[source].add(target)
+    result = {}
+    for node_id in node_ids:
+        seen = set()
+        stack = list(successors[node_id])
+        while stack:
+            current = stack.pop()
+            if current not in seen:
+                seen.add(current)
+                stack.extend(successors[current])
+        result[node_id] = seen
+    return result
+
+
+class DagReachabilityTest(unittest.TestCase):
+    def setUp(self):
+        try:
+            import models.algorithms.dag_algorithms as m_dag_algorithms
+            import models.dag_graph as m_dag_graph
+            import models.node as m_node
+            import models.edge as m_edge
+        except Exception as e:
+            self.skipTest(f"DAG algorithm dependencies not available: {e}")
+        self.algorithms = m_dag_algorithms
+        self.m_dag_graph = m_dag_graph
+        self.m_node = m_node
+        self.m_edge = m_edge
+
+    def _random_dag(self, rng, node_count, edge_count):
+        graph = self.m_dag_graph.DAGGraph()
+        nodes = [self.m_node.Node(text=f"n{i}", node_id=f"n{i}") for i in range(node_count)]
+        for node in nodes:
+            graph.add_node(node)
+        rank = list(range(node_count))
+        rng.shuffle(rank)
+        for _ in range(edge_count):
+            a, b = rng.sample(range(node_count), 2)
+            if rank[a] > rank[b]:
+                a, b = b, a
+            graph.add_edge(self.m_edge.Edge(source_id=nodes[a].id, target_id=nodes[b].id))
+        return graph
+
+    def test_closure_and_reduction_match_search(self):
+        rng = random.Random(7)
+        for _ in range(20):
+            graph = self._random_dag(rng, rng.randint(1, 90), rng.randint(0, 250))
+            node_ids = [node.id for node in graph.get_all_nodes()]
+            pairs = [(edge.source_id, edge.target_id) for edge in graph.get_all_edges()]
+            expected = reachable_sets(node_ids, pairs)
+            self.assertEqual(self.algorithms.transitive_closure(graph), expected)
+
+            index = self.algorithms.ReachabilityIndex(graph)
+            for _ in range(50):
+                a, b = rng.choice(node_ids), rng.choice(node_ids)
+                self.assertEqual(index.can_reach(a, b), b in expected[a])
+                self.assertEqual(self.algorithms.is_reachable(graph, a, b), b in expected[a])
+                self.assertEqual(self.algorithms.is_reachable(graph, a, b, index=index), b in expected[a])
+            node_id = rng.choice(node_ids)
+            self.assertEqual(index.ancestors(node_id),
+                             {other for other in node_ids if node_id in expected[other]})
+
+            reduced = [(e.source_id, e.target_id) for e in self.algorithms.transitive_reduction(graph)]
+            self.assertEqual(len(reduced), len(set(reduced)))
+            self.assertEqual(reachable_sets(node_ids, reduced), expected)
+            # Dropping any remaining edge must lose reachability
+            for pair in reduced:
+                rest = [other for other in reduced if other != pair]
+                self.assertNotIn(pair[1], reachable_sets(node_ids, rest)[pair[0]])
+
+    def test_cyclic_input(self):
+        graph = self._rebuilt_graph(["a", "b", "c"], [("a", "b"), ("b", "c"), ("c", "a")])
+        self.assertTrue(self.algorithms.is_reachable(graph, "a", "a"))
+        self.assertTrue(self.algorithms.is_reachable(graph, "c", "b"))
+        self.assertEqual(self.algorithms.transitive_closure(graph)["a"], {"a", "b", "c"})
+        with self.assertRaises(ValueError):
+            self.algorithms.transitive_reduction(graph)
+
+    def test_incremental_edges_match_rebuild(self):
+        rng = random.Random(11)
+        index = self.algorithms.ReachabilityIndex()
+        node_ids = [f"v{i}" for i in range(150)]
+        pairs = []
+        for step in range(600):
+            a, b = rng.sample(node_ids[:10 + step // 4], 2)
+            expected = reachable_sets(node_ids, pairs)
+            if a in expected[b]:
+                with self.assertRaises(ValueError):
+                    index.add_edge(a, b)
+                continue
+            index.add_edge(a, b)
+            pairs.append((a, b))
+        for node_id in node_ids:
+            index.add_node(node_id)
+        expected = reachable_sets(node_ids, pairs)
+        self.assertEqual(index.closure(), expected)
+        self.assertEqual(sorted(index.reduction()),
+                         sorted(self._rebuilt(node_ids, pairs).reduction()))
+
+    def _rebuilt_graph(self, node_ids, pairs):
+        graph = self.m_dag_graph.DAGGraph()
+        for node_id in node_ids:
+            graph.add_node(self.m_node.Node(node_id=node_id))
+        for source, target in pairs:
+            graph.add_edge(self.m_edge.Edge(source_id=source, target_id=target))
+        return graph
+
+    def _rebuilt(self, node_ids, pairs):
+        return self.algorithms.ReachabilityIndex(self._rebuilt_graph(node_ids, pairs))
+
+    def test_large_dag_stays_interactive(self):
+        rng = random.Random(3)
+        graph = self._random_dag(rng, 5000, 15000)
+        start = time.perf_counter()
+        index = self.algorithms.ReachabilityIndex(graph)
+        self.assertLess(time.perf_counter() - start, 5.0)
+        node_ids = [node.id for node in graph.get_all_nodes()]
+        start = time.perf_counter()
+        for _ in range(100):
+            a, b = rng.sample(node_ids, 2)
+            try:
+                index.add_edge(a, b)
+            except ValueError:
+                pass
+        self.assertLess(time.perf_counter() - start, 2.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
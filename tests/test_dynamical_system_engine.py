@@ -0,0 +1,94 @@
+"""
+Dynamical system engine tests.
+
+Checks that equations are compiled once through the AST whitelist, that the
+grid iteration reproduces a straightforward per-point escape loop, and that
+the progress callback can still cancel a generation.
+"""
+
+import math
+import unittest
+import sys
+import os
+
+# Ensure project root is on sys.path for "gui" imports
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+
+JULIA = {'eq_0': 'x*x - y*y + c_real', 'eq_1': '2*x*y + c_imag'}
+
+
+def _reference_escape(x, y, c_real, c_imag, max_iterations, escape_radius):
+    for iteration in range(max_iterations):
+        x, y = x * x - y * y + c_real, 2 * x * y + c_imag
+        magnitude = math.sqrt(x * x + y * y)
+        if magnitude > escape_radius:
+            if magnitude > 2.0:
+                return iteration + 1 - math.log(math.log(magnitude)) / math.log(2)
+            return iteration
+    return max_iterations
+
+
+class DynamicalSystemEngineTest(unittest.TestCase):
+    def setUp(self):
+        try:
+            import gui.sphere_3d as m_sphere_3d
+        except Exception as e:
+            self.skipTest(f"sphere_3d dependencies not available: {e}")
+        self.sphere = m_sphere_3d
+
+    def test_compiled_equation_evaluates_arrays(self):
+        import numpy as np
+        equation = self.sphere.CompiledEquation('x^2 + np.sin(y) * a - sqrt(abs(x))', {'x', 'y', 'a'})
+        xs = np.array([0.5, -1.5, 2.0])
+        ys = np.array([0.1, 1.0, -3.0])
+        values = equation({'x': xs, 'y': ys, 'a': 2.0})
+        for x, y, value in zip(xs, ys, values):
+            self.assertAlmostEqual(value, x ** 2 + math.sin(y) * 2.0 - math.sqrt(abs(x)))
+
+    def test_compiled_equation_rejects_unsafe_input(self):
+        for source in ['__import__("os")', 'x.__class__', 'open("f")', 'lambda: 1', 'q + 1', 'x +']:
+            with self.assertRaises(ValueError):
+                self.sphere.CompiledEquation(source, {'x'})
+
+    def test_parameters_are_parsed_without_eval(self):
+        engine = self.sphere.DynamicalSystemEngine({'parameters': 'a=2*pi, b=a/4, name=hello', 'equations': {}})
+        self.assertAlmostEqual(engine.parameters['a'], 2 * math.pi)
+        self.assertAlmostEqual(engine.parameters['b'], math.pi / 2)
+        self.assertEqual(engine.parameters['name'], 'hello')
+
+    def test_grid_matches_per_point_iteration(self):
+        import numpy as np
+        engine = self.sphere.DynamicalSystemEngine({
+            'equations': JULIA, 'max_iterations': 60, 'escape_radius': 2.0})
+        x0, y0 = np.meshgrid(np.linspace(-1.6, 1.6, 23), np.linspace(-1.2, 1.2, 17))
+        result = engine._iterate_grid(x0, y0)
+        for (row, col), value in np.ndenumerate(result):
+            expected = _reference_escape(x0[row, col], y0[row, col], -0.7, 0.27015, 60, 2.0)
+            self.assertAlmostEqual(value, expected, places=4)
+
+    def test_progress_callback_cancels(self):
+        engine = self.sphere.DynamicalSystemEngine({
+            'equations': JULIA, 'resolution': 40, 'max_iterations': 200})
+        calls = []
+        engine.set_progress_callback(lambda current, total, status: calls.append(current) or len(calls) < 3)
+        self.assertIsNone(engine.generate())
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(calls, sorted(calls))
+
+    def test_continuous_flow_saturates_intensity(self):
+        engine = self.sphere.DynamicalSystemEngine({
+            'system_type': 'Continuous Flow', 'resolution': 40, 'max_iterations': 400,
+            'sample_count': 200, 'domain': '[-1, 1] × [-1, 1]',
+            'equations': {'eq_0': '-x', 'eq_1': '-y'}})
+        image = engine.generate()
+        self.assertEqual(image.shape, (30, 40, 3))
+        # Every trajectory converges on the origin, which saturates instead of wrapping
+        self.assertEqual(image.max(), 255)
+        self.assertTrue((image[..., 0] == image[..., 1]).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
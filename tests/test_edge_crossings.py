@@ -0,0 +1,123 @@
+"""
+Edge crossing index tests.
+
+Checks that the swept crossing count and its incremental updates agree with
+the pairwise edges_intersect loop, including shared endpoints, collinear
+edges and edges whose endpoints are missing.
+"""
+
+import os
+import random
+import sys
+import unittest
+
+# Ensure project root is on sys.path for "utils" imports
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+
+def pairwise_crossings(graph, edges):
+    """The original count_edge_crossings loop."""
+
+    def ccw(A_x, A_y, B_x, B_y, C_x, C_y):
+        return (C_y - A_y) * (B_x - A_x) > (B_y - A_y) * (C_x - A_x)
+
+    count = 0
+    for i, edge1 in enumerate(edges):
+        for j, edge2 in enumerate(edges):
+            if i >= j:
+                continue
+            src1 = graph.get_node(edge1.source_id)
+            tgt1 = graph.get_node(edge1.target_id)
+            src2 = graph.get_node(edge2.source_id)
+            tgt2 = graph.get_node(edge2.target_id)
+            if src1 and tgt1 and src2 and tgt2:
+                x1, y1, x2, y2 = src1.x, src1.y, tgt1.x, tgt1.y
+                x3, y3, x4, y4 = src2.x, src2.y, tgt2.x, tgt2.y
+                if (ccw(x1, y1, x3, y3, x4, y4) != ccw(x2, y2, x3, y3, x4, y4)
+                        and ccw(x1, y1, x2, y2, x3, y3) != ccw(x1, y1, x2, y2, x4, y4)):
+                    count += 1
+    return count
+
+
+class EdgeCrossingIndexTest(unittest.TestCase):
+    def setUp(self):
+        try:
+            import utils.edge_crossings as m_edge_crossings
+            import models.graph as m_graph
+            import models.node as m_node
+            import models.edge as m_edge
+        except Exception as e:
+            self.skipTest(f"edge crossing dependencies not available: {e}")
+        self.crossings = m_edge_crossings
+        self.m_graph = m_graph
+        self.m_node = m_node
+        self.m_edge = m_edge
+
+    def _random_graph(self, rng, node_count, edge_count, grid):
+        graph = self.m_graph.Graph()
+        for i in range(node_count):
+            if grid:
+                x, y = rng.randint(0, grid), rng.randint(0, grid)
+            else:
+                x, y = rng.uniform(-100, 100), rng.uniform(-100, 100)
+            graph.add_node(self.m_node.Node(x=x, y=y, node_id=f"n{i}"))
+        edges = []
+        for _ in range(edge_count):
+            # A few edges point at nodes that do not exist
+            edge = self.m_edge.Edge(f"n{rng.randrange(node_count + 2)}", f"n{rng.randrange(node_count)}")
+            edges.append(edge)
+        return graph, edges
+
+    def test_count_matches_pairwise_loop(self):
+        rng = random.Random(7)
+        for _ in range(60):
+            # Small integer grids produce many shared endpoints and collinear edges
+            graph, edges = self._random_graph(rng, rng.randint(2, 20), rng.randint(0, 50),
+                                              rng.choice([0, 3, 6, 40]))
+            index = self.crossings.EdgeCrossingIndex(graph, edges)
+            self.assertEqual(index.count, pairwise_crossings(graph, edges))
+            self.assertEqual(self.crossings.count_crossings(graph, edges), index.count)
+
+    def test_incremental_updates_match_recount(self):
+        rng = random.Random(11)
+        for _ in range(20):
+            graph, edges = self._random_graph(rng, 12, 30, rng.choice([0, 5]))
+            index = self.crossings.EdgeCrossingIndex(graph, edges)
+            node_ids = [node.id for node in graph.get_all_nodes()]
+            for _ in range(6):
+                node_a, node_b = rng.choice(node_ids), rng.choice(node_ids)
+                before = index.count
+                delta = index.swap_delta(node_a, node_b)
+                self.assertEqual(index.count, before)  # Trials leave the index unchanged
+                self.assertEqual(index.swap_nodes(node_a, node_b), delta)
+                index.move_node(rng.choice(node_ids), rng.randint(0, 5), rng.randint(0, 5))
+
+                index.apply_positions()
+                self.assertEqual(index.count, pairwise_crossings(graph, edges))
+                fresh = self.crossings.EdgeCrossingIndex(graph, edges)
+                self.assertEqual(list(fresh.edge_counts), list(index.edge_counts))
+
+    def test_shared_endpoint_and_disjoint_edges(self):
+        graph = self.m_graph.Graph()
+        for node_id, (x, y) in {"a": (0, 0), "b": (10, 10), "c": (0, 10), "d": (10, 0),
+                                "e": (20, 0), "f": (30, 10)}.items():
+            graph.add_node(self.m_node.Node(x=x, y=y, node_id=node_id))
+        edges = [self.m_edge.Edge("a", "b"), self.m_edge.Edge("c", "d"),
+                 self.m_edge.Edge("d", "e"), self.m_edge.Edge("e", "f")]
+        index = self.crossings.EdgeCrossingIndex(graph, edges)
+        self.assertEqual(index.count, pairwise_crossings(graph, edges))
+        self.assertEqual(index.node_crossings("a"), 1)
+        self.assertEqual(index.move_delta("a", 20, 20), -1)
+        self.assertEqual(index.position("a"), (0.0, 0.0))
+
+    def test_star_import_exports_only_public_api(self):
+        namespace = {}
+        exec("from utils.edge_crossings import *", namespace)
+        self.assertEqual(sorted(name for name in namespace if name != "__builtins__"),
+                         ["EdgeCrossingIndex", "count_crossings", "segments_cross"])
+
+
+if __name__ == "__main__":
+    unittest.main()
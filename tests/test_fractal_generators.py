@@ -0,0 +1,66 @@
+"""
+Vectorized fractal generator tests.
+
+Validates that the array-based Mandelbrot/Julia generators agree with the
+per-point reference functions, that tiles match the full frame and that
+cached frames cannot be changed by callers.
+"""
+
+import unittest
+import sys
+import os
+
+# Ensure project root is on sys.path for "gui" imports
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+
+class FractalGeneratorTest(unittest.TestCase):
+    def setUp(self):
+        try:
+            import gui.sphere_3d as m_sphere_3d
+        except Exception as e:
+            self.skipTest(f"sphere_3d dependencies not available: {e}")
+        self.sphere = m_sphere_3d
+
+    def _assert_matches_points(self, generator, point_func):
+        iterations = generator.calculate_dynamic_iterations()
+        result = generator.generate()
+        for y in range(0, generator.height, 7):
+            for x in range(0, generator.width, 5):
+                real = (x - generator.width / 2) * (4.0 / generator.width) / generator.zoom + generator.center_x
+                imag = (y - generator.height / 2) * (4.0 / generator.height) / generator.zoom + generator.center_y
+                self.assertAlmostEqual(result[y, x], point_func(complex(real, imag), iterations), places=4)
+
+    def test_mandelbrot_matches_reference(self):
+        generator = self.sphere.MandelbrotGenerator(64, 48)
+        generator.set_zoom_region(-0.74, 0.1, 20.0)
+        self._assert_matches_points(generator, generator.mandelbrot_point)
+
+    def test_julia_matches_reference(self):
+        generator = self.sphere.JuliaGenerator(64, 48)
+        generator.set_zoom_region(0.1, -0.2, 3.0)
+        self._assert_matches_points(generator, generator.julia_point)
+
+    def test_cached_frames_are_read_only(self):
+        generator = self.sphere.MandelbrotGenerator(50, 30)
+        frame = generator.generate()
+        self.assertIs(generator.generate(), frame)
+        with self.assertRaises(ValueError):
+            frame[0, 0] = 1.0
+        self.assertEqual(len(generator.cache), 1)
+
+    def test_escape_time_fractal_is_abstract(self):
+        with self.assertRaises(TypeError):
+            self.sphere.EscapeTimeFractal()
+
+    def test_tile_matches_full_frame(self):
+        generator = self.sphere.JuliaGenerator(40, 40)
+        full = generator.generate()
+        tile = generator.generate_tile(10, 5, 16, 12)
+        self.assertTrue((tile == full[5:17, 10:26]).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+"""
+Fractal geometry tests.
+
+Compares the array-based Menger sponge, L-system rewriting and turtle
+interpretation with straightforward recursive/sequential references, and
+checks the batched IFS chaos game and the per-level cache.
+"""
+
+import math
+import unittest
+import sys
+import os
+
+# Ensure project root is on sys.path for "gui" imports
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+
+def _reference_turtle(lstring, angle):
+    x, y, heading = 0.0, 0.0, 0.0
+    stack, lines = [], []
+    for char in lstring:
+        if char == 'F':
+            nx, ny = x + math.sin(heading), y + math.cos(heading)
+            lines.append(((x, y, 0.0), (nx, ny, 0.0)))
+            x, y = nx, ny
+        elif char in '+-':
+            heading += math.radians(angle) * (1 if char == '+' else -1)
+        elif char == '[':
+            stack.append((x, y, heading))
+        elif char == ']' and stack:
+            x, y, heading = stack.pop()
+    return lines
+
+
+class FractalGeometryTest(unittest.TestCase):
+    def setUp(self):
+        try:
+            import gui.sphere_3d as m_sphere_3d
+        except Exception as e:
+            self.skipTest(f"sphere_3d dependencies not available: {e}")
+        self.sphere = m_sphere_3d
+
+    def test_menger_centers_match_recursive_subdivision(self):
+        import numpy as np
+        cubes = [(np.zeros(3), 1.0)]
+        for _ in range(3):
+            cubes = [(center + size / 3.0 * np.array([i - 1, j - 1, k - 1]), size / 3.0)
+                     for center, size in cubes
+                     for i in range(3) for j in range(3) for k in range(3)
+                     if (i == 1) + (j == 1) + (k == 1) < 2]
+        sponge = self.sphere.MengerSponge(3)
+        self.assertTrue((sponge.centers == np.array([center for center, _ in cubes])).all())
+        self.assertEqual(sponge.get_vertices().shape, (8000 * 8, 3))
+        self.assertIs(self.sphere.menger_sponge_centers(3), sponge.centers)
+        self.assertFalse(sponge.centers.flags.writeable)
+
+    def test_menger_mesh_hides_shared_faces(self):
+        vertices, normals, indices = self.sphere.MengerSponge(1).get_mesh()
+        # 48 outer faces plus 8 tunnel faces for each of the 3 tunnels
+        self.assertEqual(len(indices) // 6, 72)
+        self.assertEqual(len(vertices), len(normals))
+        self.assertEqual(str(indices.dtype), 'uint32')
+
+    def test_lsystem_rewriting(self):
+        rules = {'X': 'X+YF+', 'Y': '-FX-Y'}
+        current = 'FX'
+        for _ in range(6):
+            current = ''.join(rules.get(char, char) for char in current)
+        self.assertEqual(self.sphere.expand_lsystem('FX', rules, 6), current)
+        self.assertEqual(self.sphere.expand_lsystem('ab', {'ab': 'x', 'a': 'b'}, 1), 'bb')
+
+    def test_turtle_matches_sequential_interpretation(self):
+        import numpy as np
+        system = self.sphere.LSystem()
+        system.set_tree_rules()
+        system.angle = 22.5
+        for lstring in (system.generate(3), 'F]F+F[F-F]]F', '[F[+F]', ''):
+            segments = system.interpret(lstring)
+            expected = np.array(_reference_turtle(lstring, 22.5)).reshape(-1, 2, 3)
+            self.assertEqual(segments.shape, expected.shape)
+            np.testing.assert_allclose(segments, expected, atol=1e-9)
+
+    def test_chaos_game_batches(self):
+        import numpy as np
+        fern = self.sphere.IFSGenerator().fern_transforms
+        points, choices = self.sphere.ifs_chaos_game(fern, 5000, walkers=64)
+        self.assertEqual(points.shape, (5000, 2))
+        self.assertTrue((choices < 4).all())
+        # The Barnsley fern attractor lies within x in [-2.2, 2.7], y in [0, 10]
+        self.assertTrue((points[:, 0] > -2.5).all() and (points[:, 0] < 3.0).all())
+        self.assertTrue((points[:, 1] >= 0).all() and (points[:, 1] < 10.1).all())
+
+        # Draws beyond a total probability below one are skipped unless a fallback is given
+        partial = [row[:6] + [row[6] / 2] for row in fern]
+        skipped, _ = self.sphere.ifs_chaos_game(partial, 4000, walkers=40)
+        self.assertLess(len(skipped), 3000)
+        _, fallback = self.sphere.ifs_chaos_game(partial, 4000, walkers=40, fallback=2)
+        self.assertGreater(int(np.sum(fallback == 2)), 1500)
+
+
+if __name__ == "__main__":
+    unittest.main()
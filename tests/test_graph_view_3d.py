@@ -0,0 +1,137 @@
+"""
+3D graph view tests.
+
+Checks how GraphGeometry3D packs nodes, edges, control points and
+selections into arrays, the picking color encoding, and the 3D
+force-directed layout's exact and binned repulsion.
+"""
+
+import os
+import sys
+import unittest
+
+# Ensure project root is on sys.path for "gui" imports
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+
+class GraphView3DTest(unittest.TestCase):
+    def setUp(self):
+        try:
+            import gui.graph_view_3d as m_graph_view_3d
+            import utils.layout as m_layout
+            import models.graph as m_graph
+            import models.node as m_node
+            import models.edge as m_edge
+        except Exception as e:
+            self.skipTest(f"graph_view_3d dependencies not available: {e}")
+        self.view = m_graph_view_3d
+        self.layout = m_layout
+        self.m_node = m_node
+        self.m_edge = m_edge
+
+        self.graph = m_graph.Graph()
+        self.nodes = [m_node.Node(x=10.0 * i, y=-5.0 * i, z=float(i)) for i in range(4)]
+        for node in self.nodes:
+            self.graph.add_node(node)
+        self.nodes[3].shape = 'rectangle'
+        self.nodes[2].visible = False
+
+        self.bent = m_edge.Edge(self.nodes[0].id, self.nodes[1].id)
+        self.bent.control_points = [(1.0, 2.0, 3.0), (4.0, 5.0)]
+        self.bent.color = (1, 2, 3)
+        self.hyper = m_edge.Edge(self.nodes[0].id, self.nodes[3].id)
+        self.hyper.source_ids = [self.nodes[0].id, self.nodes[1].id]
+        self.hidden = m_edge.Edge(self.nodes[1].id, self.nodes[2].id)
+        for edge in (self.bent, self.hyper, self.hidden):
+            self.graph.add_edge(edge)
+
+    def test_geometry_packs_visible_nodes_and_edges(self):
+        geometry = self.view.GraphGeometry3D(self.graph)
+        n0, n1, n3 = (geometry.node_index[self.nodes[i].id] for i in (0, 1, 3))
+        self.assertEqual(geometry.node_count, 3)
+        self.assertEqual(geometry.positions[n3].tolist(), [30.0, -15.0, 3.0])
+        self.assertEqual(geometry.sizes[n3], 30.0)  # Half the larger side of a rectangle
+
+        # The bent edge runs through its two control points; the hyperedge joins both sources to the target
+        self.assertEqual(geometry.control_points.tolist(), [[1.0, 2.0, 3.0], [4.0, 5.0, 0.0]])
+        self.assertEqual(geometry.segment_indices.tolist(), [[n0, 3], [3, 4], [4, n1], [n0, n3], [n1, n3]])
+        lines = geometry.line_vertices()
+        self.assertEqual(lines.shape, (10, 3))
+        self.assertEqual(lines[1].tolist(), [1.0, 2.0, 3.0])
+        self.assertEqual(geometry.line_colors()[:6].tolist(), [[1, 2, 3]] * 6)
+
+        self.nodes[1].z = 50.0
+        self.bent.control_points[0] = (7.0, 8.0, 9.0)
+        geometry.update_positions(self.graph)
+        self.assertEqual(geometry.positions[n1, 2], 50.0)
+        self.assertEqual(geometry.line_vertices()[2].tolist(), [7.0, 8.0, 9.0])
+
+    def test_selection_recolors(self):
+        geometry = self.view.GraphGeometry3D(self.graph)
+        version = geometry.color_version
+        self.graph.select_node(self.nodes[1].id)
+        self.graph.selected_edges.add(self.hyper.id)
+        geometry.update_selection(self.graph)
+        self.assertGreater(geometry.color_version, version)
+        self.assertEqual(tuple(geometry.colors[geometry.node_index[self.nodes[1].id]]), self.view.SELECTED_NODE_COLOR)
+        self.assertEqual(tuple(geometry.colors[geometry.node_index[self.nodes[0].id]]), self.nodes[0].color)
+        self.assertEqual([tuple(color) for color in geometry.segment_colors[3:]], [self.view.SELECTED_EDGE_COLOR] * 2)
+
+    def test_pick_colors_round_trip(self):
+        import numpy as np
+        colors = self.view.GraphGeometry3D.id_colors(70000)
+        self.assertEqual(len({tuple(color) for color in colors}), 70000)
+        self.assertNotIn((0, 0, 0), {tuple(color) for color in colors[:10]})
+        decoded = self.view.GraphGeometry3D.decode_ids(colors)
+        self.assertTrue((decoded == np.arange(70000)).all())
+        self.assertEqual(int(self.view.GraphGeometry3D.decode_ids(np.zeros(3, dtype=np.uint8))), -1)
+
+    def test_layout_repulsion(self):
+        import numpy as np
+        positions = np.random.RandomState(1).uniform(-50, 50, (25, 3))
+        expected = np.zeros_like(positions)
+        for i in range(25):
+            for j in range(25):
+                if i != j:
+                    delta = positions[j] - positions[i]
+                    distance = np.linalg.norm(delta)
+                    expected[i] -= 1000.0 / distance ** 2 * delta / distance
+        np.testing.assert_allclose(self.layout._exact_repulsion_3d(positions, 1000.0), expected, rtol=1e-9)
+
+        # Binned repulsion stays close to the exact sum
+        positions = np.random.RandomState(2).uniform(-500, 500, (3000, 3))
+        exact = self.layout._exact_repulsion_3d(positions, 1000.0)
+        binned = self.layout._binned_repulsion_3d(positions, 1000.0, 8)
+        errors = np.linalg.norm(exact - binned, axis=1) / np.linalg.norm(exact, axis=1)
+        self.assertLess(np.median(errors), 0.1)
+
+    def test_binned_repulsion_near_field(self):
+        import numpy as np
+        # Two tight clusters in adjacent cells, plus a dense cluster that must be re-binned
+        state = np.random.RandomState(3)
+        positions = np.concatenate([state.normal(0, 5, (1500, 3)), state.normal(60, 5, (200, 3)),
+                                    state.uniform(-500, 500, (800, 3))])
+        exact = self.layout._exact_repulsion_3d(positions, 1000.0)
+        binned = self.layout._binned_repulsion_3d(positions, 1000.0, 8, leaf_pairs=1 << 14)
+        errors = np.linalg.norm(exact - binned, axis=1) / np.linalg.norm(exact, axis=1)
+        self.assertLess(np.median(errors), 0.02)
+        self.assertLess(np.percentile(errors, 95), 0.1)
+
+        # With every node in adjacent cells the sum is exact
+        positions = state.uniform(-50, 50, (400, 3))
+        np.testing.assert_allclose(self.layout._binned_repulsion_3d(positions, 1000.0, 2, leaf_pairs=1 << 16),
+                                   self.layout._exact_repulsion_3d(positions, 1000.0), rtol=1e-9)
+
+    def test_layout_lifts_flat_graph_and_keeps_locked_nodes(self):
+        for node in self.nodes:
+            node.z = 0.0
+        self.nodes[0].locked = True
+        self.assertTrue(self.layout.force_directed_layout_3d(self.graph, iterations=20))
+        self.assertEqual(self.nodes[0].get_position(), (0.0, 0.0, 0.0))
+        self.assertGreater(max(node.z for node in self.nodes) - min(node.z for node in self.nodes), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
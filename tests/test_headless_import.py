@@ -0,0 +1,86 @@
+"""
+Headless import budget tests.
+
+Imports the GUI-free core (models, algorithms, layouts and file formats) in
+a fresh interpreter and fails if it loads wxPython, OpenGL or multimedia
+libraries, or if it goes over the module count or import time budget.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+# Ensure project root is on sys.path for "models" imports
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+
+CORE_MODULES = [
+    "models",
+    "models.algorithms",
+    "models.collapsed_view",
+    "utils.layout",
+    "utils.sugiyama",
+    "utils.edge_crossings",
+    "utils.file_utils",
+    "file_io",
+]
+
+# Top-level packages the core must never load
+FORBIDDEN_PACKAGES = {"wx", "OpenGL", "cv2", "pygame", "PIL", "mvc_mvu", "mvu", "event_handlers"}
+
+# Budgets for the modules the core imports on top of a bare interpreter
+MODULE_BUDGET = 400
+IMPORT_SECONDS_BUDGET = 2.0
+
+PROBE = """
+import json, sys, time
+before = set(sys.modules)
+start = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "modules": sorted(set(sys.modules) - before)}}))
+"""
+
+
+def probe_imports(modules):
+    """Import modules in a fresh interpreter; returns (seconds, loaded module names)."""
+
+    result = subprocess.run([sys.executable, "-c", PROBE.format(modules=list(modules))],
+                            cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    return report["seconds"], report["modules"]
+
+
+class HeadlessImportTest(unittest.TestCase):
+    def test_core_imports_without_gui_libraries(self):
+        seconds, modules = probe_imports(CORE_MODULES)
+        loaded = {name.split(".")[0] for name in modules}
+        self.assertEqual(loaded & FORBIDDEN_PACKAGES, set())
+        self.assertNotIn("gui", loaded)
+        self.assertLessEqual(len(modules), MODULE_BUDGET)
+        self.assertLessEqual(seconds, IMPORT_SECONDS_BUDGET)
+
+    def test_gui_package_loads_submodules_on_demand(self):
+        seconds, modules = probe_imports(["gui", "utils", "utils.managers"])
+        self.assertIn("gui", modules)
+        self.assertEqual([name for name in modules if name.startswith("gui.")], [])
+        self.assertEqual([name for name in modules if name.startswith("utils.managers.")], [])
+        self.assertNotIn("wx", modules)
+
+    def test_unknown_gui_attribute_raises_attribute_error(self):
+        script = ("import json, sys, gui; print(json.dumps([hasattr(gui, 'nonexistent'), "
+                  "[name for name in sys.modules if name.startswith('gui.')]]))")
+        result = subprocess.run([sys.executable, "-c", script], cwd=PROJECT_ROOT,
+                                capture_output=True, text=True, check=True)
+        found, loaded = json.loads(result.stdout.strip().splitlines()[-1])
+        self.assertFalse(found)
+        self.assertEqual(loaded, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
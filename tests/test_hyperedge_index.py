@@ -0,0 +1,160 @@
+"""
+Hyperedge incidence index tests.
+
+Checks that index-backed hyperedge connectivity in Graph and Hypergraph
+matches a brute-force scan over all edge pairs, including after edges are
+removed and mutated in place.
+"""
+
+import random
+import unittest
+import sys
+import os
+
+# Ensure project root is on sys.path for "models" imports
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import models.graph as m_graph
+import models.hypergraph as m_hypergraph
+import models.node as m_node
+import models.algorithms.hypergraph_algorithms as m_hypergraph_algorithms
+import utils.commands as m_commands
+
+
+def _random_graph(seed: int, node_count: int = 30, edge_count: int = 40) -> m_graph.Graph:
+    rng = random.Random(seed)
+    graph = m_graph.Graph("Random")
+    nodes = [graph.create_node(i, i, text=f"n{i}") for i in range(node_count)]
+    for _ in range(edge_count):
+        source, target = rng.sample(nodes, 2)
+        edge = graph.create_edge(source.id, target.id)
+        if rng.random() < 0.6:
+            for extra in rng.sample(nodes, rng.randint(1, 3)):
+                edge.add_to_node(extra.id)
+            graph.reindex_edge(edge.id)
+    return graph
+
+
+def _brute_force_connected(graph: m_graph.Graph, edge_id: str):
+    edge = graph.get_edge(edge_id)
+    return {
+        other.id for other in graph.get_all_edges()
+        if other.id != edge_id and other.is_hyperedge and edge.shares_nodes_with(other)
+    }
+
+
+class HyperedgeIndexTest(unittest.TestCase):
+    def test_graph_connected_hyperedges_match_brute_force(self):
+        for seed in range(5):
+            graph = _random_graph(seed)
+            for edge in graph.get_all_edges():
+                found = {e.id for e in graph.get_connected_hyperedges(edge.id)}
+                self.assertEqual(found, _brute_force_connected(graph, edge.id))
+
+    def test_index_tracks_removals_and_in_place_mutation(self):
+        graph = _random_graph(7)
+        edges = graph.get_all_edges()
+        for edge in edges[:10]:
+            graph.remove_edge(edge.id)
+        node_ids = list(graph.nodes)
+        graph.remove_node(node_ids[0])
+        mutated = graph.get_all_edges()[0]
+        mutated.add_from_node(node_ids[5])
+        graph.reindex_edge(mutated.id)
+
+        for edge in graph.get_all_edges():
+            found = {e.id for e in graph.get_connected_hyperedges(edge.id)}
+            self.assertEqual(found, _brute_force_connected(graph, edge.id))
+
+    def test_reconnect_command_and_undo_keep_index_current(self):
+        graph = _random_graph(5)
+        hyperedge = next(e for e in graph.get_all_edges() if e.is_hyperedge)
+        source, target = graph.create_node(0, 0), graph.create_node(1, 1)
+        plain = graph.create_edge(source.id, target.id)
+        plain.add_to_node(graph.create_node(2, 2).id)
+        graph.reindex_edge(plain.id)
+        self.assertNotIn(plain.id, {e.id for e in graph.get_connected_hyperedges(hyperedge.id)})
+
+        command = m_commands.ChangeEdgeConnectionCommand(
+            graph, plain.id, plain.source_id, plain.target_id, hyperedge.target_ids[-1], plain.target_id)
+        for step in (command.execute, command.undo, command.execute):
+            step()
+            # Ask from the other edges first; the index must not rely on the moved edge being queried
+            for edge in (hyperedge, plain):
+                found = {e.id for e in graph.get_connected_hyperedges(edge.id)}
+                self.assertEqual(found, _brute_force_connected(graph, edge.id))
+            self.assertIn(plain, graph.get_node_hyperedges(plain.source_id))
+        self.assertIn(plain.id, {e.id for e in graph.get_connected_hyperedges(hyperedge.id)})
+
+    def test_select_edge_selects_connected_hyperedges(self):
+        graph = _random_graph(3)
+        hyperedge = next(e for e in graph.get_all_edges() if e.is_hyperedge)
+        graph.select_edge(hyperedge.id)
+        expected = _brute_force_connected(graph, hyperedge.id) | {hyperedge.id}
+        self.assertEqual(graph.selected_edges, expected)
+
+        graph.deselect_edge(hyperedge.id)
+        self.assertEqual(graph.selected_edges, set())
+
+    def test_from_dict_rebuilds_index(self):
+        graph = _random_graph(11)
+        loaded = m_graph.Graph.from_dict(graph.to_dict())
+        for edge in loaded.get_all_edges():
+            found = {e.id for e in loaded.get_connected_hyperedges(edge.id)}
+            self.assertEqual(found, _brute_force_connected(loaded, edge.id))
+
+    def test_hyperedge_endpoint_changes_update_index(self):
+        hypergraph = m_hypergraph.Hypergraph(name="H")
+        nodes = [m_node.Node(text=f"v{i}") for i in range(5)]
+        for node in nodes:
+            hypergraph.add_node(node)
+        ids = [node.id for node in nodes]
+        first = hypergraph.create_hyperedge([ids[0]], [ids[1]])
+        second = hypergraph.create_hyperedge([ids[3]], [ids[4]])
+        self.assertEqual(hypergraph.get_node_hyperedges(ids[3]), [second])
+
+        first.add_source(ids[2])
+        first.add_target(ids[3])
+        self.assertEqual(hypergraph.get_node_hyperedges(ids[2]), [first])
+        self.assertEqual(hypergraph.get_hyperedge_index().adjacent_edges(second.id), [first.id])
+
+        first.remove_target(ids[3])
+        first.remove_source(ids[2])
+        self.assertEqual(hypergraph.get_node_hyperedges(ids[2]), [])
+        self.assertEqual(hypergraph.get_hyperedge_index().adjacent_edges(second.id), [])
+
+        # A removed edge no longer touches the graph's index
+        hypergraph.remove_edge(first.id)
+        first.add_target(ids[4])
+        self.assertEqual(hypergraph.get_node_hyperedges(ids[4]), [second])
+
+    def test_hypergraph_components_and_traversal(self):
+        hypergraph = m_hypergraph.Hypergraph(name="H")
+        nodes = [m_node.Node(text=f"v{i}") for i in range(7)]
+        for node in nodes:
+            hypergraph.add_node(node)
+        ids = [node.id for node in nodes]
+        first = hypergraph.create_hyperedge([ids[0]], [ids[1], ids[2]])
+        hypergraph.create_hyperedge([ids[2]], [ids[3]])
+        hypergraph.create_hyperedge([ids[4]], [ids[5]])
+
+        components = m_hypergraph_algorithms.connected_components_hypergraph(hypergraph)
+        self.assertCountEqual(
+            [frozenset(c) for c in components],
+            [frozenset(ids[0:4]), frozenset(ids[4:6]), frozenset([ids[6]])])
+
+        visited = m_hypergraph_algorithms.hypergraph_traversal(hypergraph, ids[0])
+        self.assertEqual([node.id for node in visited], ids[0:4])
+
+        connected = hypergraph.get_connected_hyperedges(first.id)
+        self.assertEqual(len(connected), 1)
+        self.assertEqual(len(hypergraph.get_node_hyperedges(ids[2])), 2)
+
+        hypergraph.remove_edge(first.id)
+        self.assertEqual(len(hypergraph.get_node_hyperedges(ids[2])), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+"""
+Minimal transversal enumeration tests.
+
+Checks the MMCS enumeration against brute force on small random hypergraphs,
+and that the result cap and time budget cut a large enumeration short while
+the first transversals still arrive quickly.
+"""
+
+import itertools
+import os
+import random
+import sys
+import time
+import unittest
+
+# Ensure project root is on sys.path for "models" imports
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+
+def brute_force_transversals(node_ids, edge_sets):
+    """Minimal hitting sets found by checking every subset."""
+
+    hitting = [set(subset) for size in range(len(node_ids) + 1)
+               for subset in itertools.combinations(node_ids, size)
+               if all(set(subset) & edge for edge in edge_sets)]
+    return [subset for subset in hitting if not any(other < subset for other in hitting)]
+
+
+class MinimalTransversalsTest(unittest.TestCase):
+    def setUp(self):
+        try:
+            import models.algorithms.hypergraph_algorithms as m_hypergraph_algorithms
+            import models.hypergraph as m_hypergraph
+            import models.node as m_node
+        except Exception as e:
+            self.skipTest(f"hypergraph dependencies not available: {e}")
+        self.algorithms = m_hypergraph_algorithms
+        self.m_hypergraph = m_hypergraph
+        self.m_node = m_node
+
+    def _hypergraph(self, rng, node_count, edge_count, max_size):
+        graph = self.m_hypergraph.Hypergraph()
+        node_ids = [f"v{i}" for i in range(node_count)]
+        for node_id in node_ids:
+            graph.add_node(self.m_node.Node(node_id=node_id))
+        edge_sets = []
+        for _ in range(edge_count):
+            members = rng.sample(node_ids, rng.randint(1, min(max_size, node_count)))
+            edge = self.m_hypergraph.HypergraphEdge()
+            for node_id in members[:len(members) // 2]:
+                edge.add_source(node_id)
+            for node_id in members[len(members) // 2:]:
+                edge.add_target(node_id)
+            graph.add_edge(edge)
+            edge_sets.append(set(members))
+        return graph, node_ids, edge_sets
+
+    def test_matches_brute_force(self):
+        rng = random.Random(9)
+        for _ in range(40):
+            graph, node_ids, edge_sets = self._hypergraph(rng, rng.randint(1, 10), rng.randint(0, 8), 4)
+            used = sorted({node_id for edge in edge_sets for node_id in edge})
+            expected = brute_force_transversals(used, edge_sets)
+            found = self.algorithms.minimal_transversals(graph)
+            self.assertEqual(len(found), len({frozenset(t) for t in found}))
+            self.assertEqual(sorted(map(sorted, found)), sorted(map(sorted, expected)))
+
+    def test_cap_and_budget_on_large_hypergraph(self):
+        rng = random.Random(2)
+        graph, _, edge_sets = self._hypergraph(rng, 300, 2000, 8)
+        start = time.perf_counter()
+        first = next(self.algorithms.iter_minimal_transversals(graph))
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertTrue(all(first & edge for edge in edge_sets))
+        for node_id in first:
+            self.assertFalse(all((first - {node_id}) & edge for edge in edge_sets))
+
+        capped = self.algorithms.minimal_transversals(graph, max_results=25)
+        self.assertEqual(len(capped), 25)
+        start = time.perf_counter()
+        self.algorithms.minimal_transversals(graph, time_budget=0.2)
+        self.assertLess(time.perf_counter() - start, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+Offscreen scene rendering tests.
+
+Checks that scenes survive a JSON round trip, and, where an EGL or OSMesa
+context can be created, that frames depend only on scene time and that a
+worker pool renders the same frames as a single process.
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# Ensure project root is on sys.path for "gui" imports
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+
+class OffscreenRenderTest(unittest.TestCase):
+    def setUp(self):
+        try:
+            import gui.sphere_3d as m_sphere_3d
+        except Exception as e:
+            self.skipTest(f"sphere_3d dependencies not available: {e}")
+        self.sphere = m_sphere_3d
+
+        import numpy as np
+        renderer = m_sphere_3d.SphereRenderer()
+        renderer.active_grids = {m_sphere_3d.GridType.LONGITUDE_LATITUDE, m_sphere_3d.GridType.DOT_PARTICLES}
+        renderer.rotation = np.array([10.0, 20.0, 0.0])
+        self.scene = json.loads(json.dumps({
+            "version": "1.0",
+            "sphere_data": renderer.save_scene_to_dict(),
+            "canvas_data": {"camera": {"distance": 6.0, "rotation_x": 15.0, "rotation_y": 30.0,
+                                       "position": [0.0, 0.0, 0.0], "projection": "perspective"}}
+        }))
+
+    def _renderer(self, width=64, height=48):
+        try:
+            return self.sphere.OffscreenSceneRenderer(width, height)
+        except Exception as e:
+            self.skipTest(f"No offscreen OpenGL context: {e}")
+
+    def test_scene_json_round_trip(self):
+        loaded = self.sphere.SphereRenderer()
+        loaded.load_scene_from_dict(self.scene["sphere_data"])
+        self.assertEqual(loaded.active_grids, {self.sphere.GridType.LONGITUDE_LATITUDE,
+                                               self.sphere.GridType.DOT_PARTICLES})
+        self.assertEqual(loaded.rotation.tolist(), [10.0, 20.0, 0.0])
+
+    def test_frames_depend_only_on_scene_time(self):
+        renderer = self._renderer()
+        try:
+            renderer.load_scene(self.scene)
+            renderer.orbit_speed = 90.0
+            first = renderer.render_frame(0.5)
+            self.assertEqual(first.shape, (48, 64, 3))
+            later = renderer.render_frame(1.0)
+            self.assertFalse((first == later).all())
+            self.assertTrue((renderer.render_frame(0.5) == first).all())
+            self.assertEqual(renderer.camera_rotation_y, 30.0 + 45.0)
+        finally:
+            renderer.close()
+
+    def test_worker_pool_matches_single_process(self):
+        from PIL import Image
+        self._renderer().close()
+        expected = self.sphere.render_scene_frames(self.scene, range(3), 40, 30, fps=10, orbit_speed=30.0)
+        output_dir = tempfile.mkdtemp()
+        try:
+            paths = self.sphere.batch_render_scene(self.scene, output_dir, 0, 3, fps=10, width=40, height=30,
+                                                   workers=2, orbit_speed=30.0)
+            self.assertEqual([os.path.basename(path) for path in paths],
+                             ["frame_00000.png", "frame_00001.png", "frame_00002.png"])
+            for image, path in zip(expected, paths):
+                self.assertTrue((image == Image.open(path).convert('RGB')).all())
+        finally:
+            shutil.rmtree(output_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,171 @@
+"""
+Overlap removal tests.
+
+Checks the grid pair search against a brute-force overlap test, that the
+separation solver meets its constraints, and that overlap removal leaves
+no overlaps, keeps neighbouring boxes in order, moves little on large
+layouts and never moves locked ones.
+"""
+
+import os
+import sys
+import unittest
+
+# Ensure project root is on sys.path for "utils" imports
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+
+def brute_force_pairs(centres, sizes):
+    pairs = set()
+    for i in range(len(centres)):
+        for j in range(i + 1, len(centres)):
+            if all(abs(centres[i][k] - centres[j][k]) < (sizes[i][k] + sizes[j][k]) / 2 for k in range(2)):
+                pairs.add((i, j))
+    return pairs
+
+
+class OverlapRemovalTest(unittest.TestCase):
+    def setUp(self):
+        try:
+            import utils.layout as m_layout
+            import models.graph as m_graph
+            import models.node as m_node
+        except Exception as e:
+            self.skipTest(f"layout dependencies not available: {e}")
+        self.layout = m_layout
+        self.m_graph = m_graph
+        self.m_node = m_node
+
+    def _boxes(self, rng, count, spread, snap=None):
+        import numpy as np
+        centres = rng.normal(0, spread, (count, 2))
+        if snap:
+            centres = np.round(centres / snap) * snap  # Many boxes at the same spot
+        sizes = np.c_[rng.uniform(20, 80, count), rng.uniform(10, 50, count)]
+        return centres, sizes
+
+    def test_grid_pairs_match_brute_force(self):
+        import numpy as np
+        rng = np.random.default_rng(1)
+        for trial in range(15):
+            centres, sizes = self._boxes(rng, int(rng.integers(2, 120)), rng.uniform(20, 300),
+                                         snap=30 if trial % 3 == 0 else None)
+            first, second = self.layout.overlapping_pairs(centres, sizes)
+            self.assertEqual(set(zip(first.tolist(), second.tolist())), brute_force_pairs(centres, sizes))
+
+    def test_separate_axis_meets_constraints(self):
+        import numpy as np
+        rng = np.random.default_rng(2)
+        for _ in range(300):
+            count = int(rng.integers(2, 10))
+            desired = np.sort(rng.integers(0, 5, count)).astype(float)
+            left = rng.integers(0, count, 12)
+            right = rng.integers(0, count, 12)
+            keep = left < right
+            left, right = left[keep], right[keep]
+            gaps = rng.uniform(0.5, 3.0, len(left))
+            x = self.layout.separate_axis(desired, np.ones(count), left, right, gaps)
+            self.assertTrue((x[right] - x[left] >= gaps - 1e-9).all())
+
+    def test_resolve_removes_overlaps_in_order(self):
+        import numpy as np
+        rng = np.random.default_rng(3)
+        for trial in range(10):
+            centres, sizes = self._boxes(rng, 150, 150, snap=30 if trial % 2 else None)
+            resolved, passes = self.layout.resolve_overlaps(centres, sizes)
+            self.assertEqual(brute_force_pairs(resolved, sizes), set())
+            # Every originally overlapping pair keeps its order on at least one axis
+            for i, j in brute_force_pairs(centres, sizes):
+                kept = [np.sign(resolved[j, k] - resolved[i, k]) == np.sign(centres[j, k] - centres[i, k])
+                        or centres[j, k] == centres[i, k] for k in range(2)]
+                self.assertTrue(any(kept))
+
+    def test_resolve_keeps_order_of_neighbours(self):
+        import numpy as np
+        rng = np.random.default_rng(4)
+        for trial in range(6):
+            centres, sizes = self._boxes(rng, 300, 150, snap=30 if trial % 2 else None)
+            resolved, passes = self.layout.resolve_overlaps(centres, sizes)
+            self.assertEqual(passes, 1)
+            self.assertEqual(brute_force_pairs(resolved, sizes), set())
+            # Boxes side by side (overlapping in y) keep their left-to-right order
+            first, second = np.triu_indices(len(centres), 1)
+            beside = np.abs(centres[first, 1] - centres[second, 1]) < (sizes[first, 1] + sizes[second, 1]) / 2
+            first, second = first[beside], second[beside]
+            before = np.sign(centres[second, 0] - centres[first, 0])
+            self.assertTrue((before * (resolved[second, 0] - resolved[first, 0]) >= -1e-9).all())
+
+    def test_resolve_moves_little_on_large_layouts(self):
+        import numpy as np
+        rng = np.random.default_rng(6)
+        for density in (0.1, 0.3):
+            # 5000 boxes of 70x50 covering the given fraction of a square
+            side = np.sqrt(5000 * 70 * 50 / density)
+            centres = rng.uniform(0, side, (5000, 2))
+            sizes = np.tile([70.0, 50.0], (5000, 1))
+            first, second = self.layout.overlapping_pairs(centres, sizes)
+            overlapping = np.zeros(5000, dtype=bool)
+            overlapping[first] = overlapping[second] = True
+            resolved, passes = self.layout.resolve_overlaps(centres, sizes)
+            self.assertEqual(len(self.layout.overlapping_pairs(resolved, sizes)[0]), 0)
+            moves = np.linalg.norm(resolved - centres, axis=1)
+            self.assertLess(moves.mean(), 20.0)
+            # Nodes clear of every other only move when pushed by a neighbour
+            self.assertLess(moves[~overlapping].max(), 150.0)
+            self.assertLess((moves[~overlapping] > 0).mean(), 0.5)
+
+    def test_fixed_boxes_do_not_move(self):
+        import numpy as np
+        # A movable box squeezed between two fixed ones too close to fit it
+        centres = np.array([[0.0, 0.0], [5.0, 0.0], [10.0, 0.0]])
+        sizes = np.full((3, 2), 10.0)
+        movable = np.array([False, True, False])
+        resolved, passes = self.layout.resolve_overlaps(centres, sizes, movable)
+        self.assertEqual(resolved[0].tolist(), [0.0, 0.0])
+        self.assertEqual(resolved[2].tolist(), [10.0, 0.0])
+        self.assertEqual(brute_force_pairs(resolved, sizes), set())
+
+        rng = np.random.default_rng(5)
+        centres, sizes = self._boxes(rng, 400, 150)
+        movable = rng.random(400) > 0.1
+        resolved, passes = self.layout.resolve_overlaps(centres, sizes, movable)
+        self.assertTrue((resolved[~movable] == centres[~movable]).all())
+        # Fewer overlaps involving a movable box than before
+        first, second = self.layout.overlapping_pairs(centres, sizes)
+        before = (movable[first] | movable[second]).sum()
+        first, second = self.layout.overlapping_pairs(resolved, sizes)
+        self.assertLess((movable[first] | movable[second]).sum(), before / 10)
+
+    def test_remove_overlaps_does_not_write_locked_nodes(self):
+        graph = self.m_graph.Graph()
+        for index in range(5):
+            graph.add_node(self.m_node.Node(x=index * 7.0, y=index * 0.3, node_id=f"n{index}"))
+        for node_id in ("n0", "n4"):
+            graph.get_node(node_id).locked = True
+        self.assertTrue(self.layout.remove_overlaps(graph, padding=5.0))
+        self.assertEqual((graph.get_node("n0").x, graph.get_node("n0").y), (0.0, 0.0))
+        self.assertEqual((graph.get_node("n4").x, graph.get_node("n4").y), (28.0, 1.2))
+
+    def test_remove_overlaps_leaves_separate_and_locked_nodes(self):
+        graph = self.m_graph.Graph()
+        positions = {"a": (0, 0), "b": (10, 5), "c": (500, 500), "d": (-5, 0)}
+        for node_id, (x, y) in positions.items():
+            graph.add_node(self.m_node.Node(x=x, y=y, node_id=node_id))
+        graph.get_node("d").locked = True
+        self.assertTrue(self.layout.remove_overlaps(graph, padding=0.0))
+        self.assertEqual((graph.get_node("c").x, graph.get_node("c").y), (500, 500))
+        locked = graph.get_node("d")
+        self.assertAlmostEqual(locked.x, -5, places=3)
+        self.assertAlmostEqual(locked.y, 0, places=3)
+        nodes = graph.get_all_nodes()
+        centres = [(node.x, node.y) for node in nodes]
+        sizes = [(node.width, node.height) for node in nodes]
+        self.assertEqual(brute_force_pairs(centres, sizes), set())
+        # a was left of b and stays so
+        self.assertLess(graph.get_node("a").x, graph.get_node("b").x + 1e-9)
+
+
+if __name__ == "__main__":
+    unittest.main()
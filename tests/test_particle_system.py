@@ -0,0 +1,86 @@
+"""
+Structure-of-arrays particle system tests.
+
+Checks the vectorized integration against a hand-computed Euler step,
+compaction of dead particles, capacity limits and the built-in force kernels.
+"""
+
+import unittest
+import sys
+import os
+
+# Ensure project root is on sys.path for "gui" imports
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+
+class ParticleSystemTest(unittest.TestCase):
+    def setUp(self):
+        try:
+            import gui.sphere_3d as m_sphere_3d
+        except Exception as e:
+            self.skipTest(f"sphere_3d dependencies not available: {e}")
+        self.sphere = m_sphere_3d
+
+    def test_gravity_step_matches_euler(self):
+        import numpy as np
+        system = self.sphere.ParticleSystem(max_particles=10)
+        system.add_particle([0.0, 10.0, 0.0], [1.0, 0.0, 0.0], mass=2.0, life=2.0, color=[1.0, 0.5, 0.0])
+        system.add_force(system.gravity_force)
+        system.add_force(system.gravity_force)  # registering twice must not double gravity
+        system.update(0.5)
+
+        np.testing.assert_allclose(system.velocities[0], [1.0, -4.905, 0.0], rtol=1e-6)
+        np.testing.assert_allclose(system.positions[0], [0.5, 10.0 - 2.4525, 0.0], rtol=1e-6)
+        np.testing.assert_allclose(system.colors[0], [0.75, 0.375, 0.0, 0.6], rtol=1e-6)
+        self.assertAlmostEqual(float(system.sizes[0]), 0.75)
+
+    def test_dead_particles_are_compacted(self):
+        import numpy as np
+        system = self.sphere.ParticleSystem(max_particles=100)
+        lives = np.array([0.5, 2.0, 0.5, 3.0, 2.5])
+        system.add_particles(np.arange(15).reshape(5, 3), np.zeros((5, 3)), lives=lives)
+        system.update(1.0)
+
+        self.assertEqual(len(system), 3)
+        np.testing.assert_allclose(system.positions[:3], [[3, 4, 5], [9, 10, 11], [12, 13, 14]])
+        np.testing.assert_allclose(system.life[:3], [1.0, 2.0, 1.5])
+        self.assertEqual(len(system.particles), 3)
+
+    def test_capacity_is_respected(self):
+        system = self.sphere.ParticleSystem(max_particles=150)
+        system.emit_explosion([0.0, 0.0, 0.0], count=100)
+        system.emit_fountain([0.0, 0.0, 0.0], count=100)
+        self.assertEqual(system.count, 150)
+
+    def test_attractor_and_drag_kernels(self):
+        import numpy as np
+        system = self.sphere.ParticleSystem(max_particles=10)
+        system.add_particles([[1.0, 0.0, 0.0], [0.0, 0.0, 0.0]], [[0.0, 2.0, 0.0], [0.0, 0.0, 0.0]], lives=5.0)
+        system.add_attractor([0.0, 0.0, 0.0], strength=1.1)
+        system.set_drag(0.5)
+        positions = system.positions[:2]
+        velocities = system.velocities[:2]
+        masses = system.masses[:2]
+
+        attraction = system.attraction_force(positions, velocities, masses)
+        np.testing.assert_allclose(attraction, [[-1.0, 0.0, 0.0], [0.0, 0.0, 0.0]], rtol=1e-6)
+        drag = system.drag_force(positions, velocities, masses)
+        np.testing.assert_allclose(drag, [[0.0, -1.0, 0.0], [0.0, 0.0, 0.0]])
+
+    def test_render_batches_cover_all_particles(self):
+        import numpy as np
+        system = self.sphere.ParticleSystem(max_particles=1000)
+        system.emit_fountain([0.0, 0.0, 0.0], count=500)
+        system.update(1.0)
+        batches = list(system.render_batches())
+        self.assertEqual(sum(len(positions) for _, positions, _ in batches), system.count)
+        for point_size, positions, colors in batches:
+            self.assertGreaterEqual(point_size, 1.0)
+            self.assertEqual(colors.shape, (len(positions), 4))
+            self.assertEqual(positions.dtype, np.float32)
+
+
+if __name__ == "__main__":
+    unittest.main()
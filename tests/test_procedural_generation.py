@@ -0,0 +1,130 @@
+"""
+Procedural generation tests.
+
+Compares the array-based noise, heightmap and city layout generators with
+per-cell reference loops, and checks the mesh buffers built for terrain and
+city blocks.
+"""
+
+import unittest
+import sys
+import os
+
+# Ensure project root is on sys.path for "gui" imports
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+
+def _reference_noise(x, y):
+    n = int(x * 57 + y * 113)
+    n = (n << 13) ^ n
+    n = (n * (n * n * 15731 + 789221) + 1376312589) & 0x7fffffff
+    return 1.0 - (n / 1073741824.0)
+
+
+class ProceduralGenerationTest(unittest.TestCase):
+    def setUp(self):
+        try:
+            import gui.sphere_3d as m_sphere_3d
+        except Exception as e:
+            self.skipTest(f"sphere_3d dependencies not available: {e}")
+        self.sphere = m_sphere_3d
+        self.generator = m_sphere_3d.ProceduralGenerator()
+
+    def test_noise_matches_integer_hash(self):
+        import numpy as np
+        xs = np.linspace(-40.0, 40.0, 57)
+        ys = np.linspace(35.0, -12.5, 57)
+        values = self.generator._pseudo_noise(xs, ys)
+        for x, y, value in zip(xs, ys, values):
+            self.assertEqual(value, _reference_noise(x, y))
+        self.assertEqual(self.generator._pseudo_noise(3.7, -1.2), _reference_noise(3.7, -1.2))
+
+    def test_heightmap_matches_octave_loop(self):
+        heightmap = self.generator.generate_terrain_heightmap(24, 16, octaves=4, persistence=0.6, scale=0.05)
+        reference = [[sum(_reference_noise(x * 0.05 * 2 ** o, y * 0.05 * 2 ** o) * 0.6 ** o for o in range(4))
+                      for x in range(24)] for y in range(16)]
+        low = min(map(min, reference))
+        high = max(map(max, reference))
+        for y in range(16):
+            for x in range(24):
+                self.assertAlmostEqual(heightmap[y, x], (reference[y][x] - low) / (high - low))
+
+    def test_city_layout_matches_per_pixel_reference(self):
+        import numpy as np
+        width, height = 90, 70
+        np.random.seed(4)
+        city = self.generator.generate_city_layout(width, height, num_districts=3)
+
+        # Same random stream, drawn and painted one pixel / building at a time
+        np.random.seed(4)
+        centers = [(np.random.randint(width // 4, 3 * width // 4), np.random.randint(height // 4, 3 * height // 4))
+                   for _ in range(3)]
+        palette = [[100, 100, 150], [150, 100, 100], [100, 150, 100]]
+        expected = np.zeros((height, width, 3), dtype=np.uint8)
+        for y in range(height):
+            for x in range(width):
+                distances = [np.sqrt((x - cx) ** 2 + (y - cy) ** 2) for cx, cy in centers]
+                expected[y, x] = palette[distances.index(min(distances))]
+        for i in range(1, 4):
+            expected[i * height // 4 - 2:i * height // 4 + 3, :] = 80
+            expected[:, i * width // 4 - 2:i * width // 4 + 3] = 80
+        for _ in range(width * height // 200):
+            bx, by = np.random.randint(5, width - 10), np.random.randint(5, height - 10)
+            bw, bh = np.random.randint(3, 8), np.random.randint(3, 8)
+            if not np.any(expected[by:by + bh, bx:bx + bw] == [80, 80, 80]):
+                expected[by:by + bh, bx:bx + bw] = expected[by:by + bh, bx:bx + bw] * 0.6
+        self.assertTrue((city == expected).all())
+
+    def test_dungeon_rooms_are_connected(self):
+        import numpy as np
+        np.random.seed(2)
+        dungeon = self.generator.generate_dungeon(60, 40, num_rooms=6)
+        floor = set(zip(*np.nonzero(dungeon == 0)))
+        start = next(iter(floor))
+        seen, stack = {start}, [start]
+        while stack:
+            y, x = stack.pop()
+            for cell in ((y + 1, x), (y - 1, x), (y, x + 1), (y, x - 1)):
+                if cell in floor and cell not in seen:
+                    seen.add(cell)
+                    stack.append(cell)
+        self.assertEqual(seen, floor)
+
+    def test_terrain_mesh_buffers(self):
+        import numpy as np
+        shape = self.sphere.ProceduralShape3D(procedural_type="terrain")
+        heightmap = np.random.RandomState(0).rand(9, 12)
+        shape.generate_terrain_geometry(heightmap)
+        self.assertEqual(shape.vertices.shape, (9 * 12, 3))
+        self.assertEqual(shape.vertices.dtype, np.float32)
+        self.assertEqual(shape.indices.dtype, np.uint32)
+        self.assertEqual(len(shape.indices), 8 * 11 * 6)
+        np.testing.assert_allclose(np.linalg.norm(shape.normals, axis=1), 1.0, rtol=1e-5)
+
+        # Cell (x=3, y=5) is the two triangles over its four corners
+        cell = (5 * 11 + 3) * 6
+        corners = shape.vertices[shape.indices[cell:cell + 6]]
+        x0, x1, y0 = 3 / 12 * 4 - 2, 4 / 12 * 4 - 2, 5 / 9 * 4 - 2
+        np.testing.assert_allclose(corners[:2, :2], [[x0, y0], [x1, y0]], rtol=1e-6)
+        self.assertAlmostEqual(float(corners[2, 2]), heightmap[6, 4], places=6)
+        self.assertEqual(shape.colors[5 * 12 + 3].tolist(), shape._height_to_terrain_color(heightmap[5, 3]))
+
+    def test_city_mesh_skips_roads(self):
+        import numpy as np
+        city = np.full((16, 16, 3), 80, dtype=np.uint8)
+        city[0, 4] = [150, 100, 100]
+        city[8, 12] = [100, 150, 100]
+        shape = self.sphere.ProceduralShape3D(procedural_type="city")
+        shape.generate_city_geometry(city)
+        self.assertEqual(shape.vertices.shape, (2 * 24, 3))
+        self.assertEqual(len(shape.indices), 2 * 36)
+        self.assertEqual(shape.normals.shape, (48, 3))
+        np.testing.assert_allclose(shape.colors[24], [100 / 255, 150 / 255, 100 / 255], rtol=1e-6)
+        # Buildings stand on the ground plane
+        self.assertAlmostEqual(float(shape.vertices[:24, 2].min()), 0.0, places=6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+"""
+Retained geometry tests.
+
+Checks array packing and index helpers, that the geometry cache rebuilds
+only when its key changes and frees GPU copies it drops, and that
+mathematical shapes pick the same primitive type as the old immediate-mode
+path.
+"""
+
+import unittest
+import sys
+import os
+
+# Ensure project root is on sys.path for "gui" imports
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+
+class RetainedGeometryTest(unittest.TestCase):
+    def setUp(self):
+        try:
+            import gui.sphere_3d as m_sphere_3d
+        except Exception as e:
+            self.skipTest(f"sphere_3d dependencies not available: {e}")
+        self.sphere = m_sphere_3d
+
+    def test_segment_index_helpers(self):
+        strips = self.sphere._strip_segment_indices(2, 3)
+        self.assertEqual(strips.tolist(), [0, 1, 1, 2, 3, 4, 4, 5])
+        loops = self.sphere._strip_segment_indices(1, 3, closed=True)
+        self.assertEqual(loops.tolist(), [0, 1, 1, 2, 2, 0])
+        edges = self.sphere._triangle_edge_indices([0, 1, 2, 2, 1, 3])
+        self.assertEqual(edges.tolist(), [0, 1, 1, 2, 2, 0, 2, 1, 1, 3, 3, 2])
+
+    def test_arrays_are_packed(self):
+        import numpy as np
+        gl = self.sphere.gl
+        geometry = self.sphere.RetainedGeometry(
+            gl.GL_TRIANGLES, vertices=[0, 0, 0, 1, 0, 0, 0, 1, 0, 1, 1, 0],
+            colors=[[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]], indices=[[0, 1, 2], [1, 3, 2]])
+        self.assertEqual(geometry.vertices.shape, (4, 3))
+        self.assertEqual(geometry.vertices.dtype, np.float32)
+        self.assertEqual(geometry.indices.dtype, np.uint32)
+        self.assertEqual(geometry.element_count, 6)
+        self.assertIsNone(geometry.normals)
+        # Vertices past the end of the color list keep the last color
+        self.assertEqual(geometry.colors.tolist(), [[1, 0, 0], [0, 1, 0], [0, 1, 0], [0, 1, 0]])
+
+    def test_cache_rebuilds_only_on_key_change(self):
+        gl = self.sphere.gl
+        cache = self.sphere.RetainedGeometryCache()
+        builds = []
+
+        def builder():
+            builds.append(1)
+            return gl.GL_POINTS, {'vertices': [[0.0, 0.0, float(len(builds))]]}
+
+        first = cache.get('dots', (1.0, 10), builder)
+        self.assertIs(cache.get('dots', (1.0, 10), builder), first)
+        self.assertEqual(len(builds), 1)
+        self.assertIs(cache.get('dots', (2.0, 10), builder), first)
+        self.assertEqual(len(builds), 2)
+        self.assertEqual(first.vertices[0, 2], 2.0)
+        cache.invalidate('dots')
+        cache.get('dots', (2.0, 10), builder)
+        self.assertEqual(len(builds), 3)
+
+    def test_gpu_copies_are_freed(self):
+        from unittest import mock
+        gl = self.sphere.gl
+        cache = self.sphere.RetainedGeometryCache()
+        for name in ('a', 'b', 'c'):
+            geometry = cache.get(name, 1, lambda: (gl.GL_POINTS, {'vertices': [[0.0, 0.0, 0.0]]}))
+            # As left by an upload
+            geometry._buffers = {'vertices': 7}
+            geometry._display_list = 3
+            geometry._uploaded = True
+        with mock.patch.object(gl, 'glDeleteBuffers') as delete_buffers, \
+                mock.patch.object(gl, 'glDeleteLists') as delete_lists:
+            cache.invalidate('a')
+            self.assertEqual(delete_buffers.call_count, 1)
+            cache.discard('b')
+            self.assertEqual(delete_buffers.call_count, 2)
+            self.assertEqual(delete_lists.call_count, 2)
+            shape = self.sphere.MathematicalShape(math_type="test")
+            shape.geometry_cache = cache
+            shape.release()
+            self.assertEqual(delete_buffers.call_count, 3)
+        self.assertEqual(cache._entries, {})
+
+    def test_sphere_grid_matches_loops(self):
+        import math
+        normals, texture_coords, indices = self.sphere.SphereRenderer._sphere_grid_arrays(6)
+        self.assertEqual(normals.shape, (49, 3))
+        self.assertEqual(texture_coords.shape, (49, 2))
+        self.assertEqual(len(indices), 6 * 6 * 6)
+        lat, lon = math.pi * (-0.5 + 2 / 6), 2 * math.pi * 5 / 6
+        for actual, expected in zip(normals[2 * 7 + 5], (math.cos(lat) * math.cos(lon), math.sin(lat),
+                                                         math.cos(lat) * math.sin(lon))):
+            self.assertAlmostEqual(actual, expected)
+        self.assertEqual(indices[6 * 7:6 * 8].tolist(), [8, 15, 9, 15, 16, 9])
+
+    def test_shape_primitive_selection(self):
+        gl = self.sphere.gl
+        shape = self.sphere.MathematicalShape(math_type="test")
+        shape.set_geometry([[0, 0, 0]] * 6, colors=[[1, 0, 0, 1]] * 6)
+        mode, arrays = shape._build_geometry()
+        self.assertEqual(mode, gl.GL_TRIANGLES)
+        self.assertEqual(arrays['colors'].shape, (6, 3))
+        shape.set_geometry([[0, 0, 0]] * 8)
+        self.assertEqual(shape._build_geometry()[0], gl.GL_QUADS)
+        key = shape._geometry_key()
+        shape.set_geometry([[0, 0, 0]] * 5)
+        self.assertEqual(shape._build_geometry()[0], gl.GL_POINTS)
+        self.assertNotEqual(shape._geometry_key(), key)
+
+
+if __name__ == "__main__":
+    unittest.main()
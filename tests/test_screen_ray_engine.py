@@ -0,0 +1,117 @@
+"""
+Batched screen ray engine tests.
+
+Checks that the packet tracer used for the SphereRenderer screen produces the
+same colors as the per-ray trace_ray / trace_ray_marching reference paths,
+and that progressive screen frames converge to the full-resolution image.
+"""
+
+import contextlib
+import io
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Ensure project root is on sys.path for "gui" imports
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+
+class _CanvasStub:
+    def __init__(self, rotation):
+        self.rainbow_cube_position = np.array([2.0, 0.0, 2.0])
+        self.rainbow_cube_size = 0.3
+        self.object_rotations = {"cube": np.array(rotation, dtype=float)}
+        self.screen_render_mode = ""
+
+
+class ScreenRayEngineTest(unittest.TestCase):
+    def setUp(self):
+        try:
+            import gui.sphere_3d as m_sphere_3d
+        except Exception as e:
+            self.skipTest(f"sphere_3d dependencies not available: {e}")
+        self.sphere = m_sphere_3d
+
+    def _renderer(self, mode, rotation):
+        with contextlib.redirect_stdout(io.StringIO()):
+            renderer = self.sphere.SphereRenderer()
+        renderer._canvas_ref = _CanvasStub(rotation)
+        renderer.screen_render_mode = mode
+        return renderer
+
+    def _rays(self):
+        rng = np.random.default_rng(3)
+        directions = np.array([0.707, 0.0, 0.707]) + rng.uniform(-0.2, 0.2, size=(60, 3))
+        directions /= np.linalg.norm(directions, axis=1, keepdims=True)
+        return np.zeros_like(directions), directions
+
+    def _assert_matches_scalar(self, mode, rotation, scalar_name):
+        renderer = self._renderer(mode, rotation)
+        origins, directions = self._rays()
+        scene = self.sphere.RayPacketScene.from_renderer(renderer)
+        batch = scene.trace(origins, directions)
+        with contextlib.redirect_stdout(io.StringIO()):
+            scalar = [getattr(renderer, scalar_name)(o, d) for o, d in zip(origins, directions)]
+        np.testing.assert_allclose(batch, np.array(scalar), atol=1e-9)
+
+    def test_ray_tracing_matches_trace_ray(self):
+        self._assert_matches_scalar("ray_tracing", (0, 0, 0), "trace_ray")
+        self._assert_matches_scalar("ray_tracing", (20, 35, 10), "trace_ray")
+
+    def test_reflections_match_trace_ray(self):
+        self._assert_matches_scalar("path_tracing", (15, 0, 40), "trace_ray")
+
+    def test_ray_marching_matches_trace_ray_marching(self):
+        self._assert_matches_scalar("ray_marching", (0, 0, 0), "trace_ray_marching")
+
+    def test_tile_scheduler_runs_small_packets_inline(self):
+        renderer = self._renderer("ray_tracing", (0, 0, 0))
+        origins, directions = self._rays()
+        scene = self.sphere.RayPacketScene.from_renderer(renderer)
+        scheduler = self.sphere.RayTileScheduler(workers=4, min_rays_per_tile=1024)
+        np.testing.assert_array_equal(scheduler.trace(scene, origins, directions),
+                                      scene.trace(origins, directions))
+        self.assertIsNone(scheduler._pool)
+
+    def _camera(self, direction=(0.707, 0.05, 0.707)):
+        camera_dir = np.array(direction) / np.linalg.norm(direction)
+        right = np.cross(camera_dir, [0.0, 1.0, 0.0])
+        right /= np.linalg.norm(right)
+        up = np.cross(right, camera_dir)
+        return (np.zeros(3), camera_dir, right, up, 0.4, 0.3, False)
+
+    def test_progressive_frame_converges_to_full_resolution(self):
+        scene = self.sphere.RayPacketScene(cube_rotation=(10, 25, 0))
+        progressive = self.sphere.ProgressiveScreenRenderer()
+        scheduler = self.sphere.RayTileScheduler(workers=1)
+        camera = self._camera()
+        self.assertTrue(progressive.configure(camera, scene, 40, 30, 4))
+        self.assertIsNotNone(progressive.advance(scheduler, budget_ms=0.0))
+        self.assertTrue(progressive.is_refining)
+        while progressive.is_refining:
+            progressive.advance(scheduler, budget_ms=0.0)
+
+        xs, ys = np.meshgrid(np.arange(40) + 0.5, np.arange(30) + 0.5)
+        origins, directions = self.sphere._camera_rays(camera, xs.ravel(), ys.ravel(), 40, 30)
+        expected = (scene.trace(origins, directions) * 255).astype(np.uint8).reshape(30, 40, 3)
+        np.testing.assert_array_equal(progressive.image, expected)
+
+        self.assertFalse(progressive.configure(camera, scene, 40, 30, 4))
+        self.assertTrue(progressive.configure(self._camera((0.6, 0.0, 0.8)), scene, 40, 30, 4))
+
+    def test_progressive_accumulates_samples(self):
+        scene = self.sphere.RayPacketScene()
+        progressive = self.sphere.ProgressiveScreenRenderer()
+        scheduler = self.sphere.RayTileScheduler(workers=1)
+        progressive.configure(self._camera(), scene, 16, 12, 2, samples=3)
+        while progressive.is_refining:
+            progressive.advance(scheduler, budget_ms=1.0)
+        self.assertTrue((progressive._weight == 3).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+"""
+Subgraph matching tests.
+
+Checks the shared matcher against permutation search on small labelled
+graphs, checks that nested pattern matching and semantic ubergraph matching
+agree with the old results where those were well defined, and that a
+6-node pattern in a 2,000-node graph yields matches quickly.
+"""
+
+import itertools
+import os
+import random
+import sys
+import time
+import unittest
+
+# Ensure project root is on sys.path for "models" imports
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+
+def brute_force_matches(pattern_nodes, pattern_pairs, graph_nodes, graph_pairs, compatible):
+    """Injective, edge-preserving mappings found by trying every permutation."""
+
+    graph_pairs = set(graph_pairs)
+    result = []
+    for image in itertools.permutations(graph_nodes, len(pattern_nodes)):
+        mapping = dict(zip(pattern_nodes, image))
+        if (all(compatible(p, g) for p, g in mapping.items()) and
+                all((mapping[s], mapping[t]) in graph_pairs for s, t in pattern_pairs)):
+            result.append(mapping)
+    return result
+
+
+def as_keys(mappings):
+    return sorted(tuple(sorted(mapping.items())) for mapping in mappings)
+
+
+class SubgraphMatchingTest(unittest.TestCase):
+    def setUp(self):
+        try:
+            import models.algorithms.subgraph_matching as m_subgraph_matching
+            import models.algorithms.nested_graph_algorithms as m_nested_graph_algorithms
+            import models.algorithms.ubergraph_algorithms as m_ubergraph_algorithms
+            import models.nested_graph as m_nested_graph
+            import models.ubergraph as m_ubergraph
+            import models.node as m_node
+        except Exception as e:
+            self.skipTest(f"graph model dependencies not available: {e}")
+        self.matching = m_subgraph_matching
+        self.nested_algorithms = m_nested_graph_algorithms
+        self.uber_algorithms = m_ubergraph_algorithms
+        self.m_nested_graph = m_nested_graph
+        self.m_ubergraph = m_ubergraph
+        self.m_node = m_node
+
+    def _nested(self, rng, node_count, edge_count, labels, prefix):
+        graph = self.m_nested_graph.NestedGraph()
+        nodes = [self.m_nested_graph.NestedNode(text=rng.choice(labels), node_id=f"{prefix}{i}")
+                 for i in range(node_count)]
+        for node in nodes:
+            graph.add_node(node)
+        for _ in range(edge_count):
+            source, target = rng.choice(nodes), rng.choice(nodes)
+            graph.add_edge(self.m_nested_graph.NestedEdge(source_id=source.id, target_id=target.id))
+        return graph
+
+    def test_matches_permutation_search(self):
+        rng = random.Random(8)
+        for _ in range(40):
+            graph = self._nested(rng, rng.randint(1, 7), rng.randint(0, 14), "ab", "g")
+            pattern = self._nested(rng, rng.randint(1, 4), rng.randint(0, 5), "ab", "p")
+            nodes = {node.id: node for node in graph.get_all_nodes() + pattern.get_all_nodes()}
+            expected = brute_force_matches(
+                [node.id for node in pattern.get_all_nodes()], self.matching.edge_pairs(pattern),
+                [node.id for node in graph.get_all_nodes()], self.matching.edge_pairs(graph),
+                lambda p, g: nodes[p].text == nodes[g].text)
+            found = self.nested_algorithms.pattern_matching(graph, pattern)
+            self.assertEqual(as_keys(found), as_keys(expected))
+
+    def test_single_node_pattern_checks_subgraphs(self):
+        graph = self.m_nested_graph.NestedGraph()
+        pattern = self.m_nested_graph.NestedGraph()
+        # (owner, node id, inner labels, inner edge as label indices)
+        for owner, node_id, inner, edge in ((graph, "a", ("x", "y"), (0, 1)),
+                                            (graph, "b", ("x", "y"), (1, 0)),
+                                            (graph, "c", None, None),
+                                            (pattern, "p", ("y", "x"), (1, 0))):
+            owner.add_node(self.m_nested_graph.NestedNode(text="box", node_id=node_id))
+            if inner:
+                subgraph = owner.create_subgraph(node_id)
+                for i, text in enumerate(inner):
+                    subgraph.add_node(self.m_nested_graph.NestedNode(text=text, node_id=f"{node_id}{i}"))
+                subgraph.add_edge(self.m_nested_graph.NestedEdge(source_id=f"{node_id}{edge[0]}",
+                                                                 target_id=f"{node_id}{edge[1]}"))
+        # Only "a" holds an x -> y subgraph like the pattern's
+        self.assertEqual(self.nested_algorithms.pattern_matching(graph, pattern), [{"p": "a"}])
+
+    def test_semantic_matching_without_edges_keeps_old_results(self):
+        graph = self.m_ubergraph.Ubergraph()
+        pattern = self.m_ubergraph.Ubergraph()
+        for i, text in enumerate(["cat", "car", "dog", "cow"]):
+            graph.add_node(self.m_node.Node(text=text, node_id=f"g{i}"))
+        for i, text in enumerate(["cat", "cow"]):
+            pattern.add_node(self.m_node.Node(text=text, node_id=f"p{i}"))
+
+        def similarity(a, b):
+            return sum(x == y for x, y in zip(a.text, b.text)) / 3
+
+        nodes = {node.id: node for node in graph.get_all_nodes() + pattern.get_all_nodes()}
+        expected = brute_force_matches(["p0", "p1"], [], list(graph._nodes), [],
+                                       lambda p, g: similarity(nodes[p], nodes[g]) >= 0.6)
+        found = self.uber_algorithms.semantic_subgraph_matching(graph, pattern, similarity, 0.6)
+        self.assertEqual(as_keys(found), as_keys(expected))
+
+        # Pattern edges now map to graph edges whose ends match through the mapping
+        edge = self.m_ubergraph.UberEdge()
+        edge.add_source("g0")
+        edge.add_target("g3")
+        graph.add_edge(edge)
+        pattern_edge = self.m_ubergraph.UberEdge()
+        pattern_edge.add_source("p0")
+        pattern_edge.add_target("p1")
+        pattern.add_edge(pattern_edge)
+        found = self.uber_algorithms.semantic_subgraph_matching(graph, pattern, similarity, 0.6)
+        self.assertEqual(found, [{"p0": "g0", "p1": "g3", pattern_edge.id: edge.id}])
+
+    def test_large_graph_streams_matches(self):
+        rng = random.Random(1)
+        graph = self._nested(rng, 2000, 8000, "abcd", "g")
+        pattern = self.m_nested_graph.NestedGraph()
+        # A path through six connected graph nodes, relabelled as the pattern
+        path = [rng.choice(graph.get_all_nodes())]
+        while len(path) < 6:
+            successors = [e.target_id for e in graph.get_edges_from_node(path[-1].id)
+                          if e.target_id not in {n.id for n in path}]
+            if not successors:
+                path = [rng.choice(graph.get_all_nodes())]
+                continue
+            path.append(graph.get_node(rng.choice(successors)))
+        for i, node in enumerate(path):
+            pattern.add_node(self.m_nested_graph.NestedNode(text=node.text, node_id=f"p{i}"))
+            if i:
+                pattern.add_edge(self.m_nested_graph.NestedEdge(source_id=f"p{i - 1}", target_id=f"p{i}"))
+        start = time.perf_counter()
+        matches = list(itertools.islice(self.nested_algorithms.iter_pattern_matches(graph, pattern), 20))
+        self.assertLess(time.perf_counter() - start, 2.0)
+        self.assertTrue(matches)
+        for mapping in matches:
+            for i in range(1, 6):
+                targets = {e.target_id for e in graph.get_edges_from_node(mapping[f"p{i - 1}"])}
+                self.assertIn(mapping[f"p{i}"], targets)
+
+
+if __name__ == "__main__":
+    unittest.main()
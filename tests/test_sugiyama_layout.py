@@ -0,0 +1,101 @@
+"""
+Layered layout tests.
+
+Checks cycle breaking and layering, the inversion-based crossing count
+against a pairwise count, that sweeps untangle orderings, and that the
+coordinate assignment keeps nodes in a layer apart.
+"""
+
+import os
+import random
+import sys
+import unittest
+
+# Ensure project root is on sys.path for "utils" imports
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+
+class SugiyamaLayoutTest(unittest.TestCase):
+    def setUp(self):
+        try:
+            import utils.sugiyama as m_sugiyama
+        except Exception as e:
+            self.skipTest(f"layered layout dependencies not available: {e}")
+        self.sugiyama = m_sugiyama
+
+    def _random_edges(self, rng, node_count, edge_count):
+        return [(rng.randrange(node_count), rng.randrange(node_count)) for _ in range(edge_count)]
+
+    def test_layers_follow_edges_after_breaking_cycles(self):
+        rng = random.Random(3)
+        for _ in range(30):
+            node_count = rng.randint(1, 25)
+            edges = [(s, t) for s, t in self._random_edges(rng, node_count, rng.randint(0, 50)) if s != t]
+            reverse = self.sugiyama.break_cycles(node_count, edges)
+            acyclic = [(t, s) if flip else (s, t) for (s, t), flip in zip(edges, reverse)]
+            layer = self.sugiyama.longest_path_layers(node_count, acyclic)
+            for source, target in acyclic:
+                self.assertLess(layer[source], layer[target])
+            self.assertEqual(min(layer), 0)
+
+    def test_crossing_count_matches_pairwise(self):
+        rng = random.Random(5)
+        for _ in range(30):
+            node_count = rng.randint(2, 25)
+            edges = [(s, t) for s, t in self._random_edges(rng, node_count, rng.randint(0, 60)) if s != t]
+            reverse = self.sugiyama.break_cycles(node_count, edges)
+            acyclic = [(t, s) if flip else (s, t) for (s, t), flip in zip(edges, reverse)]
+            layering = self.sugiyama._Layering(node_count, acyclic,
+                                               self.sugiyama.longest_path_layers(node_count, acyclic))
+            for sweeps in (0, 4):
+                layering.reduce_crossings(sweeps, "median")
+                expected = 0
+                for segments in layering.gap_segments:
+                    upper = layering.pos[layering.upper[segments]]
+                    lower = layering.pos[layering.lower[segments]]
+                    for i in range(len(segments)):
+                        for j in range(i + 1, len(segments)):
+                            if (upper[i] - upper[j]) * (lower[i] - lower[j]) < 0:
+                                expected += 1
+                self.assertEqual(layering.crossings(), expected)
+
+    def test_sweeps_untangle_two_layers(self):
+        # A reversed matching between two layers drawn in insertion order
+        node_ids = ["a0", "a1", "a2", "a3", "b0", "b1", "b2", "b3"]
+        edges = [("a0", "b3"), ("a1", "b2"), ("a2", "b1"), ("a3", "b0")]
+        for ordering in ("median", "barycenter"):
+            self.assertEqual(self.sugiyama.layered_coordinates(node_ids, edges, sweeps=0).crossings, 6)
+            drawing = self.sugiyama.layered_coordinates(node_ids, edges, ordering=ordering)
+            self.assertEqual(drawing.crossings, 0)
+            # Matched nodes are stacked straight above each other
+            for source, target in edges:
+                self.assertAlmostEqual(drawing.x[source], drawing.x[target])
+
+    def test_coordinates_keep_spacing_and_long_edges(self):
+        rng = random.Random(9)
+        node_count = 60
+        edges = self._random_edges(rng, node_count, 120)
+        drawing = self.sugiyama.layered_coordinates(range(node_count), edges, node_spacing=40.0)
+        self.assertGreater(drawing.dummy_count, 0)
+        by_layer = {}
+        for node_id, layer in drawing.layers.items():
+            by_layer.setdefault(layer, []).append(drawing.x[node_id])
+        for xs in by_layer.values():
+            xs.sort()
+            for left, right in zip(xs, xs[1:]):
+                self.assertGreaterEqual(right - left, 40.0 - 1e-9)
+        real_x = list(drawing.x.values())
+        self.assertAlmostEqual(min(real_x) + max(real_x), 0.0)
+
+    def test_star_import_exports_only_public_api(self):
+        namespace = {}
+        exec("from utils.sugiyama import *", namespace)
+        self.assertEqual(sorted(name for name in namespace if name != "__builtins__"),
+                         ["LayeredDrawing", "brandes_koepf", "break_cycles", "count_layer_crossings",
+                          "layered_coordinates", "longest_path_layers"])
+
+
+if __name__ == "__main__":
+    unittest.main()
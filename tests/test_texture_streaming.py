@@ -0,0 +1,112 @@
+"""
+Texture streaming tests.
+
+Compares lazily pooled GIF frames with eagerly decoded ones, checks that the
+pool stays within its frame and memory bounds, and that streamed textures
+only accept RGB or RGBA frames.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+# Ensure project root is on sys.path for "gui" imports
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+
+class TextureStreamingTest(unittest.TestCase):
+    def setUp(self):
+        try:
+            import gui.sphere_3d as m_sphere_3d
+        except Exception as e:
+            self.skipTest(f"sphere_3d dependencies not available: {e}")
+        self.sphere = m_sphere_3d
+
+        import numpy as np
+        from PIL import Image
+        frames = []
+        for i in range(12):
+            pixels = np.zeros((9, 14, 4), dtype=np.uint8)
+            pixels[..., 0] = i * 20
+            pixels[i % 9, :, 1] = 255
+            pixels[:, i, 3] = 255
+            frames.append(Image.fromarray(pixels, 'RGBA'))
+        handle, self.gif_path = tempfile.mkstemp(suffix='.gif')
+        os.close(handle)
+        frames[0].save(self.gif_path, save_all=True, append_images=frames[1:],
+                       duration=[50 + 10 * i for i in range(12)], loop=0, disposal=2)
+
+    def tearDown(self):
+        if getattr(self, 'gif_path', None) and os.path.exists(self.gif_path):
+            os.unlink(self.gif_path)
+
+    def _eager_frames(self):
+        import numpy as np
+        from PIL import Image
+        image = Image.open(self.gif_path)
+        frames, durations = [], []
+        for index in range(image.n_frames):
+            image.seek(index)
+            frames.append(np.asarray(image.convert('RGBA')))
+            durations.append(image.info.get('duration', 100) / 1000.0)
+        image.close()
+        return frames, durations
+
+    def test_pool_matches_eager_decoding(self):
+        expected, durations = self._eager_frames()
+        pool = self.sphere.GifFramePool(self.gif_path, max_frames=4)
+        self.assertEqual(len(pool), 12)
+        self.assertEqual((pool.width, pool.height), (14, 9))
+        # Forward playback, backward jumps and a second lap
+        for index in list(range(12)) + [2, 11, 0, 7, 6] + list(range(12)):
+            self.assertTrue((pool[index] == expected[index]).all())
+            self.assertLessEqual(len(pool._frames), 4)
+        self.assertEqual(pool.durations, durations)
+        self.assertTrue((pool[-1] == expected[-1]).all())
+        with self.assertRaises(IndexError):
+            pool[12]
+        pool.close()
+
+    def test_pool_reuses_recent_frames(self):
+        pool = self.sphere.GifFramePool(self.gif_path, max_frames=3)
+        first = pool.get_frame(5)
+        pool.get_frame(6)
+        self.assertIs(pool.get_frame(5), first)
+        self.assertEqual(pool.decode_count, 2)
+        pool.close()
+
+    def test_pool_respects_memory_budget(self):
+        pool = self.sphere.GifFramePool(self.gif_path, max_frames=32, max_bytes=14 * 9 * 4 * 5)
+        self.assertEqual(pool.capacity, 5)
+        tiny = self.sphere.GifFramePool(self.gif_path, max_bytes=1)
+        self.assertEqual(tiny.capacity, 2)  # Current and next frame always fit
+        pool.close()
+        tiny.close()
+
+    def test_frame_at_follows_durations(self):
+        pool = self.sphere.GifFramePool(self.gif_path)
+        # Frames last 50, 60, 70, ... ms and the animation loops after 1.26 s
+        self.assertEqual(pool.frame_at(0.0), 0)
+        self.assertEqual(pool.frame_at(0.049), 0)
+        self.assertEqual(pool.frame_at(0.05), 1)
+        self.assertEqual(pool.frame_at(0.111), 2)
+        self.assertEqual(pool.frame_at(1.259), 11)
+        self.assertEqual(pool.frame_at(1.26 + 0.06), 1)
+        self.assertEqual(pool.decode_count, 0)  # Reading durations pools nothing
+        pool.close()
+
+    def test_streaming_texture_rejects_other_layouts(self):
+        import numpy as np
+        texture = self.sphere.StreamingTexture()
+        with self.assertRaises(ValueError):
+            texture.upload(np.zeros((4, 4), dtype=np.uint8))
+        with self.assertRaises(ValueError):
+            texture.upload(np.zeros((4, 4, 2), dtype=np.uint8))
+        self.assertIsNone(texture.texture_id)
+
+
+if __name__ == "__main__":
+    unittest.main()
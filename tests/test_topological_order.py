@@ -0,0 +1,122 @@
+"""
+Online topological order tests.
+
+Adds and removes random edges on a DAGGraph and checks after every change
+that the maintained order respects each edge, that levels match a longest
+path recomputation, and that cycle-closing edges are held back or rejected
+exactly when a search finds a cycle.
+"""
+
+import os
+import random
+import sys
+import time
+import unittest
+
+# Ensure project root is on sys.path for "models" imports
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+
+def reaches(pairs, source, target):
+    """Depth-first search over (source, target) pairs."""
+
+    stack, seen = [source], set()
+    while stack:
+        node_id = stack.pop()
+        if node_id == target:
+            return True
+        if node_id not in seen:
+            seen.add(node_id)
+            stack.extend(t for s, t in pairs if s == node_id)
+    return False
+
+
+def longest_path_levels(node_ids, pairs):
+    """Longest path ending at each node, by repeated relaxation."""
+
+    levels = {node_id: 0 for node_id in node_ids}
+    changed = True
+    while changed:
+        changed = False
+        for source, target in pairs:
+            if levels[source] + 1 > levels[target]:
+                levels[target] = levels[source] + 1
+                changed = True
+    return levels
+
+
+class TopologicalOrderTest(unittest.TestCase):
+    def setUp(self):
+        try:
+            import models.dag_graph as m_dag_graph
+            import models.node as m_node
+            import models.edge as m_edge
+            import models.algorithms.dag_algorithms as m_dag_algorithms
+        except Exception as e:
+            self.skipTest(f"DAG model dependencies not available: {e}")
+        self.m_dag_graph = m_dag_graph
+        self.m_node = m_node
+        self.m_edge = m_edge
+        self.algorithms = m_dag_algorithms
+
+    def _assert_consistent(self, graph):
+        pairs = [(edge.source_id, edge.target_id) for edge in graph.get_all_edges()]
+        node_ids = [node.id for node in graph.get_all_nodes()]
+        self.assertEqual(self.algorithms.detect_cycle(graph) is None,
+                         not any(reaches(pairs, t, s) for s, t in pairs))
+        if not graph.is_acyclic():
+            with self.assertRaises(ValueError):
+                graph.get_topological_order()
+            return
+        order = graph.get_topological_order()
+        self.assertEqual(sorted(order), sorted(node_ids))
+        position = {node_id: i for i, node_id in enumerate(order)}
+        for source, target in pairs:
+            self.assertLess(position[source], position[target])
+        self.assertEqual(graph.get_levels(), longest_path_levels(node_ids, pairs))
+
+    def test_random_edits_keep_order_and_levels(self):
+        rng = random.Random(5)
+        graph = self.m_dag_graph.DAGGraph()
+        nodes = [self.m_node.Node(text=f"n{i}", node_id=f"n{i}") for i in range(25)]
+        for node in nodes:
+            graph.add_node(node)
+        for step in range(400):
+            edges = graph.get_all_edges()
+            action = rng.random()
+            if action < 0.55:
+                source, target = rng.sample(nodes, 2)
+                graph.add_edge(self.m_edge.Edge(source_id=source.id, target_id=target.id))
+            elif action < 0.65:
+                source, target = rng.sample(nodes, 2)
+                pairs = [(edge.source_id, edge.target_id) for edge in edges]
+                closes_cycle = not graph.is_acyclic() or reaches(pairs, target.id, source.id)
+                self.assertEqual(graph.add_edge_safe(source.id, target.id) is None, closes_cycle)
+            elif action < 0.95 and edges:
+                graph.remove_edge(rng.choice(edges).id)
+            else:
+                removed = rng.choice(nodes)
+                graph.remove_node(removed.id)
+                graph.add_node(removed)
+            self._assert_consistent(graph)
+
+    def test_cycle_rejection_is_local(self):
+        graph = self.m_dag_graph.DAGGraph()
+        count = 20000
+        for i in range(count):
+            graph.add_node(self.m_node.Node(node_id=f"n{i}"))
+        for i in range(count - 1):
+            graph.add_edge(self.m_edge.Edge(source_id=f"n{i}", target_id=f"n{i + 1}"))
+        self.assertEqual(self.algorithms.layer_assignment(graph)[f"n{count - 1}"], count - 1)
+        start = time.perf_counter()
+        for i in range(0, count - 100, 100):
+            self.assertIsNone(graph.add_edge_safe(f"n{i + 50}", f"n{i}"))
+            self.assertIsNotNone(graph.add_edge_safe(f"n{i}", f"n{i + 50}"))
+        self.assertLess(time.perf_counter() - start, 2.0)
+        self.assertTrue(graph.is_acyclic())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+"""
+Video decode pipeline tests.
+
+Streams a generated clip through VideoDecodePipeline and checks sequential
+reads, backward seeks and end-of-stream handling. Skipped when FFmpeg or the
+sphere_3d dependencies are not available.
+"""
+
+import shutil
+import subprocess
+import tempfile
+import unittest
+import sys
+import os
+
+# Ensure project root is on sys.path for "gui" imports
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+
+class VideoDecodePipelineTest(unittest.TestCase):
+    def setUp(self):
+        try:
+            import gui.sphere_3d as m_sphere_3d
+        except Exception as e:
+            self.skipTest(f"sphere_3d dependencies not available: {e}")
+        if not shutil.which('ffmpeg'):
+            self.skipTest("ffmpeg not available")
+        self.sphere = m_sphere_3d
+        self.temp_dir = tempfile.mkdtemp()
+        self.video_path = os.path.join(self.temp_dir, 'clip.mp4')
+        subprocess.run([
+            'ffmpeg', '-y', '-loglevel', 'error', '-f', 'lavfi', '-i', 'testsrc=size=160x90:rate=25',
+            '-t', '4', '-g', '25', self.video_path
+        ], check=True)
+        self.pipeline = self.sphere.VideoDecodePipeline(
+            self.video_path, 25.0, width=160, height=90, frame_count=100)
+
+    def tearDown(self):
+        if hasattr(self, 'pipeline'):
+            self.pipeline.close()
+            shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_sequential_frames_stream_from_one_decoder(self):
+        first = self.pipeline.get_frame(0, timeout=5.0)
+        self.assertEqual(first.shape, (90, 160, 3))
+        process = self.pipeline._process
+        for index in range(1, 40):
+            self.assertIsNotNone(self.pipeline.get_frame(index, timeout=5.0))
+        self.assertIs(self.pipeline._process, process)
+
+    def test_backward_seek_returns_same_frame(self):
+        early = self.pipeline.get_frame(10, timeout=5.0)
+        self.assertIsNotNone(self.pipeline.get_frame(80, timeout=5.0))
+        again = self.pipeline.get_frame(10, timeout=5.0)
+        self.assertTrue((early == again).all())
+
+    def test_frames_past_the_end_are_none(self):
+        self.assertIsNone(self.pipeline.get_frame(100))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,27 +1,47 @@
 """
 Utility functions and managers for the graph editor application.
+
+The geometry, layout and file helpers import without wxPython so batch
+scripts can use them headless. The managers need wx and are imported the
+first time one of them is looked up on this package.
 """
 
+import importlib
+
 from .commands import *
 from .geometry import *
 from .layout import *
+from .edge_crossings import *
+from .sugiyama import *
 from .file_utils import *
 
-# Import all managers
-from .managers import (
-    ThemeManager,
-    HotkeyManager,
-    ClipboardManager,
-    SelectionManager,
-    LayoutManager,
-    FileManager,
-    UndoRedoManager
-)
+# Managers, loaded on first access
+_LAZY_MANAGERS = {
+    'ThemeManager': '.managers.theme_manager',
+    'HotkeyManager': '.managers.hotkey_manager',
+    'ClipboardManager': '.managers.clipboard_manager',
+    'SelectionManager': '.managers.selection_manager',
+    'LayoutManager': '.managers.layout_manager',
+    'FileManager': '.managers.file_manager',
+    'UndoRedoManager': '.managers.undo_redo_manager',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_MANAGERS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     # Core utilities
     'geometry',
     'layout',
+    'edge_crossings',
+    'sugiyama',
     'file_utils',
     
     # Managers
@@ -0,0 +1,376 @@
+"""
+Headless batch processing of graph files.
+
+Converts between JSON, DOT, GML and GraphML, applies utils.layout
+algorithms and runs models.algorithms analyses without wxPython. Every
+input file becomes one job; jobs run on a pool of worker processes and
+their results are written as each job finishes, so a directory of inputs
+streams to the output directory and to a JSON Lines report:
+
+    python -m utils.batch convert graphs/ -o out/ --to graphml
+    python -m utils.batch layout graphs/ -o laid_out/ --algorithm hierarchical_layout --param direction=left-right
+    python -m utils.batch analyze graphs/ -o report.jsonl --analysis stats --analysis components
+"""
+
+
+import argparse
+import ast
+import contextlib
+import io
+import json
+import math
+import multiprocessing
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import models.graph as m_graph
+import models.basic_graph as m_basic_graph
+import models.dag_graph as m_dag_graph
+import models.node as m_node
+import models.edge as m_edge
+import models.algorithms.graph_algorithms as m_graph_algorithms
+import models.algorithms.dag_algorithms as m_dag_algorithms
+import file_io.dot_format as m_dot_format
+import utils.edge_crossings as m_edge_crossings
+import utils.file_utils as m_file_utils
+import utils.layout as m_layout
+
+
+FORMAT_EXTENSIONS = {
+    '.json': 'json',
+    '.dot': 'dot',
+    '.gv': 'dot',
+    '.gml': 'gml',
+    '.graphml': 'graphml',
+}
+
+READERS: Dict[str, Callable[[str], "m_graph.Graph"]] = {
+    'json': m_file_utils.load_graph_json,
+    'dot': m_dot_format.load_graph_from_dot,
+    'gml': m_file_utils.import_graph_gml,
+    'graphml': m_file_utils.import_graph_graphml,
+}
+
+WRITERS: Dict[str, Callable[["m_graph.Graph", str], None]] = {
+    'json': m_file_utils.save_graph_json,
+    'dot': m_dot_format.save_graph_to_dot,
+    'gml': m_file_utils.export_graph_gml,
+    'graphml': m_file_utils.export_graph_graphml,
+}
+
+LAYOUTS = (
+    'spring_layout',
+    'circle_layout',
+    'tree_layout',
+    'grid_layout',
+    'random_layout',
+    'hierarchical_layout',
+    'layered_layout',
+    'force_directed_layout',
+    'force_directed_layout_3d',
+    'remove_overlaps',
+)
+
+# Analysis name -> (graph model it runs on, function)
+ANALYSES: Dict[str, Tuple[str, Callable]] = {
+    'stats': ('graph', lambda graph: {'node_count': len(graph.nodes), 'edge_count': len(graph.edges),
+                                      'bounds': graph.get_bounds()}),
+    'crossings': ('graph', m_edge_crossings.count_crossings),
+    'components': ('basic', m_graph_algorithms.find_connected_components),
+    'coloring': ('basic', m_graph_algorithms.graph_coloring),
+    'cycles': ('basic', m_graph_algorithms.find_cycles),
+    'centrality': ('basic', m_graph_algorithms.centrality_measures),
+    'is_dag': ('dag', m_dag_algorithms.is_dag),
+    'detect_cycle': ('dag', m_dag_algorithms.detect_cycle),
+    'topological_sort': ('dag', m_dag_algorithms.topological_sort_kahn),
+    'layers': ('dag', m_dag_algorithms.layer_assignment),
+    'minimum_height': ('dag', m_dag_algorithms.minimum_height_dag),
+    'transitive_closure': ('dag', m_dag_algorithms.transitive_closure),
+}
+
+
+def detect_format(path: str) -> str:
+    """Get the graph format name for a file path from its extension."""
+
+    fmt = FORMAT_EXTENSIONS.get(os.path.splitext(path)[1].lower())
+    if fmt is None:
+        raise ValueError(f"Unknown graph file extension: {path}")
+    return fmt
+
+
+def read_graph(path: str, fmt: Optional[str] = None) -> "m_graph.Graph":
+    """Load a graph file."""
+
+    return READERS[fmt or detect_format(path)](path)
+
+
+def write_graph(graph: "m_graph.Graph", path: str, fmt: Optional[str] = None) -> None:
+    """Save a graph file, creating its directory if needed."""
+
+    path = os.path.abspath(path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    WRITERS[fmt or detect_format(path)](graph, path)
+
+
+def apply_layout(graph: "m_graph.Graph", name: str, params: Optional[Dict[str, Any]] = None):
+    """Run a utils.layout algorithm on a graph in place."""
+
+    if name not in LAYOUTS:
+        raise ValueError(f"Unknown layout: {name}")
+    return getattr(m_layout, name)(graph, **(params or {}))
+
+
+def as_model(graph: "m_graph.Graph", kind: str):
+    """View a graph's nodes and edges through the model an analysis expects."""
+
+    if kind == 'graph':
+        return graph
+    if kind == 'basic':
+        model = m_basic_graph.BasicGraph(name=graph.name)
+    else:
+        model = m_dag_graph.DAGGraph(name=graph.name)
+    for node in graph.get_all_nodes():
+        model.add_node(node)
+    for edge in graph.get_all_edges():
+        model.add_edge(edge)
+    return model
+
+
+def run_analysis(graph: "m_graph.Graph", name: str) -> Any:
+    """Run a named analysis and return its result in JSON-ready form."""
+
+    if name not in ANALYSES:
+        raise ValueError(f"Unknown analysis: {name}")
+    kind, function = ANALYSES[name]
+    return to_json(function(as_model(graph, kind)))
+
+
+def to_json(value: Any) -> Any:
+    """Turn analysis results (nodes, edges, sets, tuples) into JSON values."""
+
+    if isinstance(value, (m_node.Node, m_edge.Edge)):
+        return value.id
+    if isinstance(value, dict):
+        return {str(to_json(key)): to_json(item) for key, item in value.items()}
+    if isinstance(value, (set, frozenset)):
+        return sorted((to_json(item) for item in value), key=str)
+    if isinstance(value, (list, tuple)):
+        return [to_json(item) for item in value]
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if hasattr(value, 'item'):
+        # numpy scalars
+        return value.item()
+    return value
+
+
+def collect_inputs(paths: Iterable[str], recursive: bool = False) -> List[Tuple[str, str]]:
+    """
+    Expand files and directories into (input_path, path relative to its root) pairs.
+
+    Directories contribute every file with a known graph extension.
+    """
+
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, subdirectories, files in os.walk(path):
+                subdirectories.sort()
+                for filename in sorted(files):
+                    if os.path.splitext(filename)[1].lower() in FORMAT_EXTENSIONS:
+                        full_path = os.path.join(directory, filename)
+                        found.append((full_path, os.path.relpath(full_path, path)))
+                if not recursive:
+                    break
+        else:
+            found.append((path, os.path.basename(path)))
+    return found
+
+
+def output_path_for(relative_path: str, output: str, fmt: Optional[str], single: bool) -> str:
+    """Place an input's result under the output directory, or at output for a single file."""
+
+    if single and os.path.splitext(output)[1].lower() in FORMAT_EXTENSIONS and not os.path.isdir(output):
+        return output
+    if fmt is None:
+        return os.path.join(output, relative_path)
+    extension = next(ext for ext, name in FORMAT_EXTENSIONS.items() if name == fmt)
+    return os.path.join(output, os.path.splitext(relative_path)[0] + extension)
+
+
+def process_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Load, lay out, analyze and save one graph file as described by a job dict.
+
+    Returns a JSON-ready record; failures are reported in the record
+    instead of raised so one bad file does not stop a batch, and an
+    analysis that fails leaves {'error': ...} under its name without
+    dropping the others.
+    """
+
+    record: Dict[str, Any] = {'input': job['input']}
+    start = time.perf_counter()
+    # Model classes print debug lines for every node and edge they touch
+    quiet = contextlib.nullcontext() if job.get('verbose') else contextlib.redirect_stdout(io.StringIO())
+    try:
+        with quiet:
+            graph = read_graph(job['input'], job.get('input_format'))
+            record['nodes'] = len(graph.nodes)
+            record['edges'] = len(graph.edges)
+            if job.get('layout'):
+                apply_layout(graph, job['layout'], job.get('layout_params'))
+                record['layout'] = job['layout']
+            if job.get('analyses'):
+                record['analyses'] = {}
+                for name in job['analyses']:
+                    # A failed analysis is reported under its own name
+                    try:
+                        record['analyses'][name] = run_analysis(graph, name)
+                    except Exception as e:
+                        record['analyses'][name] = {'error': f"{type(e).__name__}: {e}"}
+            if job.get('output'):
+                write_graph(graph, job['output'], job.get('output_format'))
+                record['output'] = job['output']
+        record['status'] = 'ok'
+    except Exception as e:
+        record['status'] = 'error'
+        record['error'] = f"{type(e).__name__}: {e}"
+    record['seconds'] = round(time.perf_counter() - start, 6)
+    return record
+
+
+def run_jobs(jobs: List[Dict[str, Any]], workers: int = 1) -> Iterator[Dict[str, Any]]:
+    """Process jobs on a pool of workers, yielding each record as soon as it is done."""
+
+    workers = max(1, min(workers, len(jobs) or 1))
+    if workers == 1:
+        yield from map(process_job, jobs)
+        return
+    # Small chunks keep every worker busy when file sizes vary
+    chunk_size = max(1, len(jobs) // (workers * 8))
+    with multiprocessing.Pool(workers) as pool:
+        yield from pool.imap_unordered(process_job, jobs, chunk_size)
+
+
+def parse_param(text: str) -> Tuple[str, Any]:
+    """Parse a KEY=VALUE option, reading VALUE as a Python literal when possible."""
+
+    key, separator, value = text.partition('=')
+    if not separator:
+        raise argparse.ArgumentTypeError(f"expected KEY=VALUE, got {text!r}")
+    try:
+        return key, ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return key, value
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m utils.batch",
+                                     description="Convert, lay out and analyze graph files without the GUI.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_common(command):
+        command.add_argument("inputs", nargs="+", help="Graph files or directories of graph files")
+        command.add_argument("-r", "--recursive", action="store_true", help="Include subdirectories")
+        command.add_argument("--from", dest="input_format", choices=sorted(READERS),
+                             help="Input format (default: from the extension)")
+        command.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1,
+                             help="Worker processes (default: CPU count)")
+        command.add_argument("-v", "--verbose", action="store_true", help="Keep the models' debug output")
+
+    convert = commands.add_parser("convert", help="Convert graph files between formats")
+    add_common(convert)
+    convert.add_argument("-o", "--output", required=True, help="Output directory, or a file for one input")
+    convert.add_argument("--to", dest="output_format", choices=sorted(WRITERS),
+                         help="Output format (default: from the output file, else unchanged)")
+    convert.add_argument("--report", help="Also write a JSON Lines record per input to this file")
+
+    layout = commands.add_parser("layout", help="Apply a layout algorithm and save the result")
+    add_common(layout)
+    layout.add_argument("-o", "--output", required=True, help="Output directory, or a file for one input")
+    layout.add_argument("--to", dest="output_format", choices=sorted(WRITERS), help="Output format")
+    layout.add_argument("-a", "--algorithm", required=True, choices=LAYOUTS, help="Layout function in utils.layout")
+    layout.add_argument("-p", "--param", action="append", type=parse_param, default=[],
+                        help="Layout argument as KEY=VALUE (repeatable)")
+    layout.add_argument("--report", help="Also write a JSON Lines record per input to this file")
+
+    analyze = commands.add_parser("analyze", help="Run analyses and write one JSON line per input")
+    add_common(analyze)
+    analyze.add_argument("-o", "--output", default="-", help="JSON Lines report file (default: stdout)")
+    analyze.add_argument("-a", "--analysis", action="append", choices=sorted(ANALYSES), required=True,
+                         help="Analysis to run (repeatable)")
+    return parser
+
+
+def build_jobs(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    """
+    Turn parsed command-line arguments into one job per input file.
+
+    Raises ValueError when two inputs would be written to the same output
+    file, such as same-named files from different directories or with
+    different extensions.
+    """
+
+    inputs = collect_inputs(args.inputs, args.recursive)
+    single = len(inputs) == 1 and not os.path.isdir(args.inputs[0])
+    jobs = []
+    writers: Dict[str, str] = {}
+    for input_path, relative_path in inputs:
+        job: Dict[str, Any] = {'input': input_path, 'input_format': args.input_format, 'verbose': args.verbose}
+        if args.command in ('convert', 'layout'):
+            job['output'] = output_path_for(relative_path, args.output, args.output_format, single)
+            job['output_format'] = args.output_format
+            key = os.path.normcase(os.path.abspath(job['output']))
+            if key in writers:
+                raise ValueError(f"{writers[key]} and {input_path} would both be written to {job['output']}")
+            writers[key] = input_path
+        if args.command == 'layout':
+            job['layout'] = args.algorithm
+            job['layout_params'] = dict(args.param)
+        if args.command == 'analyze':
+            job['analyses'] = args.analysis
+        jobs.append(job)
+    return jobs
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        jobs = build_jobs(args)
+    except ValueError as e:
+        parser.error(str(e))
+    if not jobs:
+        print("No graph files found", file=sys.stderr)
+        return 1
+
+    # analyze streams records to its output; the other commands to an optional report
+    report_path = args.output if args.command == 'analyze' else args.report
+    if report_path in (None, '-'):
+        report = sys.stdout if report_path == '-' else None
+    else:
+        os.makedirs(os.path.dirname(os.path.abspath(report_path)), exist_ok=True)
+        report = open(report_path, 'w', encoding='utf-8')
+
+    failures = 0
+    start = time.perf_counter()
+    try:
+        for record in run_jobs(jobs, args.workers):
+            failures += record['status'] != 'ok'
+            if report is not None:
+                report.write(json.dumps(record) + '\n')
+                report.flush()
+            if record['status'] != 'ok':
+                print(f"{record['input']}: {record['error']}", file=sys.stderr)
+    finally:
+        if report is not None and report is not sys.stdout:
+            report.close()
+    elapsed = time.perf_counter() - start
+    print(f"Processed {len(jobs)} files ({failures} failed) in {elapsed:.2f}s", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -173,18 +173,27 @@ class ChangeEdgeConnectionCommand(Command):
     def execute(self) -> None:
         """Apply the new connection."""
 
-        edge = self.graph.get_edge(self.edge_id)
-        if edge:
-            edge.source_id = self.new_source_id
-            edge.target_id = self.new_target_id
+        self._connect(self.old_source_id, self.old_target_id, self.new_source_id, self.new_target_id)
     
     def undo(self) -> None:
         """Restore the old connection."""
 
+        self._connect(self.new_source_id, self.new_target_id, self.old_source_id, self.old_target_id)
+
+    def _connect(self, from_source_id, from_target_id, to_source_id, to_target_id) -> None:
+        """Move the edge's endpoints, keeping its node lists and the graph's edge index in sync."""
+
         edge = self.graph.get_edge(self.edge_id)
-        if edge:
-            edge.source_id = self.old_source_id
-            edge.target_id = self.old_target_id
+        if not edge:
+            return
+        edge.source_id = to_source_id
+        edge.target_id = to_target_id
+        if from_source_id in edge.source_ids:
+            edge.source_ids[edge.source_ids.index(from_source_id)] = to_source_id
+        if from_target_id in edge.target_ids:
+            edge.target_ids[edge.target_ids.index(from_target_id)] = to_target_id
+        if hasattr(self.graph, 'reindex_edge'):
+            self.graph.reindex_edge(self.edge_id)
 
 
 class EditPropertiesCommand(Command):
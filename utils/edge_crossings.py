@@ -0,0 +1,296 @@
+"""
+Edge crossing counting for straight-line drawings.
+
+EdgeCrossingIndex counts crossings with the same orientation test as the
+editor's edges_intersect, but only tests pairs whose bounding boxes meet.
+Those pairs come from a sweep over the segments sorted by their left end.
+Moving one node or swapping two only retests the edges touching them, so
+layout searches can evaluate candidate moves without a full recount.
+"""
+
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+__all__ = ['EdgeCrossingIndex', 'count_crossings', 'segments_cross']
+
+# Upper bound on candidate pairs tested per numpy batch during a full count
+SWEEP_BATCH_PAIRS = 1 << 20
+
+
+def segments_cross(p1: np.ndarray, p2: np.ndarray, p3: np.ndarray, p4: np.ndarray) -> np.ndarray:
+    """Vectorized edges_intersect for segments p1-p2 against p3-p4 ((N, 2) arrays)."""
+
+    def ccw(a, b, c):
+        return (c[:, 1] - a[:, 1]) * (b[:, 0] - a[:, 0]) > (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0])
+
+    return (ccw(p1, p3, p4) != ccw(p2, p3, p4)) & (ccw(p1, p2, p3) != ccw(p1, p2, p4))
+
+
+class EdgeCrossingIndex:
+    """Crossing count of a graph drawing that can be updated one node at a time.
+
+    Edges are numbered in the order given, and each pair is tested with the
+    lower-numbered edge first, exactly as count_edge_crossings does. Edges
+    with a missing endpoint are ignored.
+    """
+
+    def __init__(self, graph, edges: Optional[Iterable] = None):
+        self.graph = graph
+        if edges is None:
+            edges = graph.get_all_edges()
+
+        node_index: Dict = {}
+        positions: List[Tuple[float, float]] = []
+        sources, targets = [], []
+        self.edges = []
+        for edge in edges:
+            ends = []
+            for node_id in (edge.source_id, edge.target_id):
+                if node_id not in node_index:
+                    node = graph.get_node(node_id) if node_id is not None else None
+                    if node is None:
+                        break
+                    node_index[node_id] = len(positions)
+                    positions.append((node.x, node.y))
+                ends.append(node_index[node_id])
+            if len(ends) != 2:
+                continue
+            self.edges.append(edge)
+            sources.append(ends[0])
+            targets.append(ends[1])
+
+        # Nodes without indexed edges can still take part in moves and swaps
+        for node in graph.get_all_nodes():
+            if node.id not in node_index:
+                node_index[node.id] = len(positions)
+                positions.append((node.x, node.y))
+
+        self.node_index = node_index
+        self.positions = np.array(positions, dtype=np.float64).reshape(-1, 2)
+        self.sources = np.array(sources, dtype=np.int64)
+        self.targets = np.array(targets, dtype=np.int64)
+
+        # Edges incident to each packed node
+        incident: List[List[int]] = [[] for _ in range(len(positions))]
+        for index, (source, target) in enumerate(zip(sources, targets)):
+            incident[source].append(index)
+            if target != source:
+                incident[target].append(index)
+        self._incident = [np.array(indices, dtype=np.int64) for indices in incident]
+
+        self.node_ids = list(node_index)
+        self._update_bounds()
+        crossing_a, crossing_b = self.crossing_pairs()
+        self.count = len(crossing_a)
+        # Crossings on each edge, kept up to date by move_node and swap_nodes
+        self.edge_counts = (np.bincount(crossing_a, minlength=len(self.edges))
+                            + np.bincount(crossing_b, minlength=len(self.edges)))
+
+    def __len__(self) -> int:
+        return len(self.edges)
+
+    def _update_bounds(self, indices: Optional[np.ndarray] = None):
+        if indices is None:
+            self.starts = self.positions[self.sources]
+            self.ends = self.positions[self.targets]
+            # Column-major so the x and y columns scan contiguously
+            self.lower = np.asfortranarray(np.minimum(self.starts, self.ends))
+            self.upper = np.asfortranarray(np.maximum(self.starts, self.ends))
+            return
+        self.starts[indices] = self.positions[self.sources[indices]]
+        self.ends[indices] = self.positions[self.targets[indices]]
+        self.lower[indices] = np.minimum(self.starts[indices], self.ends[indices])
+        self.upper[indices] = np.maximum(self.starts[indices], self.ends[indices])
+
+    def _test_pairs(self, first: np.ndarray, second: np.ndarray) -> np.ndarray:
+        """Crossing test for edge pairs, lower edge index first."""
+
+        low = np.minimum(first, second)
+        high = np.maximum(first, second)
+        starts, ends = self.starts, self.ends
+        return segments_cross(starts.take(low, axis=0), ends.take(low, axis=0),
+                              starts.take(high, axis=0), ends.take(high, axis=0))
+
+    def count_all(self) -> int:
+        """Recount every crossing with a sweep along x."""
+
+        return len(self.crossing_pairs()[0])
+
+    def crossing_pairs(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Index arrays (a, b) of every crossing edge pair, a < b."""
+
+        edge_count = len(self.edges)
+        crossing_a, crossing_b = [], []
+        if edge_count < 2:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+        # Sweep from left to right; edge k can only meet the edges that start
+        # before it ends, which form a contiguous run in left-end order.
+        order = np.argsort(self.lower[:, 0], kind='stable')
+        starts = self.lower[order, 0]
+        stops = np.searchsorted(starts, self.upper[order, 0], side='right')
+        run_lengths = stops - np.arange(1, edge_count + 1)
+
+        first = 0
+        while first < edge_count:
+            # Take as many sweep positions as fit in one batch
+            cumulative = np.cumsum(run_lengths[first:])
+            last = first + max(1, int(np.searchsorted(cumulative, SWEEP_BATCH_PAIRS, side='right')))
+            lengths = run_lengths[first:last]
+            pair_count = int(lengths.sum())
+            if pair_count:
+                rows = np.repeat(np.arange(first, last), lengths)
+                offsets = np.arange(pair_count) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+                a = order[rows]
+                b = order[rows + 1 + offsets]
+                overlap = ((self.lower[a, 1] <= self.upper[b, 1]) & (self.lower[b, 1] <= self.upper[a, 1]))
+                a, b = a[overlap], b[overlap]
+                crossed = self._test_pairs(a, b)
+                crossing_a.append(np.minimum(a, b)[crossed])
+                crossing_b.append(np.maximum(a, b)[crossed])
+            first = last
+        if not crossing_a:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        return np.concatenate(crossing_a), np.concatenate(crossing_b)
+
+    def node_crossing_counts(self) -> Dict:
+        """Crossings on the edges touching each node, keyed by node id."""
+
+        edge_counts = self.edge_counts
+        return {node_id: int(edge_counts[self._incident[index]].sum())
+                for node_id, index in self.node_index.items()}
+
+    def crossings_of(self, indices: Sequence[int]) -> int:
+        """Number of crossing pairs that include at least one of the given edges."""
+
+        return len(self._pairs_of(np.unique(np.asarray(indices, dtype=np.int64)))[0])
+
+    def _pairs_of(self, indices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Crossing pairs that include one of the given (unique) edges."""
+
+        if len(indices) == 0 or len(self.edges) < 2:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+        lower_x, lower_y = self.lower[:, 0], self.lower[:, 1]
+        upper_x, upper_y = self.upper[:, 0], self.upper[:, 1]
+        overlap = ((lower_x[indices, None] <= upper_x) & (lower_x <= upper_x[indices, None])
+                   & (lower_y[indices, None] <= upper_y) & (lower_y <= upper_y[indices, None]))
+        overlap[np.arange(len(indices)), indices] = False
+        rows, others = np.nonzero(overlap)
+        first = indices[rows]
+
+        # Pairs with both edges in the set turn up twice; keep one of them
+        in_set = np.zeros(len(self.edges), dtype=bool)
+        in_set[indices] = True
+        keep = ~in_set[others] | (first < others)
+        first, others = first[keep], others[keep]
+        crossed = self._test_pairs(first, others)
+        return first[crossed], others[crossed]
+
+    def incident_edges(self, node_id) -> np.ndarray:
+        """Indices of the edges touching a node."""
+
+        index = self.node_index.get(node_id)
+        if index is None:
+            return np.empty(0, dtype=np.int64)
+        return self._incident[index]
+
+    def node_crossings(self, node_id) -> int:
+        """Number of crossings involving edges that touch a node."""
+
+        return self.crossings_of(self.incident_edges(node_id))
+
+    def move_delta(self, node_id, x: float, y: float) -> int:
+        """Change in the crossing count if a node moved to (x, y)."""
+
+        return self._trial([node_id], [(x, y)], apply=False)
+
+    def move_node(self, node_id, x: float, y: float) -> int:
+        """Move a node and update the count; returns the change."""
+
+        return self._trial([node_id], [(x, y)], apply=True)
+
+    def swap_delta(self, node_a, node_b) -> int:
+        """Change in the crossing count if two nodes traded places."""
+
+        return self._trial([node_a, node_b], self._swapped(node_a, node_b), apply=False)
+
+    def swap_nodes(self, node_a, node_b) -> int:
+        """Swap two nodes' positions and update the count; returns the change."""
+
+        return self._trial([node_a, node_b], self._swapped(node_a, node_b), apply=True)
+
+    def position(self, node_id) -> Tuple[float, float]:
+        x, y = self.positions[self.node_index[node_id]]
+        return float(x), float(y)
+
+    def apply_positions(self):
+        """Write the indexed positions back to the graph's nodes."""
+
+        for node_id, index in self.node_index.items():
+            node = self.graph.get_node(node_id)
+            if node is not None:
+                node.x, node.y = float(self.positions[index, 0]), float(self.positions[index, 1])
+
+    def _swapped(self, node_a, node_b):
+        if node_a not in self.node_index or node_b not in self.node_index:
+            return []
+        return [self.positions[self.node_index[node_b]].copy(), self.positions[self.node_index[node_a]].copy()]
+
+    def _trial(self, node_ids, new_positions, apply: bool) -> int:
+        packed = [self.node_index[node_id] for node_id in node_ids if node_id in self.node_index]
+        if len(packed) != len(node_ids):
+            return 0
+        touched = np.unique(np.concatenate([self._incident[index] for index in packed]))
+        if len(touched) == 0:
+            if apply:
+                self.positions[packed] = new_positions
+            return 0
+
+        before = self._pairs_of(touched)
+        saved = self.positions[packed].copy()
+        self.positions[packed] = new_positions
+        self._update_bounds(touched)
+        after = self._pairs_of(touched)
+        delta = len(after[0]) - len(before[0])
+        if apply:
+            self.count += delta
+            for pair_edges in before:
+                np.subtract.at(self.edge_counts, pair_edges, 1)
+            for pair_edges in after:
+                np.add.at(self.edge_counts, pair_edges, 1)
+        else:
+            self.positions[packed] = saved
+            self._update_bounds(touched)
+        return delta
+
+    def nearest_nodes(self, x: float, y: float, count: int) -> List:
+        """Ids of the count nodes closest to (x, y), nearest first."""
+
+        count = min(count, len(self.node_ids))
+        if count <= 0:
+            return []
+        distances = ((self.positions - (x, y)) ** 2).sum(axis=1)
+        nearest = np.argpartition(distances, count - 1)[:count]
+        nearest = nearest[np.argsort(distances[nearest], kind='stable')]
+        return [self.node_ids[index] for index in nearest]
+
+    def neighbour_centre(self, node_id) -> Optional[Tuple[float, float]]:
+        """Mean position of a node's neighbours, or None if it has none."""
+
+        index = self.node_index.get(node_id)
+        if index is None or len(self._incident[index]) == 0:
+            return None
+        edges = self._incident[index]
+        others = np.where(self.sources[edges] == index, self.targets[edges], self.sources[edges])
+        x, y = self.positions[others].mean(axis=0)
+        return float(x), float(y)
+
+
+def count_crossings(graph, edges: Optional[Iterable] = None) -> int:
+    """Count crossings between straight edges of a graph."""
+
+    return EdgeCrossingIndex(graph, edges).count
@@ -255,8 +255,11 @@ def import_graph_graphml(filename: str) -> m_graph.Graph:
     if graph_elem is None:
         raise ValueError("No graph element found in GraphML file")
 
+    # Elements are namespaced when the file declares the GraphML namespace
+    prefix = 'graphml:' if graph_elem.tag.startswith('{') else ''
+
     # Import nodes
-    for node_elem in graph_elem.findall('.//node'):
+    for node_elem in graph_elem.findall(f'.//{prefix}node', namespace):
         node_id = node_elem.get('id')
 
         # Extract node data
@@ -264,7 +267,7 @@ def import_graph_graphml(filename: str) -> m_graph.Graph:
         x = 0.0
         y = 0.0
 
-        for data_elem in node_elem.findall('data'):
+        for data_elem in node_elem.findall(f'{prefix}data', namespace):
             key = data_elem.get('key')
             if key == 'node_label':
                 label = data_elem.text or ''
@@ -277,7 +280,7 @@ def import_graph_graphml(filename: str) -> m_graph.Graph:
         graph.add_node(node)
 
     # Import edges
-    for edge_elem in graph_elem.findall('.//edge'):
+    for edge_elem in graph_elem.findall(f'.//{prefix}edge', namespace):
         edge_id = edge_elem.get('id')
         source_id = edge_elem.get('source')
         target_id = edge_elem.get('target')
@@ -288,7 +291,7 @@ def import_graph_graphml(filename: str) -> m_graph.Graph:
 
         # Extract edge data
         label = ''
-        for data_elem in edge_elem.findall('data'):
+        for data_elem in edge_elem.findall(f'{prefix}data', namespace):
             key = data_elem.get('key')
             if key == 'edge_label':
                 label = data_elem.text or ''
@@ -3,14 +3,20 @@ Layout algorithm utilities for the graph editor.
 """
 
 
+import bisect
+import heapq
 import math
 import random
 from typing import List, Dict, Tuple, Set
 
+import numpy as np
+
 import models.graph as m_graph
 import models.node as m_node
 import models.edge as m_edge
 
+import utils.sugiyama as m_sugiyama
+
 
 def spring_layout(graph: m_graph.Graph,
                   iterations: int = 50,
@@ -272,7 +278,9 @@ def random_layout(
 def hierarchical_layout(graph: m_graph.Graph,
                         direction: str = "top-down",
                         level_spacing: float = 100.0,
-                        node_spacing: float = 150.0) -> bool:
+                        node_spacing: float = 150.0,
+                        sweeps: int = 8,
+                        ordering: str = "median") -> bool:
     """
     Apply hierarchical layout algorithm to a graph.
     
@@ -281,75 +289,38 @@ def hierarchical_layout(graph: m_graph.Graph,
         direction: Layout direction ("top-down", "bottom-up", "left-right", "right-left")
         level_spacing: Spacing between levels
         node_spacing: Spacing between nodes in same level
+        sweeps: Crossing reduction sweeps between levels
+        ordering: Crossing reduction heuristic ("median" or "barycenter")
     """
 
     nodes = graph.get_all_nodes()
     if not nodes:
         return False
 
-    # Build hierarchy using topological sort
-    in_degree = {}
-    adj_list = {}
-
-    # Initialize
-    for node in nodes:
-        in_degree[node.id] = 0
-        adj_list[node.id] = []
-
-    # Build adjacency list and calculate in-degrees
-    for edge in graph.get_all_edges():
-        adj_list[edge.source_id].append(edge.target_id)
-        in_degree[edge.target_id] += 1
-
-    # Topological sort with level tracking
-    levels = {}
-    queue = []
-
-    # Find nodes with no incoming edges
-    for node_id, degree in in_degree.items():
-        if degree == 0:
-            queue.append((node_id, 0))
-
-    while queue:
-        node_id, level = queue.pop(0)
-
-        if level not in levels:
-            levels[level] = []
-        levels[level].append(node_id)
-
-        # Process neighbors
-        for neighbor_id in adj_list[node_id]:
-            in_degree[neighbor_id] -= 1
-            if in_degree[neighbor_id] == 0:
-                queue.append((neighbor_id, level + 1))
+    # Layer, order and place nodes with the Sugiyama pipeline
+    drawing = m_sugiyama.layered_coordinates(
+        [node.id for node in nodes],
+        [(edge.source_id, edge.target_id) for edge in graph.get_all_edges()],
+        node_spacing=node_spacing, sweeps=sweeps, ordering=ordering)
 
     # Position nodes based on direction
-    for level, node_ids in levels.items():
-        level_nodes = [graph.get_node(node_id) for node_id in node_ids]
-        level_nodes = [
-            node for node in level_nodes if node and not node.locked
-        ]
-
-        if not level_nodes:
+    for node in nodes:
+        if node.locked:
             continue
-
-        # Calculate positions
-        total_width = (len(level_nodes) - 1) * node_spacing
-        start_offset = -total_width / 2
-
-        for i, node in enumerate(level_nodes):
-            if direction == "top-down":
-                node.x = start_offset + i * node_spacing
-                node.y = level * level_spacing
-            elif direction == "bottom-up":
-                node.x = start_offset + i * node_spacing
-                node.y = -level * level_spacing
-            elif direction == "left-right":
-                node.x = level * level_spacing
-                node.y = start_offset + i * node_spacing
-            elif direction == "right-left":
-                node.x = -level * level_spacing
-                node.y = start_offset + i * node_spacing
+        level = drawing.layers[node.id]
+        offset = drawing.x[node.id]
+        if direction == "top-down":
+            node.x = offset
+            node.y = level * level_spacing
+        elif direction == "bottom-up":
+            node.x = offset
+            node.y = -level * level_spacing
+        elif direction == "left-right":
+            node.x = level * level_spacing
+            node.y = offset
+        elif direction == "right-left":
+            node.x = -level * level_spacing
+            node.y = offset
 
     return True
 
@@ -424,6 +395,171 @@ def force_directed_layout(graph: m_graph.Graph,
     return True
 
 
+def force_directed_layout_3d(graph: m_graph.Graph,
+                             iterations: int = 100,
+                             repulsion_strength: float = 1000.0,
+                             attraction_strength: float = 0.1,
+                             damping: float = 0.9,
+                             exact_limit: int = 4000,
+                             cells: int = 8) -> bool:
+    """
+    Apply force-directed layout in 3D, moving nodes along x, y and z.
+    
+    Uses the same forces as force_directed_layout on (N, 3) position arrays.
+    Up to exact_limit nodes, repulsion is summed over all pairs; above it,
+    nodes are binned into a cells^3 grid, neighbouring cells are summed
+    exactly and farther cells act through their centroids weighted by their
+    node counts. Crowded neighbourhoods are binned again, so an iteration
+    stays far below O(N^2) for very large or clustered graphs. A graph lying flat
+    in one z plane is given a small deterministic z spread first so the
+    forces can lift it into 3D.
+    
+    Args:
+        graph: The graph to layout
+        iterations: Number of iterations
+        repulsion_strength: Strength of repulsive forces
+        attraction_strength: Strength of attractive forces
+        damping: Damping factor
+        exact_limit: Largest node count that uses exact all-pairs repulsion
+        cells: Grid cells per axis for the approximate repulsion
+    """
+
+    nodes = graph.get_all_nodes()
+    if len(nodes) < 2:
+        return False
+
+    index = {node.id: i for i, node in enumerate(nodes)}
+    positions = np.array([(node.x, node.y, node.z) for node in nodes], dtype=float)
+    movable = np.array([not node.locked for node in nodes])
+
+    pairs = [(index[edge.source_id], index[edge.target_id]) for edge in graph.get_all_edges()
+             if edge.source_id in index and edge.target_id in index]
+    edge_pairs = np.array(pairs, dtype=np.int64).reshape(-1, 2)
+
+    if np.ptp(positions[:, 2]) == 0:
+        spread = max(np.ptp(positions[:, :2]) * 0.01, 1.0)
+        jitter = np.random.RandomState(0).uniform(-spread, spread, len(nodes))
+        positions[movable, 2] += jitter[movable]
+
+    for iteration in range(iterations):
+        if len(nodes) <= exact_limit:
+            forces = _exact_repulsion_3d(positions, repulsion_strength)
+        else:
+            forces = _binned_repulsion_3d(positions, repulsion_strength, cells)
+
+        # Attractive forces along edges (force = strength * distance along the edge direction)
+        if len(edge_pairs):
+            pull = attraction_strength * (positions[edge_pairs[:, 1]] - positions[edge_pairs[:, 0]])
+            for axis in range(3):
+                forces[:, axis] += np.bincount(edge_pairs[:, 0], pull[:, axis], len(nodes))
+                forces[:, axis] -= np.bincount(edge_pairs[:, 1], pull[:, axis], len(nodes))
+
+        positions[movable] += forces[movable] * damping
+
+    for node, (x, y, z) in zip(nodes, positions.tolist()):
+        if not node.locked:
+            node.x, node.y, node.z = x, y, z
+
+    return True
+
+
+def _exact_repulsion_3d(positions: np.ndarray, strength: float, chunk_elements: int = 4_000_000) -> np.ndarray:
+    """Inverse-square repulsion summed over all node pairs, in row chunks to bound memory."""
+
+    return _pair_repulsion_3d(positions, positions, strength, chunk_elements)
+
+
+def _pair_repulsion_3d(targets: np.ndarray, sources: np.ndarray, strength: float,
+                       chunk_elements: int = 4_000_000) -> np.ndarray:
+    """Inverse-square repulsion on each target from every source; coincident points exert none."""
+
+    forces = np.zeros_like(targets)
+    chunk = max(1, chunk_elements // max(len(sources), 1))
+    for start in range(0, len(targets), chunk):
+        delta = sources[np.newaxis, :, :] - targets[start:start + chunk, np.newaxis, :]
+        distance = np.sqrt(np.einsum('ijk,ijk->ij', delta, delta))
+        with np.errstate(divide='ignore'):
+            scale = np.where(distance > 0, strength / distance ** 3, 0.0)
+        forces[start:start + chunk] = -np.einsum('ijk,ij->ik', delta, scale)
+    return forces
+
+
+def _binned_repulsion_3d(positions: np.ndarray, strength: float, cells: int,
+                         leaf_pairs: int = 1 << 18) -> np.ndarray:
+    """
+    Repulsion summed exactly over nodes in the same or an adjacent grid cell,
+    with every farther occupied cell acting as its node count at its centroid.
+    
+    A cell whose neighbourhood holds too many node pairs (leaf_pairs) for an
+    exact sum is binned again over that neighbourhood, so dense clusters are
+    refined instead of summed all-pairs.
+    """
+
+    forces = np.zeros_like(positions)
+    everyone = np.arange(len(positions))
+    _grid_repulsion_3d(positions, everyone, everyone, strength, cells, leaf_pairs, forces, 0)
+    return forces
+
+
+def _grid_repulsion_3d(positions: np.ndarray, targets: np.ndarray, sources: np.ndarray, strength: float,
+                       cells: int, leaf_pairs: int, forces: np.ndarray, depth: int):
+    """Add the repulsion of sources on targets (index arrays) to forces, one grid level at a time."""
+
+    # Small enough, or points too close together for binning to split them
+    if len(targets) * len(sources) <= leaf_pairs or depth >= 8:
+        forces[targets] += _pair_repulsion_3d(positions[targets], positions[sources], strength)
+        return
+
+    source_positions = positions[sources]
+    low = source_positions.min(axis=0)
+    extent = np.maximum(source_positions.max(axis=0) - low, 1e-9)
+    shape = (cells, cells, cells)
+
+    def cell_coords(points):
+        return np.clip(((points - low) / extent * cells).astype(np.int64), 0, cells - 1)
+
+    source_coords = cell_coords(source_positions)
+    occupied, source_cells, counts = np.unique(np.ravel_multi_index(source_coords.T, shape),
+                                               return_inverse=True, return_counts=True)
+    source_cells = source_cells.ravel()
+    centroids = np.stack([np.bincount(source_cells, source_positions[:, axis], len(occupied))
+                          for axis in range(3)], axis=1) / counts[:, np.newaxis]
+    occupied_coords = np.stack(np.unravel_index(occupied, shape), axis=1)
+    target_coords = cell_coords(positions[targets])
+
+    # Far field: occupied cells that are not neighbours act at their centroids
+    chunk = max(1, 1_000_000 // len(occupied))
+    for start in range(0, len(targets), chunk):
+        block = positions[targets[start:start + chunk]]
+        delta = centroids[np.newaxis, :, :] - block[:, np.newaxis, :]
+        distance = np.sqrt(np.einsum('ijk,ijk->ij', delta, delta))
+        near = (np.abs(occupied_coords[np.newaxis, :, :]
+                       - target_coords[start:start + chunk, np.newaxis, :]) <= 1).all(axis=2)
+        with np.errstate(divide='ignore'):
+            scale = np.where(near | (distance == 0), 0.0, counts * strength / distance ** 3)
+        forces[targets[start:start + chunk]] -= np.einsum('ijk,ij->ik', delta, scale)
+
+    # Near field: targets in each cell against the sources of its 3x3x3 neighbourhood
+    source_order = np.argsort(source_cells, kind='stable')
+    source_bounds = np.concatenate([[0], np.cumsum(counts)])
+    target_ids = np.ravel_multi_index(target_coords.T, shape)
+    target_cells, target_inverse = np.unique(target_ids, return_inverse=True)
+    target_inverse = target_inverse.ravel()
+    target_order = np.argsort(target_inverse, kind='stable')
+    target_bounds = np.concatenate([[0], np.cumsum(np.bincount(target_inverse, minlength=len(target_cells)))])
+    offsets = np.stack(np.meshgrid([-1, 0, 1], [-1, 0, 1], [-1, 0, 1], indexing='ij'), axis=-1).reshape(-1, 3)
+    for index, cell in enumerate(target_cells.tolist()):
+        neighbours = np.array(np.unravel_index(cell, shape)) + offsets
+        neighbours = neighbours[((neighbours >= 0) & (neighbours < cells)).all(axis=1)]
+        neighbour_ids = np.ravel_multi_index(neighbours.T, shape)
+        slots = np.searchsorted(occupied, neighbour_ids)
+        slots = slots[(slots < len(occupied)) & (occupied[np.minimum(slots, len(occupied) - 1)] == neighbour_ids)]
+        near_sources = sources[np.concatenate([source_order[source_bounds[slot]:source_bounds[slot + 1]]
+                                               for slot in slots.tolist()])]
+        near_targets = targets[target_order[target_bounds[index]:target_bounds[index + 1]]]
+        _grid_repulsion_3d(positions, near_targets, near_sources, strength, cells, leaf_pairs, forces, depth + 1)
+
+
 def layered_layout(graph: m_graph.Graph,
                    layer_height: float = 100.0,
                    node_spacing: float = 150.0) -> bool:
@@ -436,68 +572,376 @@ def layered_layout(graph: m_graph.Graph,
         node_spacing: Horizontal spacing between nodes
     """
 
+    return hierarchical_layout(graph, "top-down", layer_height, node_spacing)
+
+
+def remove_overlaps(graph: m_graph.Graph,
+                    padding: float = 10.0,
+                    max_iterations: int = 50) -> bool:
+    """
+    Move nodes apart until no two node boxes overlap, keeping the layout.
+    
+    Neighbouring nodes keep their left-to-right and top-to-bottom order,
+    and nodes away from any overlap stay put. Locked nodes stay exactly
+    where they are and push their neighbours.
+    
+    Args:
+        graph: The graph to layout
+        padding: Extra gap kept between node boxes
+        max_iterations: Upper bound on separation passes
+    """
+
     nodes = graph.get_all_nodes()
     if not nodes:
         return False
 
-    # Assign layers using longest path from sources
-    layers = {}
-    node_layers = {}
+    centres = np.array([(node.x, node.y) for node in nodes], dtype=np.float64)
+    sizes = np.array([(node.width, node.height) for node in nodes], dtype=np.float64) + padding
+    movable = np.array([not node.locked for node in nodes])
+    resolved, iterations = resolve_overlaps(centres, sizes, movable, max_iterations)
+
+    # Locked nodes are never written back
+    moved = np.flatnonzero(movable & (resolved != centres).any(axis=1))
+    for index in moved:
+        nodes[index].x = float(resolved[index, 0])
+        nodes[index].y = float(resolved[index, 1])
+    print(f"DEBUG: Removed overlaps in {iterations} passes, moved {len(moved)} nodes")
+    return True
 
-    # Find source nodes
-    sources = []
-    for node in nodes:
-        is_source = True
-        for edge in graph.get_all_edges():
-            if edge.target_id == node.id:
-                is_source = False
+
+def overlapping_pairs(centres: np.ndarray, sizes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Index pairs (i < j) of boxes that overlap, found through a uniform grid.
+
+    The cell size is the largest box extent, so overlapping boxes always
+    have their centres in the same or neighbouring cells.
+    """
+
+    count = len(centres)
+    empty = np.empty(0, dtype=np.int64)
+    if count < 2:
+        return empty, empty
+    cell = float(sizes.max())
+    if cell <= 0:
+        return empty, empty
+
+    cells = np.floor((centres - centres.min(axis=0)) / cell).astype(np.int64)
+    columns = int(cells[:, 1].max()) + 3
+    keys = (cells[:, 0] + 1) * columns + (cells[:, 1] + 1)
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+
+    firsts, seconds = [], []
+    # Half of the 3x3 neighbourhood, so each pair of cells is joined once
+    for dx, dy in ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1)):
+        neighbour_keys = keys + dx * columns + dy
+        starts = np.searchsorted(sorted_keys, neighbour_keys, side='left')
+        stops = np.searchsorted(sorted_keys, neighbour_keys, side='right')
+        lengths = stops - starts
+        total = int(lengths.sum())
+        if not total:
+            continue
+        first = np.repeat(np.arange(count), lengths)
+        offsets = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        second = order[np.repeat(starts, lengths) + offsets]
+        if dx == 0 and dy == 0:
+            keep = first < second
+            first, second = first[keep], second[keep]
+        firsts.append(first)
+        seconds.append(second)
+    if not firsts:
+        return empty, empty
+
+    first = np.concatenate(firsts)
+    second = np.concatenate(seconds)
+    reach = (sizes[first] + sizes[second]) / 2.0
+    overlap = (np.abs(centres[first] - centres[second]) < reach).all(axis=1)
+    first, second = first[overlap], second[overlap]
+    return np.minimum(first, second), np.maximum(first, second)
+
+
+def separate_axis(desired: np.ndarray, weights: np.ndarray, left: np.ndarray, right: np.ndarray,
+                  gaps: np.ndarray, fixed: np.ndarray = None, order: np.ndarray = None) -> np.ndarray:
+    """
+    Positions on one axis with x[right] - x[left] >= gap for every
+    constraint, staying close to the desired positions.
+    
+    Variables are visited in order (by default the order of their desired
+    positions), and a variable whose block violates a constraint from the
+    left is merged into the left block. Each block sits at the weighted
+    mean of its members' wishes (the "satisfy" step of variable placement
+    with separation constraints), or where its fixed member wants to be if
+    it has one. Constraints must run from earlier to later variables in
+    the order; one between two fixed variables may stay violated.
+    """
+
+    count = len(desired)
+    block_of = list(range(count))
+    offset = [0.0] * count
+    members = [[i] for i in range(count)]
+    weight_sum = [float(w) for w in weights]
+    wish_sum = [float(w * d) for w, d in zip(weights, desired)]
+    position = list(map(float, desired))
+    # The fixed member of each block, or -1
+    anchor = [-1] * count
+    if fixed is not None:
+        anchor = [i if pinned else -1 for i, pinned in enumerate(np.asarray(fixed, dtype=bool).tolist())]
+    left_list, right_list, gap_list = left.tolist(), right.tolist(), gaps.tolist()
+    if order is None:
+        order = np.argsort(desired, kind='stable')
+
+    # Each block keeps a max-heap of its incoming constraints, keyed by the
+    # block position each one needs. A variable's heap is filled when it is
+    # visited; from then on the left blocks only ever move left, so stored
+    # keys can only be too high and are refreshed when they surface.
+    def required(index):
+        source = left_list[index]
+        return position[block_of[source]] + offset[source] + gap_list[index] - offset[right_list[index]]
+
+    def merge(block, other, shift):
+        # Join other to block shifted by shift (the smaller block moves into
+        # the larger one) and return (survivor, absorbed)
+        if len(members[block]) < len(members[other]):
+            block, other, shift = other, block, -shift
+        for member in members[other]:
+            offset[member] += shift
+            block_of[member] = block
+        members[block].extend(members[other])
+        wish_sum[block] += wish_sum[other] - shift * weight_sum[other]
+        weight_sum[block] += weight_sum[other]
+        if anchor[block] < 0:
+            anchor[block] = anchor[other]
+        if anchor[block] >= 0:
+            position[block] = float(desired[anchor[block]]) - offset[anchor[block]]
+        else:
+            position[block] = wish_sum[block] / weight_sum[block]
+        members[other] = []
+        return block, other
+
+    constraints_into = [[] for _ in range(count)]
+    for index, target in enumerate(right_list):
+        constraints_into[target].append(index)
+    incoming = [[] for _ in range(count)]
+
+    for variable in np.asarray(order).tolist():
+        block = block_of[variable]
+        heap = incoming[block] = [(-required(index), index) for index in constraints_into[variable]]
+        heapq.heapify(heap)
+        while heap:
+            key, index = heap[0]
+            other = block_of[left_list[index]]
+            if other == block:
+                heapq.heappop(heap)
+                continue
+            need = required(index)
+            if need < -key - 1e-12:
+                heapq.heapreplace(heap, (-need, index))
+                continue
+            if need <= position[block] + 1e-9:
                 break
-        if is_source:
-            sources.append(node)
+            heapq.heappop(heap)
+            if anchor[block] >= 0 and anchor[other] >= 0:
+                continue
+
+            # Merge so the constraint holds with equality inside one block
+            shift = offset[left_list[index]] + gap_list[index] - offset[right_list[index]]
+            block, other = merge(other, block, shift)
+            heap = incoming[block]
+            for _, moved in incoming[other]:
+                if block_of[left_list[moved]] != block:
+                    heapq.heappush(heap, (-required(moved), moved))
+            incoming[other] = []
+
+    # A block pulled right by a fixed member can break constraints out of it,
+    # so merge across any violated constraint until none are left
+    left, right, gaps = np.asarray(left), np.asarray(right), np.asarray(gaps)
+    while len(left):
+        blocks = np.array(block_of)
+        values = np.array(position)[blocks] + np.array(offset)
+        slack = values[right] - values[left] - gaps
+        anchored = np.array(anchor)[blocks] >= 0
+        violated = np.flatnonzero((slack < -1e-9) & (blocks[left] != blocks[right])
+                                  & ~(anchored[left] & anchored[right]))
+        if not len(violated):
+            break
+        merged = set()
+        for index in violated[np.argsort(slack[violated], kind='stable')].tolist():
+            source, target = left_list[index], right_list[index]
+            if block_of[source] in merged or block_of[target] in merged:
+                continue
+            if required(index) <= position[block_of[target]] + 1e-9:
+                continue
+            block, _ = merge(block_of[source], block_of[target],
+                             offset[source] + gap_list[index] - offset[target])
+            merged.add(block)
+
+    return np.array([position[block_of[i]] + offset[i] for i in range(count)])
+
+
+def _sweep_events(centres: np.ndarray, sizes: np.ndarray, axis: int) -> List[Tuple[bool, int]]:
+    """(opening, box) events of a sweep along one axis, closings first at equal coordinates."""
+
+    count = len(centres)
+    half = sizes[:, axis] / 2.0
+    coordinates = np.concatenate([centres[:, axis] - half, centres[:, axis] + half])
+    opening = np.arange(2 * count) < count
+    order = np.lexsort((opening, coordinates))
+    return list(zip(opening[order].tolist(), (order % count).tolist()))
+
+
+def _x_constraints(centres: np.ndarray, sizes: np.ndarray,
+                   rank: np.ndarray) -> Tuple[Set[Tuple[int, int]], Set[Tuple[int, int]]]:
+    """
+    Horizontal separation pairs and neighbour pairs (left, right) from a
+    sweep over y.
+    
+    The boxes the sweep line crosses are kept in x order. A box entering
+    the line is paired with its neighbours on each side that overlap it
+    less in x than in y (so moving them apart sideways is the smaller
+    move), up to and including the first neighbour it does not overlap in x.
+    Boxes that are ever next to each other on the line, and so overlap in
+    y, are returned as neighbours.
+    """
+
+    events = _sweep_events(centres, sizes, 1)
+    by_rank = np.argsort(rank).tolist()
+    rank = rank.tolist()
+    half = sizes / 2.0
+    xs, ys = centres[:, 0].tolist(), centres[:, 1].tolist()
+    hw, hh = half[:, 0].tolist(), half[:, 1].tolist()
+    line: List[int] = []
+    pairs = set()
+    neighbours = set()
+    for opening, v in events:
+        slot = bisect.bisect_left(line, rank[v])
+        if not opening:
+            del line[slot]
+            if 0 < slot < len(line):
+                neighbours.add((by_rank[line[slot - 1]], by_rank[line[slot]]))
+            continue
+        line.insert(slot, rank[v])
+        for step in (-1, 1):
+            position = slot + step
+            if 0 <= position < len(line):
+                u = by_rank[line[position]]
+                neighbours.add((u, v) if step < 0 else (v, u))
+            while 0 <= position < len(line):
+                u = by_rank[line[position]]
+                overlap_x = hw[u] + hw[v] - abs(xs[u] - xs[v])
+                if overlap_x <= 0 or overlap_x <= hh[u] + hh[v] - abs(ys[u] - ys[v]):
+                    pairs.add((u, v) if step < 0 else (v, u))
+                if overlap_x <= 0:
+                    break
+                position += step
+    return pairs, neighbours
 
-    if not sources:
-        sources = [nodes[0]]  # Use first node if no sources
 
-    # Assign layers using DFS
-    def assign_layer(node, layer):
-        if node.id in node_layers:
-            node_layers[node.id] = max(node_layers[node.id], layer)
+def _y_constraints(centres: np.ndarray, sizes: np.ndarray, rank: np.ndarray) -> Set[Tuple[int, int]]:
+    """
+    Vertical separation pairs (lower, upper) from a sweep over x.
+    
+    The boxes the sweep line crosses are kept in y order, and every two
+    that become neighbours there are paired, so any two boxes that overlap
+    in x end up linked by a chain of separations.
+    """
+
+    events = _sweep_events(centres, sizes, 0)
+    by_rank = np.argsort(rank).tolist()
+    rank = rank.tolist()
+    line: List[int] = []
+    pairs = set()
+    for opening, v in events:
+        slot = bisect.bisect_left(line, rank[v])
+        if opening:
+            line.insert(slot, rank[v])
+            if slot > 0:
+                pairs.add((by_rank[line[slot - 1]], v))
+            if slot + 1 < len(line):
+                pairs.add((v, by_rank[line[slot + 1]]))
         else:
-            node_layers[node.id] = layer
+            del line[slot]
+            if 0 < slot < len(line):
+                pairs.add((by_rank[line[slot - 1]], by_rank[line[slot]]))
+    return pairs
 
-        # Process children
-        for edge in graph.get_all_edges():
-            if edge.source_id == node.id:
-                child = graph.get_node(edge.target_id)
-                if child:
-                    assign_layer(child, layer + 1)
 
-    # Start from sources
-    for source in sources:
-        assign_layer(source, 0)
+def _axis_rank(values: np.ndarray, tie_break: np.ndarray) -> np.ndarray:
+    """Rank of each box on one axis, equal positions ranked as in tie_break."""
 
-    # Group nodes by layer
-    for node_id, layer in node_layers.items():
-        if layer not in layers:
-            layers[layer] = []
-        layers[layer].append(node_id)
+    tied = np.empty(len(values), dtype=np.int64)
+    tied[tie_break] = np.arange(len(values))
+    rank = np.empty(len(values), dtype=np.int64)
+    rank[np.lexsort((tied, values))] = np.arange(len(values))
+    return rank
 
-    # Position nodes
-    for layer, node_ids in layers.items():
-        layer_nodes = [graph.get_node(node_id) for node_id in node_ids]
-        layer_nodes = [
-            node for node in layer_nodes if node and not node.locked
-        ]
 
-        if not layer_nodes:
-            continue
+def _solve_axis(centres: np.ndarray, sizes: np.ndarray, movable: np.ndarray, rank: np.ndarray,
+                axis: int, pairs: Set[Tuple[int, int]], kept: Set[Tuple[int, int]] = frozenset()) -> np.ndarray:
+    """Solve one axis for the separation pairs, keeping each kept (left, right) pair in order."""
 
-        # Center nodes horizontally
-        total_width = (len(layer_nodes) - 1) * node_spacing
-        start_x = -total_width / 2
+    count = len(centres)
+    # A hair over touching, so rounding cannot leave them overlapping
+    constraints = [(u, v, (sizes[u, axis] + sizes[v, axis]) / 2.0 + 1e-6) for u, v in pairs]
+    # Order only between movable boxes, or fixed ones could trap boxes between them
+    constraints += [(u, v, 0.0) for u, v in kept if movable[u] and movable[v]]
+    left = np.array([u for u, _, _ in constraints], dtype=np.int64)
+    right = np.array([v for _, v, _ in constraints], dtype=np.int64)
+    gaps = np.array([gap for _, _, gap in constraints], dtype=np.float64)
+    return separate_axis(centres[:, axis], np.ones(count), left, right, gaps,
+                         fixed=~movable, order=np.argsort(rank))
 
-        for i, node in enumerate(layer_nodes):
-            node.x = start_x + i * node_spacing
-            node.y = layer * layer_height
 
-    return True
+def resolve_overlaps(centres: np.ndarray, sizes: np.ndarray, movable: np.ndarray = None,
+                     max_iterations: int = 50) -> Tuple[np.ndarray, int]:
+    """
+    Separate overlapping boxes with small moves that keep the order of
+    neighbouring boxes.
+    
+    A pass solves x against separation constraints found by a sweep over
+    y, then y against constraints from a sweep over x at the new x
+    positions, which leaves no overlaps unless fixed (not movable) boxes
+    make that impossible. Order is only held between boxes the sweeps find
+    next to each other: movable boxes overlapping in y keep their
+    left-to-right order, and boxes overlapping in x are stacked in their
+    top-to-bottom order, so boxes far from any overlap stay put. Fixed boxes never move. Passes repeat, up to
+    max_iterations, while each clears at least a quarter of the overlaps
+    left that involve a movable box.
+    
+    Returns:
+        (new centres, number of passes made)
+    """
+
+    original = np.array(centres, dtype=np.float64)
+    centres = original.copy()
+    sizes = np.asarray(sizes, dtype=np.float64)
+    count = len(centres)
+    if movable is None:
+        movable = np.ones(count, dtype=bool)
+    movable = np.asarray(movable, dtype=bool)
+    if count < 2:
+        return centres, 0
+
+    # Ties in position keep the original order
+    tie_break = [np.lexsort((np.arange(count), original[:, axis])) for axis in range(2)]
+
+    previous, previous_count = centres, None
+    for iteration in range(max_iterations + 1):
+        first, second = overlapping_pairs(centres, sizes)
+        remaining = int((movable[first] | movable[second]).sum())
+        if previous_count is not None and remaining >= previous_count:
+            # Boxes trapped by fixed ones; more passes only shuffle them
+            return previous, iteration - 1
+        if not remaining or iteration == max_iterations:
+            return centres, iteration
+        if previous_count and remaining * 4 > previous_count * 3:
+            return centres, iteration
+        previous, previous_count = centres.copy(), remaining
+        # Side by side boxes go apart in x, and neighbours overlapping in y
+        # keep their x order; then every two boxes still overlapping in x
+        # are stacked in their y order
+        rank = _axis_rank(centres[:, 0], tie_break[0])
+        pairs, neighbours = _x_constraints(centres, sizes, rank)
+        centres[:, 0] = _solve_axis(centres, sizes, movable, rank, 0, pairs, neighbours - pairs)
+        rank = _axis_rank(centres[:, 1], tie_break[1])
+        centres[:, 1] = _solve_axis(centres, sizes, movable, rank, 1, _y_constraints(centres, sizes, rank))
+        # Fixed boxes come back exactly, free of rounding
+        centres[~movable] = original[~movable]
@@ -1,14 +1,31 @@
 """
 Manager classes for various application functionalities.
+
+Each manager module is imported the first time its class is looked up, so
+importing one manager does not pull in the others.
 """
 
-from .theme_manager import ThemeManager
-from .hotkey_manager import HotkeyManager
-from .clipboard_manager import ClipboardManager
-from .selection_manager import SelectionManager
-from .layout_manager import LayoutManager
-from .file_manager import FileManager
-from .undo_redo_manager import UndoRedoManager
+import importlib
+
+_MANAGER_MODULES = {
+    'ThemeManager': '.theme_manager',
+    'HotkeyManager': '.hotkey_manager',
+    'ClipboardManager': '.clipboard_manager',
+    'SelectionManager': '.selection_manager',
+    'LayoutManager': '.layout_manager',
+    'FileManager': '.file_manager',
+    'UndoRedoManager': '.undo_redo_manager',
+}
+
+
+def __getattr__(name):
+    module_name = _MANAGER_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     'ThemeManager',
@@ -11,6 +11,8 @@ from dataclasses import dataclass
 from enum import Enum, auto
 import wx
 
+import utils.layout as m_layout
+
 if TYPE_CHECKING:
     from gui.main_window import MainWindow
     from models.node import Node
@@ -417,51 +419,12 @@ class LayoutManager:
         if not nodes:
             return
             
-        # Assign layers based on longest path from any root
-        layers: Dict[str, int] = {}
-        roots = []
-        
-        # Find roots (nodes with no incoming edges)
-        for node in nodes:
-            if not any(edge.target_id == node.id for edge in graph.get_all_edges()):
-                roots.append(node.id)
-        
-        if not roots:
-            roots = [nodes[0].id]  # Use first node if no roots found
-        
-        # Assign initial layers
-        def assign_layer(node_id: str, layer: int):
-            if node_id in layers:
-                layers[node_id] = max(layers[node_id], layer)
-            else:
-                layers[node_id] = layer
-            for edge in graph.get_node_edges(node_id):
-                if edge.source_id == node_id:
-                    assign_layer(edge.target_id, layer + 1)
-        
-        for root in roots:
-            assign_layer(root, 0)
-        
-        # Group nodes by layer
-        layer_nodes: Dict[int, List[str]] = {}
-        for node_id, layer in layers.items():
-            if layer not in layer_nodes:
-                layer_nodes[layer] = []
-            layer_nodes[layer].append(node_id)
-        
-        # Position nodes in layers
-        max_layer = max(layer_nodes.keys())
-        for layer, node_ids in layer_nodes.items():
-            y = layer * self.settings.layer_spacing
-            width = (len(node_ids) - 1) * self.settings.node_spacing
-            x = -width / 2
-            for node_id in node_ids:
-                node = graph.get_node(node_id)
-                if node:
-                    node.x = x
-                    node.y = y
-                    x += self.settings.node_spacing
-            self.progress = (layer + 1) / (max_layer + 1)
+        # Break cycles, layer by longest path, reduce crossings and place
+        # nodes with the shared Sugiyama pipeline
+        m_layout.hierarchical_layout(graph, "top-down",
+                                     level_spacing=self.settings.layer_spacing,
+                                     node_spacing=self.settings.node_spacing)
+        self.progress = 1.0
     
     def _apply_organic_layout(self, graph: 'Graph'):
         """Apply organic layout (modified spring layout)."""
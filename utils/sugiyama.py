@@ -0,0 +1,445 @@
+"""
+Sugiyama-style layered layout.
+
+The pipeline breaks cycles by reversing DFS back edges and assigns layers by
+longest path. Long edges are split with dummy nodes. Layers are reordered
+with median or barycenter sweeps, keeping the ordering with the fewest
+crossings. Nodes are then placed with the Brandes-Koepf method: four
+vertical alignments, each compacted and balanced into the final x.
+Every step is linear in nodes plus edges (sorting aside) per sweep.
+"""
+
+
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+__all__ = ['LayeredDrawing', 'brandes_koepf', 'break_cycles', 'count_layer_crossings',
+           'layered_coordinates', 'longest_path_layers']
+
+
+class LayeredDrawing:
+    """Result of layered_coordinates for one graph.
+
+    layers maps node id to layer index, x maps node id to the horizontal
+    coordinate within its layer, and crossings is the number of edge
+    crossings between adjacent layers in the chosen ordering.
+    """
+
+    def __init__(self, layers: Dict, x: Dict, crossings: int, dummy_count: int, reversed_edges: int):
+        self.layers = layers
+        self.x = x
+        self.crossings = crossings
+        self.dummy_count = dummy_count
+        self.reversed_edges = reversed_edges
+
+    @property
+    def layer_count(self) -> int:
+        return max(self.layers.values()) + 1 if self.layers else 0
+
+
+def break_cycles(node_count: int, edges: Sequence[Tuple[int, int]]) -> List[bool]:
+    """Flags for the edges to reverse so the graph becomes acyclic (DFS back edges)."""
+
+    outgoing: List[List[Tuple[int, int]]] = [[] for _ in range(node_count)]
+    for index, (source, target) in enumerate(edges):
+        outgoing[source].append((target, index))
+
+    reverse = [False] * len(edges)
+    state = [0] * node_count  # 0 unvisited, 1 on the DFS stack, 2 finished
+    for start in range(node_count):
+        if state[start]:
+            continue
+        state[start] = 1
+        stack = [(start, 0)]
+        while stack:
+            node, next_edge = stack[-1]
+            if next_edge == len(outgoing[node]):
+                state[node] = 2
+                stack.pop()
+                continue
+            stack[-1] = (node, next_edge + 1)
+            target, index = outgoing[node][next_edge]
+            if state[target] == 1:
+                reverse[index] = True
+            elif state[target] == 0:
+                state[target] = 1
+                stack.append((target, 0))
+    return reverse
+
+
+def longest_path_layers(node_count: int, edges: Sequence[Tuple[int, int]]) -> List[int]:
+    """Layer each node of a DAG one below its deepest predecessor.
+
+    Sources are then pulled down to sit just above their highest successor
+    so they do not stretch edges across the whole drawing.
+    """
+
+    outgoing: List[List[int]] = [[] for _ in range(node_count)]
+    in_degree = [0] * node_count
+    for source, target in edges:
+        outgoing[source].append(target)
+        in_degree[target] += 1
+
+    topological = [node for node in range(node_count) if in_degree[node] == 0]
+    remaining = list(in_degree)
+    head = 0
+    while head < len(topological):
+        node = topological[head]
+        head += 1
+        for target in outgoing[node]:
+            remaining[target] -= 1
+            if remaining[target] == 0:
+                topological.append(target)
+
+    layer = [0] * node_count
+    for node in topological:
+        for target in outgoing[node]:
+            if layer[target] < layer[node] + 1:
+                layer[target] = layer[node] + 1
+
+    for node in reversed(topological):
+        if in_degree[node] == 0 and outgoing[node]:
+            layer[node] = min(layer[target] for target in outgoing[node]) - 1
+    return layer
+
+
+def count_layer_crossings(upper_pos: np.ndarray, lower_pos: np.ndarray, gaps: np.ndarray) -> int:
+    """Crossings between adjacent layers, counted as inversions per gap."""
+
+    if len(upper_pos) < 2:
+        return 0
+    order = np.lexsort((lower_pos, upper_pos, gaps))
+    values = lower_pos[order].astype(np.int64)
+    groups = gaps[order].astype(np.int64)
+
+    # Radix inversion count: at each bit, an element with the bit clear is
+    # inverted with every earlier element in its group and prefix that has it set.
+    total = 0
+    sequence = np.arange(len(values))
+    for bit in reversed(range(max(1, int(values.max()).bit_length()))):
+        prefix = values >> (bit + 1)
+        key = groups * (int(prefix.max()) + 1) + prefix
+        grouped = np.lexsort((sequence, key))
+        key = key[grouped]
+        ones = ((values[grouped] >> bit) & 1).astype(np.int64)
+        seen = np.cumsum(ones) - ones
+        starts = np.flatnonzero(np.r_[True, key[1:] != key[:-1]])
+        seen -= np.repeat(seen[starts], np.diff(np.r_[starts, len(key)]))
+        total += int(seen[ones == 0].sum())
+    return total
+
+
+class _Layering:
+    """Proper layered graph: every segment joins adjacent layers."""
+
+    def __init__(self, node_count: int, edges: Sequence[Tuple[int, int]], layer: List[int]):
+        self.real_count = node_count
+        layer = list(layer)
+        upper, lower = [], []
+        for source, target in edges:
+            if layer[source] > layer[target]:
+                source, target = target, source
+            chain = [source]
+            for level in range(layer[source] + 1, layer[target]):
+                chain.append(len(layer))
+                layer.append(level)
+            chain.append(target)
+            for a, b in zip(chain, chain[1:]):
+                upper.append(a)
+                lower.append(b)
+
+        self.layer = np.array(layer, dtype=np.int64)
+        self.node_count = len(layer)
+        self.upper = np.array(upper, dtype=np.int64)
+        self.lower = np.array(lower, dtype=np.int64)
+        self.gap = self.layer[self.upper] if len(upper) else np.empty(0, dtype=np.int64)
+        self.layer_count = int(self.layer.max()) + 1 if self.node_count else 0
+
+        # Nodes of each layer in their initial order
+        by_layer = np.argsort(self.layer, kind='stable')
+        bounds = np.searchsorted(self.layer[by_layer], np.arange(self.layer_count + 1))
+        self.layers = [by_layer[bounds[i]:bounds[i + 1]] for i in range(self.layer_count)]
+        self.pos = np.empty(self.node_count, dtype=np.int64)
+        for nodes in self.layers:
+            self.pos[nodes] = np.arange(len(nodes))
+
+        # Segments of each gap (gap i joins layer i to layer i + 1)
+        segment_order = np.argsort(self.gap, kind='stable')
+        bounds = np.searchsorted(self.gap[segment_order], np.arange(self.layer_count + 1))
+        self.gap_segments = [segment_order[bounds[i]:bounds[i + 1]] for i in range(self.layer_count)]
+
+    def is_dummy(self, node: int) -> bool:
+        return node >= self.real_count
+
+    def crossings(self) -> int:
+        return count_layer_crossings(self.pos[self.upper], self.pos[self.lower], self.gap)
+
+    def _sweep_layer(self, layer_index: int, downward: bool, method: str):
+        nodes = self.layers[layer_index]
+        if len(nodes) < 2:
+            return
+        if downward:
+            segments = self.gap_segments[layer_index - 1]
+            own, other = self.lower[segments], self.upper[segments]
+            other_size = len(self.layers[layer_index - 1])
+        else:
+            segments = self.gap_segments[layer_index]
+            own, other = self.upper[segments], self.lower[segments]
+            other_size = len(self.layers[layer_index + 1])
+
+        local = self.pos[own]
+        other_pos = self.pos[other].astype(np.float64)
+        counts = np.bincount(local, minlength=len(nodes))
+        # Nodes without neighbours keep their relative place in the layer
+        keys = (np.arange(len(nodes)) + 0.5) * (other_size / len(nodes)) - 0.5
+        has = counts > 0
+        if method == "barycenter":
+            sums = np.bincount(local, weights=other_pos, minlength=len(nodes))
+            keys[has] = sums[has] / counts[has]
+        else:
+            order = np.lexsort((other_pos, local))
+            sorted_pos = other_pos[order]
+            starts = np.cumsum(counts) - counts
+            low = starts + (counts - 1) // 2
+            high = starts + counts // 2
+            keys[has] = (sorted_pos[low[has]] + sorted_pos[high[has]]) / 2.0
+
+        current = np.empty(len(nodes), dtype=np.int64)
+        current[self.pos[nodes]] = nodes
+        new_order = current[np.lexsort((np.arange(len(nodes)), keys))]
+        self.layers[layer_index] = new_order
+        self.pos[new_order] = np.arange(len(nodes))
+
+    def reduce_crossings(self, sweeps: int, method: str) -> int:
+        """Alternate down and up sweeps, keeping the best ordering found."""
+
+        best = self.crossings()
+        best_pos = self.pos.copy()
+        for sweep in range(sweeps):
+            if best == 0:
+                break
+            if sweep % 2 == 0:
+                for layer_index in range(1, self.layer_count):
+                    self._sweep_layer(layer_index, True, method)
+            else:
+                for layer_index in range(self.layer_count - 2, -1, -1):
+                    self._sweep_layer(layer_index, False, method)
+            crossings = self.crossings()
+            if crossings < best:
+                best = crossings
+                best_pos = self.pos.copy()
+
+        self.pos = best_pos
+        for layer_index, nodes in enumerate(self.layers):
+            ordered = np.empty(len(nodes), dtype=np.int64)
+            ordered[self.pos[nodes]] = nodes
+            self.layers[layer_index] = ordered
+        return best
+
+
+def _type1_conflicts(layering: _Layering) -> set:
+    """Non-inner segments crossing an inner (dummy-dummy) segment, as (upper, lower) pairs."""
+
+    if len(layering.upper) == 0:
+        return set()
+    pos = layering.pos
+    upper, lower, gap = layering.upper, layering.lower, layering.gap
+    inner = (upper >= layering.real_count) & (lower >= layering.real_count)
+    if not inner.any():
+        return set()
+
+    # Each segment must stay between the inner segments nearest to its lower
+    # end on either side: k0 from the one before it, k1 from the one at or after it.
+    width = int(pos.max()) + 1
+    inner_keys = gap[inner] * width + pos[lower[inner]]
+    order = np.argsort(inner_keys)
+    inner_keys = inner_keys[order]
+    inner_gap = gap[inner][order]
+    inner_upper = pos[upper[inner]][order]
+    layer_sizes = np.array([len(nodes) for nodes in layering.layers], dtype=np.int64)
+
+    after = np.searchsorted(inner_keys, gap * width + pos[lower], side='left')
+    has_after = after < len(inner_keys)
+    has_after[has_after] = inner_gap[after[has_after]] == gap[has_after]
+    k1 = layer_sizes[gap] - 1
+    k1[has_after] = inner_upper[after[has_after]]
+    before = after - 1
+    has_before = before >= 0
+    has_before[has_before] = inner_gap[before[has_before]] == gap[has_before]
+    k0 = np.zeros(len(gap), dtype=np.int64)
+    k0[has_before] = inner_upper[before[has_before]]
+
+    upper_pos = pos[upper]
+    conflict = ~inner & ((upper_pos < k0) | (upper_pos > k1))
+    return set(zip(upper[conflict].tolist(), lower[conflict].tolist()))
+
+
+def _compact(roots: np.ndarray, left: np.ndarray, right: np.ndarray, separation: np.ndarray,
+             node_count: int) -> Optional[np.ndarray]:
+    """Longest-path placement of blocks, one frontier of ready blocks at a time."""
+
+    a, b = roots[left], roots[right]
+    order = np.argsort(a, kind='stable')
+    a, b, separation = a[order], b[order], separation[order]
+    starts = np.searchsorted(a, np.arange(node_count + 1))
+    in_degree = np.bincount(b, minlength=node_count)
+
+    x = np.zeros(node_count)
+    block_roots = np.flatnonzero(roots == np.arange(node_count))
+    frontier = block_roots[in_degree[block_roots] == 0]
+    placed = 0
+    while len(frontier):
+        placed += len(frontier)
+        counts = starts[frontier + 1] - starts[frontier]
+        if not counts.any():
+            break
+        edges = np.repeat(starts[frontier] - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        targets = b[edges]
+        np.maximum.at(x, targets, x[a[edges]] + separation[edges])
+        touched, hits = np.unique(targets, return_counts=True)
+        in_degree[touched] -= hits
+        frontier = touched[in_degree[touched] == 0]
+    if placed != len(block_roots):
+        return None
+    return x[roots]
+
+
+def _align_and_compact(layering: _Layering, medians: List[Tuple[int, ...]], layer_sequence: List[int],
+                       mirrored: bool, marked: set, downward: bool, widths: np.ndarray) -> np.ndarray:
+    """One Brandes-Koepf pass: vertical alignment, then leftmost block compaction."""
+
+    node_count = layering.node_count
+    root = list(range(node_count))
+    align = list(range(node_count))
+    rank = -layering.pos - 1 if mirrored else layering.pos
+    rank_list = rank.tolist()
+    ordered_layers = [layering.layers[i][::-1] if mirrored else layering.layers[i] for i in layer_sequence]
+
+    for ordered in ordered_layers:
+        r = -node_count - 1
+        for v in ordered.tolist():
+            for u in medians[v]:
+                if align[v] != v:
+                    break
+                segment = (u, v) if downward else (v, u)
+                if r < rank_list[u] and segment not in marked:
+                    align[u] = v
+                    root[v] = root[u]
+                    align[v] = root[v]
+                    r = rank_list[u]
+
+    # Blocks must keep their left neighbours' blocks at least a separation apart
+    lefts = [ordered[:-1] for ordered in ordered_layers if len(ordered) > 1]
+    rights = [ordered[1:] for ordered in ordered_layers if len(ordered) > 1]
+    roots = np.array(root, dtype=np.int64)
+    if not lefts:
+        return np.zeros(node_count)
+    left = np.concatenate(lefts)
+    right = np.concatenate(rights)
+    x = _compact(roots, left, right, (widths[left] + widths[right]) / 2.0, node_count)
+    if x is None:
+        # Alignment left a cycle in the block graph; fall back to ranks
+        return layering.pos.astype(np.float64) * (-1.0 if mirrored else 1.0) * float(widths.max())
+    return x
+
+
+def brandes_koepf(layering: _Layering, widths: np.ndarray) -> np.ndarray:
+    """Horizontal coordinates from the four balanced Brandes-Koepf alignments."""
+
+    node_count = layering.node_count
+    upper_adj: List[List[int]] = [[] for _ in range(node_count)]
+    lower_adj: List[List[int]] = [[] for _ in range(node_count)]
+    pos = layering.pos.tolist()
+    for upper, lower in zip(layering.upper.tolist(), layering.lower.tolist()):
+        upper_adj[lower].append(upper)
+        lower_adj[upper].append(lower)
+    marked = _type1_conflicts(layering)
+
+    def median_neighbours(adjacent):
+        medians = []
+        for neighbours in adjacent:
+            degree = len(neighbours)
+            if degree == 0:
+                medians.append(())
+            elif degree == 1:
+                medians.append((neighbours[0],))
+            else:
+                neighbours = sorted(neighbours, key=pos.__getitem__)
+                low, high = neighbours[(degree - 1) // 2], neighbours[degree // 2]
+                medians.append((low,) if low == high else (low, high))
+        return medians
+
+    layouts = []
+    for downward in (True, False):
+        medians = median_neighbours(upper_adj if downward else lower_adj)
+        layer_sequence = list(range(layering.layer_count))
+        if not downward:
+            layer_sequence.reverse()
+        for leftward in (True, False):
+            if leftward:
+                x = _align_and_compact(layering, medians, layer_sequence, False, marked, downward, widths)
+            else:
+                # Mirror the layers: ranks run right to left and medians are tried in reverse
+                mirrored = [tuple(reversed(candidates)) for candidates in medians]
+                x = -_align_and_compact(layering, mirrored, layer_sequence, True, marked, downward, widths)
+            layouts.append((leftward, x))
+
+    # Align every layout to the narrowest one, then take the average median
+    spans = [x.max() - x.min() for _, x in layouts]
+    narrow = layouts[int(np.argmin(spans))][1]
+    shifted = []
+    for leftward, x in layouts:
+        shift = narrow.min() - x.min() if leftward else narrow.max() - x.max()
+        shifted.append(x + shift)
+    stacked = np.sort(np.vstack(shifted), axis=0)
+    return (stacked[1] + stacked[2]) / 2.0
+
+
+def layered_coordinates(node_ids: Sequence[Hashable], edges: Iterable[Tuple[Hashable, Hashable]],
+                        node_spacing: float = 150.0, dummy_spacing: Optional[float] = None,
+                        sweeps: int = 8, ordering: str = "median") -> LayeredDrawing:
+    """
+    Compute layers and in-layer coordinates for a directed graph.
+
+    Args:
+        node_ids: Nodes to place, in their preferred initial order
+        edges: (source, target) pairs; self-loops and unknown ids are ignored
+        node_spacing: Minimum distance between adjacent nodes in a layer
+        dummy_spacing: Space taken by bends of long edges (node_spacing / 2 by default)
+        sweeps: Number of alternating down/up ordering sweeps
+        ordering: "median" or "barycenter"
+    """
+
+    node_ids = list(node_ids)
+    index = {node_id: i for i, node_id in enumerate(node_ids)}
+    pairs = []
+    for source, target in edges:
+        if source in index and target in index and source != target:
+            pairs.append((index[source], index[target]))
+    if not node_ids:
+        return LayeredDrawing({}, {}, 0, 0, 0)
+
+    reverse = break_cycles(len(node_ids), pairs)
+    acyclic = [(t, s) if flip else (s, t) for (s, t), flip in zip(pairs, reverse)]
+    layer = longest_path_layers(len(node_ids), acyclic)
+
+    layering = _Layering(len(node_ids), acyclic, layer)
+    crossings = layering.reduce_crossings(sweeps, ordering)
+
+    if dummy_spacing is None:
+        dummy_spacing = node_spacing / 2.0
+    widths = np.full(layering.node_count, float(dummy_spacing))
+    widths[:len(node_ids)] = node_spacing
+    x = brandes_koepf(layering, widths)
+
+    real_x = x[:len(node_ids)]
+    x -= (real_x.min() + real_x.max()) / 2.0
+
+    return LayeredDrawing(
+        layers={node_id: int(layering.layer[i]) for i, node_id in enumerate(node_ids)},
+        x={node_id: float(x[i]) for i, node_id in enumerate(node_ids)},
+        crossings=crossings,
+        dummy_count=layering.node_count - len(node_ids),
+        reversed_edges=sum(reverse))